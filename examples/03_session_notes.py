@@ -15,6 +15,7 @@ from mini_agent import LLMClient
 from mini_agent.agent import Agent
 from mini_agent.config import Config
 from mini_agent.tools import BashTool, ReadTool, WriteTool
+from mini_agent.tools.note_store import NoteStore, note_db_path
 from mini_agent.tools.note_tool import RecallNoteTool, SessionNoteTool
 
 
@@ -63,15 +64,16 @@ async def demo_direct_note_usage():
         result = await recall_tool.execute(category="user_preference")
         print(result.content)
 
-        # Show the memory file
-        print("\n📄 Memory file content:")
+        # Show the note store content
+        print("\n📄 Note store content:")
         print("=" * 60)
-        notes = json.loads(Path(note_file).read_text())
+        notes = record_tool.store.search()
         print(json.dumps(notes, indent=2, ensure_ascii=False))
         print("=" * 60)
 
     finally:
         Path(note_file).unlink(missing_ok=True)
+        note_db_path(note_file).unlink(missing_ok=True)
 
 
 async def demo_agent_with_notes():
@@ -174,9 +176,9 @@ Guidelines:
             print(result1)
             print("=" * 60)
 
-            # Check memory file
-            if memory_file.exists():
-                notes = json.loads(memory_file.read_text())
+            # Check note store
+            notes = NoteStore(note_db_path(memory_file)).search()
+            if notes:
                 print(f"\n✅ Agent recorded {len(notes)} notes in memory")
                 for note in notes:
                     print(f"  - [{note['category']}] {note['content'][:50]}...")
@@ -18,6 +18,7 @@ from mini_agent.agent import Agent
 from mini_agent.config import Config
 from mini_agent.tools import BashTool, EditTool, ReadTool, WriteTool
 from mini_agent.tools.mcp_loader import load_mcp_tools_async
+from mini_agent.tools.note_store import NoteStore, note_db_path
 from mini_agent.tools.note_tool import RecallNoteTool, SessionNoteTool
 
 
@@ -168,10 +169,8 @@ You have record_note and recall_notes tools. Use them to:
                     print("-" * 60)
 
             # Show memory
-            if memory_file.exists():
-                import json
-
-                notes = json.loads(memory_file.read_text())
+            notes = NoteStore(note_db_path(memory_file)).search()
+            if notes:
                 print(f"\n💾 Session notes recorded: {len(notes)}")
                 for note in notes:
                     print(f"  - [{note['category']}] {note['content'][:60]}...")
@@ -32,11 +32,14 @@ from pydantic import field_validator
 from acp.schema import AgentCapabilities, Implementation, McpCapabilities
 
 from mini_agent.agent import Agent
-from mini_agent.cli import add_workspace_tools, initialize_base_tools
+from mini_agent.cli import add_workspace_tools, create_hot_reloader, initialize_base_tools
+from mini_agent.hot_reload import HotReloader, render_system_prompt
 from mini_agent.config import Config
 from mini_agent.llm import LLMClient
 from mini_agent.retry import RetryConfig as RetryConfigBase
 from mini_agent.schema import Message
+from mini_agent.tools.base import tool_progress
+from mini_agent.tools.mcp_loader import get_mcp_connection_manager
 
 logger = logging.getLogger(__name__)
 
@@ -77,12 +80,14 @@ class MiniMaxACPAgent:
         llm: LLMClient,
         base_tools: list,
         system_prompt: str,
+        hot_reloader: HotReloader | None = None,
     ):
         self._conn = conn
         self._config = config
         self._llm = llm
         self._base_tools = base_tools
         self._system_prompt = system_prompt
+        self._hot_reloader = hot_reloader
         self._sessions: dict[str, SessionState] = {}
 
     async def initialize(self, params: InitializeRequest) -> InitializeResponse:  # noqa: ARG002
@@ -100,6 +105,9 @@ class MiniMaxACPAgent:
         tools = list(self._base_tools)
         add_workspace_tools(tools, self._config, workspace)
         agent = Agent(llm_client=self._llm, system_prompt=self._system_prompt, tools=tools, max_steps=self._config.agent.max_steps, workspace_dir=str(workspace))
+        agent.attach_mcp_lease(get_mcp_connection_manager().acquire(session_id))
+        if self._hot_reloader:
+            agent.attach_hot_reloader(self._hot_reloader)
         self._sessions[session_id] = SessionState(agent=agent)
         return NewSessionResponse(sessionId=session_id)
 
@@ -129,6 +137,7 @@ class MiniMaxACPAgent:
         for _ in range(agent.max_steps):
             if state.cancelled:
                 return "cancelled"
+            agent.apply_hot_reload()
             tool_schemas = [tool.to_schema() for tool in agent.tools.values()]
             try:
                 response = await agent.llm.generate(messages=agent.messages, tools=tool_schemas)
@@ -154,7 +163,8 @@ class MiniMaxACPAgent:
                     text, status = f"[ERROR] Unknown tool: {name}", "failed"
                 else:
                     try:
-                        result = await tool.execute(**args)
+                        with tool_progress(self._tool_progress_sender(session_id, call.id)):
+                            result = await tool.execute(**args)
                         status = "completed" if result.success else "failed"
                         prefix = "[OK]" if result.success else "[ERROR]"
                         text = f"{prefix} {result.content if result.success else result.error or 'Tool execution failed'}"
@@ -164,28 +174,50 @@ class MiniMaxACPAgent:
                 agent.messages.append(Message(role="tool", content=text, tool_call_id=call.id, name=name))
         return "max_turn_requests"
 
+    def _tool_progress_sender(self, session_id: str, tool_call_id: str):
+        async def send_progress(output: str) -> None:
+            await self._send(
+                session_id,
+                update_tool_call(tool_call_id, status="in_progress", content=[tool_content(text_block(output))]),
+            )
+
+        return send_progress
+
     async def _send(self, session_id: str, update: Any) -> None:
         await self._conn.sessionUpdate(session_notification(session_id, update))
 
 
+def skills_prompt_template(system_prompt: str) -> str:
+    """Return the prompt with exactly one {SKILLS_METADATA} placeholder (appended if missing)."""
+    if "{SKILLS_METADATA}" in system_prompt:
+        return system_prompt
+    return f"{system_prompt.rstrip()}\n\n{{SKILLS_METADATA}}"
+
+
 async def run_acp_server(config: Config | None = None) -> None:
     """Run Mini-Agent as an ACP-compatible stdio server."""
     config = config or Config.load()
     logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(name)s: %(message)s")
-    base_tools, skill_loader = await initialize_base_tools(config)
+    hot_reloader = None
+
+    def attach_late_mcp_tools(late_tools: list) -> None:
+        # Sessions created later pick them up from base_tools
+        if hot_reloader is not None:
+            hot_reloader.add_tools(late_tools)
+
+    base_tools, skill_loader = await initialize_base_tools(config, on_late_mcp_tools=attach_late_mcp_tools)
     prompt_path = Config.find_config_file(config.agent.system_prompt_path)
     if prompt_path and prompt_path.exists():
         system_prompt = prompt_path.read_text(encoding="utf-8")
     else:
         system_prompt = "You are a helpful AI assistant."
-    if skill_loader:
-        meta = skill_loader.get_skills_metadata_prompt()
-        if meta:
-            system_prompt = f"{system_prompt.rstrip()}\n\n{meta}"
+    system_prompt_template = skills_prompt_template(system_prompt)
+    hot_reloader = create_hot_reloader(config, system_prompt_template, skill_loader)
+    system_prompt = render_system_prompt(system_prompt_template, skill_loader)
     rcfg = config.llm.retry
     llm = LLMClient(api_key=config.llm.api_key, api_base=config.llm.api_base, model=config.llm.model, retry_config=RetryConfigBase(enabled=rcfg.enabled, max_retries=rcfg.max_retries, initial_delay=rcfg.initial_delay, max_delay=rcfg.max_delay, exponential_base=rcfg.exponential_base))
     reader, writer = await stdio_streams()
-    AgentSideConnection(lambda conn: MiniMaxACPAgent(conn, config, llm, base_tools, system_prompt), writer, reader)
+    AgentSideConnection(lambda conn: MiniMaxACPAgent(conn, config, llm, base_tools, system_prompt, hot_reloader), writer, reader)
     logger.info("Mini-Agent ACP server running")
     await asyncio.Event().wait()
 
@@ -11,7 +11,7 @@ import tiktoken
 from .llm import LLMClient
 from .logger import AgentLogger
 from .schema import Message
-from .tools.base import Tool, ToolResult
+from .tools.base import ProgressCallback, Tool, ToolResult, tool_progress
 from .utils import calculate_display_width
 
 
@@ -61,19 +61,24 @@ class Agent:
         self.workspace_dir = Path(workspace_dir)
         # Cancellation event for interrupting agent execution (set externally, e.g., by Esc key)
         self.cancel_event: Optional[asyncio.Event] = None
+        # Receives live output of long-running tools (e.g. bash); None discards it.
+        # Stdout is not safe to print to here: ACP speaks JSON-RPC over stdio.
+        self.progress_callback: Optional[ProgressCallback] = None
+        # Hot reload of skills / MCP tools (see attach_hot_reloader)
+        self.hot_reloader = None
+        self._reload_generation = 0
+        self._reloaded_tool_names: set[str] = set()
+        self._reload_prompt_suffix = ""
+        # Tenant claim on stateful MCP server sessions (see attach_mcp_lease)
+        self.mcp_lease = None
 
         # Ensure workspace exists
         self.workspace_dir.mkdir(parents=True, exist_ok=True)
 
-        # Inject workspace information into system prompt if not already present
-        if "Current Workspace" not in system_prompt:
-            workspace_info = f"\n\n## Current Workspace\nYou are currently working in: `{self.workspace_dir.absolute()}`\nAll relative paths will be resolved relative to this directory."
-            system_prompt = system_prompt + workspace_info
-
-        self.system_prompt = system_prompt
+        self.system_prompt = self._with_workspace_info(system_prompt)
 
         # Initialize message history
-        self.messages: list[Message] = [Message(role="system", content=system_prompt)]
+        self.messages: list[Message] = [Message(role="system", content=self.system_prompt)]
 
         # Initialize logger
         self.logger = AgentLogger()
@@ -83,10 +88,89 @@ class Agent:
         # Flag to skip token check right after summary (avoid consecutive triggers)
         self._skip_next_token_check: bool = False
 
+    def _with_workspace_info(self, system_prompt: str) -> str:
+        """Inject workspace information into system prompt if not already present."""
+        if "Current Workspace" not in system_prompt:
+            workspace_info = f"\n\n## Current Workspace\nYou are currently working in: `{self.workspace_dir.absolute()}`\nAll relative paths will be resolved relative to this directory."
+            system_prompt = system_prompt + workspace_info
+        return system_prompt
+
+    def attach_hot_reloader(self, reloader, prompt_suffix: str = "") -> None:
+        """Follow a HotReloader: its snapshots are applied between steps.
+
+        Args:
+            reloader: HotReloader whose initial MCP tools this agent was created with
+            prompt_suffix: Per-agent text appended to every reloaded system prompt
+        """
+        self.hot_reloader = reloader
+        self._reload_prompt_suffix = prompt_suffix
+        self._reload_generation = 0
+        self._reloaded_tool_names = set(reloader.initial_tool_names)
+
+    def attach_mcp_lease(self, lease) -> None:
+        """Use a tenant's own sessions for stateful MCP servers.
+
+        Args:
+            lease: MCPTenantLease; released when this agent is garbage collected
+        """
+        self.mcp_lease = lease
+        self.tools = {tool.name: tool for tool in lease.bind_tools(list(self.tools.values()))}
+        lease.attach(self)
+
+    def _bind_mcp_tools(self, tools) -> list[Tool]:
+        """Bind MCP tools to this agent's tenant sessions, if it has a lease."""
+        return self.mcp_lease.bind_tools(list(tools)) if self.mcp_lease is not None else list(tools)
+
+    def apply_hot_reload(self) -> bool:
+        """Swap in the latest reloaded MCP tools and system prompt.
+
+        Called at step boundaries only, so a running step keeps a consistent
+        tool set.
+
+        Returns:
+            True if a newer snapshot was applied
+        """
+        if self.hot_reloader is None:
+            return False
+        snapshot = self.hot_reloader.snapshot
+        if snapshot.generation == self._reload_generation:
+            return False
+
+        tools = {name: tool for name, tool in self.tools.items() if name not in self._reloaded_tool_names}
+        for tool in self._bind_mcp_tools(snapshot.mcp_tools):
+            tools.setdefault(tool.name, tool)
+        self.tools = tools
+        self._reloaded_tool_names = {tool.name for tool in snapshot.mcp_tools}
+
+        if snapshot.system_prompt is not None:
+            self.system_prompt = self._with_workspace_info(snapshot.system_prompt + self._reload_prompt_suffix)
+            if self.messages and self.messages[0].role == "system":
+                self.messages[0] = Message(role="system", content=self.system_prompt)
+
+        self._reload_generation = snapshot.generation
+        return True
+
+    def add_tools(self, tools: list[Tool]) -> None:
+        """Register additional tools (e.g. MCP servers that connected late)."""
+        for tool in self._bind_mcp_tools(tools):
+            self.tools.setdefault(tool.name, tool)
+        if self.hot_reloader is not None:
+            # Late MCP tools are replaced or dropped by later reloads like the initial ones
+            self._reloaded_tool_names.update(tool.name for tool in tools)
+
     def add_user_message(self, content: str):
         """Add a user message to history."""
         self.messages.append(Message(role="user", content=content))
 
+    def print_tool_progress(self, output: str):
+        """Print the latest line of a running tool's output."""
+        lines = [line for line in output.splitlines() if line.strip()]
+        if lines:
+            last_line = lines[-1]
+            if len(last_line) > 200:
+                last_line = last_line[:200] + "..."
+            print(f"{Colors.DIM}   │ {last_line}{Colors.RESET}")
+
     def _check_cancelled(self) -> bool:
         """Check if agent execution has been cancelled.
 
@@ -349,6 +433,8 @@ Requirements:
                 return cancel_msg
 
             step_start_time = perf_counter()
+            # Pick up skills / MCP servers changed since the last step
+            self.apply_hot_reload()
             # Check and summarize message history to prevent context overflow
             await self._summarize_messages()
 
@@ -460,7 +546,8 @@ Requirements:
                 else:
                     try:
                         tool = self.tools[function_name]
-                        result = await tool.execute(**arguments)
+                        with tool_progress(self.progress_callback):
+                            result = await tool.execute(**arguments)
                     except Exception as e:
                         # Catch all exceptions during tool execution, convert to failed ToolResult
                         import traceback
@@ -7,14 +7,18 @@ Supports multiple AI agents discussing the same topic with shared memory.
 import asyncio
 import os
 from enum import Enum
-from typing import Optional
+from typing import Awaitable, Callable, Optional, TypeVar
 from dataclasses import dataclass
 
 from mini_agent.agent_team.chatroom import Chatroom, ChatroomManager
 from mini_agent.agent_team.agent import Agent, AgentConfig, ModelProvider
+from mini_agent.agent_team.convergence import ConvergenceDetector, ConvergenceStats, LLMConvergenceJudge
+from mini_agent.agent_team.latency import LatencyTracker
 from mini_agent.agent_team.memory import Memory, Message
 from mini_agent.agent_team.personality import Personality
 from mini_agent.agent_team.providers import ProvidersConfig, ProviderConfig, PROVIDER_ENV_VARS
+from mini_agent.agent_team.store import ChatroomStore
+from mini_agent.schema import TokenUsage
 
 
 class DiscussionMode(str, Enum):
@@ -22,6 +26,11 @@ class DiscussionMode(str, Enum):
 
     CONCURRENT = "concurrent"  # 所有 Agent 同时响应
     DEBATE = "debate"  # 串行辩论模式，一个一个发言
+    STAGED = "staged"  # 先并行初稿，再进行若干轮并行反驳，每轮都能看到上一轮
+
+
+# Appended to each agent's context in the rebuttal passes of staged mode
+REBUTTAL_PROMPT = "请阅读其他参与者上一轮的观点，有针对性地回应或反驳，并完善你自己的立场。"
 
 
 @dataclass
@@ -33,6 +42,26 @@ class AgentResponse:
     content: str
     success: bool
     error: Optional[str] = None
+    timed_out: bool = False
+    latency: Optional[float] = None  # Seconds the LLM request took
+    usage: Optional[TokenUsage] = None  # Token usage reported by the provider
+    used_fallback: bool = False  # Reply came from the agent's fallback model
+
+
+T = TypeVar("T")
+
+# Receives each streamed text delta of an agent's reply
+DeltaCallback = Callable[[Agent, str], Awaitable[None]]
+
+# Hedging: an agent's backup request starts at HEDGE_MARGIN x its recent p95
+# latency, clamped to [MIN_HEDGE_DELAY, MAX_HEDGE_FRACTION x timeout] so the
+# backup still has time to answer. Until MIN_LATENCY_SAMPLES are known it
+# starts at DEFAULT_HEDGE_FRACTION x timeout.
+HEDGE_MARGIN = 1.5
+MIN_HEDGE_DELAY = 1.0
+MAX_HEDGE_FRACTION = 0.6
+DEFAULT_HEDGE_FRACTION = 0.5
+MIN_LATENCY_SAMPLES = 3
 
 
 class AgentTeam:
@@ -43,7 +72,12 @@ class AgentTeam:
     - Create and manage chatrooms
     - Add/remove agents with different models and personalities
     - All agents share the same memory
-    - Two discussion modes: concurrent (parallel) or debate (serial)
+    - Discussion modes: concurrent (parallel), debate (serial) or staged
+      (parallel drafts followed by parallel rebuttal passes)
+    - Optional early exit: agents that only restate earlier turns are skipped,
+      and once all of them are, rounds make no agent calls (see converged)
+    - Per-agent adaptive deadlines: a turn running late for that agent races
+      a backup request to the agent's fallback model (if configured)
     """
 
     def __init__(
@@ -53,6 +87,9 @@ class AgentTeam:
         timeout: float = 30.0,
         providers_config: Optional[ProvidersConfig] = None,
         discussion_mode: DiscussionMode = DiscussionMode.CONCURRENT,
+        rebuttal_passes: int = 1,
+        chatroom: Optional[Chatroom] = None,
+        convergence: Optional[ConvergenceDetector] = None,
     ):
         """
         Initialize AgentTeam with a chatroom.
@@ -60,15 +97,22 @@ class AgentTeam:
         Args:
             name: Chatroom name
             max_agents: Maximum number of agents
-            timeout: Response timeout in seconds
+            timeout: Response timeout in seconds (hard limit per turn, backups included)
             providers_config: Provider configuration (optional)
-            discussion_mode: Discussion mode (concurrent or debate)
+            discussion_mode: Discussion mode (concurrent, debate or staged)
+            rebuttal_passes: Staged mode: parallel rebuttal passes after the drafts
+            chatroom: Existing chatroom to discuss in (e.g. one restored by a
+                      ChatroomManager with a store); a new one if None
+            convergence: Optional detector for skipping agents with nothing new
+                         to add and stopping converged discussions early
         """
-        self._chatroom = Chatroom(name=name, max_members=max_agents)
+        self._chatroom = chatroom or Chatroom(name=name, max_members=max_agents)
         self._agents: dict[str, Agent] = {}
         self._timeout = timeout
         self._providers_config = providers_config
         self._discussion_mode = discussion_mode
+        self._rebuttal_passes = rebuttal_passes
+        self._convergence = convergence
 
     @property
     def chatroom(self) -> Chatroom:
@@ -111,6 +155,8 @@ class AgentTeam:
         personality_name: str = "Assistant",
         system_prompt: str = "You are a helpful assistant.",
         response_style: Optional[str] = None,
+        fallback_provider_id: Optional[str] = None,
+        fallback_model_name: Optional[str] = None,
     ) -> Agent:
         """
         Add an agent to the chatroom using provider_id.
@@ -122,6 +168,8 @@ class AgentTeam:
             personality_name: Personality name
             system_prompt: System prompt
             response_style: Response style
+            fallback_provider_id: Provider of the backup model for late turns (optional)
+            fallback_model_name: Backup model name (optional)
 
         Returns:
             Created agent
@@ -129,6 +177,22 @@ class AgentTeam:
         if len(self._agents) >= self._chatroom.max_members:
             raise ValueError(f"Maximum number of agents ({self._chatroom.max_members}) reached")
 
+        # Create personality
+        personality = Personality(
+            name=personality_name,
+            system_prompt=system_prompt,
+            response_style=response_style,
+        )
+
+        agent = self._create_agent(name, provider_id, model_name, personality)
+        if fallback_provider_id and fallback_model_name:
+            agent.fallback = self._create_agent(name, fallback_provider_id, fallback_model_name, personality)
+        self._agents[agent.id] = agent
+
+        return agent
+
+    def _create_agent(self, name: str, provider_id: str, model_name: str, personality: Personality) -> Agent:
+        """Create an agent for a provider_id (not added to the chatroom)."""
         # Get provider info
         provider_type, api_url, api_key = self._get_provider_info(provider_id)
 
@@ -145,13 +209,6 @@ class AgentTeam:
         }
         model_provider = provider_map.get(provider_id, ModelProvider.OPENAI)
 
-        # Create personality
-        personality = Personality(
-            name=personality_name,
-            system_prompt=system_prompt,
-            response_style=response_style,
-        )
-
         # Create agent config
         config = AgentConfig(
             name=name,
@@ -162,11 +219,7 @@ class AgentTeam:
             personality=personality,
         )
 
-        # Create agent
-        agent = Agent(config)
-        self._agents[agent.id] = agent
-
-        return agent
+        return Agent(config)
 
     # 兼容旧接口
     def add_agent_legacy(
@@ -234,7 +287,51 @@ class AgentTeam:
         """List all agents."""
         return list(self._agents.values())
 
-    async def discuss(self, topic: str, add_topic_to_memory: bool = True) -> list[AgentResponse]:
+    @property
+    def convergence(self) -> Optional[ConvergenceDetector]:
+        """Convergence detector (None if early exit is disabled)."""
+        return self._convergence
+
+    @property
+    def converged(self) -> bool:
+        """Whether the discussion converged; further rounds make no agent calls."""
+        return self._convergence is not None and self._convergence.converged
+
+    def reset_convergence(self) -> None:
+        """Forget convergence state, e.g. after new user input."""
+        if self._convergence is not None:
+            self._convergence.reset()
+
+    def speakers(self) -> list[Agent]:
+        """
+        Active agents that take part in the next round.
+
+        Agents the convergence detector skips are left out and counted as saved.
+        """
+        agents = [agent for agent in self._agents.values() if agent.is_active]
+        if self._convergence is None:
+            return agents
+        speakers = []
+        for agent in agents:
+            if self._convergence.should_skip(agent.name):
+                self._convergence.record_skip(agent.name, self._chatroom.memory.context_tokens)
+            else:
+                speakers.append(agent)
+        return speakers
+
+    async def end_round(self, results: list[AgentResponse]) -> None:
+        """Feed a finished round to the convergence detector (last reply per agent)."""
+        if self._convergence is None:
+            return
+        replies = {r.agent_name: r.content for r in results if r.success and r.content}
+        await self._convergence.observe(replies)
+
+    async def discuss(
+        self,
+        topic: str,
+        add_topic_to_memory: bool = True,
+        on_delta: Optional[DeltaCallback] = None,
+    ) -> list[AgentResponse]:
         """
         Start a discussion on a topic.
 
@@ -242,37 +339,87 @@ class AgentTeam:
             topic: Discussion topic
             add_topic_to_memory: Whether to add topic as user message to memory.
                                 Set False for subsequent rounds on the same topic.
+            on_delta: Debate mode only: stream each reply, passing text to this
+                      callback as it arrives
 
         Returns:
             List of agent responses
         """
         if add_topic_to_memory:
             self._chatroom.memory.add_message(role="user", content=topic)
-
-        if self._discussion_mode == DiscussionMode.DEBATE:
-            return await self._discuss_debate()
+            self.reset_convergence()
+
+        agents = self.speakers()
+        if not agents:
+            results = []
+        elif self._discussion_mode == DiscussionMode.DEBATE:
+            if on_delta is not None:
+                results = await self._discuss_debate_stream(agents, on_delta)
+            else:
+                results = await self._discuss_debate(agents)
+        elif self._discussion_mode == DiscussionMode.STAGED:
+            results = await self._discuss_staged(agents)
         else:
-            return await self._discuss_concurrent()
+            results = await self._discuss_concurrent(agents)
+        await self.end_round(results)
 
-    async def _discuss_concurrent(self) -> list[AgentResponse]:
+        # Persist the round if the memory is bound to a store
+        self._chatroom.memory.flush()
+        return results
+
+    async def _discuss_concurrent(self, agents: list[Agent]) -> list[AgentResponse]:
         """
         Concurrent discussion mode - all agents respond simultaneously.
 
         Each agent gets its own view of messages (with self-identification).
 
+        Returns:
+            List of agent responses
+        """
+        return await self._run_parallel_pass(agents)
+
+    async def _discuss_staged(self, agents: list[Agent]) -> list[AgentResponse]:
+        """
+        Staged mode - parallel first drafts, then parallel rebuttal passes.
+
+        Every pass runs all agents concurrently against the memory as it was
+        when the pass started, so agents see the previous pass but not each
+        other's replies within a pass. Latency is one concurrent round per pass.
+
+        Returns:
+            Agent responses of all passes, pass by pass
+        """
+        results = await self._run_parallel_pass(agents)
+        for _ in range(self._rebuttal_passes):
+            results.extend(await self._run_parallel_pass(agents, instruction=REBUTTAL_PROMPT))
+        return results
+
+    async def _run_parallel_pass(self, agents: list[Agent], instruction: Optional[str] = None) -> list[AgentResponse]:
+        """
+        Call the given agents concurrently on the current memory.
+
+        Replies are added to memory after the whole pass, in agent order, so
+        the resulting history does not depend on which reply arrived first.
+
+        Args:
+            agents: Agents to call
+            instruction: Extra user message appended to every agent's context
+                         (not stored in memory)
+
         Returns:
             List of agent responses
         """
         # Create tasks for all agents, each with its own message view
         tasks = []
         active_agents = []
-        for agent in self._agents.values():
-            if agent.is_active:
-                messages = self._chatroom.memory.get_messages_for_agent(
-                    current_agent_name=agent.name
-                )
-                tasks.append(self._call_agent(agent, messages))
-                active_agents.append(agent)
+        for agent in agents:
+            messages = self._chatroom.memory.get_messages_for_agent(
+                current_agent_name=agent.name
+            )
+            if instruction:
+                messages.append({"role": "user", "content": instruction})
+            tasks.append(self._call_agent(agent, messages))
+            active_agents.append(agent)
 
         # Wait for all responses
         responses = await asyncio.gather(*tasks, return_exceptions=True)
@@ -283,33 +430,38 @@ class AgentTeam:
             if i >= len(active_agents):
                 continue
             agent = active_agents[i]
-            if isinstance(response, Exception):
+            if isinstance(response, BaseException):
                 results.append(AgentResponse(
                     agent_id=agent.id,
                     agent_name=agent.name,
                     content="",
                     success=False,
                     error=str(response),
+                    timed_out=isinstance(response, TimeoutError),
                 ))
             else:
+                content, responder = response
                 results.append(AgentResponse(
                     agent_id=agent.id,
                     agent_name=agent.name,
-                    content=response,
+                    content=content,
                     success=True,
+                    latency=responder.last_latency,
+                    usage=responder.last_usage,
+                    used_fallback=responder is not agent,
                 ))
 
                 # Add agent response to memory
                 self._chatroom.memory.add_message(
                     role="agent",
-                    content=response,
+                    content=content,
                     agent_id=agent.id,
                     agent_name=agent.name,
                 )
 
         return results
 
-    async def _discuss_debate(self) -> list[AgentResponse]:
+    async def _discuss_debate(self, agent_list: list[Agent]) -> list[AgentResponse]:
         """
         Debate mode - agents respond one by one, seeing each other's responses.
 
@@ -321,9 +473,6 @@ class AgentTeam:
         """
         results = []
 
-        # Get active agents in order
-        agent_list = [agent for agent in self._agents.values() if agent.is_active]
-
         # Each agent responds one by one
         for agent in agent_list:
             # Get current memory context with agent identity
@@ -332,9 +481,9 @@ class AgentTeam:
             )
 
             try:
-                # Call agent
-                response = await asyncio.wait_for(
-                    agent.generate_response(messages),
+                # Call agent (or its fallback, if the agent runs late)
+                response, responder = await asyncio.wait_for(
+                    self._generate(agent, messages),
                     timeout=self._timeout
                 )
 
@@ -343,6 +492,9 @@ class AgentTeam:
                     agent_name=agent.name,
                     content=response,
                     success=True,
+                    latency=responder.last_latency,
+                    usage=responder.last_usage,
+                    used_fallback=responder is not agent,
                 ))
 
                 # Add response to memory immediately so next agent sees it
@@ -360,6 +512,7 @@ class AgentTeam:
                     content="",
                     success=False,
                     error=f"Timeout after {self._timeout}s",
+                    timed_out=True,
                 ))
             except Exception as e:
                 results.append(AgentResponse(
@@ -372,7 +525,95 @@ class AgentTeam:
 
         return results
 
-    async def _call_agent(self, agent: Agent, messages: list[dict]) -> str:
+    async def _discuss_debate_stream(self, agent_list: list[Agent], on_delta: DeltaCallback) -> list[AgentResponse]:
+        """
+        Streamed debate mode - agents speak one by one, each reply streamed.
+
+        A speaker's context depends on the previous reply, so requests cannot
+        overlap; instead the next speaker's client is set up while the current
+        one streams, and output reaches the user from the first token.
+
+        Args:
+            agent_list: Speaking agents in order
+            on_delta: Receives (agent, text) for every streamed delta
+
+        Returns:
+            List of agent responses
+        """
+        results = []
+        for i, agent in enumerate(agent_list):
+            if i + 1 < len(agent_list):
+                agent_list[i + 1].warm_up()
+            results.append(await self.stream_turn(agent, on_delta))
+        return results
+
+    async def stream_turn(self, agent: Agent, on_delta: DeltaCallback) -> AgentResponse:
+        """
+        Let one agent reply to the current memory, streaming the reply.
+
+        The reply is stored in memory as it streams; a reply cut off by an
+        error or the timeout keeps the text received so far. If the first
+        delta is late for this agent, its fallback model races it and the
+        first one to start streaming gives the reply.
+
+        Args:
+            agent: Speaking agent
+            on_delta: Receives (agent, text) for every streamed delta
+
+        Returns:
+            Agent response with the full (or partial) reply
+        """
+        memory = self._chatroom.memory
+        messages = memory.get_messages_for_agent(current_agent_name=agent.name)
+        message = memory.add_message(role="agent", content="", agent_id=agent.id, agent_name=agent.name)
+
+        error = None
+        timed_out = False
+        speaker = agent
+
+        async def open_stream(candidate: Agent):
+            # Starts the stream and waits for its first delta ("" if empty)
+            stream = candidate.stream_response(messages)
+            try:
+                return stream, await anext(stream, "")
+            except BaseException:
+                await stream.aclose()
+                raise
+
+        try:
+            async with asyncio.timeout(self._timeout):
+                (stream, first), speaker = await self._race(
+                    agent, open_stream, self._hedge_delay(agent.first_delta_latency)
+                )
+                try:
+                    if first:
+                        memory.append_to_message(message, first)
+                        await on_delta(agent, first)
+                    async for delta in stream:
+                        memory.append_to_message(message, delta)
+                        await on_delta(agent, delta)
+                finally:
+                    await stream.aclose()
+        except TimeoutError:
+            error = f"Timeout after {self._timeout}s"
+            timed_out = True
+        except Exception as e:
+            error = str(e)
+
+        if not message.content:
+            memory.remove_message(message)
+        return AgentResponse(
+            agent_id=agent.id,
+            agent_name=agent.name,
+            content=message.content,
+            success=error is None,
+            error=error,
+            timed_out=timed_out,
+            latency=speaker.last_latency,
+            used_fallback=speaker is not agent,
+        )
+
+    async def _call_agent(self, agent: Agent, messages: list[dict]) -> tuple[str, Agent]:
         """
         Call an agent with timeout.
 
@@ -381,16 +622,74 @@ class AgentTeam:
             messages: Messages for context
 
         Returns:
-            Agent response
+            (response, agent that produced it: the agent or its fallback)
         """
         try:
             return await asyncio.wait_for(
-                agent.generate_response(messages),
+                self._generate(agent, messages),
                 timeout=self._timeout
             )
         except asyncio.TimeoutError:
             raise TimeoutError(f"Agent {agent.name} timed out after {self._timeout}s")
 
+    async def _generate(self, agent: Agent, messages: list[dict]) -> tuple[str, Agent]:
+        """Get a full reply from an agent, hedged with its fallback model."""
+        return await self._race(
+            agent,
+            lambda candidate: candidate.generate_response(messages),
+            self._hedge_delay(agent.latency),
+        )
+
+    def _hedge_delay(self, tracker: LatencyTracker) -> float:
+        """Seconds after which a request counts as late for this agent."""
+        if tracker.count < MIN_LATENCY_SAMPLES:
+            return self._timeout * DEFAULT_HEDGE_FRACTION
+        return min(max(tracker.p95 * HEDGE_MARGIN, MIN_HEDGE_DELAY), self._timeout * MAX_HEDGE_FRACTION)
+
+    async def _race(
+        self,
+        agent: Agent,
+        request: Callable[[Agent], Awaitable[T]],
+        hedge_delay: float,
+    ) -> tuple[T, Agent]:
+        """
+        Run a request on an agent; if it is late or fails, race its fallback.
+
+        The first successful result wins and the other request is cancelled.
+        The caller enforces the overall timeout.
+
+        Args:
+            agent: Agent to ask first
+            request: Starts the request on the agent or its fallback
+            hedge_delay: Seconds to wait for the agent before starting the fallback
+
+        Returns:
+            (result, agent that produced it)
+        """
+        fallback = agent.fallback
+        pending = {asyncio.ensure_future(request(agent)): agent}
+        error: Optional[BaseException] = None
+        try:
+            while pending:
+                done, _ = await asyncio.wait(
+                    pending,
+                    timeout=hedge_delay if fallback is not None else None,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                for task in done:
+                    responder = pending.pop(task)
+                    if task.exception() is None:
+                        return task.result(), responder
+                    error = task.exception()
+                if fallback is not None and (not done or not pending):
+                    # Late or failed: start the backup next to the running request
+                    pending[asyncio.ensure_future(request(fallback))] = fallback
+                    fallback = None
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
 
 def load_providers_from_config(config_path: str = "mini_agent/config/config.yaml") -> Optional[ProvidersConfig]:
     """Load providers configuration from config.yaml."""
@@ -431,6 +730,11 @@ class AgentTeamConfig:
     discussion_mode: DiscussionMode = DiscussionMode.DEBATE
     timeout: float = 30.0
     max_agents: int = 10
+    rebuttal_passes: int = 1
+    session_ttl: Optional[float] = None  # 飞书讨论闲置多少秒后移出内存
+    max_session_memory_mb: Optional[float] = None  # 飞书讨论 Memory 总预算
+    convergence_threshold: Optional[float] = None  # 设置后启用收敛检测（提前结束讨论）
+    store_path: Optional[str] = None  # 飞书讨论的 SQLite 数据库（移出内存和重启后恢复讨论）
     providers_config: Optional[ProvidersConfig] = None
 
 
@@ -445,7 +749,8 @@ def load_agent_team_config(config_path: str = "mini_agent/config/config.yaml") -
 
         # Load discussion mode
         mode_str = agent_team_config.get("discussion_mode", "debate")
-        discussion_mode = DiscussionMode.CONCURRENT if mode_str == "concurrent" else DiscussionMode.DEBATE
+        mode_map = {"concurrent": DiscussionMode.CONCURRENT, "staged": DiscussionMode.STAGED}
+        discussion_mode = mode_map.get(mode_str, DiscussionMode.DEBATE)
 
         # Load timeout
         timeout = agent_team_config.get("default_timeout", 30.0)
@@ -453,6 +758,17 @@ def load_agent_team_config(config_path: str = "mini_agent/config/config.yaml") -
         # Load max agents
         max_agents = agent_team_config.get("max_agents_per_chatroom", 10)
 
+        # Load rebuttal passes (staged mode)
+        rebuttal_passes = agent_team_config.get("rebuttal_passes", 1)
+
+        # Load discussion session eviction settings (Feishu)
+        session_ttl = agent_team_config.get("session_ttl")
+        max_session_memory_mb = agent_team_config.get("max_session_memory_mb")
+        store_path = agent_team_config.get("store_path")
+
+        # Load early exit on convergence
+        convergence_threshold = agent_team_config.get("convergence_threshold")
+
         # Load providers
         providers_config = load_providers_from_config(config_path)
 
@@ -460,6 +776,11 @@ def load_agent_team_config(config_path: str = "mini_agent/config/config.yaml") -
             discussion_mode=discussion_mode,
             timeout=timeout,
             max_agents=max_agents,
+            rebuttal_passes=rebuttal_passes,
+            session_ttl=session_ttl,
+            max_session_memory_mb=max_session_memory_mb,
+            convergence_threshold=convergence_threshold,
+            store_path=store_path,
             providers_config=providers_config,
         )
     except Exception as e:
@@ -4,13 +4,20 @@ Agent - AI Agent configuration and instance
 Defines agent configuration and LLM client wrapper.
 """
 
+import asyncio
+import contextlib
+import logging
+import time
 import uuid
-from typing import Optional
+from typing import AsyncIterator, Optional
 from enum import Enum
 from pydantic import BaseModel, Field
 
+from mini_agent.agent_team.latency import LatencyTracker
 from mini_agent.agent_team.personality import Personality
 
+logger = logging.getLogger(__name__)
+
 
 class ModelProvider(str, Enum):
     """
@@ -84,6 +91,19 @@ class Agent:
         """
         self.config = config
         self._llm_client = None
+        # Optional semaphore shared by many agents to cap concurrent LLM requests
+        self.limiter: Optional[asyncio.Semaphore] = None
+        # Stats of the most recent LLM request (latency in seconds, TokenUsage or None)
+        self.last_latency: Optional[float] = None
+        self.last_usage = None
+        # Recent latencies of full replies and of the first streamed delta
+        self.latency = LatencyTracker()
+        self.first_delta_latency = LatencyTracker()
+        # Optional backup agent (same name and personality, another model)
+        # raced against this one when a turn runs late
+        self.fallback: Optional["Agent"] = None
+        # Background connection warm-up started by warm_up()
+        self._warm_up_task: Optional[asyncio.Task] = None
 
     @property
     def id(self) -> str:
@@ -146,54 +166,139 @@ class Agent:
             "api_key": self.config.api_key,
         }
 
-    async def generate_response(self, messages: list[dict]) -> str:
+    def prepare(self):
         """
-        Generate response using the configured LLM.
+        Create the LLM client ahead of the first request.
 
-        Args:
-            messages: List of message dicts with role and content
+        The client is reused for every later request, so its HTTP connection
+        pool stays warm between turns.
 
         Returns:
-            Generated response text
+            LLMClient for this agent
         """
-        # Import existing LLM wrapper and schema
-        from mini_agent.llm.llm_wrapper import LLMClient, LLMProvider
-        from mini_agent.schema.schema import Message
-
-        # Determine provider
-        provider_map = {
-            ModelProvider.OPENAI: LLMProvider.OPENAI,
-            ModelProvider.ANTHROPIC: LLMProvider.ANTHROPIC,
-        }
-
-        provider = provider_map.get(
-            self.config.model_provider,
-            LLMProvider.OPENAI  # default
-        )
+        if self._llm_client is None:
+            # Import existing LLM wrapper
+            from mini_agent.llm.llm_wrapper import LLMClient, LLMProvider
+
+            # Determine provider
+            provider_map = {
+                ModelProvider.OPENAI: LLMProvider.OPENAI,
+                ModelProvider.ANTHROPIC: LLMProvider.ANTHROPIC,
+            }
+
+            provider = provider_map.get(
+                self.config.model_provider,
+                LLMProvider.OPENAI  # default
+            )
+
+            # Create client
+            self._llm_client = LLMClient(
+                api_key=self.config.api_key or "",
+                provider=provider,
+                api_base=self.config.api_url or "",
+                model=self.config.model_name,
+            )
+        return self._llm_client
+
+    def warm_up(self) -> None:
+        """
+        Create the LLM client and start opening its connection ahead of this agent's turn.
 
-        # Create client
-        client = LLMClient(
-            api_key=self.config.api_key or "",
-            provider=provider,
-            api_base=self.config.api_url or "",
-            model=self.config.model_name,
-        )
+        The connection is opened in a background task on the running loop, so
+        the TCP and TLS handshakes overlap the current speaker's turn. Errors
+        (e.g. a missing API key or an unreachable host) are only logged: the
+        agent's own request raises them again and they are reported for this
+        agent alone.
+        """
+        try:
+            client = self.prepare()
+        except Exception as e:
+            logger.warning(f"Agent {self.name}: Failed to create LLM client ahead of its turn: {e}")
+            return
+        if client is None or (self._warm_up_task is not None and not self._warm_up_task.done()):
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._warm_up_task = loop.create_task(self._open_connection(client))
+
+    async def _open_connection(self, client) -> None:
+        """Open a pooled connection to the agent's API, logging failures."""
+        try:
+            await client.warm_up()
+        except Exception as e:
+            logger.warning(f"Agent {self.name}: Failed to open a connection ahead of its turn: {e}")
+
+    def _build_messages(self, messages: list[dict]) -> list:
+        """Convert dict messages to Message objects, prefixed by the system prompt."""
+        from mini_agent.schema.schema import Message
 
-        # Convert dict messages to Message objects
         message_objects = [
             Message(role=msg["role"], content=msg["content"])
             for msg in messages
         ]
-
-        # Add system prompt
-        full_messages = [
+        return [
             Message(role="system", content=self.get_system_prompt())
         ] + message_objects
 
-        # Call LLM
-        response = await client.generate(full_messages)
+    async def generate_response(self, messages: list[dict]) -> str:
+        """
+        Generate response using the configured LLM.
+
+        Args:
+            messages: List of message dicts with role and content
+
+        Returns:
+            Generated response text
+        """
+        self.last_latency = None
+        self.last_usage = None
+        async with self._limit():
+            start = time.monotonic()
+            try:
+                response = await self.prepare().generate(self._build_messages(messages))
+            except asyncio.CancelledError:
+                # Cut off by a timeout or a faster backup: it took at least this long
+                self.latency.record(time.monotonic() - start)
+                raise
+            self.last_latency = time.monotonic() - start
+        self.latency.record(self.last_latency)
+        self.last_usage = response.usage
         return response.content
 
+    async def stream_response(self, messages: list[dict]) -> AsyncIterator[str]:
+        """
+        Generate response using the configured LLM, yielding text as it arrives.
+
+        Args:
+            messages: List of message dicts with role and content
+
+        Yields:
+            Text deltas of the response
+        """
+        self.last_latency = None
+        self.last_usage = None
+        async with self._limit():
+            start = time.monotonic()
+            first = True
+            try:
+                async for delta in self.prepare().generate_stream(self._build_messages(messages)):
+                    if first:
+                        self.first_delta_latency.record(time.monotonic() - start)
+                        first = False
+                    yield delta
+            except asyncio.CancelledError:
+                if first:
+                    self.first_delta_latency.record(time.monotonic() - start)
+                raise
+            self.last_latency = time.monotonic() - start
+        self.latency.record(self.last_latency)
+
+    def _limit(self):
+        """Context manager holding a slot of the shared limiter, if any."""
+        return self.limiter if self.limiter is not None else contextlib.nullcontext()
+
     def deactivate(self) -> None:
         """Deactivate the agent."""
         self.config.is_active = False
@@ -212,3 +317,5 @@ class Agent:
         for key, value in kwargs.items():
             if hasattr(self.config, key):
                 setattr(self.config, key, value)
+        # Model or credentials may have changed
+        self._llm_client = None
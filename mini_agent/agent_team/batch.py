@@ -0,0 +1,289 @@
+"""
+Batch Runner - Run many AgentTeam discussions concurrently
+
+Reads topics from a file, runs one discussion per topic with the agents from
+agents.yaml, and appends one JSON line per finished discussion (transcript
+plus per-agent latency and token stats) to a result file.
+
+A shared semaphore caps concurrent LLM requests across all discussions. Each
+discussion is checkpointed to disk after every round, so a crashed or
+interrupted run resumes where it stopped when started again with the same
+checkpoint directory.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Optional
+
+from mini_agent.agent_team import AgentResponse, AgentTeam
+from mini_agent.agent_team.memory import Message
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class BatchTopic:
+    """One discussion to run."""
+
+    id: str
+    topic: str
+
+
+@dataclass
+class AgentStats:
+    """Per-agent request statistics of one discussion."""
+
+    calls: int = 0
+    failures: int = 0
+    timeouts: int = 0
+    fallbacks: int = 0  # Replies that came from the agent's fallback model
+    latencies: list[float] = field(default_factory=list)
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+
+    def record(self, response: AgentResponse) -> None:
+        """Add one agent response."""
+        self.calls += 1
+        if not response.success:
+            self.failures += 1
+        if response.timed_out:
+            self.timeouts += 1
+        if response.used_fallback:
+            self.fallbacks += 1
+        if response.latency is not None:
+            self.latencies.append(response.latency)
+        if response.usage is not None:
+            self.prompt_tokens += response.usage.prompt_tokens
+            self.completion_tokens += response.usage.completion_tokens
+
+    def to_dict(self) -> dict:
+        latencies = sorted(self.latencies)
+        return {
+            "calls": self.calls,
+            "failures": self.failures,
+            "timeouts": self.timeouts,
+            "fallbacks": self.fallbacks,
+            "latency_avg": round(sum(latencies) / len(latencies), 3) if latencies else None,
+            "latency_p50": round(latencies[len(latencies) // 2], 3) if latencies else None,
+            "latency_max": round(latencies[-1], 3) if latencies else None,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "total_tokens": self.prompt_tokens + self.completion_tokens,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "AgentStats":
+        return cls(
+            calls=data.get("calls", 0),
+            failures=data.get("failures", 0),
+            timeouts=data.get("timeouts", 0),
+            fallbacks=data.get("fallbacks", 0),
+            latencies=list(data.get("latencies", [])),
+            prompt_tokens=data.get("prompt_tokens", 0),
+            completion_tokens=data.get("completion_tokens", 0),
+        )
+
+
+def load_topics(path: str) -> list[BatchTopic]:
+    """
+    Load topics from a file.
+
+    Supported formats:
+    - JSONL: one {"topic": "...", "id": "..."} object per line ("id" optional)
+    - Plain text: one topic per line; blank lines and lines starting with # are skipped
+
+    Topics without an id get one derived from their text, so ids stay stable
+    when the file is reordered (needed for resuming).
+
+    Args:
+        path: Topic file path
+
+    Returns:
+        Topics in file order
+    """
+    topics = []
+    seen: dict[str, int] = {}
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            topic_id = None
+            if line.startswith("{"):
+                data = json.loads(line)
+                text = data["topic"]
+                topic_id = data.get("id")
+            else:
+                text = line
+            if topic_id is None:
+                topic_id = hashlib.sha1(text.encode("utf-8")).hexdigest()[:12]
+            topic_id = str(topic_id)
+            # Repeated topics get distinct ids
+            seen[topic_id] = seen.get(topic_id, 0) + 1
+            if seen[topic_id] > 1:
+                topic_id = f"{topic_id}-{seen[topic_id]}"
+            topics.append(BatchTopic(id=topic_id, topic=text))
+    return topics
+
+
+class BatchRunner:
+    """Runs discussions for many topics with bounded concurrency."""
+
+    def __init__(
+        self,
+        team_factory: Callable[[], AgentTeam],
+        output_path: str,
+        checkpoint_dir: str,
+        rounds: int = 1,
+        max_discussions: int = 4,
+        max_llm_requests: int = 8,
+    ):
+        """
+        Initialize batch runner.
+
+        Args:
+            team_factory: Creates a fresh AgentTeam (with agents) for each topic
+            output_path: JSONL file results are appended to
+            checkpoint_dir: Directory for per-discussion checkpoints
+            rounds: Discussion rounds per topic
+            max_discussions: Discussions running at the same time
+            max_llm_requests: LLM requests in flight across all discussions
+        """
+        self._team_factory = team_factory
+        self._output_path = Path(output_path)
+        self._checkpoint_dir = Path(checkpoint_dir)
+        self._rounds = rounds
+        self._max_discussions = max_discussions
+        self._llm_limiter = asyncio.Semaphore(max_llm_requests)
+        self._output_lock = asyncio.Lock()
+
+    def _checkpoint_path(self, topic: BatchTopic) -> Path:
+        return self._checkpoint_dir / f"{topic.id}.json"
+
+    def _load_checkpoint(self, topic: BatchTopic) -> Optional[dict]:
+        path = self._checkpoint_path(topic)
+        if not path.exists():
+            return None
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            logger.warning(f"BatchRunner: Ignoring unreadable checkpoint {path}: {e}")
+            return None
+        # A changed topic text under the same id starts over
+        return data if data.get("topic") == topic.topic else None
+
+    def _save_checkpoint(self, topic: BatchTopic, state: dict) -> None:
+        """Write a checkpoint atomically (a crash never leaves a torn file)."""
+        path = self._checkpoint_path(topic)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(state, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp_path, path)
+
+    async def run(self, topics: list[BatchTopic]) -> dict:
+        """
+        Run all topics that have not finished in an earlier run.
+
+        Args:
+            topics: Topics to discuss
+
+        Returns:
+            Counts of completed, skipped (already done) and failed discussions
+        """
+        self._checkpoint_dir.mkdir(parents=True, exist_ok=True)
+        self._output_path.parent.mkdir(parents=True, exist_ok=True)
+        summary = {"completed": 0, "skipped": 0, "failed": 0}
+        slots = asyncio.Semaphore(self._max_discussions)
+
+        async def run_one(topic: BatchTopic) -> None:
+            async with slots:
+                try:
+                    outcome = await self.run_topic(topic)
+                except Exception as e:
+                    logger.error(f"BatchRunner: Discussion {topic.id} failed: {e}")
+                    outcome = "failed"
+                summary[outcome] += 1
+
+        await asyncio.gather(*(run_one(topic) for topic in topics))
+        return summary
+
+    async def run_topic(self, topic: BatchTopic) -> str:
+        """
+        Run (or resume) the discussion of one topic.
+
+        Returns:
+            "completed", or "skipped" if an earlier run already finished it
+        """
+        state = self._load_checkpoint(topic)
+        if state and state.get("done"):
+            return "skipped"
+        if state is None:
+            state = {
+                "id": topic.id,
+                "topic": topic.topic,
+                "rounds_done": 0,
+                "elapsed": 0.0,
+                "messages": [],
+                "agent_stats": {},
+            }
+
+        team = self._team_factory()
+        for agent in team.agents.values():
+            agent.limiter = self._llm_limiter
+            if agent.fallback is not None:
+                agent.fallback.limiter = self._llm_limiter
+        team.chatroom.memory.messages = [Message(**message) for message in state["messages"]]
+        stats = {name: AgentStats.from_dict(data) for name, data in state["agent_stats"].items()}
+        tokens_saved = state.get("tokens_saved", 0)
+
+        for round_num in range(state["rounds_done"] + 1, self._rounds + 1):
+            if state.get("converged"):
+                break
+            start = time.monotonic()
+            responses = await team.discuss(topic.topic, add_topic_to_memory=not team.chatroom.memory.messages)
+            for response in responses:
+                stats.setdefault(response.agent_name, AgentStats()).record(response)
+
+            state["rounds_done"] = round_num
+            state["elapsed"] += time.monotonic() - start
+            state["messages"] = [message.model_dump() for message in team.chatroom.memory.messages]
+            state["agent_stats"] = {
+                name: {**agent_stats.to_dict(), "latencies": agent_stats.latencies}
+                for name, agent_stats in stats.items()
+            }
+            if team.convergence is not None:
+                # Converged discussions stop early instead of running the remaining rounds
+                state["converged"] = team.converged
+                state["tokens_saved"] = tokens_saved + team.convergence.stats.tokens_saved
+            self._save_checkpoint(topic, state)
+
+        await self._write_result(topic, state, stats)
+        # Marked done only after the result is written: a crash in between
+        # repeats the result line instead of losing it
+        state["done"] = True
+        self._save_checkpoint(topic, state)
+        return "completed"
+
+    async def _write_result(self, topic: BatchTopic, state: dict, stats: dict[str, AgentStats]) -> None:
+        result = {
+            "id": topic.id,
+            "topic": topic.topic,
+            "rounds": state["rounds_done"],
+            "elapsed": round(state["elapsed"], 3),
+            "converged": state.get("converged", False),
+            "tokens_saved": state.get("tokens_saved", 0),
+            "agents": {name: agent_stats.to_dict() for name, agent_stats in stats.items()},
+            "messages": [
+                {"role": message["role"], "agent_name": message.get("agent_name"), "content": message["content"]}
+                for message in state["messages"]
+            ],
+        }
+        line = json.dumps(result, ensure_ascii=False) + "\n"
+        async with self._output_lock:
+            with open(self._output_path, "a", encoding="utf-8") as f:
+                f.write(line)
@@ -10,7 +10,8 @@ from typing import Optional
 from pydantic import BaseModel, Field
 
 from mini_agent.agent_team.agent import Agent, AgentConfig
-from mini_agent.agent_team.memory import Memory
+from mini_agent.agent_team.memory import Memory, Message
+from mini_agent.agent_team.store import ChatroomStore
 
 
 class Chatroom(BaseModel):
@@ -50,16 +51,24 @@ class Chatroom(BaseModel):
 class ChatroomManager:
     """
     Manager for Chatroom instances.
+
+    With a store, chatrooms and messages survive restarts: a stored chatroom
+    is loaded on first access, and only its context window is kept in RAM.
     """
 
-    def __init__(self, max_chatrooms: int = 10):
+    def __init__(self, max_chatrooms: int = 10, store: Optional[ChatroomStore] = None, page_size: int = 200):
         """
         Initialize chatroom manager.
 
         Args:
             max_chatrooms: Maximum number of chatrooms
+            store: Optional store to persist chatrooms in (in-memory only if None)
+            page_size: Messages read per query when loading a stored chatroom
         """
         self.max_chatrooms = max_chatrooms
+        self._store = store
+        self._page_size = page_size
+        # Chatrooms in RAM (with a store: the ones loaded so far)
         self._chatrooms: dict[str, Chatroom] = {}
 
     def create_chatroom(self, name: str, max_members: int = 10) -> Chatroom:
@@ -73,24 +82,85 @@ class ChatroomManager:
         Returns:
             Created chatroom
         """
-        if len(self._chatrooms) >= self.max_chatrooms:
+        count = self._store.count_chatrooms() if self._store else len(self._chatrooms)
+        if count >= self.max_chatrooms:
             raise ValueError(f"Maximum number of chatrooms ({self.max_chatrooms}) reached")
 
         chatroom = Chatroom(name=name, max_members=max_members)
+        if self._store:
+            self._store.save_chatroom(chatroom.id, chatroom.name, chatroom.created_at, chatroom.max_members)
+            chatroom.memory.bind_store(self._store, chatroom.id)
         self._chatrooms[chatroom.id] = chatroom
         return chatroom
 
     def get_chatroom(self, chatroom_id: str) -> Optional[Chatroom]:
-        """Get chatroom by ID."""
-        return self._chatrooms.get(chatroom_id)
+        """Get chatroom by ID (loading it from the store if needed)."""
+        chatroom = self._chatrooms.get(chatroom_id)
+        if chatroom is not None or not self._store:
+            return chatroom
+
+        row = self._store.get_chatroom(chatroom_id)
+        if row is None:
+            return None
+        chatroom = Chatroom(**row)
+        chatroom.memory.load_from_store(self._store, chatroom_id, page_size=self._page_size)
+        self._chatrooms[chatroom_id] = chatroom
+        return chatroom
 
     def list_chatrooms(self) -> list[Chatroom]:
-        """List all chatrooms."""
-        return list(self._chatrooms.values())
+        """List all chatrooms (loads every stored chatroom; see list_chatroom_ids)."""
+        if not self._store:
+            return list(self._chatrooms.values())
+        return [self.get_chatroom(chatroom_id) for chatroom_id in self._store.list_chatroom_ids()]
+
+    def list_chatroom_ids(self) -> list[str]:
+        """List chatroom IDs without loading any chatroom."""
+        if not self._store:
+            return list(self._chatrooms)
+        return self._store.list_chatroom_ids()
+
+    def get_history(self, chatroom_id: str, before_seq: Optional[int] = None, limit: int = 50) -> list[tuple[int, Message]]:
+        """
+        Get one page of a chatroom's history, newest page first.
+
+        Args:
+            chatroom_id: Chatroom ID
+            before_seq: Only messages older than this sequence number (None for the latest page)
+            limit: Page size
+
+        Returns:
+            (seq, message) pairs in chronological order
+        """
+        if self._store:
+            return self._store.load_history(chatroom_id, before_seq=before_seq, limit=limit)
+        chatroom = self._chatrooms.get(chatroom_id)
+        if chatroom is None:
+            return []
+        end = len(chatroom.memory.messages) if before_seq is None else max(before_seq, 0)
+        start = max(end - limit, 0)
+        return list(enumerate(chatroom.memory.messages[start:end], start=start))
+
+    def unload_chatroom(self, chatroom_id: str) -> bool:
+        """Write a stored chatroom's pending messages and drop it from RAM."""
+        if not self._store or chatroom_id not in self._chatrooms:
+            return False
+        self._chatrooms.pop(chatroom_id).memory.flush()
+        return True
 
     def delete_chatroom(self, chatroom_id: str) -> bool:
         """Delete a chatroom."""
-        if chatroom_id in self._chatrooms:
-            del self._chatrooms[chatroom_id]
-            return True
-        return False
+        deleted = self._chatrooms.pop(chatroom_id, None) is not None
+        if self._store:
+            deleted = self._store.delete_chatroom(chatroom_id) or deleted
+        return deleted
+
+    def flush(self) -> None:
+        """Write pending messages and release stored turns outside the context windows."""
+        for chatroom in self._chatrooms.values():
+            chatroom.memory.flush()
+
+    def close(self) -> None:
+        """Flush and close the store."""
+        if self._store:
+            self.flush()
+            self._store.close()
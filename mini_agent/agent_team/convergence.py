@@ -0,0 +1,155 @@
+"""
+Convergence - Early exit for multi-round discussions
+
+Compares each reply with the previous round (the agent's own last reply and
+the other agents' replies) using a cheap lexical similarity. An agent whose
+replies keep restating what was already said is skipped in later rounds, and
+once every agent is restating, the discussion counts as converged and further
+rounds make no agent calls. An optional judge (e.g. a small model) must
+confirm convergence before it is declared.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Optional
+
+from mini_agent.agent_team.agent import Agent
+from mini_agent.agent_team.memory import count_tokens
+
+# Latin words/numbers, or single CJK characters (CJK text has no spaces)
+_TOKEN_RE = re.compile(r"[a-z0-9]+|[\u3400-\u9fff\uf900-\ufaff]")
+
+# Receives the latest round as "[Agent]: reply" lines, returns True if converged
+ConvergenceJudge = Callable[[str], Awaitable[bool]]
+
+JUDGE_PROMPT = (
+    "下面是一场多人讨论的最新一轮发言。如果参与者已经达成一致、只是在重复彼此的观点，"
+    "没有提出新的论点，请只回答 YES；否则只回答 NO。\n\n"
+)
+
+
+def _shingles(text: str) -> set:
+    tokens = _TOKEN_RE.findall(text.lower())
+    if len(tokens) < 2:
+        return set(tokens)
+    return set(zip(tokens, tokens[1:]))
+
+
+def similarity(a: str, b: str) -> float:
+    """Jaccard similarity of token bigrams (0 = unrelated, 1 = same wording)."""
+    shingles_a, shingles_b = _shingles(a), _shingles(b)
+    if not shingles_a or not shingles_b:
+        return 0.0
+    return len(shingles_a & shingles_b) / len(shingles_a | shingles_b)
+
+
+class LLMConvergenceJudge:
+    """Asks an agent (typically on a small, cheap model) whether the discussion converged."""
+
+    def __init__(self, agent: Agent):
+        self.agent = agent
+        self.tokens_used = 0
+
+    async def __call__(self, transcript: str) -> bool:
+        reply = await self.agent.generate_response([{"role": "user", "content": JUDGE_PROMPT + transcript}])
+        if self.agent.last_usage is not None:
+            self.tokens_used += self.agent.last_usage.total_tokens
+        return reply.strip().upper().startswith("YES")
+
+
+@dataclass
+class ConvergenceStats:
+    """What early exit saved."""
+
+    skipped_turns: int = 0
+    tokens_saved: int = 0  # Estimate: context + typical reply of every skipped turn
+    converged_round: Optional[int] = None  # Round after which the discussion converged
+
+
+class ConvergenceDetector:
+    """Tracks how much each round adds and decides who still needs to speak."""
+
+    def __init__(
+        self,
+        threshold: float = 0.6,
+        patience: int = 1,
+        min_rounds: int = 2,
+        judge: Optional[ConvergenceJudge] = None,
+    ):
+        """
+        Initialize convergence detector.
+
+        Args:
+            threshold: Similarity to the previous round at or above which a reply is a restatement
+            patience: Consecutive restating rounds before an agent is skipped
+            min_rounds: Rounds that always run before convergence can be declared
+            judge: Optional async check that must confirm convergence
+        """
+        self.threshold = threshold
+        self.patience = patience
+        self.min_rounds = min_rounds
+        self.judge = judge
+        self.stats = ConvergenceStats()
+        self.reset()
+
+    def reset(self) -> None:
+        """Start over, e.g. after the user adds something new (stats are kept)."""
+        self.converged = False
+        self._rounds = 0
+        self._previous: dict[str, str] = {}
+        self._stale: dict[str, int] = {}
+        self._reply_tokens: dict[str, int] = {}
+
+    def should_skip(self, agent_name: str) -> bool:
+        """Whether an agent has nothing new to add this round."""
+        return self.converged or self._stale.get(agent_name, 0) >= self.patience
+
+    def record_skip(self, agent_name: str, context_tokens: int) -> None:
+        """Count a skipped turn and the tokens it would have cost."""
+        self.stats.skipped_turns += 1
+        self.stats.tokens_saved += context_tokens + self._reply_tokens.get(agent_name, 0)
+
+    async def observe(self, replies: dict[str, str]) -> bool:
+        """
+        Feed the replies of one round.
+
+        Args:
+            replies: Agent name -> reply text (agents that spoke this round)
+
+        Returns:
+            True if the discussion is now converged
+        """
+        if self.converged:
+            return True
+        self._rounds += 1
+        novel = False
+        for name, reply in replies.items():
+            # Own last reply and everything the others said last round
+            score = max((similarity(reply, text) for text in self._previous.values()), default=0.0)
+            if score >= self.threshold:
+                self._stale[name] = self._stale.get(name, 0) + 1
+            else:
+                self._stale[name] = 0
+                novel = True
+            self._reply_tokens[name] = count_tokens(reply)
+
+        for name, reply in replies.items():
+            self._previous[name] = reply
+        if novel:
+            # Something new was said: skipped agents get to respond to it
+            for name in self._stale:
+                if name not in replies:
+                    self._stale[name] = 0
+
+        restating = bool(self._previous) and all(self.should_skip(name) for name in self._previous)
+        if restating and self._rounds >= self.min_rounds:
+            if self.judge is not None and replies:
+                transcript = "\n\n".join(f"[{name}]: {reply}" for name, reply in replies.items())
+                restating = await self.judge(transcript)
+                if not restating:
+                    # The judge disagrees: let everyone speak again
+                    self._stale.clear()
+            if restating:
+                self.converged = True
+                self.stats.converged_round = self._rounds
+        return self.converged
@@ -5,23 +5,54 @@ Discussion Handler - 飞书讨论模式状态机
 - 关键词触发 → 展示 Agent 列表 → 用户选择 → 逐条发言 → 多轮讨论 → 结束
 
 Session 以 session_id（即飞书 chat_id）为 key，确保群聊讨论和私聊互不干扰。
+每个 session 有一个按顺序处理的消息信箱：同一会话内的消息依次处理，
+不同会话之间并发进行。
+
+传入 ChatroomStore 时，讨论状态和消息写入 SQLite，每处理完一条消息写入一次
+（由 store 的写线程提交，不阻塞事件循环），
+进程重启后该会话的下一条消息会从数据库恢复讨论。
+
+闲置超过 session_ttl 的讨论、以及超出内存预算时最久未活动的讨论会被移出内存：
+有 store 时写入数据库后释放，该会话下一条消息到来时自动恢复；没有 store 时直接结束，
+并在该会话的下一条消息到来时告知用户。
 """
 
 import asyncio
 import logging
+import time
+from collections import deque
 from dataclasses import dataclass, field
 from enum import Enum
 from typing import Callable, Awaitable, Optional
 
 from mini_agent.agent_team import (
     AgentTeam,
+    ConvergenceDetector,
     DiscussionMode,
 )
+from mini_agent.agent_team.chatroom import Chatroom, ChatroomManager
 from mini_agent.agent_team.providers import ProvidersConfig
+from mini_agent.agent_team.store import ChatroomStore
 from mini_agent.agents import AgentConfigLoader, AgentDefinition
 
 logger = logging.getLogger(__name__)
 
+# 流式回复攒够这么多字符后，在段落边界处发出一条消息
+STREAM_FLUSH_CHARS = 200
+
+CONTINUE_COMMAND = "继续"
+END_COMMAND = "讨论结束"
+
+SendFn = Callable[[str], Awaitable[None]]
+
+# 估算会话内存占用时，每条消息在正文之外的固定开销（字节）
+MESSAGE_OVERHEAD_BYTES = 300
+
+# 数据库中最多保存的讨论数
+MAX_STORED_DISCUSSIONS = 100_000
+
+LOST_DISCUSSION_NOTICE = '之前的讨论因长时间闲置已结束或无法恢复，请发送"讨论 话题"重新发起讨论。'
+
 
 class DiscussionState(Enum):
     """讨论会话状态。"""
@@ -39,8 +70,57 @@ class UserDiscussionSession:
     state: DiscussionState
     team: AgentTeam
     agent_names: list[str] = field(default_factory=list)
+    # 展示给用户的 Agent 列表；选择编号按它解析，不受之后 agents.yaml 修改的影响
+    candidates: list[AgentDefinition] = field(default_factory=list)
     round_num: int = 0
     message_count: int = 0
+    last_activity: float = field(default_factory=time.time)
+    size_bytes: int = 0  # Memory 占用估算，每处理完一条消息后更新
+
+
+@dataclass
+class _Mailbox:
+    """单个会话的消息信箱：按到达顺序排队，由一个 worker 逐条处理。"""
+
+    pending: deque = field(default_factory=deque)  # (content, send_fn)
+    worker: Optional[asyncio.Task] = None  # 有待处理消息时才存在
+    current: Optional[asyncio.Task] = None  # 正在处理的消息
+    interrupted: bool = False  # current 是被"讨论结束"取消的
+
+
+class _StreamSender:
+    """把流式回复按段落分批发送（飞书消息发出后无法追加内容）。"""
+
+    def __init__(self, send_fn: SendFn, header: str):
+        self._send_fn = send_fn
+        self._header = header
+        self._buffer = ""
+        self.sent = False
+
+    async def feed(self, delta: str) -> None:
+        """追加文本，够长时发出已完成的段落。"""
+        self._buffer += delta
+        if len(self._buffer) < STREAM_FLUSH_CHARS:
+            return
+        cut = self._buffer.rfind("\n\n")
+        if cut > 0:
+            text, self._buffer = self._buffer[:cut], self._buffer[cut + 2:]
+            await self._send(text)
+
+    async def flush(self) -> None:
+        """发出剩余文本。"""
+        if self._buffer.strip():
+            await self._send(self._buffer)
+        self._buffer = ""
+
+    async def _send(self, text: str) -> None:
+        if not self.sent:
+            text = f"{self._header}\n{text}"
+        self.sent = True
+        try:
+            await self._send_fn(text)
+        except Exception as send_err:
+            logger.error(f"DiscussionHandler: Failed to send streamed message: {send_err}")
 
 
 class DiscussionHandler:
@@ -58,32 +138,70 @@ class DiscussionHandler:
         providers_config: Optional[ProvidersConfig],
         loader: AgentConfigLoader,
         timeout: float = 30.0,
+        discussion_mode: DiscussionMode = DiscussionMode.DEBATE,
+        rebuttal_passes: int = 1,
+        session_ttl: Optional[float] = None,
+        max_memory_bytes: Optional[int] = None,
+        convergence_threshold: Optional[float] = None,
+        store: Optional[ChatroomStore] = None,
     ):
+        """
+        Args:
+            providers_config: Provider 配置
+            loader: Agent 配置加载器
+            timeout: 单个 Agent 的响应超时（秒）
+            discussion_mode: 讨论模式
+            rebuttal_passes: STAGED 模式的反驳轮数
+            session_ttl: 闲置多少秒后移出内存（None 表示不按时间移出）
+            max_memory_bytes: 所有讨论 Memory 的总预算，超出时移出最久未活动的讨论
+            convergence_threshold: 与上一轮的相似度达到该值视为重复（None 表示不检测收敛）
+            store: 保存讨论状态和消息的数据库（None 表示只保存在内存中，移出内存即结束）
+        """
         self._providers_config = providers_config
         self._loader = loader
         self._timeout = timeout
+        # STAGED：并行初稿 + 并行反驳；其他模式按辩论方式逐个流式发言
+        self._discussion_mode = discussion_mode
+        self._rebuttal_passes = rebuttal_passes
         self._sessions: dict[str, UserDiscussionSession] = {}
-        # 缓存 agent 列表
-        self._agent_list_text: Optional[str] = None
-        self._agent_defs: Optional[list[AgentDefinition]] = None
+        self._mailboxes: dict[str, _Mailbox] = {}
+        self._session_ttl = session_ttl
+        self._max_memory_bytes = max_memory_bytes
+        # 已写入数据库、等待恢复的会话
+        self._evicted: set[str] = set()
+        # 没有 store 时被移出（已结束）的会话，下一条消息到来时告知用户
+        self._dropped: set[str] = set()
+        self._cleanup_task: Optional[asyncio.Task] = None
+        self._convergence_threshold = convergence_threshold
+        self._store = store
+        self._chatrooms = ChatroomManager(max_chatrooms=MAX_STORED_DISCUSSIONS, store=store) if store else None
+        if store is not None:
+            # 上次运行留下的讨论，该会话下一条消息到来时从数据库恢复
+            self._evicted.update(store.list_discussion_ids())
 
     def _ensure_agent_list(self) -> tuple[str, list[AgentDefinition]]:
-        """确保 agent 列表已加载并缓存。"""
-        if self._agent_list_text is None or self._agent_defs is None:
-            self._agent_list_text, self._agent_defs = self._loader.format_agent_list()
-        return self._agent_list_text, self._agent_defs
+        """当前的 agent 列表（由 loader 缓存，agents.yaml 修改后自动更新）。"""
+        return self._loader.format_agent_list()
 
     def is_active(self, session_id: str) -> bool:
-        """检查某个会话是否有活跃的讨论。"""
-        return session_id in self._sessions
+        """检查某个会话是否有活跃的讨论（包括已移出内存、可恢复的讨论和排队中的消息）。"""
+        return (
+            session_id in self._sessions
+            or session_id in self._mailboxes
+            or session_id in self._evicted
+            or session_id in self._dropped
+        )
 
     async def handle_message(
         self,
         session_id: str,
         content: str,
-        send_fn: Callable[[str], Awaitable[None]],
+        send_fn: SendFn,
     ) -> None:
-        """总路由：根据当前状态分派到对应的处理方法。
+        """把消息放入会话信箱后立即返回，由该会话的 worker 按顺序处理。
+
+        - 连续排队的多个"继续"只运行一轮
+        - "讨论结束"会取消正在进行的一轮，并丢弃尚未处理的消息
 
         Args:
             session_id: 会话标识（chat_id），区分不同群聊/私聊
@@ -91,9 +209,99 @@ class DiscussionHandler:
             send_fn: 发送消息的回调
         """
         content = content.strip()
+        session = self._sessions.get(session_id)
+        if session is not None:
+            session.last_activity = time.time()
+        mailbox = self._mailboxes.get(session_id)
+        if mailbox is None:
+            mailbox = self._mailboxes[session_id] = _Mailbox()
+
+        if content == END_COMMAND and session_id in self._sessions:
+            mailbox.pending.clear()
+            if mailbox.current is not None:
+                mailbox.interrupted = True
+                mailbox.current.cancel()
+        elif content == CONTINUE_COMMAND and mailbox.pending and mailbox.pending[-1][0] == CONTINUE_COMMAND:
+            return
+
+        mailbox.pending.append((content, send_fn))
+        if mailbox.worker is None:
+            mailbox.worker = asyncio.create_task(self._drain_mailbox(session_id, mailbox))
+
+    async def wait_idle(self, session_id: Optional[str] = None) -> None:
+        """等待某个会话（默认全部会话）的排队消息处理完毕。"""
+        while True:
+            if session_id is not None:
+                mailbox = self._mailboxes.get(session_id)
+                workers = [mailbox.worker] if mailbox and mailbox.worker else []
+            else:
+                workers = [m.worker for m in self._mailboxes.values() if m.worker]
+            if not workers:
+                return
+            await asyncio.gather(*workers, return_exceptions=True)
+
+    async def close(self) -> None:
+        """取消所有会话的处理任务，停止后台清理，把讨论写入数据库并关闭。"""
+        workers = [m.worker for m in self._mailboxes.values() if m.worker]
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        self._mailboxes.clear()
+        await self.stop_cleanup_task()
+        if self._chatrooms is not None:
+            for session in self._sessions.values():
+                self._persist(session)
+            self._chatrooms.close()
+
+    async def _drain_mailbox(self, session_id: str, mailbox: _Mailbox) -> None:
+        """会话 worker：按顺序处理信箱中的消息，处理完后退出。"""
+        try:
+            while mailbox.pending:
+                content, send_fn = mailbox.pending.popleft()
+                mailbox.current = asyncio.create_task(self._dispatch(session_id, content, send_fn))
+                try:
+                    await mailbox.current
+                except asyncio.CancelledError:
+                    if not mailbox.interrupted:
+                        mailbox.current.cancel()
+                        raise
+                    logger.info(f"DiscussionHandler: Round interrupted for {session_id}")
+                except Exception as e:
+                    logger.error(f"DiscussionHandler: Failed to handle message for {session_id}: {e}")
+                    try:
+                        await send_fn("抱歉，处理讨论消息时发生错误。")
+                    except Exception:
+                        pass
+                finally:
+                    mailbox.current = None
+                    mailbox.interrupted = False
+                    session = self._sessions.get(session_id)
+                    if session is not None:
+                        self._persist(session)
+                    self._update_size(session_id)
+        finally:
+            mailbox.worker = None
+            if not mailbox.pending and self._mailboxes.get(session_id) is mailbox:
+                del self._mailboxes[session_id]
+
+    async def _dispatch(
+        self,
+        session_id: str,
+        content: str,
+        send_fn: SendFn,
+    ) -> None:
+        """总路由：根据当前状态分派到对应的处理方法。"""
+        lost = session_id in self._dropped
+        self._dropped.discard(session_id)
+        if session_id in self._evicted and not self._restore_session(session_id):
+            lost = True
+        if lost:
+            await send_fn(LOST_DISCUSSION_NOTICE)
+            if not content.startswith("讨论 "):
+                return
 
         # 新讨论：用户发送 "讨论 {话题}"
-        if not self.is_active(session_id):
+        if session_id not in self._sessions:
             if content.startswith("讨论 "):
                 topic = content[3:].strip()
                 if topic:
@@ -104,7 +312,9 @@ class DiscussionHandler:
 
         session = self._sessions[session_id]
 
-        if session.state == DiscussionState.SELECTING:
+        if content == END_COMMAND:
+            await self._end_discussion(session_id, send_fn)
+        elif session.state == DiscussionState.SELECTING:
             await self._select_agents(session_id, content, send_fn)
         elif session.state == DiscussionState.DISCUSSING:
             await self._handle_discussing(session_id, content, send_fn)
@@ -113,7 +323,7 @@ class DiscussionHandler:
         self,
         session_id: str,
         topic: str,
-        send_fn: Callable[[str], Awaitable[None]],
+        send_fn: SendFn,
     ) -> None:
         """创建讨论 session 并展示 Agent 列表。"""
         list_text, agent_defs = self._ensure_agent_list()
@@ -122,19 +332,12 @@ class DiscussionHandler:
             await send_fn("暂无可用的 Agent，无法发起讨论。")
             return
 
-        # 创建 AgentTeam（DEBATE 模式）
-        team = AgentTeam(
-            name=f"discussion_{session_id}",
-            timeout=self._timeout,
-            providers_config=self._providers_config,
-            discussion_mode=DiscussionMode.DEBATE,
-        )
-
         session = UserDiscussionSession(
             session_id=session_id,
             topic=topic,
             state=DiscussionState.SELECTING,
-            team=team,
+            team=self._create_team(session_id),
+            candidates=agent_defs,
         )
         self._sessions[session_id] = session
 
@@ -144,15 +347,49 @@ class DiscussionHandler:
             f'请输入编号（逗号分隔），或输入"全部"'
         )
 
+    def _create_team(self, session_id: str, chatroom: Optional[Chatroom] = None) -> AgentTeam:
+        """创建会话的 AgentTeam（DEBATE 或 STAGED 模式）；配置了 store 时聊天室写入数据库。"""
+        staged = self._discussion_mode == DiscussionMode.STAGED
+        if chatroom is None and self._chatrooms is not None:
+            chatroom = self._chatrooms.create_chatroom(f"discussion_{session_id}")
+        return AgentTeam(
+            name=f"discussion_{session_id}",
+            chatroom=chatroom,
+            timeout=self._timeout,
+            providers_config=self._providers_config,
+            discussion_mode=DiscussionMode.STAGED if staged else DiscussionMode.DEBATE,
+            rebuttal_passes=self._rebuttal_passes,
+            convergence=(
+                ConvergenceDetector(threshold=self._convergence_threshold)
+                if self._convergence_threshold is not None
+                else None
+            ),
+        )
+
+    def _add_agent(self, team: AgentTeam, agent_def: AgentDefinition) -> None:
+        """按 agents.yaml 中的定义向 team 添加 Agent。"""
+        personality = self._loader.resolve_personality(agent_def)
+        team.add_agent(
+            name=agent_def.name,
+            provider_id=agent_def.provider_id,
+            model_name=agent_def.model_name,
+            personality_name=personality.name,
+            system_prompt=personality.system_prompt,
+            response_style=personality.response_style,
+            fallback_provider_id=agent_def.fallback.provider_id if agent_def.fallback else None,
+            fallback_model_name=agent_def.fallback.model_name if agent_def.fallback else None,
+        )
+
     async def _select_agents(
         self,
         session_id: str,
         content: str,
-        send_fn: Callable[[str], Awaitable[None]],
+        send_fn: SendFn,
     ) -> None:
         """解析用户选择，创建 Agent，启动第一轮讨论。"""
         session = self._sessions[session_id]
-        _, agent_defs = self._ensure_agent_list()
+        # 恢复的会话若没有保存 candidates，使用当前列表
+        agent_defs = session.candidates or self._ensure_agent_list()[1]
 
         # 解析选择
         if content.strip() == "全部":
@@ -192,15 +429,7 @@ class DiscussionHandler:
         selected_names = []
         for idx in selected_indices:
             agent_def = agent_defs[idx]
-            personality = self._loader.resolve_personality(agent_def)
-            session.team.add_agent(
-                name=agent_def.name,
-                provider_id=agent_def.provider_id,
-                model_name=agent_def.model_name,
-                personality_name=personality.name,
-                system_prompt=personality.system_prompt,
-                response_style=personality.response_style,
-            )
+            self._add_agent(session.team, agent_def)
             selected_names.append(agent_def.name)
 
         session.agent_names = selected_names
@@ -217,12 +446,10 @@ class DiscussionHandler:
         self,
         session_id: str,
         content: str,
-        send_fn: Callable[[str], Awaitable[None]],
+        send_fn: SendFn,
     ) -> None:
         """讨论进行中的消息处理。"""
-        if content == "讨论结束":
-            await self._end_discussion(session_id, send_fn)
-        elif content == "继续":
+        if content == CONTINUE_COMMAND:
             session = self._sessions[session_id]
             await self._run_round(session, send_fn)
         else:
@@ -233,95 +460,128 @@ class DiscussionHandler:
     async def _run_round(
         self,
         session: UserDiscussionSession,
-        send_fn: Callable[[str], Awaitable[None]],
+        send_fn: SendFn,
         user_message: Optional[str] = None,
     ) -> None:
-        """运行一轮讨论：逐个 Agent 发言并即时发送。"""
+        """运行一轮讨论：按讨论模式让 Agent 发言并即时发送。"""
         session.round_num += 1
 
-        # 如果有用户消息，加入 Memory
+        # 如果有用户消息，加入 Memory；新观点让已收敛的讨论重新开始
         if user_message:
             session.team.chatroom.memory.add_message(
                 role="user", content=user_message
             )
+            session.team.reset_convergence()
 
-        # 遍历 active agents，逐个调用并即时发送
-        agent_list = [
-            agent
-            for agent in session.team.agents.values()
-            if agent.is_active
-        ]
+        if self._discussion_mode == DiscussionMode.STAGED:
+            await self._run_staged_round(session, send_fn)
+        else:
+            await self._run_debate_round(session, send_fn)
 
-        for agent in agent_list:
-            # 获取当前 Memory 上下文
-            messages = session.team.chatroom.memory.get_messages_for_agent(
-                current_agent_name=agent.name
-            )
+        # 轮次提示
+        try:
+            if session.team.converged:
+                await send_fn(
+                    f"第 {session.round_num} 轮结束 | 讨论已收敛，各方不再提出新观点 | "
+                    f'发消息提出新观点 | "讨论结束"'
+                )
+            else:
+                await send_fn(
+                    f"第 {session.round_num} 轮结束 | "
+                    f'发消息继续 | "继续"下一轮 | "讨论结束"'
+                )
+        except Exception as e:
+            logger.error(f"DiscussionHandler: Failed to send round summary: {e}")
+
+    async def _run_staged_round(
+        self,
+        session: UserDiscussionSession,
+        send_fn: SendFn,
+    ) -> None:
+        """分阶段一轮：所有 Agent 并行写初稿，再并行反驳，逐阶段发送。"""
+        responses = await session.team.discuss("", add_topic_to_memory=False)
+        if not responses:
+            return
+        # 已收敛的 Agent 不参与本轮，按实际发言人数划分阶段
+        agent_count = len({response.agent_name for response in responses})
 
+        for i, response in enumerate(responses):
+            stage = "初稿" if i < agent_count else f"反驳 {i // agent_count}"
+            header = f"【第 {session.round_num} 轮 · {stage} · {response.agent_name}】"
+            if response.success:
+                session.message_count += 1
+                text = f"{header}\n{response.content}"
+            elif response.timed_out:
+                text = f"{header}⏰ 响应超时"
+            else:
+                logger.error(
+                    f"DiscussionHandler: Agent {response.agent_name} error: {response.error}"
+                )
+                text = f"{header}发生错误: {response.error}"
             try:
-                response = await asyncio.wait_for(
-                    agent.generate_response(messages),
-                    timeout=self._timeout,
+                await send_fn(text)
+            except Exception as send_err:
+                logger.error(
+                    f"DiscussionHandler: Failed to send message for {response.agent_name}: {send_err}"
                 )
 
-                # 即时发送到飞书
-                try:
-                    await send_fn(
-                        f"【第 {session.round_num} 轮 · {agent.name}】\n{response}"
-                    )
-                except Exception as send_err:
-                    logger.error(
-                        f"DiscussionHandler: Failed to send message for {agent.name}: {send_err}"
-                    )
+    async def _run_debate_round(
+        self,
+        session: UserDiscussionSession,
+        send_fn: SendFn,
+    ) -> None:
+        """辩论一轮：逐个 Agent 流式发言。"""
+        # 遍历本轮发言的 agents（跳过已无新观点的），逐个调用并即时发送
+        agent_list = session.team.speakers()
+        responses = []
+
+        for i, agent in enumerate(agent_list):
+            # 当前发言流式输出时，提前准备下一位的 LLM 客户端
+            if i + 1 < len(agent_list):
+                agent_list[i + 1].warm_up()
+
+            header = f"【第 {session.round_num} 轮 · {agent.name}】"
+            sender = _StreamSender(send_fn, header)
+            # 边生成边发送，回复同时逐步写入 Memory，下一个 agent 能看到
+            response = await session.team.stream_turn(
+                agent, lambda _agent, delta: sender.feed(delta)
+            )
+            await sender.flush()
+            responses.append(response)
 
+            if response.success:
                 session.message_count += 1
+                continue
 
-                # 写入 Memory，让下一个 agent 能看到
-                session.team.chatroom.memory.add_message(
-                    role="agent",
-                    content=response,
-                    agent_id=agent.id,
-                    agent_name=agent.name,
-                )
-
-            except asyncio.TimeoutError:
+            if response.timed_out:
                 logger.warning(
                     f"DiscussionHandler: Agent {agent.name} timed out "
                     f"(round {session.round_num})"
                 )
-                try:
-                    await send_fn(
-                        f"【第 {session.round_num} 轮 · {agent.name}】⏰ 响应超时"
-                    )
-                except Exception:
-                    pass
-            except Exception as e:
+                notice = "⏰ 响应超时"
+            else:
                 logger.error(
-                    f"DiscussionHandler: Agent {agent.name} error: {e}"
+                    f"DiscussionHandler: Agent {agent.name} error: {response.error}"
                 )
-                try:
-                    await send_fn(
-                        f"【第 {session.round_num} 轮 · {agent.name}】发生错误: {e}"
-                    )
-                except Exception:
-                    pass
+                notice = f"发生错误: {response.error}"
+            try:
+                await send_fn(notice if sender.sent else f"{header}{notice}")
+            except Exception:
+                pass
 
-        # 轮次提示
-        try:
-            await send_fn(
-                f"第 {session.round_num} 轮结束 | "
-                f'发消息继续 | "继续"下一轮 | "讨论结束"'
-            )
-        except Exception as e:
-            logger.error(f"DiscussionHandler: Failed to send round summary: {e}")
+        await session.team.end_round(responses)
 
     async def _end_discussion(
         self,
         session_id: str,
-        send_fn: Callable[[str], Awaitable[None]],
+        send_fn: SendFn,
     ) -> None:
         """结束讨论，发送总结并清理 session。"""
         session = self._sessions.pop(session_id)
+        self._evicted.discard(session_id)
+        if self._store is not None:
+            self._store.delete_discussion(session_id)
+            self._chatrooms.delete_chatroom(session.team.chatroom.id)
 
         await send_fn(
             f"讨论结束 | "
@@ -334,3 +594,177 @@ class DiscussionHandler:
             f"DiscussionHandler: Discussion ended for {session_id}, "
             f"topic={session.topic}, rounds={session.round_num}"
         )
+
+    # ==================== 闲置会话移出与恢复 ====================
+
+    def _update_size(self, session_id: str) -> None:
+        """重新估算会话的 Memory 占用，并在超出总预算时移出闲置会话。"""
+        session = self._sessions.get(session_id)
+        if session is not None:
+            session.size_bytes = sum(
+                len(message.content.encode("utf-8")) + MESSAGE_OVERHEAD_BYTES
+                for message in session.team.chatroom.memory.messages
+            )
+        self._enforce_memory_budget()
+
+    def _enforce_memory_budget(self) -> int:
+        """超出 max_memory_bytes 时，按最久未活动优先移出闲置会话。"""
+        if self._max_memory_bytes is None:
+            return 0
+        total = sum(session.size_bytes for session in self._sessions.values())
+        if total <= self._max_memory_bytes:
+            return 0
+        evicted = 0
+        for session in sorted(self._sessions.values(), key=lambda s: s.last_activity):
+            if total <= self._max_memory_bytes:
+                break
+            if session.session_id in self._mailboxes:
+                continue
+            total -= session.size_bytes
+            self._evict(session.session_id)
+            evicted += 1
+        if evicted:
+            logger.info(f"DiscussionHandler: Evicted {evicted} sessions over memory budget")
+        return evicted
+
+    async def evict_idle(self) -> int:
+        """移出闲置超过 session_ttl 的会话。
+
+        Returns:
+            移出的会话数
+        """
+        if self._session_ttl is None:
+            return 0
+        now = time.time()
+        expired_ids = [
+            session_id
+            for session_id, session in self._sessions.items()
+            if now - session.last_activity > self._session_ttl and session_id not in self._mailboxes
+        ]
+        for session_id in expired_ids:
+            self._evict(session_id)
+        if expired_ids:
+            logger.info(f"DiscussionHandler: Evicted {len(expired_ids)} idle sessions")
+        return len(expired_ids)
+
+    async def start_cleanup_task(self, interval: int = 60) -> None:
+        """启动后台任务，定期移出闲置会话并把缓冲的消息写入数据库。"""
+        if self._cleanup_task is not None or (self._session_ttl is None and self._store is None):
+            return
+        self._cleanup_task = asyncio.create_task(self._cleanup_loop(interval))
+
+    async def stop_cleanup_task(self) -> None:
+        """停止后台清理任务。"""
+        if self._cleanup_task is None:
+            return
+        self._cleanup_task.cancel()
+        try:
+            await self._cleanup_task
+        except asyncio.CancelledError:
+            pass
+        self._cleanup_task = None
+
+    async def _cleanup_loop(self, interval: int) -> None:
+        while True:
+            try:
+                await asyncio.sleep(interval)
+                await self.evict_idle()
+                if self._chatrooms is not None:
+                    self._chatrooms.flush()
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"DiscussionHandler: Cleanup error: {e}")
+
+    def _session_state(self, session: UserDiscussionSession) -> dict:
+        """会话中需要持久化的状态（消息由聊天室单独保存）。"""
+        return {
+            "topic": session.topic,
+            "state": session.state.value,
+            "agent_names": session.agent_names,
+            "candidates": [agent_def.model_dump() for agent_def in session.candidates],
+            "round_num": session.round_num,
+            "message_count": session.message_count,
+            "last_activity": session.last_activity,
+        }
+
+    def _persist(self, session: UserDiscussionSession) -> bool:
+        """把会话状态和尚未写入的消息写入数据库。
+
+        Returns:
+            是否写入成功（未配置 store 时为 False）
+        """
+        if self._store is None:
+            return False
+        try:
+            session.team.chatroom.memory.flush()
+            self._store.save_discussion(session.session_id, session.team.chatroom.id, self._session_state(session))
+        except Exception as e:
+            logger.error(f"DiscussionHandler: Failed to persist discussion {session.session_id}: {e}")
+            return False
+        return True
+
+    def _build_session(self, session_id: str, state: dict, chatroom: Chatroom) -> UserDiscussionSession:
+        """按保存的状态重建会话：按名字重新创建 Agent。"""
+        team = self._create_team(session_id, chatroom)
+        agent_names = state["agent_names"]
+        if agent_names:
+            _, agent_defs = self._ensure_agent_list()
+            defs_by_name = {agent_def.name: agent_def for agent_def in agent_defs}
+            for name in agent_names:
+                if name in defs_by_name:
+                    self._add_agent(team, defs_by_name[name])
+                else:
+                    logger.warning(f"DiscussionHandler: Agent {name} no longer configured, skipped on restore")
+        return UserDiscussionSession(
+            session_id=session_id,
+            topic=state["topic"],
+            state=DiscussionState(state["state"]),
+            team=team,
+            agent_names=agent_names,
+            candidates=[AgentDefinition(**data) for data in state.get("candidates", [])],
+            round_num=state["round_num"],
+            message_count=state["message_count"],
+        )
+
+    def _evict(self, session_id: str) -> None:
+        """把会话移出内存：有 store 时写入数据库后释放 Memory，否则结束讨论。"""
+        session = self._sessions.pop(session_id)
+        if self._persist(session):
+            self._chatrooms.unload_chatroom(session.team.chatroom.id)
+            self._evicted.add(session_id)
+            logger.info(f"DiscussionHandler: Evicted discussion {session_id} to store")
+            return
+        if self._chatrooms is not None:
+            self._chatrooms.unload_chatroom(session.team.chatroom.id)
+        self._dropped.add(session_id)
+        logger.info(f"DiscussionHandler: Dropped idle discussion {session_id}")
+
+    def _restore_session(self, session_id: str) -> bool:
+        """从数据库恢复会话（重建 AgentTeam；Memory 分页加载并重建摘要）。
+
+        Returns:
+            是否恢复成功；失败时删除残留记录，该会话可以重新发起讨论
+        """
+        self._evicted.discard(session_id)
+        stored = None
+        try:
+            stored = self._store.get_discussion(session_id)
+            if stored is None:
+                raise LookupError("discussion not in store")
+            chatroom_id, state = stored
+            chatroom = self._chatrooms.get_chatroom(chatroom_id)
+            if chatroom is None:
+                raise LookupError(f"chatroom {chatroom_id} not in store")
+            self._sessions[session_id] = self._build_session(session_id, state, chatroom)
+        except Exception as e:
+            logger.error(f"DiscussionHandler: Failed to restore {session_id}, discussion ended: {e}")
+            try:
+                self._store.delete_discussion(session_id)
+                if stored is not None:
+                    self._chatrooms.delete_chatroom(stored[0])
+            except Exception:
+                pass
+            return False
+        logger.info(f"DiscussionHandler: Restored discussion {session_id}")
+        return True
@@ -0,0 +1,50 @@
+"""
+Latency - Per-agent latency tracking for adaptive deadlines
+
+Each agent keeps an EWMA and a sliding-window p95 of its recent request
+latencies. AgentTeam derives a per-agent hedge deadline from them: when a
+request runs past what is normal for that agent, a backup request goes to
+the agent's fallback model instead of waiting for the global timeout.
+"""
+
+import math
+from collections import deque
+from typing import Optional
+
+
+class LatencyTracker:
+    """EWMA and recent-window percentiles of one agent's request latencies."""
+
+    def __init__(self, alpha: float = 0.2, window: int = 50):
+        """
+        Initialize latency tracker.
+
+        Args:
+            alpha: EWMA weight of the newest sample
+            window: Number of recent samples kept for percentiles
+        """
+        self.alpha = alpha
+        self.ewma: Optional[float] = None
+        self._samples: deque[float] = deque(maxlen=window)
+
+    @property
+    def count(self) -> int:
+        """Number of samples in the window."""
+        return len(self._samples)
+
+    def record(self, seconds: float) -> None:
+        """Add one latency sample (a cut-off request counts with the time it ran)."""
+        self._samples.append(seconds)
+        self.ewma = seconds if self.ewma is None else self.alpha * seconds + (1 - self.alpha) * self.ewma
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Nearest-rank percentile of the window (q in 0-100), None without samples."""
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        return ordered[max(0, math.ceil(q / 100 * len(ordered)) - 1)]
+
+    @property
+    def p95(self) -> Optional[float]:
+        """95th percentile of the window."""
+        return self.percentile(95)
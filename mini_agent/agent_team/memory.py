@@ -1,15 +1,62 @@
 """
 Memory - Shared conversation history for chatroom
 
-Stores messages that all agents can access.
+Stores messages that all agents can access, and renders each agent's LLM
+context within a token budget: the topic stays pinned, the most recent turns
+are kept verbatim and older turns are folded into a rolling summary.
+
+Bound to a ChatroomStore, every message is also written to the store, and
+turns that have left the context window are dropped from RAM once stored.
 """
 
 import time
 import uuid
-from typing import Optional
-from pydantic import BaseModel, Field
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Optional
+from pydantic import BaseModel, Field, PrivateAttr
 from datetime import datetime
 
+import tiktoken
+
+if TYPE_CHECKING:
+    from mini_agent.agent_team.store import ChatroomStore
+
+# Characters of an older turn kept in the rolling summary
+SUMMARY_LINE_CHARS = 200
+
+_encoding = None
+
+
+def count_tokens(text: str) -> int:
+    """Count tokens with tiktoken (cl100k_base), estimating if it is unavailable."""
+    global _encoding
+    if _encoding is None:
+        try:
+            _encoding = tiktoken.get_encoding("cl100k_base")
+        except Exception:
+            _encoding = False
+    if _encoding:
+        return len(_encoding.encode(text))
+    # UTF-8 bytes / 3 is about one token per CJK character and errs high for Latin text
+    return len(text.encode("utf-8")) // 3 + 1
+
+
+def summarize_message(speaker: str, content: str) -> str:
+    """One-line extract of an older turn for the rolling summary."""
+    text = " ".join(content.split())
+    if len(text) > SUMMARY_LINE_CHARS:
+        text = text[:SUMMARY_LINE_CHARS].rstrip() + "…"
+    return f"- {speaker}: {text}"
+
+
+@dataclass
+class _AgentView:
+    """Rendered window messages for one agent, extended as messages arrive."""
+
+    start: int
+    end: int
+    items: list[dict] = field(default_factory=list)
+
 
 class Message(BaseModel):
     """
@@ -42,7 +89,12 @@ class Memory(BaseModel):
 
     max_tokens: int = Field(
         default=100000,
-        description="Maximum number of tokens to store"
+        description="Token budget of the context rendered for an agent"
+    )
+
+    summary_max_tokens: int = Field(
+        default=2000,
+        description="Token budget of the rolling summary of older turns"
     )
 
     created_at: float = Field(
@@ -50,6 +102,24 @@ class Memory(BaseModel):
         description="Creation timestamp"
     )
 
+    # Context window state, derived from messages (see _sync_window)
+    _token_counts: list[int] = PrivateAttr(default_factory=list)
+    _pinned: Optional[int] = PrivateAttr(default=None)
+    _window_start: int = PrivateAttr(default=0)
+    _window_tokens: int = PrivateAttr(default=0)
+    _summary_lines: list[tuple[str, int]] = PrivateAttr(default_factory=list)
+    _summary_tokens: int = PrivateAttr(default=0)
+    _summary_dropped: int = PrivateAttr(default=0)
+    _views: dict[str, _AgentView] = PrivateAttr(default_factory=dict)
+
+    # Persistence state (see bind_store): stored messages messages[_trim_head:]
+    # follow _trimmed older ones that were dropped from RAM
+    _store: Optional["ChatroomStore"] = PrivateAttr(default=None)
+    _chatroom_id: Optional[str] = PrivateAttr(default=None)
+    _trim_head: int = PrivateAttr(default=0)
+    _trimmed: int = PrivateAttr(default=0)
+    _base_summary: tuple[list[tuple[str, int]], int, int] = PrivateAttr(default=([], 0, 0))
+
     def add_message(self, role: str, content: str, agent_id: Optional[str] = None, agent_name: Optional[str] = None) -> Message:
         """
         Add a message to memory.
@@ -72,12 +142,129 @@ class Memory(BaseModel):
             agent_name=agent_name
         )
         self.messages.append(message)
+        if self._store is not None:
+            self._store.put_message(self._chatroom_id, self._seq(len(self.messages) - 1), message)
         return message
 
+    def append_to_message(self, message: Message, delta: str) -> None:
+        """
+        Append streamed text to a stored message.
+
+        Args:
+            message: Message returned by add_message
+            delta: Text to append
+        """
+        message.content += delta
+        index = len(self.messages) - 1
+        if self._store is not None:
+            stored_index = self._index_of(message)
+            if stored_index is not None:
+                self._store.put_message(self._chatroom_id, self._seq(stored_index), message)
+        if index >= 0 and self.messages[index] is message and index >= len(self._token_counts):
+            # Not yet counted into the context window: nothing to update
+            return
+        # Already rendered: recount from scratch on the next render
+        self._reset_window()
+
+    def remove_message(self, message: Message) -> bool:
+        """
+        Remove a message (e.g. a streamed reply that produced nothing).
+
+        Returns:
+            True if the message was found
+        """
+        index = self._index_of(message)
+        if index is None:
+            return False
+        del self.messages[index]
+        if self._store is not None:
+            # Later messages move up one sequence number
+            self._store.delete_messages(self._chatroom_id, self._seq(index))
+            for later in range(index, len(self.messages)):
+                self._store.put_message(self._chatroom_id, self._seq(later), self.messages[later])
+        self._reset_window()
+        return True
+
+    def _index_of(self, message: Message) -> Optional[int]:
+        """Index of a message object (searching from the newest), or None."""
+        for index in range(len(self.messages) - 1, -1, -1):
+            if self.messages[index] is message:
+                return index
+        return None
+
     def get_messages(self) -> list[Message]:
-        """Get all messages."""
+        """Get the messages held in RAM (all of them unless bound to a store)."""
         return self.messages
 
+    def bind_store(self, store: "ChatroomStore", chatroom_id: str) -> None:
+        """
+        Write this memory's messages to a store from now on.
+
+        Messages already in memory are written as well. Once written, turns
+        that have left the context window are dropped from RAM on flush().
+
+        Args:
+            store: Chatroom store
+            chatroom_id: Chatroom the messages belong to
+        """
+        self._store = store
+        self._chatroom_id = chatroom_id
+        for index, message in enumerate(self.messages):
+            store.put_message(chatroom_id, self._seq(index), message)
+
+    def load_from_store(self, store: "ChatroomStore", chatroom_id: str, page_size: int = 200) -> None:
+        """
+        Restore the messages of a chatroom and bind to the store.
+
+        History is read page by page and older turns are folded into the
+        summary as it goes, so only the context window stays in RAM.
+
+        Args:
+            store: Chatroom store
+            chatroom_id: Chatroom to restore
+            page_size: Messages read per query
+        """
+        self._store = None
+        self.clear()
+        self._store = store
+        self._chatroom_id = chatroom_id
+        for page in store.iter_pages(chatroom_id, page_size=page_size):
+            self.messages.extend(message for _, message in page)
+            self._trim()
+
+    def flush(self) -> None:
+        """Write pending messages to the store and drop stored turns outside the window."""
+        if self._store is None:
+            return
+        self._store.flush()
+        self._trim()
+
+    def _seq(self, index: int) -> int:
+        """Store sequence number of messages[index]."""
+        return index if index < self._trim_head else index + self._trimmed
+
+    def _trim(self) -> None:
+        """Drop stored turns that were folded into the summary (the pinned topic stays)."""
+        self._sync_window()
+        if not self._trimmed:
+            self._trim_head = 1 if self._pinned == 0 else 0
+        head = self._trim_head
+        count = self._window_start - head
+        if count <= 0:
+            return
+        del self.messages[head:self._window_start]
+        del self._token_counts[head:self._window_start]
+        for key, view in list(self._views.items()):
+            if view.start < self._window_start:
+                del self._views[key]
+            else:
+                view.start -= count
+                view.end -= count
+        self._window_start = head
+        self._trimmed += count
+        # The summary of dropped turns cannot be rebuilt from messages any more
+        self._base_summary = (list(self._summary_lines), self._summary_tokens, self._summary_dropped)
+
     def get_messages_for_agent(self, current_agent_name: Optional[str] = None) -> list[dict]:
         """
         Get messages formatted for LLM context with proper role mapping.
@@ -87,6 +274,11 @@ class Memory(BaseModel):
         - "agent" messages from current_agent_name -> role="assistant"
         - "agent" messages from other agents -> role="user" with "[AgentName]: " prefix
 
+        The context stays within max_tokens: the first user message (the
+        topic) is always included, followed by a summary of turns that no
+        longer fit and the most recent turns verbatim. Rendered turns are
+        cached per agent, so each call only renders messages added since.
+
         Args:
             current_agent_name: Name of the agent receiving these messages.
                                Used to identify its own messages as "assistant" role.
@@ -94,30 +286,128 @@ class Memory(BaseModel):
         Returns:
             List of message dicts with valid LLM API roles (user/assistant).
         """
+        self._sync_window()
+        end = len(self.messages)
+        start = self._window_start
+
+        key = current_agent_name or ""
+        view = self._views.get(key)
+        # Rebuild when messages were removed, or when everything the view holds
+        # (and possibly more) has since been folded into the summary
+        if view is None or view.end > end or view.start > start or view.end < start:
+            view = self._views[key] = _AgentView(start=start, end=start)
+        if view.start < start:
+            del view.items[: start - view.start]
+            view.start = start
+        for msg in self.messages[view.end:end]:
+            view.items.append(self._render(msg, current_agent_name))
+        view.end = end
+
         result = []
-        for msg in self.messages:
-            if msg.role == "user":
-                result.append({"role": "user", "content": msg.content})
-            elif msg.role == "agent":
-                if current_agent_name and msg.agent_name == current_agent_name:
-                    result.append({"role": "assistant", "content": msg.content})
-                else:
-                    speaker = msg.agent_name or "Unknown"
-                    result.append({
-                        "role": "user",
-                        "content": f"[{speaker}]: {msg.content}"
-                    })
-            else:
-                result.append({"role": msg.role, "content": msg.content})
+        if self._pinned is not None:
+            result.append(self._render(self.messages[self._pinned], current_agent_name))
+        summary = self.get_summary()
+        if summary:
+            result.append({"role": "user", "content": summary})
+        result.extend(view.items)
         return result
 
+    @staticmethod
+    def _render(msg: Message, current_agent_name: Optional[str]) -> dict:
+        """Map a stored message to an LLM message for one agent."""
+        if msg.role == "user":
+            return {"role": "user", "content": msg.content}
+        if msg.role == "agent":
+            if current_agent_name and msg.agent_name == current_agent_name:
+                return {"role": "assistant", "content": msg.content}
+            speaker = msg.agent_name or "Unknown"
+            return {"role": "user", "content": f"[{speaker}]: {msg.content}"}
+        return {"role": msg.role, "content": msg.content}
+
+    def _sync_window(self) -> None:
+        """Count new messages and move turns that exceed the budget into the summary."""
+        if len(self.messages) < len(self._token_counts):
+            # Messages were removed behind our back: start over
+            self._reset_window()
+
+        for msg in self.messages[len(self._token_counts):]:
+            speaker = msg.agent_name or "Unknown"
+            tokens = count_tokens(f"[{speaker}]: {msg.content}" if msg.role == "agent" else msg.content)
+            self._token_counts.append(tokens)
+            self._window_tokens += tokens
+
+        if (
+            self._pinned is None
+            and self._window_start == 0
+            and (not self._trimmed or self._trim_head == 1)
+            and self.messages
+            and self.messages[0].role == "user"
+        ):
+            self._pinned = 0
+            self._window_start = 1
+            self._window_tokens -= self._token_counts[0]
+
+        pinned_tokens = self._token_counts[self._pinned] if self._pinned is not None else 0
+        # The latest message is always kept, even if it alone exceeds the budget
+        while (
+            self._window_start < len(self.messages) - 1
+            and pinned_tokens + self._summary_tokens + self._window_tokens > self.max_tokens
+        ):
+            self._fold_into_summary(self._window_start)
+            self._window_tokens -= self._token_counts[self._window_start]
+            self._window_start += 1
+
+    def _fold_into_summary(self, index: int) -> None:
+        """Add a turn leaving the window to the rolling summary."""
+        msg = self.messages[index]
+        speaker = (msg.agent_name or "Unknown") if msg.role == "agent" else msg.role
+        line = summarize_message(speaker, msg.content)
+        tokens = count_tokens(line) + 1
+        self._summary_lines.append((line, tokens))
+        self._summary_tokens += tokens
+        while len(self._summary_lines) > 1 and self._summary_tokens > self.summary_max_tokens:
+            _, dropped_tokens = self._summary_lines.pop(0)
+            self._summary_tokens -= dropped_tokens
+            self._summary_dropped += 1
+
+    def get_summary(self) -> str:
+        """Rolling summary of the turns outside the context window ("" if none)."""
+        if not self._summary_lines:
+            return ""
+        header = "[Summary of earlier discussion]"
+        if self._summary_dropped:
+            header += f" ({self._summary_dropped} older turns omitted)"
+        return "\n".join([header] + [line for line, _ in self._summary_lines])
+
+    @property
+    def context_tokens(self) -> int:
+        """Approximate token count of the context rendered for an agent."""
+        self._sync_window()
+        pinned_tokens = self._token_counts[self._pinned] if self._pinned is not None else 0
+        return pinned_tokens + self._summary_tokens + self._window_tokens
+
+    def _reset_window(self) -> None:
+        self._token_counts = []
+        self._pinned = None
+        self._window_start = 0
+        self._window_tokens = 0
+        summary_lines, self._summary_tokens, self._summary_dropped = self._base_summary
+        self._summary_lines = list(summary_lines)
+        self._views = {}
+
     def clear(self) -> None:
-        """Clear all messages."""
+        """Clear all messages (in the store as well, if bound)."""
         self.messages.clear()
+        if self._store is not None:
+            self._store.delete_messages(self._chatroom_id)
+        self._trim_head = 0
+        self._trimmed = 0
+        self._base_summary = ([], 0, 0)
+        self._reset_window()
 
     def count(self) -> int:
-        """Get message count."""
-        return len(self.messages)
+        """Get message count (including stored turns dropped from RAM)."""
+        return len(self.messages) + self._trimmed
 
     class Config:
         """Pydantic configuration."""
@@ -0,0 +1,325 @@
+"""
+Chatroom Store - SQLite persistence for chatrooms and their messages
+
+Chatrooms and messages are stored as compact rows (a message is addressed by
+its chatroom and sequence number instead of a UUID). Writes are buffered and
+flushed in one transaction once enough are pending, after flush_interval
+seconds, or on flush(); a streamed reply that changes after being queued is
+simply queued again. History is read back in pages, so a chatroom can be
+restored without loading all of it at once.
+
+Message batches, chatroom rows and discussion states are committed by a
+single writer thread in the order they were queued, so callers on the event
+loop never wait for SQLite. Reads and deletes first wait for the queued
+writes (sync()), so they always see them.
+
+Applications can keep a small JSON state per discussion next to its chatroom
+(e.g. the Feishu discussion state machine), so a discussion survives restarts.
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Iterator, Optional
+
+from mini_agent.agent_team.memory import Message
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS chatrooms (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    max_members INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS messages (
+    chatroom_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    role TEXT NOT NULL,
+    agent_id TEXT,
+    agent_name TEXT,
+    content TEXT NOT NULL,
+    timestamp REAL NOT NULL,
+    PRIMARY KEY (chatroom_id, seq)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS discussions (
+    session_id TEXT PRIMARY KEY,
+    chatroom_id TEXT NOT NULL,
+    state TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+"""
+
+
+class ChatroomStore:
+    """SQLite storage for chatrooms and messages with write-behind batching."""
+
+    def __init__(self, db_path: str | Path, batch_size: int = 100, flush_interval: float = 2.0):
+        """
+        Initialize chatroom store.
+
+        Args:
+            db_path: Path to the SQLite database (created on first use)
+            batch_size: Pending message writes that trigger a flush
+            flush_interval: Seconds a write may stay pending before the next write flushes it
+        """
+        self.db_path = Path(db_path)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._conn: Optional[sqlite3.Connection] = None
+        # Guards the connection, which the writer thread and readers share
+        self._lock = threading.RLock()
+        # (chatroom_id, seq) -> message; a message queued twice is written once
+        self._pending: dict[tuple[str, int], Message] = {}
+        self._pending_since: Optional[float] = None
+        self._writer: Optional[ThreadPoolExecutor] = None
+        self._last_write: Optional[Future] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database and create the schema."""
+        if self._conn is not None:
+            return self._conn
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.db_path, timeout=10, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(_SCHEMA)
+        self._conn = conn
+        return conn
+
+    def _submit(self, write, *args) -> None:
+        """Queue a write for the writer thread."""
+        if self._writer is None:
+            self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="chatroom-store")
+        self._last_write = self._writer.submit(self._run_write, write, *args)
+
+    def _run_write(self, write, *args) -> None:
+        try:
+            with self._lock:
+                write(*args)
+        except Exception as e:
+            logger.error(f"ChatroomStore: Write to {self.db_path} failed: {e}")
+
+    def sync(self) -> None:
+        """Block until all queued writes are committed."""
+        if self._last_write is not None:
+            self._last_write.result()
+            self._last_write = None
+
+    def _execute(self, sql: str, params: tuple = ()) -> None:
+        conn = self._connect()
+        with conn:
+            conn.execute(sql, params)
+
+    def _read(self, sql: str, params: tuple = ()) -> list[tuple]:
+        """Run a query after the queued writes."""
+        self.flush()
+        self.sync()
+        with self._lock:
+            return self._connect().execute(sql, params).fetchall()
+
+    # ---- chatrooms ----
+
+    def save_chatroom(self, chatroom_id: str, name: str, created_at: float, max_members: int) -> None:
+        """Insert or update a chatroom row (queued for the writer thread)."""
+        self._submit(
+            self._execute,
+            "INSERT OR REPLACE INTO chatrooms (id, name, created_at, max_members) VALUES (?, ?, ?, ?)",
+            (chatroom_id, name, created_at, max_members),
+        )
+
+    def get_chatroom(self, chatroom_id: str) -> Optional[dict]:
+        """Get a chatroom row as a dict, or None."""
+        rows = self._read("SELECT id, name, created_at, max_members FROM chatrooms WHERE id = ?", (chatroom_id,))
+        if not rows:
+            return None
+        row = rows[0]
+        return {"id": row[0], "name": row[1], "created_at": row[2], "max_members": row[3]}
+
+    def list_chatroom_ids(self) -> list[str]:
+        """Ids of all stored chatrooms, oldest first."""
+        return [row[0] for row in self._read("SELECT id FROM chatrooms ORDER BY created_at, id")]
+
+    def count_chatrooms(self) -> int:
+        """Number of stored chatrooms."""
+        return self._read("SELECT COUNT(*) FROM chatrooms")[0][0]
+
+    def delete_chatroom(self, chatroom_id: str) -> bool:
+        """Delete a chatroom and its messages."""
+        self._drop_pending(chatroom_id)
+        self.sync()
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute("DELETE FROM messages WHERE chatroom_id = ?", (chatroom_id,))
+                deleted = conn.execute("DELETE FROM chatrooms WHERE id = ?", (chatroom_id,)).rowcount
+        return deleted > 0
+
+    # ---- discussions ----
+
+    def save_discussion(self, session_id: str, chatroom_id: str, state: dict) -> None:
+        """Insert or update the state of a discussion (queued for the writer thread)."""
+        self._submit(
+            self._execute,
+            "INSERT OR REPLACE INTO discussions (session_id, chatroom_id, state, updated_at) VALUES (?, ?, ?, ?)",
+            (session_id, chatroom_id, json.dumps(state, ensure_ascii=False), time.time()),
+        )
+
+    def get_discussion(self, session_id: str) -> Optional[tuple[str, dict]]:
+        """
+        Get a discussion.
+
+        Returns:
+            (chatroom_id, state), or None if not stored
+
+        Raises:
+            ValueError: If the stored state is not valid JSON
+        """
+        rows = self._read("SELECT chatroom_id, state FROM discussions WHERE session_id = ?", (session_id,))
+        if not rows:
+            return None
+        return rows[0][0], json.loads(rows[0][1])
+
+    def list_discussion_ids(self) -> list[str]:
+        """Session ids of all stored discussions."""
+        return [row[0] for row in self._read("SELECT session_id FROM discussions ORDER BY updated_at")]
+
+    def delete_discussion(self, session_id: str) -> bool:
+        """Delete a discussion's state (its chatroom is deleted separately)."""
+        self.sync()
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                deleted = conn.execute("DELETE FROM discussions WHERE session_id = ?", (session_id,)).rowcount
+        return deleted > 0
+
+    # ---- messages ----
+
+    def put_message(self, chatroom_id: str, seq: int, message: Message) -> None:
+        """Queue a message write (insert or replace); may flush the batch."""
+        self._pending[(chatroom_id, seq)] = message
+        now = time.monotonic()
+        if self._pending_since is None:
+            self._pending_since = now
+        if len(self._pending) >= self.batch_size or now - self._pending_since >= self.flush_interval:
+            self.flush()
+
+    def delete_messages(self, chatroom_id: str, from_seq: int = 0) -> None:
+        """Delete the messages of a chatroom from a sequence number on."""
+        self._drop_pending(chatroom_id, from_seq)
+        self._submit(self._execute, "DELETE FROM messages WHERE chatroom_id = ? AND seq >= ?", (chatroom_id, from_seq))
+
+    def flush(self) -> None:
+        """Queue all pending messages to be written in one transaction."""
+        if not self._pending:
+            return
+        # Snapshot now: a streamed reply may keep changing while the batch waits
+        rows = [
+            (chatroom_id, seq, m.role, m.agent_id, m.agent_name, m.content, m.timestamp)
+            for (chatroom_id, seq), m in self._pending.items()
+        ]
+        self._pending.clear()
+        self._pending_since = None
+        self._submit(self._write_messages, rows)
+
+    def _write_messages(self, rows: list[tuple]) -> None:
+        conn = self._connect()
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO messages "
+                "(chatroom_id, seq, role, agent_id, agent_name, content, timestamp) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+
+    @property
+    def pending_count(self) -> int:
+        """Message writes not yet flushed."""
+        return len(self._pending)
+
+    def count_messages(self, chatroom_id: str) -> int:
+        """Number of messages of a chatroom (including pending writes)."""
+        return self._read("SELECT COUNT(*) FROM messages WHERE chatroom_id = ?", (chatroom_id,))[0][0]
+
+    def load_messages(self, chatroom_id: str, after_seq: int = -1, limit: Optional[int] = None) -> list[tuple[int, Message]]:
+        """
+        Load messages in order, starting after a sequence number.
+
+        Args:
+            chatroom_id: Chatroom ID
+            after_seq: Only messages with a larger sequence number
+            limit: Maximum number of messages (None for all)
+
+        Returns:
+            (seq, message) pairs in chronological order
+        """
+        rows = self._read(
+            "SELECT seq, role, agent_id, agent_name, content, timestamp FROM messages "
+            "WHERE chatroom_id = ? AND seq > ? ORDER BY seq LIMIT ?",
+            (chatroom_id, after_seq, -1 if limit is None else limit),
+        )
+        return [(row[0], self._to_message(chatroom_id, row)) for row in rows]
+
+    def iter_pages(self, chatroom_id: str, page_size: int = 200) -> Iterator[list[tuple[int, Message]]]:
+        """Yield all messages of a chatroom in pages of page_size, oldest first."""
+        after_seq = -1
+        while True:
+            page = self.load_messages(chatroom_id, after_seq=after_seq, limit=page_size)
+            if not page:
+                return
+            yield page
+            after_seq = page[-1][0]
+
+    def load_history(self, chatroom_id: str, before_seq: Optional[int] = None, limit: int = 50) -> list[tuple[int, Message]]:
+        """
+        Load one page of history, newest page first.
+
+        Args:
+            chatroom_id: Chatroom ID
+            before_seq: Only messages older than this (None for the latest page)
+            limit: Page size
+
+        Returns:
+            (seq, message) pairs in chronological order; pass the first seq as
+            before_seq to get the previous page
+        """
+        rows = self._read(
+            "SELECT seq, role, agent_id, agent_name, content, timestamp FROM messages "
+            "WHERE chatroom_id = ? AND seq < ? ORDER BY seq DESC LIMIT ?",
+            (chatroom_id, before_seq if before_seq is not None else 2**62, limit),
+        )
+        return [(row[0], self._to_message(chatroom_id, row)) for row in reversed(rows)]
+
+    @staticmethod
+    def _to_message(chatroom_id: str, row: tuple) -> Message:
+        seq, role, agent_id, agent_name, content, timestamp = row
+        return Message(
+            id=f"{chatroom_id}:{seq}",
+            role=role,
+            agent_id=agent_id,
+            agent_name=agent_name,
+            content=content,
+            timestamp=timestamp,
+        )
+
+    def _drop_pending(self, chatroom_id: str, from_seq: int = 0) -> None:
+        for key in [key for key in self._pending if key[0] == chatroom_id and key[1] >= from_seq]:
+            del self._pending[key]
+        if not self._pending:
+            self._pending_since = None
+
+    def close(self) -> None:
+        """Commit pending writes, stop the writer thread and close the database connection."""
+        self.flush()
+        self.sync()
+        if self._writer is not None:
+            self._writer.shutdown(wait=True)
+            self._writer = None
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
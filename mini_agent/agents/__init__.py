@@ -3,9 +3,17 @@ Agent configuration loader.
 
 Loads agent definitions from agents.yaml and personality templates
 from the personalities/ directory.
+
+The parsed result is cached as an AgentCatalogue. A refresh compares each
+file's (mtime_ns, size) and re-parses only files that changed, so edits are
+picked up without a restart and unchanged YAML is never parsed twice.
 """
 
+import asyncio
+import logging
 import os
+import time
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Optional, Union
 
@@ -14,6 +22,19 @@ from pydantic import BaseModel, Field
 
 from mini_agent.agent_team.personality import Personality
 
+logger = logging.getLogger(__name__)
+
+FileStamp = tuple[int, int]
+
+
+def _stamp(path: str) -> Optional[FileStamp]:
+    """Return (mtime_ns, size) of a file, or None if it is missing."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
 
 class InlinePersonalityConfig(BaseModel):
     """Inline personality definition in agents.yaml."""
@@ -23,6 +44,13 @@ class InlinePersonalityConfig(BaseModel):
     response_style: Optional[str] = None
 
 
+class FallbackModelConfig(BaseModel):
+    """Backup model raced against an agent whose turn runs late."""
+
+    provider_id: str
+    model_name: str
+
+
 class AgentDefinition(BaseModel):
     """Single agent definition from agents.yaml."""
 
@@ -30,6 +58,7 @@ class AgentDefinition(BaseModel):
     provider_id: str
     model_name: str
     personality: Union[str, InlinePersonalityConfig]
+    fallback: Optional[FallbackModelConfig] = None
 
 
 class AgentsFileConfig(BaseModel):
@@ -38,16 +67,154 @@ class AgentsFileConfig(BaseModel):
     agents: list[AgentDefinition] = Field(default_factory=list)
 
 
+@dataclass(frozen=True)
+class AgentCatalogue:
+    """Parsed agents.yaml and personality templates; replaced as a whole on change."""
+
+    generation: int
+    agents: tuple[AgentDefinition, ...]
+    personalities: dict[str, Personality]
+    agent_list_text: str
+    agent_list_error: Optional[str] = None  # Set if an agent's personality cannot be resolved
+
+
 class AgentConfigLoader:
     """Loads agent configurations from agents.yaml and personality templates."""
 
-    def __init__(self, agents_dir: Optional[str] = None):
+    def __init__(self, agents_dir: Optional[str] = None, check_interval: float = 1.0):
+        """
+        Args:
+            agents_dir: Directory with agents.yaml and personalities/ (default: this package)
+            check_interval: Minimum seconds between file checks made by readers;
+                            not used while start_watching() polls in the background
+        """
         if agents_dir is None:
             agents_dir = str(Path(__file__).parent)
         self._agents_dir = agents_dir
         self._personalities_dir = os.path.join(agents_dir, "personalities")
         self._agents_yaml = os.path.join(agents_dir, "agents.yaml")
         self._personality_templates: dict[str, Personality] = {}
+        self._check_interval = check_interval
+        # File name -> (stamp, parsed template); agents.yaml -> (stamp, agents)
+        self._template_entries: dict[str, tuple[FileStamp, Personality]] = {}
+        self._agents_entry: Optional[tuple[Optional[FileStamp], list[AgentDefinition]]] = None
+        self._catalogue: Optional[AgentCatalogue] = None
+        self._last_check = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def catalogue(self) -> AgentCatalogue:
+        """Current catalogue, refreshed if files may have changed."""
+        if self._catalogue is None:
+            self.refresh()
+        elif self._task is None and time.monotonic() - self._last_check >= self._check_interval:
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.warning(f"AgentConfigLoader: Keeping previous agents after reload error: {e}")
+        return self._catalogue
+
+    def refresh(self) -> bool:
+        """Re-parse changed files and rebuild the catalogue.
+
+        A file that fails to parse raises; the previous catalogue stays in use.
+
+        Returns:
+            True if the catalogue changed.
+        """
+        self._last_check = time.monotonic()
+        templates, templates_changed = self._scan_templates()
+        agents_entry, agents_changed = self._scan_agents()
+        if self._catalogue is not None and not templates_changed and not agents_changed:
+            return False
+
+        personalities = {fname.rsplit(".", 1)[0]: template for fname, (_, template) in templates.items()}
+        agents = agents_entry[1]
+        try:
+            agent_list_text, agent_list_error = self._format_agents(agents, personalities), None
+        except ValueError as e:
+            agent_list_text, agent_list_error = "", str(e)
+
+        self._template_entries = templates
+        self._agents_entry = agents_entry
+        self._personality_templates = personalities
+        generation = self._catalogue.generation + 1 if self._catalogue else 1
+        self._catalogue = AgentCatalogue(
+            generation=generation,
+            agents=tuple(agents),
+            personalities=personalities,
+            agent_list_text=agent_list_text,
+            agent_list_error=agent_list_error,
+        )
+        if generation > 1:
+            logger.info(f"AgentConfigLoader: Reloaded agents (generation {generation}, {len(agents)} agents)")
+        return True
+
+    def _scan_templates(self) -> tuple[dict[str, tuple[FileStamp, Personality]], bool]:
+        """Parse new or changed templates, reusing unchanged ones."""
+        entries = {}
+        changed = False
+        if os.path.isdir(self._personalities_dir):
+            for fname in sorted(os.listdir(self._personalities_dir)):
+                if not (fname.endswith(".yaml") or fname.endswith(".yml")):
+                    continue
+                filepath = os.path.join(self._personalities_dir, fname)
+                stamp = _stamp(filepath)
+                if stamp is None:
+                    continue
+                cached = self._template_entries.get(fname)
+                if cached is not None and cached[0] == stamp:
+                    entries[fname] = cached
+                else:
+                    entries[fname] = (stamp, self._parse_template(fname, filepath))
+                    changed = True
+        return entries, changed or entries.keys() != self._template_entries.keys()
+
+    @staticmethod
+    def _parse_template(fname: str, filepath: str) -> Personality:
+        template_name = fname.rsplit(".", 1)[0]
+        with open(filepath, "r", encoding="utf-8") as f:
+            data = yaml.safe_load(f)
+        return Personality(
+            name=data.get("name", template_name),
+            system_prompt=data["system_prompt"],
+            response_style=data.get("response_style"),
+        )
+
+    def _scan_agents(self) -> tuple[tuple[Optional[FileStamp], list[AgentDefinition]], bool]:
+        """Parse agents.yaml if it changed."""
+        stamp = _stamp(self._agents_yaml)
+        if self._agents_entry is not None and self._agents_entry[0] == stamp:
+            return self._agents_entry, False
+        if stamp is None:
+            return (None, []), True
+        with open(self._agents_yaml, "r", encoding="utf-8") as f:
+            data = yaml.safe_load(f)
+        config = AgentsFileConfig(**data)
+        return (stamp, config.agents), True
+
+    def start_watching(self, interval: float = 2.0) -> None:
+        """Poll for changes in a background task (requires a running event loop).
+
+        While watching, readers never touch the files themselves.
+        """
+        if self._task is None or self._task.done():
+            self.catalogue
+            self._task = asyncio.create_task(self._watch(interval))
+
+    async def _watch(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.warning(f"AgentConfigLoader: Keeping previous agents after reload error: {e}")
+
+    def stop_watching(self) -> None:
+        """Stop background polling."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
 
     def load_personality_templates(self) -> dict[str, Personality]:
         """Load all personality templates from personalities/ directory.
@@ -55,31 +222,11 @@ class AgentConfigLoader:
         Returns:
             Dict keyed by template name (filename without extension).
         """
-        templates = {}
-        if not os.path.isdir(self._personalities_dir):
-            return templates
-        for fname in sorted(os.listdir(self._personalities_dir)):
-            if fname.endswith(".yaml") or fname.endswith(".yml"):
-                template_name = fname.rsplit(".", 1)[0]
-                filepath = os.path.join(self._personalities_dir, fname)
-                with open(filepath, "r", encoding="utf-8") as f:
-                    data = yaml.safe_load(f)
-                templates[template_name] = Personality(
-                    name=data.get("name", template_name),
-                    system_prompt=data["system_prompt"],
-                    response_style=data.get("response_style"),
-                )
-        self._personality_templates = templates
-        return templates
+        return dict(self.catalogue.personalities)
 
     def load_agents(self) -> list[AgentDefinition]:
         """Load agent definitions from agents.yaml."""
-        if not os.path.isfile(self._agents_yaml):
-            return []
-        with open(self._agents_yaml, "r", encoding="utf-8") as f:
-            data = yaml.safe_load(f)
-        config = AgentsFileConfig(**data)
-        return config.agents
+        return list(self.catalogue.agents)
 
     def resolve_personality(self, agent_def: AgentDefinition) -> Personality:
         """Resolve personality from template reference or inline definition.
@@ -91,15 +238,19 @@ class AgentConfigLoader:
         Returns:
             Resolved Personality object.
         """
+        return self._resolve(agent_def, self.catalogue.personalities)
+
+    @staticmethod
+    def _resolve(agent_def: AgentDefinition, templates: dict[str, Personality]) -> Personality:
         if isinstance(agent_def.personality, str):
             template_name = agent_def.personality
-            if template_name not in self._personality_templates:
-                available = list(self._personality_templates.keys())
+            if template_name not in templates:
+                available = list(templates.keys())
                 raise ValueError(
                     f"Personality template '{template_name}' not found. "
                     f"Available: {available}"
                 )
-            return self._personality_templates[template_name]
+            return templates[template_name]
         else:
             return Personality(
                 name=agent_def.personality.name,
@@ -113,14 +264,32 @@ class AgentConfigLoader:
         Returns:
             Tuple of (formatted text, list of AgentDefinition in display order).
         """
-        agents = self.load_agents()
+        catalogue = self.catalogue
+        if catalogue.agent_list_error:
+            raise ValueError(catalogue.agent_list_error)
+        return catalogue.agent_list_text, list(catalogue.agents)
+
+    @classmethod
+    def _format_agents(cls, agents: list[AgentDefinition], templates: dict[str, Personality]) -> str:
         if not agents:
-            return "暂无可用的 Agent。", []
+            return "暂无可用的 Agent。"
 
         lines = []
         for i, agent_def in enumerate(agents, 1):
-            personality = self.resolve_personality(agent_def)
+            personality = cls._resolve(agent_def, templates)
             lines.append(
                 f"{i}. {agent_def.name} ({agent_def.model_name}) — {personality.name}"
             )
-        return "\n".join(lines), agents
+        return "\n".join(lines)
+
+
+_shared_loaders: dict[str, AgentConfigLoader] = {}
+
+
+def get_agent_loader(agents_dir: Optional[str] = None) -> AgentConfigLoader:
+    """Return the loader shared by all callers for an agents directory."""
+    key = os.path.abspath(agents_dir or str(Path(__file__).parent))
+    loader = _shared_loaders.get(key)
+    if loader is None:
+        loader = _shared_loaders[key] = AgentConfigLoader(agents_dir=key)
+    return loader
@@ -18,9 +18,12 @@ import platform
 import subprocess
 import sys
 import threading
+import time
+import uuid
+import weakref
 from datetime import datetime
 from pathlib import Path
-from typing import List, Optional
+from typing import Callable, List, Optional
 
 from prompt_toolkit import PromptSession
 from prompt_toolkit.auto_suggest import AutoSuggestFromHistory
@@ -31,12 +34,27 @@ from prompt_toolkit.styles import Style
 
 from mini_agent import LLMClient
 from mini_agent.agent import Agent
-from mini_agent.config import Config, LOG_DIR
+from mini_agent.config import BASH_SPILL_DIR, CACHE_DIR, MCP_OUTPUT_DIR, Config, LOG_DIR
+from mini_agent.hot_reload import HotReloader
 from mini_agent.schema import LLMProvider
 from mini_agent.tools.base import Tool
-from mini_agent.tools.bash_tool import BashKillTool, BashOutputTool, BashTool
+from mini_agent.tools.bash_tool import BashKillTool, BashOutputTool, BashSessionPool, BashTool
 from mini_agent.tools.file_tools import EditTool, ReadTool, WriteTool
-from mini_agent.tools.mcp_loader import cleanup_mcp_connections, load_mcp_tools_async, set_mcp_timeout_config
+from mini_agent.tools.mcp_loader import (
+    cleanup_mcp_connections,
+    get_mcp_cache_stats,
+    get_mcp_connection_manager,
+    get_mcp_server_stats,
+    get_mcp_tools,
+    load_mcp_tools_async,
+    set_mcp_cache_config,
+    set_mcp_concurrency_config,
+    set_mcp_health_config,
+    set_mcp_lazy_config,
+    set_mcp_result_config,
+    set_mcp_tenant_config,
+    set_mcp_timeout_config,
+)
 from mini_agent.tools.note_tool import SessionNoteTool
 from mini_agent.tools.skill_tool import create_skill_tools
 from mini_agent.utils import calculate_display_width
@@ -295,6 +313,24 @@ def print_stats(agent: Agent, session_start: datetime):
     print(f"  Available Tools: {len(agent.tools)}")
     if agent.api_total_tokens > 0:
         print(f"  API Tokens Used: {Colors.BRIGHT_MAGENTA}{agent.api_total_tokens:,}{Colors.RESET}")
+    mcp_stats = get_mcp_server_stats()
+    if mcp_stats:
+        print("  MCP Servers:")
+        for server_name, stats in mcp_stats.items():
+            color = Colors.BRIGHT_GREEN if stats["state"] == "connected" else Colors.BRIGHT_YELLOW
+            print(
+                f"    - {server_name}: {color}{stats['state']}{Colors.RESET} "
+                f"{Colors.DIM}(calls {stats['calls']}, failures {stats['call_failures']}, "
+                f"reconnects {stats['reconnects']}, sessions {stats['sessions']}, "
+                f"max queue wait {stats['queue_wait_max']:.1f}s){Colors.RESET}"
+            )
+    cache_stats = get_mcp_cache_stats()
+    if cache_stats["hits"] or cache_stats["misses"]:
+        print(
+            f"  MCP Result Cache: hit rate {cache_stats['hit_rate']:.0%} "
+            f"{Colors.DIM}({cache_stats['hits']} hits, {cache_stats['misses']} misses, "
+            f"{cache_stats['entries']} entries, {cache_stats['bytes'] / 1024:.0f} KB){Colors.RESET}"
+        )
     print(f"{Colors.DIM}{'─' * 40}{Colors.RESET}\n")
 
 
@@ -351,7 +387,7 @@ Examples:
     return parser.parse_args()
 
 
-async def initialize_base_tools(config: Config):
+async def initialize_base_tools(config: Config, on_late_mcp_tools: Optional[Callable[[List[Tool]], None]] = None):
     """Initialize base tools (independent of workspace)
 
     These tools are loaded from package configuration and don't depend on workspace.
@@ -359,6 +395,9 @@ async def initialize_base_tools(config: Config):
 
     Args:
         config: Configuration object
+        on_late_mcp_tools: Called with the tools of MCP servers that connect after
+            startup (only with tools.mcp.background_connect); they are also
+            appended to the returned tool list
 
     Returns:
         Tuple of (list of tools, skill loader if skills enabled)
@@ -367,16 +406,8 @@ async def initialize_base_tools(config: Config):
     tools = []
     skill_loader = None
 
-    # 1. Bash auxiliary tools (output monitoring and kill)
-    # Note: BashTool itself is created in add_workspace_tools() with workspace_dir as cwd
-    if config.tools.enable_bash:
-        bash_output_tool = BashOutputTool()
-        tools.append(bash_output_tool)
-        print(f"{Colors.GREEN}✅ Loaded Bash Output tool{Colors.RESET}")
-
-        bash_kill_tool = BashKillTool()
-        tools.append(bash_kill_tool)
-        print(f"{Colors.GREEN}✅ Loaded Bash Kill tool{Colors.RESET}")
+    # 1. Bash tools (bash, bash_output, bash_kill) are created in add_workspace_tools()
+    # with workspace_dir as cwd and a per-workspace background shell namespace
 
     # 3. Claude Skills (loaded from package directory)
     if config.tools.enable_skills:
@@ -404,10 +435,15 @@ async def initialize_base_tools(config: Config):
                         skills_dir = str(path.resolve())
                         break
 
-            skill_tools, skill_loader = create_skill_tools(skills_dir)
+            skill_tools, skill_loader = create_skill_tools(
+                skills_dir,
+                cache_dir=str(CACHE_DIR),
+                enable_search=config.tools.skills_search,
+            )
             if skill_tools:
                 tools.extend(skill_tools)
-                print(f"{Colors.GREEN}✅ Loaded Skill tool (get_skill){Colors.RESET}")
+                tool_names = ", ".join(tool.name for tool in skill_tools)
+                print(f"{Colors.GREEN}✅ Loaded Skill tools ({tool_names}){Colors.RESET}")
             else:
                 print(f"{Colors.YELLOW}⚠️  No available Skills found{Colors.RESET}")
         except Exception as e:
@@ -424,6 +460,24 @@ async def initialize_base_tools(config: Config):
                 execute_timeout=mcp_config.execute_timeout,
                 sse_read_timeout=mcp_config.sse_read_timeout,
             )
+            set_mcp_lazy_config(
+                lazy=mcp_config.lazy_connect,
+                idle_timeout=mcp_config.idle_timeout,
+                cache_dir=str(CACHE_DIR),
+            )
+            set_mcp_health_config(
+                health_check_interval=mcp_config.health_check_interval,
+                reconnect_max_delay=mcp_config.reconnect_max_delay,
+            )
+            set_mcp_concurrency_config(max_concurrency=mcp_config.max_concurrency)
+            set_mcp_result_config(
+                max_result_tokens=mcp_config.max_result_tokens,
+                spill_dir=str(MCP_OUTPUT_DIR),
+                spill_max_age=mcp_config.output_max_age_hours * 3600,
+                spill_max_bytes=mcp_config.output_max_mb * 1024 * 1024,
+            )
+            set_mcp_tenant_config(max_idle_tenants=mcp_config.max_idle_tenants)
+            set_mcp_cache_config(max_bytes=mcp_config.cache_max_bytes)
             print(
                 f"{Colors.DIM}  MCP timeouts: connect={mcp_config.connect_timeout}s, "
                 f"execute={mcp_config.execute_timeout}s, sse_read={mcp_config.sse_read_timeout}s{Colors.RESET}"
@@ -432,7 +486,16 @@ async def initialize_base_tools(config: Config):
             # Use priority search for mcp.json
             mcp_config_path = Config.find_config_file(config.tools.mcp_config_path)
             if mcp_config_path:
-                mcp_tools = await load_mcp_tools_async(str(mcp_config_path))
+                def attach_late_mcp_tools(late_tools: List[Tool]):
+                    tools.extend(late_tools)
+                    if on_late_mcp_tools:
+                        on_late_mcp_tools(late_tools)
+
+                mcp_tools = await load_mcp_tools_async(
+                    str(mcp_config_path),
+                    startup_timeout=mcp_config.startup_timeout,
+                    on_late_tools=attach_late_mcp_tools if mcp_config.background_connect else None,
+                )
                 if mcp_tools:
                     tools.extend(mcp_tools)
                     print(f"{Colors.GREEN}✅ Loaded {len(mcp_tools)} MCP tools (from: {mcp_config_path}){Colors.RESET}")
@@ -447,6 +510,38 @@ async def initialize_base_tools(config: Config):
     return tools, skill_loader
 
 
+def create_hot_reloader(config: Config, system_prompt_template: str, skill_loader=None) -> Optional[HotReloader]:
+    """Create and start a hot reloader for skills and mcp.json if enabled in config
+
+    Args:
+        config: Configuration object
+        system_prompt_template: System prompt still containing {SKILLS_METADATA}
+        skill_loader: Skill loader returned by initialize_base_tools()
+
+    Returns:
+        Running HotReloader, or None if hot reload is disabled
+    """
+    if not config.tools.hot_reload:
+        return None
+
+    mcp_config_path = None
+    if config.tools.enable_mcp:
+        path = Config.find_config_file(config.tools.mcp_config_path)
+        if path:
+            mcp_config_path = str(path)
+
+    reloader = HotReloader(
+        system_prompt_template=system_prompt_template,
+        skill_loader=skill_loader,
+        mcp_config_path=mcp_config_path,
+        mcp_tools=get_mcp_tools() if mcp_config_path else None,
+        interval=config.tools.hot_reload_interval,
+    )
+    reloader.start()
+    print(f"{Colors.GREEN}✅ Hot reload enabled (checking every {config.tools.hot_reload_interval}s){Colors.RESET}")
+    return reloader
+
+
 def add_workspace_tools(tools: List[Tool], config: Config, workspace_dir: Path):
     """Add workspace-dependent tools
 
@@ -462,9 +557,8 @@ def add_workspace_tools(tools: List[Tool], config: Config, workspace_dir: Path):
 
     # Bash tool - needs workspace as cwd for command execution
     if config.tools.enable_bash:
-        bash_tool = BashTool(workspace_dir=str(workspace_dir))
-        tools.append(bash_tool)
-        print(f"{Colors.GREEN}✅ Loaded Bash tool (cwd: {workspace_dir}){Colors.RESET}")
+        tools.extend(create_bash_tools(config, workspace_dir))
+        print(f"{Colors.GREEN}✅ Loaded Bash tools (cwd: {workspace_dir}){Colors.RESET}")
 
     # File tools - need workspace to resolve relative paths
     if config.tools.enable_file_tools:
@@ -483,8 +577,50 @@ def add_workspace_tools(tools: List[Tool], config: Config, workspace_dir: Path):
         print(f"{Colors.GREEN}✅ Loaded session note tool{Colors.RESET}")
 
 
+def create_bash_tools(config: Config, workspace_dir: Path) -> List[Tool]:
+    """Create bash, bash_output and bash_kill sharing a fresh namespace
+
+    Background shells are namespaced per call so agents/sessions sharing
+    this process cannot read or kill each other's shells.
+    """
+    bash_config = config.tools.bash
+    bash_namespace = uuid.uuid4().hex[:8]
+    bash_tool = BashTool(
+        workspace_dir=str(workspace_dir),
+        persistent=bash_config.persistent,
+        pool_size=bash_config.pool_size,
+        namespace=bash_namespace,
+        max_output_lines=bash_config.max_output_lines,
+        max_output_bytes=bash_config.max_output_bytes,
+        spill_dir=str(BASH_SPILL_DIR) if bash_config.spill_to_disk else None,
+        spill_max_age=bash_config.spill_max_age_hours * 3600 if bash_config.spill_max_age_hours > 0 else None,
+        output_head_bytes=bash_config.output_head_bytes,
+        output_tail_bytes=bash_config.output_tail_bytes,
+    )
+    return [bash_tool, BashOutputTool(namespace=bash_namespace), BashKillTool(namespace=bash_namespace)]
+
+
+def _feishu_progress_sender(send_fn, interval: float = 30.0):
+    """Build a tool progress callback that posts long-running output to Feishu.
+
+    Messages are throttled to one per interval (counted from the user's
+    message), so short commands never produce progress messages.
+    """
+    last_sent = time.monotonic()
+
+    async def send_progress(output: str) -> None:
+        nonlocal last_sent
+        now = time.monotonic()
+        if now - last_sent < interval:
+            return
+        last_sent = now
+        await send_fn(f"⏳ 命令执行中，最新输出：\n{output[-500:]}")
+
+    return send_progress
+
+
 async def _quiet_cleanup():
-    """Clean up MCP connections, suppressing noisy asyncgen teardown tracebacks."""
+    """Clean up MCP connections and persistent bash shells, suppressing noisy asyncgen teardown tracebacks."""
     # Silence the asyncgen finalization noise that anyio/mcp emits when
     # stdio_client's task group is torn down across tasks.  The handler is
     # intentionally NOT restored: asyncgen finalization happens during
@@ -493,6 +629,8 @@ async def _quiet_cleanup():
     # right before process exit, swallowing late exceptions is safe.
     loop = asyncio.get_event_loop()
     loop.set_exception_handler(lambda _loop, _ctx: None)
+    HotReloader.stop_all()
+    BashSessionPool.close_all()
     try:
         await cleanup_mcp_connections()
     except Exception:
@@ -588,7 +726,16 @@ async def run_agent(workspace_dir: Path, task: str = None):
         print(f"{Colors.GREEN}✅ LLM retry mechanism enabled (max {config.llm.retry.max_retries} retries){Colors.RESET}")
 
     # 3. Initialize base tools (independent of workspace)
-    tools, skill_loader = await initialize_base_tools(config)
+    agent = None
+    hot_reloader = None
+
+    def attach_late_mcp_tools(late_tools: List[Tool]):
+        if agent is not None:
+            agent.add_tools(late_tools)
+        if hot_reloader is not None:
+            hot_reloader.add_tools(late_tools)
+
+    tools, skill_loader = await initialize_base_tools(config, on_late_mcp_tools=attach_late_mcp_tools)
 
     # 4. Add workspace-dependent tools
     add_workspace_tools(tools, config, workspace_dir)
@@ -601,6 +748,7 @@ async def run_agent(workspace_dir: Path, task: str = None):
     else:
         system_prompt = "You are Mini-Agent, an intelligent assistant powered by MiniMax M2.5 that can help users complete various tasks."
         print(f"{Colors.YELLOW}⚠️  System prompt not found, using default{Colors.RESET}")
+    system_prompt_template = system_prompt
 
     # 6. Inject Skills Metadata into System Prompt (Progressive Disclosure - Level 1)
     if skill_loader:
@@ -624,6 +772,13 @@ async def run_agent(workspace_dir: Path, task: str = None):
         max_steps=config.agent.max_steps,
         workspace_dir=str(workspace_dir),
     )
+    # Show live tool output in the terminal
+    agent.progress_callback = agent.print_tool_progress
+
+    # 7.1. Hot reload of skills and MCP servers (applied between agent steps)
+    hot_reloader = create_hot_reloader(config, system_prompt_template, skill_loader)
+    if hot_reloader:
+        agent.attach_hot_reloader(hot_reloader)
 
     # 7.4. Inject logging environment variables for sub-processes
     if config.logging.enabled:
@@ -643,6 +798,7 @@ async def run_agent(workspace_dir: Path, task: str = None):
 
     # 7.5. Initialize and connect Long Connection Skills (e.g., Feishu)
     long_connection_registry = None
+    discussion_handler = None
     if LONG_CONNECTION_AVAILABLE and FEISHU_SKILL_AVAILABLE:
         long_connection_registry = LongConnectionRegistry()
         logger = logging.getLogger(__name__)
@@ -654,43 +810,71 @@ async def run_agent(workspace_dir: Path, task: str = None):
 
                 # Initialize DiscussionHandler for multi-agent discussions
                 from mini_agent.agent_team.discussion_handler import DiscussionHandler
-                from mini_agent.agents import AgentConfigLoader
-                from mini_agent.agent_team import load_agent_team_config
+                from mini_agent.agents import get_agent_loader
+                from mini_agent.agent_team import ChatroomStore, load_agent_team_config
 
                 team_config = load_agent_team_config()
-                agent_loader = AgentConfigLoader()
-                agent_loader.load_personality_templates()
+                # 共享的 Agent 目录缓存：后台检测 agents.yaml / 性格模板的修改，请求路径不解析 YAML
+                agent_loader = get_agent_loader()
+                agent_loader.start_watching()
 
                 discussion_handler = DiscussionHandler(
                     providers_config=team_config.providers_config,
                     loader=agent_loader,
                     timeout=team_config.timeout,
+                    discussion_mode=team_config.discussion_mode,
+                    rebuttal_passes=team_config.rebuttal_passes,
+                    session_ttl=team_config.session_ttl,
+                    max_memory_bytes=(
+                        int(team_config.max_session_memory_mb * 1024 * 1024)
+                        if team_config.max_session_memory_mb
+                        else None
+                    ),
+                    convergence_threshold=team_config.convergence_threshold,
+                    # 讨论状态和消息写入 SQLite，重启后可继续
+                    store=ChatroomStore(team_config.store_path) if team_config.store_path else None,
                 )
+                await discussion_handler.start_cleanup_task(interval=60)
 
                 # Agent 工厂函数：每个 session 创建独立的 Agent 实例
                 def make_agent(session_id: str = ""):
                     if config.logging.enabled and config.logging.feishu_logging:
                         logger.info(f"[FACTORY] session_id={session_id} "
                                     f"user_context={'injected' if session_id else 'none'}")
-                    agent_system_prompt = system_prompt
+                    user_context = ""
                     if session_id:
-                        agent_system_prompt += (
+                        user_context = (
                             f"\n\n## User Context\n"
                             f"Current user identifier: `{session_id}`\n"
                             f"When using coding-skill, you MUST include `--user {session_id}` parameter."
                         )
-                    return Agent(
+                    session_tools = tools
+                    if config.tools.enable_bash:
+                        # Each chat gets its own shells, so chats cannot see each other's background jobs
+                        bash_tools = create_bash_tools(config, workspace_dir)
+                        bash_names = {tool.name for tool in bash_tools}
+                        session_tools = [tool for tool in tools if tool.name not in bash_names] + bash_tools
+                    session_agent = Agent(
                         llm_client=LLMClient(
                             api_key=config.llm.api_key,
                             provider=LLMProvider.ANTHROPIC if config.llm.provider.lower() == "anthropic" else LLMProvider.OPENAI,
                             api_base=config.llm.api_base,
                             model=config.llm.model,
                         ),
-                        system_prompt=agent_system_prompt,
-                        tools=tools,
+                        system_prompt=system_prompt + user_context,
+                        tools=session_tools,
                         max_steps=config.agent.max_steps,
                         workspace_dir=str(workspace_dir),
                     )
+                    if config.tools.enable_bash:
+                        # Kill the chat's shells and delete their spill files when the session ends
+                        weakref.finalize(session_agent, bash_tools[0].close)
+                    if session_id:
+                        # Stateful MCP servers get a session per chat
+                        session_agent.attach_mcp_lease(get_mcp_connection_manager().acquire(session_id))
+                    if hot_reloader:
+                        session_agent.attach_hot_reloader(hot_reloader, prompt_suffix=user_context)
+                    return session_agent
 
                 feishu_skill.set_agent_factory(make_agent)
 
@@ -708,9 +892,10 @@ async def run_agent(workspace_dir: Path, task: str = None):
                     # 讨论模式判断：用 chat_id 区分会话，避免群聊和私聊互相干扰
                     if discussion_handler.is_active(session_id) or message.startswith("讨论 "):
                         print(f"{Colors.BRIGHT_BLUE}[Feishu]{Colors.RESET} {Colors.DIM}讨论模式 (session={session_id[:16]}...){Colors.RESET}")
+                        # 放入会话信箱后立即返回，不阻塞其他会话的消息
                         await discussion_handler.handle_message(session_id, message, send_fn)
-                        print(f"{Colors.GREEN}[Feishu]{Colors.RESET} {Colors.DIM}讨论消息已发送{Colors.RESET}")
-                        return None  # DiscussionHandler 已通过 send_fn 发送消息
+                        print(f"{Colors.GREEN}[Feishu]{Colors.RESET} {Colors.DIM}讨论消息已排队{Colors.RESET}")
+                        return None  # DiscussionHandler 通过 send_fn 发送消息
 
                     # 普通模式 — Agent 已由 SessionManager 创建并缓存
                     print(f"{Colors.BRIGHT_BLUE}[Feishu]{Colors.RESET} {Colors.DIM}Agent 处理中...{Colors.RESET}")
@@ -724,6 +909,7 @@ async def run_agent(workspace_dir: Path, task: str = None):
                         return "抱歉，Agent 未初始化。"
 
                     session.agent.add_user_message(message)
+                    session.agent.progress_callback = _feishu_progress_sender(send_fn)
                     try:
                         await session.agent.run()
                     except Exception as e:
@@ -775,6 +961,9 @@ async def run_agent(workspace_dir: Path, task: str = None):
         finally:
             print_stats(agent, session_start)
 
+        if discussion_handler is not None:
+            await discussion_handler.close()
+
         # Cleanup MCP connections
         await _quiet_cleanup()
         return
@@ -994,6 +1183,13 @@ async def run_agent(workspace_dir: Path, task: str = None):
         except Exception:
             pass
 
+    # 11.5 Write pending discussion messages and close the discussion store
+    if discussion_handler is not None:
+        try:
+            await discussion_handler.close()
+        except Exception:
+            pass
+
     # 12. Cleanup MCP connections
     await _quiet_cleanup()
 
@@ -11,6 +11,9 @@ from pydantic import BaseModel, Field
 
 # 统一日志目录：所有日志文件（agent_run, feishu, bash, coding）均写入此目录
 LOG_DIR = Path.home() / ".mini-agent" / "log"
+BASH_SPILL_DIR = Path.home() / ".mini-agent" / "bash_output"
+CACHE_DIR = Path.home() / ".mini-agent" / "cache"
+MCP_OUTPUT_DIR = Path.home() / ".mini-agent" / "mcp_output"
 
 # Import FeishuConfig if available (optional dependency)
 try:
@@ -53,6 +56,31 @@ class MCPConfig(BaseModel):
     connect_timeout: float = 10.0  # Connection timeout (seconds)
     execute_timeout: float = 60.0  # Tool execution timeout (seconds)
     sse_read_timeout: float = 120.0  # SSE read timeout (seconds)
+    startup_timeout: float = 30.0  # Global deadline for connecting all servers at startup (seconds)
+    background_connect: bool = False  # Keep connecting late servers after startup and attach their tools
+    lazy_connect: bool = False  # Connect servers on first tool call (tool schemas come from a cache)
+    idle_timeout: float = 300.0  # Shut down lazy servers after this many idle seconds (0 disables)
+    health_check_interval: float = 30.0  # Ping servers this often; dead connections are re-established (0 disables)
+    reconnect_max_delay: float = 60.0  # Upper bound of the reconnect backoff (seconds)
+    max_concurrency: int = 0  # Concurrent calls per server session, extra calls queue (0 = unlimited)
+    max_result_tokens: int = 16000  # Truncate larger results; full text goes to MCP_OUTPUT_DIR (0 disables)
+    output_max_age_hours: float = 24.0  # Delete files in MCP_OUTPUT_DIR older than this (0 keeps them)
+    output_max_mb: int = 256  # Delete the oldest files in MCP_OUTPUT_DIR beyond this total (0 = unlimited)
+    max_idle_tenants: int = 64  # Chats/sessions whose stateful-server sessions are kept after they end
+    cache_max_bytes: int = 16 * 1024 * 1024  # Budget of the tool result cache (0 disables it)
+
+
+class BashConfig(BaseModel):
+    """Bash tool configuration"""
+
+    persistent: bool = False  # Reuse long-lived bash sessions across commands (Unix only)
+    pool_size: int = 1  # Max concurrent persistent shells per workspace
+    max_output_lines: int = 5000  # Ring buffer line limit per background shell
+    max_output_bytes: int = 5 * 1024 * 1024  # Ring buffer byte limit per background shell
+    spill_to_disk: bool = True  # Write lines evicted from the ring buffer to BASH_SPILL_DIR
+    spill_max_age_hours: float = 24.0  # Delete spill files older than this (0 keeps them)
+    output_head_bytes: int = 64 * 1024  # Bytes kept from the start of foreground output
+    output_tail_bytes: int = 64 * 1024  # Bytes kept from the end of foreground output
 
 
 class ToolsConfig(BaseModel):
@@ -61,17 +89,23 @@ class ToolsConfig(BaseModel):
     # Basic tools (file operations, bash)
     enable_file_tools: bool = True
     enable_bash: bool = True
+    bash: BashConfig = Field(default_factory=BashConfig)
     enable_note: bool = True
 
     # Skills
     enable_skills: bool = True
     skills_dir: str = "./skills"
+    skills_search: bool = False  # Add search_skills; prompt lists no skills
 
     # MCP tools
     enable_mcp: bool = True
     mcp_config_path: str = "mcp.json"
     mcp: MCPConfig = Field(default_factory=MCPConfig)
 
+    # Hot reload of skills and MCP servers (polls for file changes)
+    hot_reload: bool = False
+    hot_reload_interval: float = 2.0  # Seconds between checks
+
 
 class LoggingConfig(BaseModel):
     """Logging configuration"""
@@ -169,17 +203,45 @@ class Config(BaseModel):
             connect_timeout=mcp_data.get("connect_timeout", 10.0),
             execute_timeout=mcp_data.get("execute_timeout", 60.0),
             sse_read_timeout=mcp_data.get("sse_read_timeout", 120.0),
+            startup_timeout=mcp_data.get("startup_timeout", 30.0),
+            background_connect=mcp_data.get("background_connect", False),
+            lazy_connect=mcp_data.get("lazy_connect", False),
+            idle_timeout=mcp_data.get("idle_timeout", 300.0),
+            health_check_interval=mcp_data.get("health_check_interval", 30.0),
+            reconnect_max_delay=mcp_data.get("reconnect_max_delay", 60.0),
+            max_concurrency=mcp_data.get("max_concurrency", 0),
+            max_result_tokens=mcp_data.get("max_result_tokens", 16000),
+            output_max_age_hours=mcp_data.get("output_max_age_hours", 24.0),
+            output_max_mb=mcp_data.get("output_max_mb", 256),
+            max_idle_tenants=mcp_data.get("max_idle_tenants", 64),
+            cache_max_bytes=mcp_data.get("cache_max_bytes", 16 * 1024 * 1024),
+        )
+
+        bash_data = tools_data.get("bash", {})
+        bash_config = BashConfig(
+            persistent=bash_data.get("persistent", False),
+            pool_size=bash_data.get("pool_size", 1),
+            max_output_lines=bash_data.get("max_output_lines", 5000),
+            max_output_bytes=bash_data.get("max_output_bytes", 5 * 1024 * 1024),
+            spill_to_disk=bash_data.get("spill_to_disk", True),
+            spill_max_age_hours=bash_data.get("spill_max_age_hours", 24.0),
+            output_head_bytes=bash_data.get("output_head_bytes", 64 * 1024),
+            output_tail_bytes=bash_data.get("output_tail_bytes", 64 * 1024),
         )
 
         tools_config = ToolsConfig(
             enable_file_tools=tools_data.get("enable_file_tools", True),
             enable_bash=tools_data.get("enable_bash", True),
+            bash=bash_config,
             enable_note=tools_data.get("enable_note", True),
             enable_skills=tools_data.get("enable_skills", True),
             skills_dir=tools_data.get("skills_dir", "./skills"),
+            skills_search=tools_data.get("skills_search", False),
             enable_mcp=tools_data.get("enable_mcp", True),
             mcp_config_path=tools_data.get("mcp_config_path", "mcp.json"),
             mcp=mcp_config,
+            hot_reload=tools_data.get("hot_reload", False),
+            hot_reload_interval=tools_data.get("hot_reload_interval", 2.0),
         )
 
         # Parse Feishu configuration (optional)
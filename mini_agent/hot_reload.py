@@ -0,0 +1,186 @@
+"""Hot reload of skills and MCP servers without restarting the process.
+
+HotReloader polls the skills directory and the MCP config file. When a
+SKILL.md or mcp.json changes it reloads only the affected skills / servers and
+publishes a new immutable ReloadSnapshot. Agents apply the latest snapshot
+between steps (Agent.apply_hot_reload), so a step never sees a half-updated
+tool registry or system prompt.
+"""
+
+import asyncio
+import logging
+import os
+import weakref
+from dataclasses import dataclass
+from typing import Optional
+
+from .tools.base import Tool
+from .tools.mcp_loader import get_mcp_tools, reload_mcp_tools
+from .tools.skill_loader import SkillLoader
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ReloadSnapshot:
+    """Reloadable agent state; replaced as a whole on every reload."""
+
+    generation: int
+    mcp_tools: tuple[Tool, ...]
+    system_prompt: Optional[str]
+
+
+def render_system_prompt(template: Optional[str], skill_loader: Optional[SkillLoader]) -> Optional[str]:
+    """Fill the {SKILLS_METADATA} placeholder of a system prompt template."""
+    if template is None:
+        return None
+    metadata = skill_loader.get_skills_metadata_prompt() if skill_loader else ""
+    return template.replace("{SKILLS_METADATA}", metadata)
+
+
+class HotReloader:
+    """Watches skills and MCP config and publishes reload snapshots."""
+
+    _active: "weakref.WeakSet[HotReloader]" = weakref.WeakSet()
+
+    def __init__(
+        self,
+        system_prompt_template: Optional[str] = None,
+        skill_loader: Optional[SkillLoader] = None,
+        mcp_config_path: Optional[str] = None,
+        mcp_tools: Optional[list[Tool]] = None,
+        interval: float = 2.0,
+    ):
+        """
+        Initialize hot reloader
+
+        Args:
+            system_prompt_template: System prompt containing {SKILLS_METADATA};
+                None leaves agents' system prompts untouched
+            skill_loader: Loader whose skills directory is watched
+            mcp_config_path: MCP config file to watch (None disables MCP reload)
+            mcp_tools: MCP tools the agents were created with
+            interval: Polling interval in seconds
+        """
+        self.system_prompt_template = system_prompt_template
+        self.skill_loader = skill_loader
+        self.mcp_config_path = mcp_config_path
+        self.interval = interval
+        mcp_tools = tuple(mcp_tools or ())
+        # Names of reloadable tools agents were created with (removed on first apply)
+        self.initial_tool_names = frozenset(tool.name for tool in mcp_tools)
+        self.snapshot = ReloadSnapshot(
+            generation=0,
+            mcp_tools=mcp_tools,
+            system_prompt=render_system_prompt(system_prompt_template, skill_loader),
+        )
+        self._skills_state = self._scan_skills()
+        self._mcp_state = self._stat_mcp_config()
+        self._task: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+
+    def _scan_skills(self) -> dict[str, tuple[int, int]]:
+        """Return (mtime_ns, size) of every SKILL.md in the skills directory."""
+        if self.skill_loader is None or not self.skill_loader.skills_dir.exists():
+            return {}
+        state = {}
+        for skill_file in self.skill_loader.skills_dir.rglob("SKILL.md"):
+            try:
+                stat = skill_file.stat()
+            except OSError:
+                continue
+            state[str(skill_file)] = (stat.st_mtime_ns, stat.st_size)
+        return state
+
+    def _stat_mcp_config(self) -> Optional[tuple[int, int]]:
+        """Return (mtime_ns, size) of the MCP config file, or None if missing."""
+        if not self.mcp_config_path:
+            return None
+        try:
+            stat = os.stat(self.mcp_config_path)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    async def check(self) -> bool:
+        """
+        Reload whatever changed since the last check
+
+        Returns:
+            True if a new snapshot was published
+        """
+        async with self._lock:
+            changed_skills: list[str] = []
+            changed_servers: list[str] = []
+
+            skills_state = self._scan_skills()
+            if skills_state != self._skills_state:
+                self._skills_state = skills_state
+                changed_skills = self.skill_loader.refresh()
+
+            mcp_state = self._stat_mcp_config()
+            if mcp_state != self._mcp_state:
+                self._mcp_state = mcp_state
+                if mcp_state is not None:
+                    changed_servers = await reload_mcp_tools(self.mcp_config_path)
+
+            if not changed_skills and not changed_servers:
+                return False
+
+            mcp_tools = tuple(get_mcp_tools()) if self.mcp_config_path else self.snapshot.mcp_tools
+            self.snapshot = ReloadSnapshot(
+                generation=self.snapshot.generation + 1,
+                mcp_tools=mcp_tools,
+                system_prompt=render_system_prompt(self.system_prompt_template, self.skill_loader),
+            )
+            logger.info(
+                "Hot reload generation %d: skills=%s mcp_servers=%s",
+                self.snapshot.generation,
+                changed_skills,
+                changed_servers,
+            )
+            return True
+
+    def add_tools(self, tools: list[Tool]) -> None:
+        """Track MCP tools of a server that connected after startup.
+
+        They become reloadable like the initial tools, and a new snapshot
+        hands them to every attached agent at its next step boundary.
+        """
+        names = {tool.name for tool in tools}
+        self.initial_tool_names = self.initial_tool_names | names
+        kept = tuple(tool for tool in self.snapshot.mcp_tools if tool.name not in names)
+        self.snapshot = ReloadSnapshot(
+            generation=self.snapshot.generation + 1,
+            mcp_tools=kept + tuple(tools),
+            system_prompt=self.snapshot.system_prompt,
+        )
+
+    def start(self) -> None:
+        """Start polling in a background task (requires a running event loop)."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._watch())
+            HotReloader._active.add(self)
+
+    async def _watch(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.check()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Hot reload failed: {e}")
+
+    def stop(self) -> None:
+        """Stop polling."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        HotReloader._active.discard(self)
+
+    @classmethod
+    def stop_all(cls) -> None:
+        """Stop every running reloader (used on process shutdown)."""
+        for reloader in list(cls._active):
+            reloader.stop()
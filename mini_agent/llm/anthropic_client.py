@@ -1,7 +1,7 @@
 """Anthropic LLM client implementation."""
 
 import logging
-from typing import Any
+from typing import Any, AsyncIterator
 
 import anthropic
 
@@ -39,10 +39,12 @@ class AnthropicClient(LLMClientBase):
         super().__init__(api_key, api_base, model, retry_config)
 
         # Initialize Anthropic async client
+        self.http_client = anthropic.DefaultAsyncHttpxClient()
         self.client = anthropic.AsyncAnthropic(
             base_url=api_base,
             api_key=api_key,
             default_headers={"Authorization": f"Bearer {api_key}"},
+            http_client=self.http_client,
         )
 
     async def _make_api_request(
@@ -291,3 +293,25 @@ class AnthropicClient(LLMClientBase):
 
         # Parse and return response
         return self._parse_response(response)
+
+    async def generate_stream(self, messages: list[Message]) -> AsyncIterator[str]:
+        """Stream a plain-text response from Anthropic LLM.
+
+        Args:
+            messages: List of conversation messages
+
+        Yields:
+            Text deltas of the response content (thinking is not included)
+        """
+        request_params = self._prepare_request(messages)
+        params = {
+            "model": self.model,
+            "max_tokens": 16384,
+            "messages": request_params["api_messages"],
+        }
+        if request_params["system_message"]:
+            params["system"] = request_params["system_message"]
+
+        async with self.client.messages.stream(**params) as stream:
+            async for text in stream.text_stream:
+                yield text
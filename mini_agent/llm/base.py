@@ -1,7 +1,9 @@
 """Base class for LLM clients."""
 
 from abc import ABC, abstractmethod
-from typing import Any
+from typing import Any, AsyncIterator
+
+import httpx
 
 from ..retry import RetryConfig
 from ..schema import LLMResponse, Message
@@ -37,6 +39,9 @@ class LLMClientBase(ABC):
         # Callback for tracking retry count
         self.retry_callback = None
 
+        # HTTP client shared with the SDK client, so warm_up() fills its pool
+        self.http_client: httpx.AsyncClient | None = None
+
     @abstractmethod
     async def generate(
         self,
@@ -54,6 +59,31 @@ class LLMClientBase(ABC):
         """
         pass
 
+    async def warm_up(self) -> None:
+        """Open a connection to the API ahead of the first request.
+
+        Sends a HEAD request to api_base. Whatever the response, the connection
+        (TCP and TLS handshakes done) goes back to the pool for the next request.
+        """
+        if self.http_client is not None:
+            await self.http_client.head(self.api_base)
+
+    async def generate_stream(self, messages: list[Message]) -> AsyncIterator[str]:
+        """Generate a plain-text response, yielding text as it arrives.
+
+        Tools are not supported and streams are not retried. Clients without
+        native streaming yield the whole response at once.
+
+        Args:
+            messages: List of conversation messages
+
+        Yields:
+            Text deltas of the response content
+        """
+        response = await self.generate(messages)
+        if response.content:
+            yield response.content
+
     @abstractmethod
     def _prepare_request(
         self,
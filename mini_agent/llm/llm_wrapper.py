@@ -5,6 +5,7 @@ This module provides a unified interface for different LLM providers
 """
 
 import logging
+from typing import AsyncIterator
 
 from ..retry import RetryConfig
 from ..schema import LLMProvider, LLMResponse, Message
@@ -125,3 +126,19 @@ class LLMClient:
             LLMResponse containing the generated content
         """
         return await self._client.generate(messages, tools)
+
+    async def warm_up(self) -> None:
+        """Open a connection to the API ahead of the first request."""
+        await self._client.warm_up()
+
+    async def generate_stream(self, messages: list[Message]) -> AsyncIterator[str]:
+        """Generate a plain-text response, yielding text as it arrives.
+
+        Args:
+            messages: List of conversation messages
+
+        Yields:
+            Text deltas of the response content
+        """
+        async for delta in self._client.generate_stream(messages):
+            yield delta
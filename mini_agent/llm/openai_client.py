@@ -2,9 +2,9 @@
 
 import json
 import logging
-from typing import Any
+from typing import Any, AsyncIterator
 
-from openai import AsyncOpenAI
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
 
 from ..retry import RetryConfig, async_retry
 from ..schema import FunctionCall, LLMResponse, Message, TokenUsage, ToolCall
@@ -40,9 +40,11 @@ class OpenAIClient(LLMClientBase):
         super().__init__(api_key, api_base, model, retry_config)
 
         # Initialize OpenAI client
+        self.http_client = DefaultAsyncHttpxClient()
         self.client = AsyncOpenAI(
             api_key=api_key,
             base_url=api_base,
+            http_client=self.http_client,
         )
 
     async def _make_api_request(
@@ -293,3 +295,23 @@ class OpenAIClient(LLMClientBase):
 
         # Parse and return response
         return self._parse_response(response)
+
+    async def generate_stream(self, messages: list[Message]) -> AsyncIterator[str]:
+        """Stream a plain-text response from OpenAI LLM.
+
+        Args:
+            messages: List of conversation messages
+
+        Yields:
+            Text deltas of the response content (reasoning is not included)
+        """
+        request_params = self._prepare_request(messages)
+        stream = await self.client.chat.completions.create(
+            model=self.model,
+            messages=request_params["api_messages"],
+            extra_body={"reasoning_split": True},
+            stream=True,
+        )
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
@@ -1,9 +1,49 @@
 """Base tool classes."""
 
-from typing import Any
+import inspect
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Iterator
 
 from pydantic import BaseModel
 
+# Receives a snapshot of a running tool's recent output (e.g. bash stdout tail)
+ProgressCallback = Callable[[str], Awaitable[None] | None]
+
+_progress_callback: ContextVar[ProgressCallback | None] = ContextVar("tool_progress_callback", default=None)
+
+
+@contextmanager
+def tool_progress(callback: ProgressCallback | None) -> Iterator[None]:
+    """Route progress reported by tools executed in this context to callback.
+
+    The callback is stored in a ContextVar, so concurrent agents (ACP sessions,
+    Feishu chats) each receive only the progress of their own tool calls.
+    """
+    token = _progress_callback.set(callback)
+    try:
+        yield
+    finally:
+        _progress_callback.reset(token)
+
+
+def get_progress_callback() -> ProgressCallback | None:
+    """Return the progress callback of the current context, if any."""
+    return _progress_callback.get()
+
+
+async def report_progress(message: str) -> None:
+    """Send a progress message to the current callback; errors are swallowed."""
+    callback = _progress_callback.get()
+    if callback is None:
+        return
+    try:
+        result = callback(message)
+        if inspect.isawaitable(result):
+            await result
+    except Exception:
+        pass
+
 
 class ToolResult(BaseModel):
     """Tool execution result."""
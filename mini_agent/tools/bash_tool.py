@@ -4,17 +4,22 @@ Supports both bash (Unix/Linux/macOS) and PowerShell (Windows).
 """
 
 import asyncio
+import codecs
+import itertools
 import logging
 import os
 import platform
 import re
+import signal
 import time
 import uuid
+import weakref
+from collections import deque
 from typing import Any
 
 from pydantic import Field, model_validator
 
-from .base import Tool, ToolResult
+from .base import Tool, ToolResult, get_progress_callback, report_progress
 
 _log = logging.getLogger("mini_agent.bash")
 _log_initialized = False
@@ -85,31 +90,179 @@ class BashOutputResult(ToolResult):
         return self
 
 
+DEFAULT_NAMESPACE = "default"
+DEFAULT_MAX_OUTPUT_LINES = 5000
+DEFAULT_MAX_OUTPUT_BYTES = 5 * 1024 * 1024
+_READ_CHUNK_SIZE = 64 * 1024
+# A line without newline longer than this is flushed as-is instead of growing forever
+_MAX_PARTIAL_LINE = 64 * 1024
+DEFAULT_OUTPUT_HEAD_BYTES = 64 * 1024
+DEFAULT_OUTPUT_TAIL_BYTES = 64 * 1024
+# Minimum seconds between two progress reports of a foreground command
+_PROGRESS_INTERVAL = 1.0
+_PROGRESS_TAIL_CHARS = 2000
+# SIGKILL does not exist on Windows, where terminate() and kill() are the same
+_SIGKILL = getattr(signal, "SIGKILL", signal.SIGTERM)
+
+
 class BackgroundShell:
     """Background shell data container.
 
     Pure data class that only stores state and output.
     IO operations are managed externally by BackgroundShellManager.
+
+    Output is kept in a bounded ring buffer (``max_lines`` / ``max_bytes``).
+    Line indices are absolute, so the read cursor stays valid after old lines
+    are evicted; evicted lines are appended to ``spill_path`` when set.
     """
 
-    def __init__(self, bash_id: str, command: str, process: "asyncio.subprocess.Process", start_time: float):
+    def __init__(
+        self,
+        bash_id: str,
+        command: str,
+        process: "asyncio.subprocess.Process",
+        start_time: float,
+        namespace: str = DEFAULT_NAMESPACE,
+        max_lines: int = DEFAULT_MAX_OUTPUT_LINES,
+        max_bytes: int = DEFAULT_MAX_OUTPUT_BYTES,
+        spill_path: str | None = None,
+    ):
         self.bash_id = bash_id
         self.command = command
         self.process = process
         self.start_time = start_time
-        self.output_lines: list[str] = []
-        self.last_read_index = 0
+        self.namespace = namespace
+        self.max_lines = max(1, max_lines)
+        self.max_bytes = max(1, max_bytes)
+        self.spill_path = spill_path
+        self._lines: deque[tuple[str, int]] = deque()  # (line, encoded size)
+        self._buffered_bytes = 0
+        self.first_index = 0  # Absolute index of the oldest buffered line
+        self.last_read_index = 0  # Absolute index of the next unread line
         self.status = "running"
         self.exit_code: int | None = None
+        self._partial = ""  # Trailing output not yet terminated by a newline
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self._output_event = asyncio.Event()
+
+    @property
+    def output_lines(self) -> list[str]:
+        """Lines currently held in the ring buffer."""
+        return [line for line, _ in self._lines]
+
+    @property
+    def total_lines(self) -> int:
+        """Total number of lines produced so far, including evicted ones."""
+        return self.first_index + len(self._lines)
 
     def add_output(self, line: str):
-        """Add new output line."""
-        self.output_lines.append(line)
+        """Add new output line, evicting the oldest lines if over budget."""
+        size = len(line.encode("utf-8", errors="replace")) + 1
+        self._lines.append((line, size))
+        self._buffered_bytes += size
+
+        evicted: list[str] = []
+        while len(self._lines) > 1 and (len(self._lines) > self.max_lines or self._buffered_bytes > self.max_bytes):
+            old_line, old_size = self._lines.popleft()
+            self._buffered_bytes -= old_size
+            self.first_index += 1
+            evicted.append(old_line)
+
+        if evicted and self.spill_path:
+            self._spill(evicted)
+
+        self._notify()
+
+    def feed(self, data: bytes) -> None:
+        """Add a raw output chunk, splitting it into lines.
+
+        Incomplete trailing lines are buffered until their newline arrives (or
+        they exceed _MAX_PARTIAL_LINE characters). Pass b"" at EOF to flush.
+        """
+        text = self._partial + self._decoder.decode(data, final=not data)
+        lines = text.split("\n")
+        self._partial = lines.pop()
+        if not data and self._partial:
+            lines.append(self._partial)
+            self._partial = ""
+        elif len(self._partial) > _MAX_PARTIAL_LINE:
+            lines.append(self._partial)
+            self._partial = ""
+
+        for line in lines:
+            self.add_output(line.removesuffix("\r"))
+
+    def _notify(self) -> None:
+        """Wake every coroutine waiting for new output or a status change."""
+        self._output_event.set()
+        self._output_event = asyncio.Event()
+
+    async def wait_for_output(self, timeout: float, pattern: "re.Pattern[str] | None" = None) -> bool:
+        """Wait until there is unread output (matching pattern, if given).
+
+        Returns early when the process is no longer running. Does not consume
+        output; call get_new_output() afterwards.
+
+        Args:
+            timeout: Maximum time to wait in seconds
+            pattern: Optional compiled regex an unread line must match
+
+        Returns:
+            True if the condition was met, False on timeout or process exit
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        scan_index = self.last_read_index
+        while True:
+            if pattern is None:
+                if self.total_lines > self.last_read_index:
+                    return True
+            else:
+                start = max(scan_index, self.first_index) - self.first_index
+                for line, _ in itertools.islice(self._lines, start, None):
+                    if pattern.search(line):
+                        return True
+                scan_index = self.total_lines
+
+            if self.status != "running":
+                return False
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return False
+
+            event = self._output_event
+            try:
+                await asyncio.wait_for(event.wait(), timeout=remaining)
+            except asyncio.TimeoutError:
+                pass
+
+    def _spill(self, lines: list[str]) -> None:
+        """Append evicted lines to the spill file; disable spilling on failure."""
+        try:
+            with open(self.spill_path, "a", encoding="utf-8", errors="replace") as f:
+                f.write("\n".join(lines) + "\n")
+        except OSError:
+            self.spill_path = None
+
+    def remove_spill(self) -> None:
+        """Delete the spill file, if any."""
+        if self.spill_path:
+            try:
+                os.remove(self.spill_path)
+            except OSError:
+                pass
+            self.spill_path = None
 
     def get_new_output(self, filter_pattern: str | None = None) -> list[str]:
-        """Get new output since last check, optionally filtered by regex."""
-        new_lines = self.output_lines[self.last_read_index :]
-        self.last_read_index = len(self.output_lines)
+        """Get new output since last check, optionally filtered by regex.
+
+        If unread lines were evicted from the ring buffer, a marker line with
+        the number of dropped lines is prepended (never filtered out).
+        """
+        dropped = max(0, self.first_index - self.last_read_index)
+        start = max(self.last_read_index, self.first_index) - self.first_index
+        new_lines = [line for line, _ in itertools.islice(self._lines, start, None)]
+        self.last_read_index = self.total_lines
 
         if filter_pattern:
             try:
@@ -119,6 +272,12 @@ class BackgroundShell:
                 # Invalid regex, return all lines
                 pass
 
+        if dropped:
+            marker = f"[{dropped} lines dropped]"
+            if self.spill_path:
+                marker = f"[{dropped} lines dropped, full output in {self.spill_path}]"
+            new_lines.insert(0, marker)
+
         return new_lines
 
     def update_status(self, is_alive: bool, exit_code: int | None = None):
@@ -128,21 +287,28 @@ class BackgroundShell:
             self.exit_code = exit_code
         else:
             self.status = "running"
+        self._notify()
 
     async def terminate(self):
         """Terminate the background process."""
         if self.process.returncode is None:
-            self.process.terminate()
+            _signal_process_group(self.process, signal.SIGTERM)
             try:
                 await asyncio.wait_for(self.process.wait(), timeout=5)
             except asyncio.TimeoutError:
-                self.process.kill()
+                _signal_process_group(self.process, _SIGKILL)
         self.status = "terminated"
         self.exit_code = self.process.returncode
+        self._notify()
 
 
 class BackgroundShellManager:
-    """Manager for all background shell processes."""
+    """Manager for all background shell processes.
+
+    Shells are namespaced: every lookup takes the namespace of the agent (or
+    session) that owns the shell, so agents sharing a process cannot see or
+    kill each other's shells.
+    """
 
     _shells: dict[str, BackgroundShell] = {}
     _monitor_tasks: dict[str, asyncio.Task] = {}
@@ -153,14 +319,17 @@ class BackgroundShellManager:
         cls._shells[shell.bash_id] = shell
 
     @classmethod
-    def get(cls, bash_id: str) -> BackgroundShell | None:
-        """Get a background shell by ID."""
-        return cls._shells.get(bash_id)
+    def get(cls, bash_id: str, namespace: str = DEFAULT_NAMESPACE) -> BackgroundShell | None:
+        """Get a background shell by ID within a namespace."""
+        shell = cls._shells.get(bash_id)
+        if shell is None or shell.namespace != namespace:
+            return None
+        return shell
 
     @classmethod
-    def get_available_ids(cls) -> list[str]:
-        """Get all available bash IDs."""
-        return list(cls._shells.keys())
+    def get_available_ids(cls, namespace: str = DEFAULT_NAMESPACE) -> list[str]:
+        """Get all available bash IDs in a namespace."""
+        return [bash_id for bash_id, shell in cls._shells.items() if shell.namespace == namespace]
 
     @classmethod
     def _remove(cls, bash_id: str) -> None:
@@ -171,29 +340,20 @@ class BackgroundShellManager:
     @classmethod
     async def start_monitor(cls, bash_id: str) -> None:
         """Start monitoring a background shell's output."""
-        shell = cls.get(bash_id)
+        shell = cls._shells.get(bash_id)
         if not shell:
             return
 
         async def monitor():
             try:
                 process = shell.process
-                # Continuously read output until process ends
-                while process.returncode is None:
-                    try:
-                        if process.stdout:
-                            line = await asyncio.wait_for(process.stdout.readline(), timeout=0.1)
-                            if line:
-                                decoded_line = line.decode("utf-8", errors="replace").rstrip("\n")
-                                shell.add_output(decoded_line)
-                            else:
-                                break
-                    except asyncio.TimeoutError:
-                        await asyncio.sleep(0.1)
-                        continue
-                    except Exception:
-                        await asyncio.sleep(0.1)
-                        continue
+                # Event-driven chunk reads: the task sleeps until data or EOF arrives
+                if process.stdout is not None:
+                    while True:
+                        chunk = await process.stdout.read(_READ_CHUNK_SIZE)
+                        shell.feed(chunk)
+                        if not chunk:
+                            break
 
                 # Process ended, wait for exit code
                 try:
@@ -224,11 +384,12 @@ class BackgroundShellManager:
             del cls._monitor_tasks[bash_id]
 
     @classmethod
-    async def terminate(cls, bash_id: str) -> BackgroundShell:
+    async def terminate(cls, bash_id: str, namespace: str = DEFAULT_NAMESPACE) -> BackgroundShell:
         """Terminate a background shell and clean up all resources.
 
         Args:
             bash_id: The unique identifier of the background shell
+            namespace: Namespace that owns the shell
 
         Returns:
             The terminated BackgroundShell object
@@ -236,7 +397,7 @@ class BackgroundShellManager:
         Raises:
             ValueError: If shell not found
         """
-        shell = cls.get(bash_id)
+        shell = cls.get(bash_id, namespace)
         if not shell:
             raise ValueError(f"Shell not found: {bash_id}")
 
@@ -249,6 +410,357 @@ class BackgroundShellManager:
 
         return shell
 
+    @classmethod
+    def discard_namespace(cls, namespace: str) -> None:
+        """Kill every shell of a namespace and delete its spill files.
+
+        Synchronous so it can run from a finalizer when the owning session ends.
+        """
+        for bash_id in cls.get_available_ids(namespace):
+            shell = cls._shells[bash_id]
+            if shell.process.returncode is None:
+                _signal_process_group(shell.process, _SIGKILL)
+            cls._cancel_monitor(bash_id)
+            cls._remove(bash_id)
+            shell.remove_spill()
+
+
+def prune_spill_files(spill_dir: str, max_age: float) -> None:
+    """Delete spill files in spill_dir last written more than max_age seconds ago."""
+    cutoff = time.time() - max_age
+    try:
+        entries = list(os.scandir(spill_dir))
+    except OSError:
+        return
+    for entry in entries:
+        try:
+            if entry.name.endswith(".log") and entry.stat().st_mtime < cutoff:
+                os.remove(entry.path)
+        except OSError:
+            pass
+
+
+def _signal_process_group(process: "asyncio.subprocess.Process", sig: int) -> None:
+    """Send sig to the process group led by process (Unix), or to process only.
+
+    Processes are spawned with start_new_session=True on Unix, so the group
+    contains the shell and everything it started (pipelines, subshells).
+    """
+    if process.returncode is not None:
+        return
+    try:
+        if os.name == "nt":
+            process.kill()
+        else:
+            os.killpg(process.pid, sig)
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+class _ProgressReporter:
+    """Throttled forwarder of recent command output to the progress callback."""
+
+    def __init__(self, interval: float = _PROGRESS_INTERVAL, tail_chars: int = _PROGRESS_TAIL_CHARS):
+        self.interval = interval
+        self.tail_chars = tail_chars
+        self._recent = ""
+        self._last_report = 0.0
+
+    async def feed(self, data: bytes) -> None:
+        self._recent = (self._recent + data[-self.tail_chars :].decode("utf-8", errors="replace"))[-self.tail_chars :]
+        now = time.monotonic()
+        if now - self._last_report >= self.interval:
+            self._last_report = now
+            await report_progress(self._recent)
+
+
+class _OutputCapture:
+    """Streaming output capture that keeps only the first and last bytes.
+
+    Output beyond ``head_bytes`` + ``tail_bytes`` is discarded while reading,
+    so memory stays bounded no matter how much a command prints.
+    """
+
+    def __init__(
+        self,
+        head_bytes: int = DEFAULT_OUTPUT_HEAD_BYTES,
+        tail_bytes: int = DEFAULT_OUTPUT_TAIL_BYTES,
+        progress: _ProgressReporter | None = None,
+    ):
+        self.head_bytes = max(0, head_bytes)
+        self.tail_bytes = max(0, tail_bytes)
+        self.progress = progress
+        self.head = bytearray()
+        self.tail = bytearray()
+        self.total_bytes = 0
+
+    @property
+    def truncated_bytes(self) -> int:
+        return self.total_bytes - len(self.head) - len(self.tail)
+
+    async def feed(self, data: bytes) -> None:
+        """Add a chunk of output."""
+        if not data:
+            return
+        if self.progress is not None:
+            await self.progress.feed(data)
+        self.store(data)
+
+    def store(self, data: bytes) -> None:
+        """Add a chunk of output without reporting progress."""
+        self.total_bytes += len(data)
+        room = self.head_bytes - len(self.head)
+        if room > 0:
+            self.head += data[:room]
+            data = data[room:]
+        if data and self.tail_bytes:
+            self.tail += data[-self.tail_bytes :]
+            excess = len(self.tail) - self.tail_bytes
+            if excess > 0:
+                del self.tail[:excess]
+
+    def text(self) -> str:
+        """Decode the captured output, marking the truncated middle if any."""
+        head = self.head.decode("utf-8", errors="replace")
+        if not self.truncated_bytes:
+            return (self.head + self.tail).decode("utf-8", errors="replace")
+        tail = self.tail.decode("utf-8", errors="replace")
+        return f"{head}\n\n... [{self.truncated_bytes} bytes of output truncated] ...\n\n{tail}"
+
+
+async def _pump(stream: asyncio.StreamReader | None, capture: _OutputCapture) -> None:
+    """Copy a stream into capture until EOF."""
+    if stream is None:
+        return
+    while chunk := await stream.read(_READ_CHUNK_SIZE):
+        await capture.feed(chunk)
+
+
+def _ansi_c_quote(text: str) -> str:
+    """Quote text as a bash $'...' string so it can be passed to eval verbatim."""
+    escaped = text.replace("\\", "\\\\").replace("'", "\\'").replace("\n", "\\n")
+    return f"$'{escaped}'"
+
+
+class PersistentShellError(Exception):
+    """Raised when a persistent shell dies or times out while running a command."""
+
+
+class PersistentShell:
+    """A long-lived bash process that runs commands framed by sentinels.
+
+    Each command is sent as ``eval $'<command>' < /dev/null`` followed by a
+    ``printf`` of a random sentinel and the exit status, once on stdout and once
+    on stderr. Output is read until both sentinels are seen, so the shell stays
+    alive between commands and keeps its cwd, environment and shell variables.
+    """
+
+    def __init__(self, cwd: str | None = None):
+        self.cwd = cwd
+        self.process: asyncio.subprocess.Process | None = None
+        self.commands_run = 0
+
+    @property
+    def is_alive(self) -> bool:
+        return self.process is not None and self.process.returncode is None
+
+    async def start(self) -> None:
+        """Spawn the bash process in its own process group."""
+        self.process = await asyncio.create_subprocess_exec(
+            "bash",
+            "--noprofile",
+            "--norc",
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            cwd=self.cwd,
+            start_new_session=True,
+        )
+        self.commands_run = 0
+
+    def kill(self) -> None:
+        """Kill the shell and every process it started (synchronous, best effort)."""
+        if self.process is None:
+            return
+        if self.process.returncode is None:
+            try:
+                os.killpg(self.process.pid, signal.SIGKILL)
+            except (ProcessLookupError, PermissionError):
+                pass
+        self.process = None
+
+    async def run(
+        self,
+        command: str,
+        timeout: float,
+        stdout_capture: _OutputCapture | None = None,
+        stderr_capture: _OutputCapture | None = None,
+    ) -> tuple[str, str, int]:
+        """Run a command in this shell.
+
+        Args:
+            command: Shell command to evaluate
+            timeout: Timeout in seconds
+            stdout_capture: Capture receiving stdout while it streams
+            stderr_capture: Capture receiving stderr while it streams
+
+        Returns:
+            (stdout, stderr, exit_code)
+
+        Raises:
+            PersistentShellError: If the shell exits or the command times out.
+                The shell is killed in both cases and must be restarted.
+        """
+        if not self.is_alive:
+            await self.start()
+        stdout_capture = stdout_capture or _OutputCapture()
+        stderr_capture = stderr_capture or _OutputCapture()
+
+        marker = f"__MINI_AGENT_DONE_{uuid.uuid4().hex}__"
+        script = (
+            f"eval {_ansi_c_quote(command)} < /dev/null\n"
+            f"printf '\\n{marker} %d\\n' $?\n"
+            f"printf '\\n{marker}\\n' >&2\n"
+        )
+        process = self.process
+        process.stdin.write(script.encode("utf-8"))
+        await process.stdin.drain()
+        self.commands_run += 1
+
+        stdout_sentinel = f"\n{marker} ".encode()
+        stderr_sentinel = f"\n{marker}\n".encode()
+
+        try:
+            stdout_rest, _ = await asyncio.wait_for(
+                asyncio.gather(
+                    self._read_framed(process.stdout, stdout_sentinel, stdout_capture, status_line=True),
+                    self._read_framed(process.stderr, stderr_sentinel, stderr_capture),
+                ),
+                timeout=timeout,
+            )
+        except asyncio.TimeoutError:
+            self.kill()
+            raise PersistentShellError(f"Command timed out after {timeout} seconds")
+
+        if stdout_rest is None:
+            # EOF before sentinel: the command exited the shell (e.g. `exit 1`)
+            try:
+                exit_code = await asyncio.wait_for(process.wait(), timeout=5)
+            except asyncio.TimeoutError:
+                exit_code = -1
+            self.kill()
+            return stdout_capture.text(), stderr_capture.text(), exit_code
+
+        status_line = stdout_rest.split(b"\n", 1)[0]
+        try:
+            exit_code = int(status_line.strip() or b"0")
+        except ValueError:
+            exit_code = -1
+
+        return stdout_capture.text(), stderr_capture.text(), exit_code
+
+    @staticmethod
+    async def _read_framed(
+        stream: asyncio.StreamReader, sentinel: bytes, capture: _OutputCapture, status_line: bool = False
+    ) -> bytes | None:
+        """Stream output into capture until sentinel; return trailing bytes, or None on EOF.
+
+        Only the last len(sentinel) - 1 bytes are held back between reads (they
+        may be the start of a split sentinel), so memory stays bounded.
+        With status_line=True, keep reading until the rest of the sentinel line
+        (the exit status) has arrived.
+        """
+        keep = len(sentinel) - 1
+        pending = b""
+        try:
+            while True:
+                chunk = await stream.read(_READ_CHUNK_SIZE)
+                if not chunk:
+                    await capture.feed(pending)
+                    return None
+                pending += chunk
+                idx = pending.find(sentinel)
+                if idx != -1:
+                    rest = pending[idx + len(sentinel) :]
+                    pending = pending[:idx]
+                    await capture.feed(pending)
+                    pending = b""
+                    while status_line and b"\n" not in rest:
+                        chunk = await stream.read(_READ_CHUNK_SIZE)
+                        if not chunk:
+                            break
+                        rest += chunk
+                    return rest
+                if len(pending) > keep:
+                    await capture.feed(pending[:-keep])
+                    pending = pending[-keep:]
+        except asyncio.CancelledError:
+            # Timed out: keep the held-back bytes so the partial output is returned
+            capture.store(pending)
+            raise
+
+
+class BashSessionPool:
+    """Pool of persistent bash shells bound to one workspace.
+
+    Shells are reused across commands so `cd`, exported variables and
+    virtualenv activation persist. With ``max_size`` > 1 concurrent commands
+    get separate shells, and shell state is then per-shell, not per-pool.
+    Dead or timed-out shells are dropped and transparently respawned. A shell
+    only goes back to the pool after its command completed; one that was
+    cancelled or failed mid-command may still be running it, so it is killed.
+    """
+
+    _live_pools: "weakref.WeakSet[BashSessionPool]" = weakref.WeakSet()
+
+    def __init__(self, cwd: str | None = None, max_size: int = 1):
+        self.cwd = cwd
+        self.max_size = max(1, max_size)
+        self._idle: list[PersistentShell] = []
+        self._semaphore: asyncio.Semaphore | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        BashSessionPool._live_pools.add(self)
+
+    def _ensure_loop(self) -> None:
+        """Reset the pool if it is being used from a different event loop."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self.close()
+            self._loop = loop
+            self._semaphore = asyncio.Semaphore(self.max_size)
+
+    async def run(
+        self,
+        command: str,
+        timeout: float,
+        stdout_capture: _OutputCapture | None = None,
+        stderr_capture: _OutputCapture | None = None,
+    ) -> tuple[str, str, int]:
+        """Run a command on an idle shell, spawning one if needed."""
+        self._ensure_loop()
+        async with self._semaphore:
+            shell = self._idle.pop() if self._idle else PersistentShell(cwd=self.cwd)
+            try:
+                result = await shell.run(command, timeout, stdout_capture, stderr_capture)
+            except BaseException:
+                shell.kill()
+                raise
+            if shell.is_alive:
+                self._idle.append(shell)
+            return result
+
+    def close(self) -> None:
+        """Kill all idle shells."""
+        for shell in self._idle:
+            shell.kill()
+        self._idle.clear()
+
+    @classmethod
+    def close_all(cls) -> None:
+        """Kill the shells of every live pool (used on process shutdown)."""
+        for pool in list(cls._live_pools):
+            pool.close()
+
 
 class BashTool(Tool):
     """Execute shell commands in foreground or background.
@@ -258,17 +770,60 @@ class BashTool(Tool):
     - Unix/Linux/macOS: bash
     """
 
-    def __init__(self, workspace_dir: str | None = None):
+    def __init__(
+        self,
+        workspace_dir: str | None = None,
+        persistent: bool = False,
+        pool_size: int = 1,
+        namespace: str = DEFAULT_NAMESPACE,
+        max_output_lines: int = DEFAULT_MAX_OUTPUT_LINES,
+        max_output_bytes: int = DEFAULT_MAX_OUTPUT_BYTES,
+        spill_dir: str | None = None,
+        spill_max_age: float | None = None,
+        output_head_bytes: int = DEFAULT_OUTPUT_HEAD_BYTES,
+        output_tail_bytes: int = DEFAULT_OUTPUT_TAIL_BYTES,
+    ):
         """Initialize BashTool with OS-specific shell detection.
 
         Args:
             workspace_dir: Working directory for command execution.
                            If provided, all commands run in this directory.
                            If None, commands run in the process's cwd.
+            persistent: Run foreground commands in long-lived bash sessions so
+                        cwd and environment persist between calls (Unix only).
+            pool_size: Maximum number of concurrent persistent shells.
+            namespace: Namespace for background shells; must match the
+                       namespace of the bash_output / bash_kill tools.
+            max_output_lines: Ring buffer line limit per background shell.
+            max_output_bytes: Ring buffer byte limit per background shell.
+            spill_dir: Directory where lines evicted from the ring buffer are
+                       written (one file per shell). None disables spilling.
+            spill_max_age: Seconds after which old spill files are deleted when
+                           a new background shell starts. None keeps them.
+            output_head_bytes: Bytes kept from the start of foreground output.
+            output_tail_bytes: Bytes kept from the end of foreground output;
+                               anything in between is dropped while reading.
         """
         self.is_windows = platform.system() == "Windows"
         self.shell_name = "PowerShell" if self.is_windows else "bash"
         self.workspace_dir = workspace_dir
+        self.namespace = namespace
+        self.max_output_lines = max_output_lines
+        self.max_output_bytes = max_output_bytes
+        self.spill_dir = spill_dir
+        self.spill_max_age = spill_max_age
+        self.output_head_bytes = output_head_bytes
+        self.output_tail_bytes = output_tail_bytes
+        # Persistent sessions are not supported for PowerShell
+        self.session_pool: BashSessionPool | None = None
+        if persistent and not self.is_windows:
+            self.session_pool = BashSessionPool(cwd=workspace_dir, max_size=pool_size)
+
+    def close(self) -> None:
+        """Kill this tool's persistent and background shells and delete their spill files."""
+        if self.session_pool is not None:
+            self.session_pool.close()
+        BackgroundShellManager.discard_namespace(self.namespace)
 
     @property
     def name(self) -> str:
@@ -396,10 +951,26 @@ Examples:
                         stdout=asyncio.subprocess.PIPE,
                         stderr=asyncio.subprocess.STDOUT,
                         cwd=self.workspace_dir,
+                        start_new_session=True,
                     )
 
                 # Create background shell and add to manager
-                bg_shell = BackgroundShell(bash_id=bash_id, command=command, process=process, start_time=time.time())
+                spill_path = None
+                if self.spill_dir:
+                    os.makedirs(self.spill_dir, exist_ok=True)
+                    if self.spill_max_age is not None:
+                        prune_spill_files(self.spill_dir, self.spill_max_age)
+                    spill_path = os.path.join(self.spill_dir, f"{bash_id}.log")
+                bg_shell = BackgroundShell(
+                    bash_id=bash_id,
+                    command=command,
+                    process=process,
+                    start_time=time.time(),
+                    namespace=self.namespace,
+                    max_lines=self.max_output_lines,
+                    max_bytes=self.max_output_bytes,
+                    spill_path=spill_path,
+                )
                 BackgroundShellManager.add(bg_shell)
 
                 # Start monitoring task
@@ -418,6 +989,9 @@ Examples:
                     bash_id=bash_id,
                 )
 
+            elif self.session_pool is not None:
+                return await self._execute_persistent(command, timeout)
+
             else:
                 # Foreground execution: Create isolated process
                 if self.is_windows:
@@ -428,35 +1002,47 @@ Examples:
                         cwd=self.workspace_dir,
                     )
                 else:
+                    # Own process group so a timeout can kill the whole pipeline
                     process = await asyncio.create_subprocess_shell(
                         shell_cmd,
                         stdout=asyncio.subprocess.PIPE,
                         stderr=asyncio.subprocess.PIPE,
                         cwd=self.workspace_dir,
+                        start_new_session=True,
                     )
 
+                # Stream output, keeping only head/tail bytes in memory
+                stdout_capture, stderr_capture = self._new_captures()
                 try:
-                    stdout, stderr = await asyncio.wait_for(process.communicate(), timeout=timeout)
+                    await asyncio.wait_for(
+                        asyncio.gather(
+                            _pump(process.stdout, stdout_capture),
+                            _pump(process.stderr, stderr_capture),
+                            process.wait(),
+                        ),
+                        timeout=timeout,
+                    )
                 except asyncio.TimeoutError:
-                    process.kill()
+                    _signal_process_group(process, _SIGKILL)
+                    # Reap the killed process so it does not linger as a zombie
+                    await process.wait()
                     if _is_bash_log_enabled():
                         _log.warning(f"[BASH_TIMEOUT] cmd={command[:200]!r} timeout={timeout}")
                     error_msg = f"Command timed out after {timeout} seconds"
                     return BashOutputResult(
                         success=False,
                         error=error_msg,
-                        stdout="",
-                        stderr=error_msg,
+                        stdout=stdout_capture.text(),
+                        stderr=stderr_capture.text(),
                         exit_code=-1,
                     )
 
-                # Decode output
-                stdout_text = stdout.decode("utf-8", errors="replace")
-                stderr_text = stderr.decode("utf-8", errors="replace")
+                stdout_text = stdout_capture.text()
+                stderr_text = stderr_capture.text()
 
                 if _is_bash_log_enabled():
                     _log.info(f"[BASH_DONE] exit_code={process.returncode} "
-                              f"stdout_len={len(stdout_text)} stderr_len={len(stderr_text)}")
+                              f"stdout_bytes={stdout_capture.total_bytes} stderr_bytes={stderr_capture.total_bytes}")
 
                 # Create result (content auto-formatted by model_validator)
                 is_success = process.returncode == 0
@@ -483,10 +1069,64 @@ Examples:
                 exit_code=-1,
             )
 
+    def _new_captures(self) -> tuple[_OutputCapture, _OutputCapture]:
+        """Create stdout/stderr captures sharing one progress reporter (if any)."""
+        progress = _ProgressReporter() if get_progress_callback() is not None else None
+        return (
+            _OutputCapture(self.output_head_bytes, self.output_tail_bytes, progress),
+            _OutputCapture(self.output_head_bytes, self.output_tail_bytes, progress),
+        )
+
+    async def _execute_persistent(self, command: str, timeout: int) -> BashOutputResult:
+        """Execute a foreground command in a pooled persistent bash session."""
+        stdout_capture, stderr_capture = self._new_captures()
+        try:
+            stdout_text, stderr_text, exit_code = await self.session_pool.run(
+                command, timeout, stdout_capture, stderr_capture
+            )
+        except PersistentShellError as e:
+            if _is_bash_log_enabled():
+                _log.warning(f"[BASH_TIMEOUT] cmd={command[:200]!r} timeout={timeout} persistent=True")
+            error_msg = f"{e} (shell session was reset)"
+            return BashOutputResult(
+                success=False,
+                error=error_msg,
+                stdout=stdout_capture.text(),
+                stderr=stderr_capture.text(),
+                exit_code=-1,
+            )
+
+        if _is_bash_log_enabled():
+            _log.info(f"[BASH_DONE] exit_code={exit_code} persistent=True "
+                      f"stdout_len={len(stdout_text)} stderr_len={len(stderr_text)}")
+
+        is_success = exit_code == 0
+        error_msg = None
+        if not is_success:
+            error_msg = f"Command failed with exit code {exit_code}"
+            if stderr_text:
+                error_msg += f"\n{stderr_text.strip()}"
+
+        return BashOutputResult(
+            success=is_success,
+            error=error_msg,
+            stdout=stdout_text,
+            stderr=stderr_text,
+            exit_code=exit_code,
+        )
+
 
 class BashOutputTool(Tool):
     """Retrieve output from background bash shells."""
 
+    def __init__(self, namespace: str = DEFAULT_NAMESPACE):
+        """Initialize BashOutputTool.
+
+        Args:
+            namespace: Namespace of the background shells this tool can read.
+        """
+        self.namespace = namespace
+
     @property
     def name(self) -> str:
         return "bash_output"
@@ -497,8 +1137,13 @@ class BashOutputTool(Tool):
 
         - Takes a bash_id parameter identifying the shell
         - Always returns only new output since the last check
+        - Output is kept in a bounded buffer; if unread lines were discarded,
+          a "[N lines dropped]" marker is returned first
         - Returns stdout and stderr output along with shell status
         - Supports optional regex filtering to show only lines matching a pattern
+        - Can block until new output arrives (wait_timeout) or until a line matches a
+          regex (wait_for), e.g. wait for "Listening on" after starting a server,
+          instead of calling this tool repeatedly
         - Use this tool when you need to monitor or check the output of a long-running shell
         - Shell IDs can be found using the bash tool with run_in_background=true
 
@@ -509,7 +1154,8 @@ class BashOutputTool(Tool):
           - "terminated": Was terminated
           - "error": Error occurred
 
-        Example: bash_output(bash_id="abc12345")"""
+        Example: bash_output(bash_id="abc12345")
+        Example: bash_output(bash_id="abc12345", wait_for="ready|error", wait_timeout=60)"""
 
     @property
     def parameters(self) -> dict[str, Any]:
@@ -524,6 +1170,14 @@ class BashOutputTool(Tool):
                     "type": "string",
                     "description": "Optional regular expression to filter the output lines. Only lines matching this regex will be included in the result. Any lines that do not match will no longer be available to read.",
                 },
+                "wait_timeout": {
+                    "type": "number",
+                    "description": "Optional: seconds to wait for new output before returning (default: 0, max: 600). Returns as soon as new output arrives or the process exits.",
+                },
+                "wait_for": {
+                    "type": "string",
+                    "description": "Optional regular expression: wait until an unread output line matches it (or the process exits, or wait_timeout expires, default 30s).",
+                },
             },
             "required": ["bash_id"],
         }
@@ -532,12 +1186,16 @@ class BashOutputTool(Tool):
         self,
         bash_id: str,
         filter_str: str | None = None,
+        wait_timeout: float | None = None,
+        wait_for: str | None = None,
     ) -> BashOutputResult:
         """Retrieve output from background shell.
 
         Args:
             bash_id: The unique identifier of the background shell
             filter_str: Optional regex pattern to filter output lines
+            wait_timeout: Seconds to wait for new output (or a wait_for match)
+            wait_for: Optional regex an unread line must match before returning
 
         Returns:
             BashOutputResult with shell output including stdout, stderr, status, and success flag
@@ -545,9 +1203,9 @@ class BashOutputTool(Tool):
 
         try:
             # Get background shell from manager
-            bg_shell = BackgroundShellManager.get(bash_id)
+            bg_shell = BackgroundShellManager.get(bash_id, self.namespace)
             if not bg_shell:
-                available_ids = BackgroundShellManager.get_available_ids()
+                available_ids = BackgroundShellManager.get_available_ids(self.namespace)
                 return BashOutputResult(
                     success=False,
                     error=f"Shell not found: {bash_id}. Available: {available_ids or 'none'}",
@@ -556,8 +1214,29 @@ class BashOutputTool(Tool):
                     exit_code=-1,
                 )
 
+            # Optionally block until output (or a matching line) arrives
+            timed_out = False
+            if wait_for or wait_timeout:
+                pattern = None
+                if wait_for:
+                    try:
+                        pattern = re.compile(wait_for)
+                    except re.error as e:
+                        return BashOutputResult(
+                            success=False,
+                            error=f"Invalid wait_for regex: {e}",
+                            stdout="",
+                            stderr="",
+                            exit_code=-1,
+                        )
+                timeout = min(max(float(wait_timeout or (30 if wait_for else 0)), 0.0), 600.0)
+                matched = await bg_shell.wait_for_output(timeout, pattern)
+                timed_out = not matched and bg_shell.status == "running"
+
             # Get new output
             new_lines = bg_shell.get_new_output(filter_pattern=filter_str)
+            if timed_out and wait_for:
+                new_lines.append(f"[wait_for {wait_for!r} not matched within {timeout:g}s]")
             stdout = "\n".join(new_lines) if new_lines else ""
 
             return BashOutputResult(
@@ -581,6 +1260,14 @@ class BashOutputTool(Tool):
 class BashKillTool(Tool):
     """Terminate a running background bash shell."""
 
+    def __init__(self, namespace: str = DEFAULT_NAMESPACE):
+        """Initialize BashKillTool.
+
+        Args:
+            namespace: Namespace of the background shells this tool can kill.
+        """
+        self.namespace = namespace
+
     @property
     def name(self) -> str:
         return "bash_kill"
@@ -623,14 +1310,14 @@ class BashKillTool(Tool):
 
         try:
             # Get remaining output before termination
-            bg_shell = BackgroundShellManager.get(bash_id)
+            bg_shell = BackgroundShellManager.get(bash_id, self.namespace)
             if bg_shell:
                 remaining_lines = bg_shell.get_new_output()
             else:
                 remaining_lines = []
 
             # Terminate through manager (handles all cleanup)
-            bg_shell = await BackgroundShellManager.terminate(bash_id)
+            bg_shell = await BackgroundShellManager.terminate(bash_id, self.namespace)
 
             # Get remaining output
             stdout = "\n".join(remaining_lines) if remaining_lines else ""
@@ -645,7 +1332,7 @@ class BashKillTool(Tool):
 
         except ValueError as e:
             # Shell not found
-            available_ids = BackgroundShellManager.get_available_ids()
+            available_ids = BackgroundShellManager.get_available_ids(self.namespace)
             return BashOutputResult(
                 success=False,
                 error=f"{str(e)}. Available: {available_ids or 'none'}",
@@ -1,16 +1,38 @@
 """MCP tool loader with real MCP client integration and timeout handling."""
 
 import asyncio
+import base64
+import hashlib
 import json
-from contextlib import AsyncExitStack
-from dataclasses import dataclass
+import mimetypes
+import os
+import re
+import time
+import uuid
+import weakref
+from collections import OrderedDict
+from contextlib import AsyncExitStack, asynccontextmanager
+from dataclasses import asdict, dataclass, field
 from pathlib import Path
-from typing import Any, Literal
+from typing import Any, Callable, Literal
 
-from mcp import ClientSession, StdioServerParameters
+import anyio
+import httpx
+import tiktoken
+from mcp import ClientSession, McpError, StdioServerParameters
 from mcp.client.sse import sse_client
 from mcp.client.stdio import stdio_client
 from mcp.client.streamable_http import streamablehttp_client
+from mcp.types import (
+    CONNECTION_CLOSED,
+    AudioContent,
+    BlobResourceContents,
+    EmbeddedResource,
+    ImageContent,
+    ResourceLink,
+    TextContent,
+    TextResourceContents,
+)
 
 from .base import Tool, ToolResult
 
@@ -57,6 +79,501 @@ def get_mcp_timeout_config() -> MCPTimeoutConfig:
     return _default_timeout_config
 
 
+@dataclass
+class MCPLazyConfig:
+    """Lazy MCP connection configuration."""
+
+    lazy: bool = False  # Connect on first tool call, using cached tool schemas
+    idle_timeout: float = 300.0  # Disconnect lazy servers idle this long (seconds, 0 disables)
+    cache_dir: str | None = None  # Directory for cached tool schemas (None disables the cache)
+
+
+# Global default lazy config
+_default_lazy_config = MCPLazyConfig()
+
+
+def set_mcp_lazy_config(
+    lazy: bool | None = None,
+    idle_timeout: float | None = None,
+    cache_dir: str | None = None,
+) -> None:
+    """Set global lazy MCP connection configuration.
+
+    Args:
+        lazy: Connect servers on first tool call instead of at startup
+        idle_timeout: Seconds of inactivity before a lazy server is shut down
+        cache_dir: Directory for the persisted tool schema cache
+    """
+    if lazy is not None:
+        _default_lazy_config.lazy = lazy
+    if idle_timeout is not None:
+        _default_lazy_config.idle_timeout = idle_timeout
+    if cache_dir is not None:
+        _default_lazy_config.cache_dir = cache_dir
+
+
+def get_mcp_lazy_config() -> MCPLazyConfig:
+    """Get current lazy MCP connection configuration."""
+    return _default_lazy_config
+
+
+@dataclass
+class MCPHealthConfig:
+    """MCP connection health check and reconnect configuration."""
+
+    health_check_interval: float = 30.0  # Seconds between pings (0 disables)
+    reconnect_initial_delay: float = 1.0  # First reconnect backoff (seconds)
+    reconnect_max_delay: float = 60.0  # Maximum reconnect backoff (seconds)
+
+
+# Global default health config
+_default_health_config = MCPHealthConfig()
+
+
+def set_mcp_health_config(
+    health_check_interval: float | None = None,
+    reconnect_initial_delay: float | None = None,
+    reconnect_max_delay: float | None = None,
+) -> None:
+    """Set global MCP health check / reconnect configuration.
+
+    Args:
+        health_check_interval: Seconds between health-check pings (0 disables)
+        reconnect_initial_delay: Backoff after the first failed reconnect
+        reconnect_max_delay: Upper bound of the exponential reconnect backoff
+    """
+    if health_check_interval is not None:
+        _default_health_config.health_check_interval = health_check_interval
+    if reconnect_initial_delay is not None:
+        _default_health_config.reconnect_initial_delay = reconnect_initial_delay
+    if reconnect_max_delay is not None:
+        _default_health_config.reconnect_max_delay = reconnect_max_delay
+
+
+def get_mcp_health_config() -> MCPHealthConfig:
+    """Get current MCP health check / reconnect configuration."""
+    return _default_health_config
+
+
+@dataclass
+class MCPConcurrencyConfig:
+    """MCP request concurrency configuration."""
+
+    max_concurrency: int = 0  # Concurrent calls per server session (0 = unlimited)
+
+
+# Global default concurrency config
+_default_concurrency_config = MCPConcurrencyConfig()
+
+
+def set_mcp_concurrency_config(max_concurrency: int | None = None) -> None:
+    """Set global MCP concurrency configuration.
+
+    Args:
+        max_concurrency: Concurrent tool calls per server session; further calls
+            queue (0 = unlimited). Overridable per server in mcp.json.
+    """
+    if max_concurrency is not None:
+        _default_concurrency_config.max_concurrency = max_concurrency
+
+
+def get_mcp_concurrency_config() -> MCPConcurrencyConfig:
+    """Get current MCP concurrency configuration."""
+    return _default_concurrency_config
+
+
+@dataclass
+class MCPResultConfig:
+    """MCP tool result size configuration."""
+
+    max_result_tokens: int = 16000  # Larger results are truncated (0 disables)
+    spill_dir: str | None = None  # Where full oversized results and binary blocks are saved
+    spill_max_age: float = 24 * 3600  # Saved files older than this many seconds are deleted (0 keeps them)
+    spill_max_bytes: int = 256 * 1024 * 1024  # Oldest saved files are deleted beyond this total (0 = unlimited)
+
+
+# Global default result config
+_default_result_config = MCPResultConfig()
+
+
+def set_mcp_result_config(
+    max_result_tokens: int | None = None,
+    spill_dir: str | None = None,
+    spill_max_age: float | None = None,
+    spill_max_bytes: int | None = None,
+) -> None:
+    """Set global MCP tool result configuration.
+
+    Args:
+        max_result_tokens: Results above this many tokens keep only their head
+            and tail (0 disables the cap)
+        spill_dir: Directory for full oversized results and images/blobs
+        spill_max_age: Seconds saved files are kept (0 keeps them)
+        spill_max_bytes: Total size of saved files before the oldest are
+            deleted (0 disables the limit)
+    """
+    if max_result_tokens is not None:
+        _default_result_config.max_result_tokens = max_result_tokens
+    if spill_dir is not None:
+        _default_result_config.spill_dir = spill_dir
+    if spill_max_age is not None:
+        _default_result_config.spill_max_age = spill_max_age
+    if spill_max_bytes is not None:
+        _default_result_config.spill_max_bytes = spill_max_bytes
+
+
+def get_mcp_result_config() -> MCPResultConfig:
+    """Get current MCP tool result configuration."""
+    return _default_result_config
+
+
+@dataclass
+class MCPTenantConfig:
+    """Per-tenant MCP session configuration (stateful servers)."""
+
+    max_idle_tenants: int = 64  # Released tenants kept before the oldest are evicted
+
+
+# Global default tenant config
+_default_tenant_config = MCPTenantConfig()
+
+
+def set_mcp_tenant_config(max_idle_tenants: int | None = None) -> None:
+    """Set global per-tenant MCP session configuration.
+
+    Args:
+        max_idle_tenants: Tenants without live agents whose sessions are kept
+            for reuse; beyond this the least recently released are closed
+    """
+    if max_idle_tenants is not None:
+        _default_tenant_config.max_idle_tenants = max_idle_tenants
+
+
+def get_mcp_tenant_config() -> MCPTenantConfig:
+    """Get current per-tenant MCP session configuration."""
+    return _default_tenant_config
+
+
+@dataclass
+class MCPCacheConfig:
+    """MCP tool result cache configuration."""
+
+    max_bytes: int = 16 * 1024 * 1024  # Budget for cached results (0 disables caching)
+
+
+# Global default cache config
+_default_cache_config = MCPCacheConfig()
+
+
+def set_mcp_cache_config(max_bytes: int | None = None) -> None:
+    """Set global MCP result cache configuration.
+
+    Args:
+        max_bytes: Total size of cached results; least recently used entries
+            are evicted beyond it (0 disables caching). Which tools are cached,
+            and for how long, is set per server in mcp.json.
+    """
+    if max_bytes is not None:
+        _default_cache_config.max_bytes = max_bytes
+        _result_cache.trim()
+
+
+def get_mcp_cache_config() -> MCPCacheConfig:
+    """Get current MCP result cache configuration."""
+    return _default_cache_config
+
+
+@dataclass
+class _CacheEntry:
+    content: str
+    size: int
+    stored_at: float
+    expires_at: float
+
+
+class MCPResultCache:
+    """LRU cache of successful MCP tool results with per-entry TTL and a byte budget."""
+
+    def __init__(self):
+        self._entries: OrderedDict[str, _CacheEntry] = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @staticmethod
+    def make_key(server_name: str, tool_name: str, arguments: dict[str, Any]) -> str:
+        """Cache key: server, tool and arguments in canonical JSON form."""
+        canonical = json.dumps(arguments, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str)
+        return f"{server_name}\x00{tool_name}\x00{canonical}"
+
+    def get(self, key: str) -> _CacheEntry | None:
+        """Return a fresh entry (marking it recently used), or None."""
+        entry = self._entries.get(key)
+        if entry is not None and entry.expires_at <= time.monotonic():
+            self._remove(key)
+            self.expirations += 1
+            entry = None
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, key: str, content: str, ttl: float) -> None:
+        """Store a result; entries larger than the whole budget are not cached."""
+        size = len(content.encode("utf-8"))
+        if ttl <= 0 or size > _default_cache_config.max_bytes:
+            return
+        self._remove(key)
+        now = time.monotonic()
+        self._entries[key] = _CacheEntry(content=content, size=size, stored_at=now, expires_at=now + ttl)
+        self.bytes += size
+        self.trim()
+
+    def trim(self) -> None:
+        """Evict least recently used entries until within the byte budget."""
+        while self._entries and self.bytes > _default_cache_config.max_bytes:
+            key = next(iter(self._entries))
+            self._remove(key)
+            self.evictions += 1
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.bytes -= entry.size
+
+    def drop_server(self, server_name: str) -> None:
+        """Drop all entries of one server (e.g. after its config changed)."""
+        prefix = f"{server_name}\x00"
+        for key in [key for key in self._entries if key.startswith(prefix)]:
+            self._remove(key)
+
+    def clear(self) -> None:
+        """Drop all entries (counters are kept)."""
+        self._entries.clear()
+        self.bytes = 0
+
+    def get_stats(self) -> dict[str, Any]:
+        """Entry count, size and hit/miss counters."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+_result_cache = MCPResultCache()
+
+
+def get_mcp_cache_stats() -> dict[str, Any]:
+    """Get MCP result cache counters."""
+    return _result_cache.get_stats()
+
+
+# tiktoken encoder, loaded on first use (False if it cannot be loaded)
+_token_encoding: Any = None
+
+
+def _count_tokens(text: str) -> int:
+    """Count tokens with tiktoken (cl100k_base), estimating if it is unavailable."""
+    global _token_encoding
+    if _token_encoding is None:
+        try:
+            _token_encoding = tiktoken.get_encoding("cl100k_base")
+        except Exception:
+            _token_encoding = False
+    if _token_encoding:
+        return len(_token_encoding.encode(text, disallowed_special=()))
+    # Rough estimation: average 2.5 characters = 1 token
+    return int(len(text) / 2.5)
+
+
+def _spill_file(prefix: str, suffix: str) -> Path | None:
+    """New unique file path in the spill directory (None if spilling is disabled)."""
+    if not _default_result_config.spill_dir:
+        return None
+    spill_dir = Path(_default_result_config.spill_dir)
+    try:
+        spill_dir.mkdir(parents=True, exist_ok=True)
+    except OSError:
+        return None
+    _prune_spill_dir(spill_dir)
+    safe_prefix = re.sub(r"[^A-Za-z0-9_.-]", "_", prefix)[:60]
+    return spill_dir / f"{safe_prefix}-{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}{suffix}"
+
+
+def _prune_spill_dir(spill_dir: Path) -> None:
+    """Delete saved files past the configured age, then the oldest beyond the size budget."""
+    config = _default_result_config
+    files = []
+    for path in spill_dir.iterdir():
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        if path.is_file():
+            files.append((stat.st_mtime, stat.st_size, path))
+    files.sort()
+
+    cutoff = time.time() - config.spill_max_age if config.spill_max_age > 0 else None
+    total = sum(size for _, size, _ in files)
+    for mtime, size, path in files:
+        expired = cutoff is not None and mtime < cutoff
+        over_budget = config.spill_max_bytes > 0 and total > config.spill_max_bytes
+        if not expired and not over_budget:
+            break
+        try:
+            path.unlink()
+        except OSError:
+            continue
+        total -= size
+
+
+def _save_binary(tool_name: str, data: str, mime_type: str | None) -> tuple[int, Path | None]:
+    """Decode a base64 block and save it to the spill directory.
+
+    Returns:
+        Tuple of (decoded size in bytes, saved path or None)
+    """
+    try:
+        raw = base64.b64decode(data)
+    except (ValueError, TypeError):
+        return len(data) * 3 // 4, None
+    path = _spill_file(tool_name, mimetypes.guess_extension(mime_type or "") or ".bin")
+    if path is not None:
+        try:
+            path.write_bytes(raw)
+        except OSError:
+            path = None
+    return len(raw), path
+
+
+def _describe_binary(kind: str, tool_name: str, data: str, mime_type: str | None, uri: str | None = None) -> str:
+    """Placeholder for an image/audio/blob block (binary data never enters the history)."""
+    size, path = _save_binary(tool_name, data, mime_type)
+    label = f"{kind} {uri}" if uri else kind
+    text = f"[{label}: {mime_type or 'unknown type'}, {size:,} bytes"
+    return text + (f", saved to {path}]" if path else "]")
+
+
+def _render_content_item(tool_name: str, item: Any) -> str:
+    """Render one MCP content block as text."""
+    if isinstance(item, TextContent):
+        return item.text
+    if isinstance(item, ImageContent):
+        return _describe_binary("image", tool_name, item.data, item.mimeType)
+    if isinstance(item, AudioContent):
+        return _describe_binary("audio", tool_name, item.data, item.mimeType)
+    if isinstance(item, EmbeddedResource):
+        resource = item.resource
+        if isinstance(resource, TextResourceContents):
+            return f"[resource {resource.uri}]\n{resource.text}"
+        if isinstance(resource, BlobResourceContents):
+            return _describe_binary("resource", tool_name, resource.blob, resource.mimeType, str(resource.uri))
+    if isinstance(item, ResourceLink):
+        description = f": {item.description}" if item.description else ""
+        return f"[resource link {item.name} ({item.uri}){description}]"
+    if hasattr(item, "text"):
+        return item.text
+    return str(item)
+
+
+def _cap_result(tool_name: str, text: str) -> str:
+    """Keep head and tail of an oversized result; save the full text to a file
+    the agent can page through with read_file."""
+    max_tokens = _default_result_config.max_result_tokens
+    # Cheap pre-check: text shorter than the budget in characters always fits
+    if max_tokens <= 0 or len(text) <= max_tokens:
+        return text
+    token_count = _count_tokens(text)
+    if token_count <= max_tokens:
+        return text
+
+    path = _spill_file(tool_name, ".txt")
+    if path is not None:
+        try:
+            path.write_text(text, encoding="utf-8")
+        except OSError:
+            path = None
+
+    # Keep head and tail: half of the budget each (with 5% safety margin)
+    chars_per_half = int((max_tokens / 2) / (token_count / len(text)) * 0.95)
+    head = text[:chars_per_half]
+    if head.rfind("\n") > 0:
+        head = head[: head.rfind("\n")]
+    tail = text[-chars_per_half:]
+    if 0 < tail.find("\n") < len(tail) - 1:
+        tail = tail[tail.find("\n") + 1 :]
+
+    note = f"\n\n... [Result truncated: {token_count} tokens -> ~{max_tokens} tokens limit"
+    if path is not None:
+        note += f"; full result saved to {path} ({text.count(chr(10)) + 1} lines), use read_file with offset/limit to page through it"
+    return head + note + "] ...\n\n" + tail
+
+
+def render_tool_result(tool_name: str, result: Any) -> str:
+    """Render an MCP CallToolResult as size-capped text."""
+    parts = [_render_content_item(tool_name, item) for item in result.content]
+    structured = getattr(result, "structuredContent", None)
+    if not parts and structured:
+        parts.append(json.dumps(structured, ensure_ascii=False, indent=2))
+    return _cap_result(tool_name, "\n".join(parts))
+
+
+@dataclass
+class MCPServerStats:
+    """Connection state and counters of one MCP server."""
+
+    # disconnected | connecting | connected | broken | failed | closed
+    state: str = "disconnected"
+    connects: int = 0
+    reconnects: int = 0
+    connect_failures: int = 0
+    connection_losses: int = 0
+    calls: int = 0
+    call_failures: int = 0
+    retries: int = 0
+    failed_pings: int = 0
+    last_error: str | None = None
+    last_connected_at: float | None = None  # Unix time
+    # Request queueing (server-wide, including pooled sessions)
+    sessions: int = 1
+    in_flight: int = 0
+    queued: int = 0
+    queue_wait_total: float = 0.0  # Seconds spent waiting for a free slot
+    queue_wait_max: float = 0.0
+
+
+def _is_connection_error(error: BaseException) -> bool:
+    """Whether an exception means the session/transport is dead (not a tool error)."""
+    if isinstance(error, McpError):
+        return error.error.code == CONNECTION_CLOSED
+    return isinstance(
+        error,
+        (
+            anyio.ClosedResourceError,
+            anyio.BrokenResourceError,
+            anyio.EndOfStream,
+            ConnectionError,
+            httpx.TransportError,
+        ),
+    )
+
+
+def _server_config_hash(server_config: dict | None) -> str:
+    """Stable hash of an mcp.json server entry (cache key for its tool schemas)."""
+    canonical = json.dumps(server_config or {}, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(canonical.encode("utf-8")).hexdigest()[:16]
+
+
 class MCPTool(Tool):
     """Wrapper for MCP tools with timeout handling."""
 
@@ -65,14 +582,24 @@ class MCPTool(Tool):
         name: str,
         description: str,
         parameters: dict[str, Any],
-        session: ClientSession,
+        session: ClientSession | None = None,
         execute_timeout: float | None = None,
+        connection: "MCPServerConnection | None" = None,
+        idempotent: bool = False,
+        cache_ttl: float = 0,
     ):
         self._name = name
         self._description = description
         self._parameters = parameters
         self._session = session
         self._execute_timeout = execute_timeout
+        # Owning connection; when set, the session is obtained from it per call
+        # so the server can be (re)connected on demand
+        self._connection = connection
+        # Safe to retry once after a lost connection
+        self.idempotent = idempotent
+        # Seconds successful results are reused for identical arguments (0 = not cached)
+        self.cache_ttl = cache_ttl
 
     @property
     def name(self) -> str:
@@ -90,22 +617,40 @@ class MCPTool(Tool):
         """Execute MCP tool via the session with timeout protection."""
         timeout = self._execute_timeout or _default_timeout_config.execute_timeout
 
+        cache_key = None
+        connection = self._connection
+        if connection is not None and connection.closed:
+            # Removed by a reload or shut down; an agent still holding the old tool must not respawn it
+            return ToolResult(
+                success=False,
+                content="",
+                error=f"MCP server '{connection.name}' has been shut down; tool '{self._name}' is no longer available.",
+            )
+        # Stateful servers answer per session, so their results are never shared
+        if self.cache_ttl > 0 and _default_cache_config.max_bytes > 0 and connection is not None and not connection.stateful:
+            cache_key = MCPResultCache.make_key(connection.name, self._name, kwargs)
+            entry = _result_cache.get(cache_key)
+            if entry is not None:
+                age = time.monotonic() - entry.stored_at
+                return ToolResult(
+                    success=True,
+                    content=f"[Cached result from {age:.0f}s ago; may be stale]\n{entry.content}",
+                )
+
         try:
-            # Wrap call_tool with timeout
-            async with asyncio.timeout(timeout):
-                result = await self._session.call_tool(self._name, arguments=kwargs)
+            if self._connection is not None:
+                result = await self._connection.call_tool(self._name, kwargs, timeout, retry=self.idempotent)
+            else:
+                # Wrap call_tool with timeout
+                async with asyncio.timeout(timeout):
+                    result = await self._session.call_tool(self._name, arguments=kwargs)
 
             # MCP tool results are a list of content items
-            content_parts = []
-            for item in result.content:
-                if hasattr(item, "text"):
-                    content_parts.append(item.text)
-                else:
-                    content_parts.append(str(item))
-
-            content_str = "\n".join(content_parts)
+            content_str = render_tool_result(self._name, result)
 
             is_error = result.isError if hasattr(result, "isError") else False
+            if cache_key is not None and not is_error:
+                _result_cache.put(cache_key, content_str, self.cache_ttl)
 
             return ToolResult(success=not is_error, content=content_str, error=None if not is_error else "Tool returned error")
 
@@ -137,6 +682,14 @@ class MCPServerConnection:
         connect_timeout: float | None = None,
         execute_timeout: float | None = None,
         sse_read_timeout: float | None = None,
+        # Lazy connection overrides (per-server)
+        lazy: bool | None = None,
+        idle_timeout: float | None = None,
+        # Concurrency (per-server)
+        max_concurrency: int | None = None,
+        pool_size: int = 1,
+        # Server keeps per-session state: one session per tenant, never pooled
+        stateful: bool = False,
     ):
         self.name = name
         self.connection_type = connection_type
@@ -155,6 +708,35 @@ class MCPServerConnection:
         self.session: ClientSession | None = None
         self.exit_stack: AsyncExitStack | None = None
         self.tools: list[MCPTool] = []
+        # Raw mcp.json entry this connection was created from (used by reload)
+        self.server_config: dict | None = None
+        # Task owning the transport (see connect())
+        self._lifecycle_task: asyncio.Task | None = None
+        self._closing: asyncio.Event | None = None
+        self._cancel_requested = False
+        # Lazy connection settings (per-server overrides)
+        self.lazy = lazy
+        self.idle_timeout = idle_timeout
+        # On-demand connection state
+        self._connect_lock = asyncio.Lock()
+        self._active_calls = 0
+        self.last_used = time.monotonic()
+        self._idle_task: asyncio.Task | None = None
+        # Health checks and reconnect backoff
+        self.stats = MCPServerStats()
+        self._health_task: asyncio.Task | None = None
+        self._next_connect_at = 0.0
+        self._consecutive_connect_failures = 0
+        # Set by close(); a closed connection is never reopened
+        self.closed = False
+        # Concurrency limit per session, and extra sessions for stateless servers
+        self.max_concurrency = max_concurrency
+        self.stateful = stateful
+        self.pool_size = 1 if stateful else max(1, pool_size)
+        self._slots: asyncio.Semaphore | None = None
+        self._in_flight = 0
+        self._replicas: list[MCPServerConnection] = []
+        self._primary: MCPServerConnection | None = None
 
     def _get_connect_timeout(self) -> float:
         """Get effective connect timeout."""
@@ -168,8 +750,367 @@ class MCPServerConnection:
         """Get effective execute timeout."""
         return self.execute_timeout or _default_timeout_config.execute_timeout
 
+    def is_lazy(self) -> bool:
+        """Whether this server is connected on demand."""
+        return _default_lazy_config.lazy if self.lazy is None else self.lazy
+
+    def _get_idle_timeout(self) -> float:
+        """Get effective idle timeout (0 disables idle shutdown)."""
+        return _default_lazy_config.idle_timeout if self.idle_timeout is None else self.idle_timeout
+
+    def _schema_cache_path(self) -> Path | None:
+        """Path of the persisted tool schemas for this server config."""
+        if not _default_lazy_config.cache_dir:
+            return None
+        return Path(_default_lazy_config.cache_dir) / f"mcp-tools-{_server_config_hash(self.server_config)}.json"
+
+    def load_cached_tools(self) -> bool:
+        """Create tools from the persisted schema cache without connecting.
+
+        Returns:
+            True if cached schemas were found
+        """
+        cache_path = self._schema_cache_path()
+        if cache_path is None or not cache_path.exists():
+            return False
+        try:
+            schemas = json.loads(cache_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return False
+        if not isinstance(schemas, list):
+            return False
+        self.tools = [self._make_tool(schema) for schema in schemas]
+        print(f"✓ Registered MCP server '{self.name}' (lazy, cached schemas) - {len(self.tools)} tools")
+        return True
+
+    def _save_tool_schemas(self, schemas: list[dict[str, Any]]) -> None:
+        """Persist listed tool schemas for later lazy startups."""
+        cache_path = self._schema_cache_path()
+        if cache_path is None:
+            return
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+            tmp_path.write_text(json.dumps(schemas, ensure_ascii=False), encoding="utf-8")
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            print(f"⚠️  Failed to write MCP schema cache ({cache_path}): {e}")
+
+    def _make_tool(self, schema: dict[str, Any]) -> MCPTool:
+        """Wrap a tool schema (name, description, parameters) as an MCPTool."""
+        return MCPTool(
+            name=schema["name"],
+            description=schema.get("description") or "",
+            parameters=schema.get("parameters") or {},
+            session=self.session,
+            execute_timeout=self._get_execute_timeout(),
+            connection=self,
+            idempotent=bool(schema.get("idempotent"))
+            or schema["name"] in (self.server_config or {}).get("idempotent_tools", []),
+            cache_ttl=self._get_cache_ttl(schema["name"]),
+        )
+
+    def _get_cache_ttl(self, tool_name: str) -> float:
+        """Result cache TTL of a tool from mcp.json: "cache_tools" {name: ttl}
+        overrides the server-wide "cache_ttl" (default 0 = not cached)."""
+        server_config = self.server_config or {}
+        per_tool = server_config.get("cache_tools") or {}
+        if tool_name in per_tool:
+            return float(per_tool[tool_name] or 0)
+        return float(server_config.get("cache_ttl") or 0)
+
+    async def _ensure_session(self) -> ClientSession:
+        """Return the live session, (re)connecting first if needed.
+
+        Failed connects back off exponentially; calls made during the backoff
+        fail fast instead of waiting for another connect timeout.
+        """
+        async with self._connect_lock:
+            if self.closed:
+                raise RuntimeError(f"MCP server '{self.name}' has been shut down")
+            if self.session is None:
+                wait = self._next_connect_at - time.monotonic()
+                if wait > 0:
+                    raise RuntimeError(
+                        f"MCP server '{self.name}' is unavailable (retrying in {wait:.0f}s, "
+                        f"last error: {self.stats.last_error})"
+                    )
+                if not await self.connect():
+                    self._consecutive_connect_failures += 1
+                    delay = min(
+                        _default_health_config.reconnect_initial_delay * 2 ** (self._consecutive_connect_failures - 1),
+                        _default_health_config.reconnect_max_delay,
+                    )
+                    self._next_connect_at = time.monotonic() + delay
+                    raise RuntimeError(f"MCP server '{self.name}' is not available")
+            return self.session
+
+    def _get_max_concurrency(self) -> int:
+        """Get effective per-session concurrency limit (0 = unlimited)."""
+        if self.max_concurrency is not None:
+            return self.max_concurrency
+        return _default_concurrency_config.max_concurrency
+
+    def _pick_member(self) -> "MCPServerConnection":
+        """Choose the pooled session with the fewest calls in flight, adding a
+        session while all existing ones are saturated and the pool has room."""
+        members = [self] + self._replicas
+        member = min(members, key=lambda m: m._in_flight)
+        limit = self._get_max_concurrency() or 1
+        if member._in_flight >= limit and len(members) < self.pool_size:
+            member = self.spawn_session()
+            self._replicas.append(member)
+            self.stats.sessions = len(self._replicas) + 1
+        return member
+
+    def spawn_session(self) -> "MCPServerConnection":
+        """Create another, not yet connected session to this server.
+
+        The new session connects on its first call and shuts down when idle;
+        its call counters are added to this connection's stats.
+        """
+        member = MCPServerConnection(
+            name=self.name,
+            connection_type=self.connection_type,
+            command=self.command,
+            args=self.args,
+            env=self.env,
+            url=self.url,
+            headers=self.headers,
+            connect_timeout=self.connect_timeout,
+            execute_timeout=self.execute_timeout,
+            sse_read_timeout=self.sse_read_timeout,
+            # Extra sessions only exist while used: connect on demand, idle out
+            lazy=True,
+            idle_timeout=self.idle_timeout,
+            max_concurrency=self.max_concurrency,
+            stateful=self.stateful,
+        )
+        member.server_config = self.server_config
+        member._primary = self
+        member.tools = [
+            member._make_tool(
+                {
+                    "name": tool.name,
+                    "description": tool.description,
+                    "parameters": tool.parameters,
+                    "idempotent": tool.idempotent,
+                }
+            )
+            for tool in self.tools
+        ]
+        return member
+
+    async def call_tool(self, name: str, arguments: dict[str, Any], timeout: float, retry: bool = False):
+        """
+        Call a tool, reconnecting if the session turns out to be dead
+
+        Calls beyond the server's max_concurrency wait in a queue (the wait does
+        not count against the execute timeout); with pool_size > 1 they are
+        spread over several sessions instead.
+
+        Args:
+            name: Tool name
+            arguments: Tool arguments
+            timeout: Execute timeout for the call itself
+            retry: Retry once on a fresh connection (only for idempotent tools)
+
+        Returns:
+            MCP CallToolResult
+        """
+        member = self._pick_member() if self.pool_size > 1 else self
+        stats = self.stats
+        member._in_flight += 1
+        stats.in_flight += 1
+        try:
+            limit = member._get_max_concurrency()
+            if limit <= 0:
+                return await member._call_tool(name, arguments, timeout, retry)
+            if member._slots is None:
+                member._slots = asyncio.Semaphore(limit)
+            stats.queued += 1
+            wait_start = time.monotonic()
+            try:
+                await member._slots.acquire()
+            finally:
+                waited = time.monotonic() - wait_start
+                stats.queued -= 1
+                stats.queue_wait_total += waited
+                stats.queue_wait_max = max(stats.queue_wait_max, waited)
+            try:
+                return await member._call_tool(name, arguments, timeout, retry)
+            finally:
+                member._slots.release()
+        finally:
+            member._in_flight -= 1
+            stats.in_flight -= 1
+
+    async def _call_tool(self, name: str, arguments: dict[str, Any], timeout: float, retry: bool):
+        """Call a tool on this session, retrying once on a new connection if allowed."""
+        # Call counters are server-wide; connection counters stay per session
+        stats = (self._primary or self).stats
+        attempts = 2 if retry else 1
+        for attempt in range(attempts):
+            session = None
+            try:
+                async with self.use() as session:
+                    async with asyncio.timeout(timeout):
+                        result = await session.call_tool(name, arguments=arguments)
+                stats.calls += 1
+                return result
+            except Exception as e:
+                stats.calls += 1
+                stats.call_failures += 1
+                if session is None or not _is_connection_error(e):
+                    raise
+                await self._mark_broken(session, e)
+                if attempt + 1 >= attempts:
+                    raise
+                stats.retries += 1
+                print(f"MCP server '{self.name}' connection lost, retrying '{name}' once")
+
+    async def _mark_broken(self, session: ClientSession, error: BaseException) -> None:
+        """Drop a dead session so the next call reconnects (no-op if already replaced)."""
+        async with self._connect_lock:
+            if self.session is not session:
+                return
+            print(f"✗ MCP server '{self.name}' connection lost: {error!r}")
+            self.stats.connection_losses += 1
+            self.stats.last_error = repr(error)
+            await self.disconnect()
+            self.stats.state = "broken"
+
+    @asynccontextmanager
+    async def use(self):
+        """Session for one tool call; the server is connected on demand and
+        lazy servers are shut down again after idle_timeout without calls."""
+        self._active_calls += 1
+        try:
+            yield await self._ensure_session()
+        finally:
+            self._active_calls -= 1
+            self.last_used = time.monotonic()
+            self._schedule_idle_shutdown()
+
+    def _schedule_idle_shutdown(self) -> None:
+        """Start the idle watcher for a connected lazy server."""
+        if not self.is_lazy() or self._get_idle_timeout() <= 0 or self.session is None:
+            return
+        if self._idle_task is None or self._idle_task.done():
+            self._idle_task = asyncio.create_task(self._idle_watch())
+
+    async def _idle_watch(self) -> None:
+        """Disconnect once no call has been made for idle_timeout seconds."""
+        idle_timeout = self._get_idle_timeout()
+        while self.session is not None:
+            remaining = self.last_used + idle_timeout - time.monotonic()
+            if remaining > 0:
+                await asyncio.sleep(remaining)
+                continue
+            async with self._connect_lock:
+                if self._active_calls == 0 and time.monotonic() - self.last_used >= idle_timeout:
+                    print(f"MCP server '{self.name}' idle for {idle_timeout}s, shutting down")
+                    self._idle_task = None
+                    await self.disconnect()
+                    return
+            await asyncio.sleep(idle_timeout)
+
     async def connect(self) -> bool:
-        """Connect to the MCP server with timeout protection."""
+        """Connect to the MCP server with timeout protection.
+
+        The transport is opened, and later closed, by a dedicated lifecycle
+        task: the anyio cancel scopes inside the MCP clients must be exited by
+        the task that entered them, while connect() may be called from
+        short-lived tasks (e.g. concurrent startup).
+        """
+        if self._lifecycle_task is not None and not self._lifecycle_task.done():
+            return self.session is not None
+
+        ready = asyncio.get_running_loop().create_future()
+        self._closing = asyncio.Event()
+        self._cancel_requested = False
+        self.stats.state = "connecting"
+        self._lifecycle_task = asyncio.create_task(self._lifecycle(ready), name=f"mcp-{self.name}")
+        try:
+            connected = await asyncio.shield(ready)
+        except asyncio.CancelledError:
+            # Caller gave up (e.g. startup deadline): abort the connection attempt
+            self._cancel_requested = True
+            self._lifecycle_task.cancel()
+            self.stats.state = "failed"
+            raise
+
+        if connected:
+            if self.stats.connects:
+                self.stats.reconnects += 1
+            self.stats.connects += 1
+            self.stats.state = "connected"
+            self.stats.last_connected_at = time.time()
+            self._consecutive_connect_failures = 0
+            self._next_connect_at = 0.0
+        else:
+            self.stats.connect_failures += 1
+            self.stats.state = "failed"
+            self._lifecycle_task = None
+        return connected
+
+    def start_health_check(self) -> None:
+        """Start periodic pings; dead sessions are dropped and eager servers reconnected."""
+        if _default_health_config.health_check_interval <= 0:
+            return
+        if self._health_task is None or self._health_task.done():
+            self._health_task = asyncio.create_task(self._health_watch())
+
+    async def _health_watch(self) -> None:
+        while True:
+            await asyncio.sleep(_default_health_config.health_check_interval)
+            session = self.session
+            if session is not None:
+                try:
+                    async with asyncio.timeout(self._get_connect_timeout()):
+                        await session.send_ping()
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    self.stats.failed_pings += 1
+                    await self._mark_broken(session, e)
+            # Eager servers are brought back in the background (lazy ones on next call)
+            if self.session is None and self.stats.state in ("broken", "failed") and not self.is_lazy():
+                try:
+                    await self._ensure_session()
+                    print(f"✓ Reconnected to MCP server '{self.name}'")
+                except Exception:
+                    pass
+
+    async def close(self) -> None:
+        """Stop health checks and disconnect for good."""
+        self.closed = True
+        if self._health_task is not None:
+            self._health_task.cancel()
+            self._health_task = None
+        replicas, self._replicas = self._replicas, []
+        await asyncio.gather(*(replica.close() for replica in replicas), return_exceptions=True)
+        self.stats.sessions = 1
+        await self.disconnect()
+        self.stats.state = "closed"
+
+    async def _lifecycle(self, ready: asyncio.Future) -> None:
+        """Open the connection, hold it until disconnect(), then close it."""
+        connected = False
+        try:
+            connected = await self._open()
+        finally:
+            if not ready.done():
+                ready.set_result(connected)
+        if not connected:
+            return
+        try:
+            await self._closing.wait()
+        finally:
+            await self._close_exit_stack()
+
+    async def _open(self) -> bool:
+        """Open transport and session, and list tools (runs in the lifecycle task)."""
         connect_timeout = self._get_connect_timeout()
 
         try:
@@ -194,18 +1135,33 @@ class MCPServerConnection:
                 # List available tools
                 tools_list = await session.list_tools()
 
+            schemas = [
+                {
+                    "name": tool.name,
+                    "description": tool.description or "",
+                    "parameters": tool.inputSchema if hasattr(tool, "inputSchema") else {},
+                    "idempotent": bool(
+                        tool.annotations and (tool.annotations.readOnlyHint or tool.annotations.idempotentHint)
+                    ),
+                }
+                for tool in tools_list.tools
+            ]
+            self._save_tool_schemas(schemas)
+
+            if self.tools:
+                # Reconnect (e.g. lazy server): keep the registered tool objects,
+                # refreshing their schemas and session
+                by_name = {schema["name"]: schema for schema in schemas}
+                for mcp_tool in self.tools:
+                    schema = by_name.get(mcp_tool.name)
+                    if schema:
+                        mcp_tool._description = schema["description"]
+                        mcp_tool._parameters = schema["parameters"]
+                    mcp_tool._session = session
+                return True
+
             # Wrap each tool with execute timeout
-            execute_timeout = self._get_execute_timeout()
-            for tool in tools_list.tools:
-                parameters = tool.inputSchema if hasattr(tool, "inputSchema") else {}
-                mcp_tool = MCPTool(
-                    name=tool.name,
-                    description=tool.description or "",
-                    parameters=parameters,
-                    session=session,
-                    execute_timeout=execute_timeout,
-                )
-                self.tools.append(mcp_tool)
+            self.tools = [self._make_tool(schema) for schema in schemas]
 
             conn_info = self.url if self.url else self.command
             print(f"✓ Connected to MCP server '{self.name}' ({self.connection_type}: {conn_info}) - loaded {len(self.tools)} tools")
@@ -216,21 +1172,41 @@ class MCPServerConnection:
 
         except TimeoutError:
             print(f"✗ Connection to MCP server '{self.name}' timed out after {connect_timeout}s")
-            if self.exit_stack:
-                await self.exit_stack.aclose()
-                self.exit_stack = None
+            self.stats.last_error = f"connect timed out after {connect_timeout}s"
+            await self._close_exit_stack()
+            return False
+
+        except asyncio.CancelledError:
+            await self._close_exit_stack()
+            if self._cancel_requested:
+                raise
+            # Cancelled from inside the transport (its task group failed)
+            print(f"✗ Failed to connect to MCP server '{self.name}': connection aborted")
+            self.stats.last_error = "connection aborted"
             return False
 
         except Exception as e:
             print(f"✗ Failed to connect to MCP server '{self.name}': {e}")
-            if self.exit_stack:
-                await self.exit_stack.aclose()
-                self.exit_stack = None
+            self.stats.last_error = repr(e)
+            await self._close_exit_stack()
             import traceback
 
             traceback.print_exc()
             return False
 
+    async def _close_exit_stack(self) -> None:
+        """Close transport and session (must run in the lifecycle task)."""
+        if self.exit_stack:
+            try:
+                await self.exit_stack.aclose()
+            except (Exception, asyncio.CancelledError):
+                # anyio cancel scopes may raise RuntimeError, ExceptionGroup or
+                # a stray cancellation while the transport is torn down.
+                pass
+            finally:
+                self.exit_stack = None
+                self.session = None
+
     async def _connect_stdio(self):
         """Connect via STDIO transport."""
         server_params = StdioServerParameters(command=self.command, args=self.args, env=self.env if self.env else None)
@@ -268,21 +1244,30 @@ class MCPServerConnection:
 
     async def disconnect(self):
         """Properly disconnect from the MCP server."""
-        if self.exit_stack:
-            try:
-                await self.exit_stack.aclose()
-            except Exception:
-                # anyio cancel scope may raise RuntimeError or ExceptionGroup
-                # when stdio_client's task group is closed from a different
-                # task context during shutdown.
-                pass
-            finally:
-                self.exit_stack = None
-                self.session = None
+        idle_task = self._idle_task
+        self._idle_task = None
+        if idle_task is not None and idle_task is not asyncio.current_task():
+            idle_task.cancel()
+        task = self._lifecycle_task
+        if task is None:
+            return
+        self._lifecycle_task = None
+        self._cancel_requested = True
+        if self._closing is not None:
+            self._closing.set()
+        if not task.done() and self.session is None:
+            # Still connecting: abort the attempt
+            task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        self.exit_stack = None
+        self.session = None
+        self.stats.state = "disconnected"
 
 
 # Global connections registry
 _mcp_connections: list[MCPServerConnection] = []
+# Background tasks attaching servers that missed the startup deadline
+_late_attach_tasks: set[asyncio.Task] = set()
 
 
 def _determine_connection_type(server_config: dict) -> ConnectionType:
@@ -327,13 +1312,17 @@ def _resolve_mcp_config_path(config_path: str) -> Path | None:
     return None
 
 
-async def load_mcp_tools_async(config_path: str = "mcp.json") -> list[Tool]:
+async def load_mcp_tools_async(
+    config_path: str = "mcp.json",
+    startup_timeout: float | None = None,
+    on_late_tools: Callable[[list[Tool]], None] | None = None,
+) -> list[Tool]:
     """
     Load MCP tools from config file.
 
     This function:
     1. Reads the MCP config file (with fallback to mcp-example.json)
-    2. Connects to each server (STDIO or URL-based)
+    2. Connects to all servers concurrently (STDIO or URL-based)
     3. Fetches tool definitions
     4. Wraps them as Tool objects
 
@@ -346,73 +1335,72 @@ async def load_mcp_tools_async(config_path: str = "mcp.json") -> list[Tool]:
     - "execute_timeout": float - Tool execution timeout in seconds
     - "sse_read_timeout": float - SSE read timeout in seconds
 
+    Result caching (optional, off by default):
+    - "cache_ttl": float - Reuse results of identical calls for this many seconds
+    - "cache_tools": {name: ttl} - Per-tool TTL, overriding cache_ttl (0 disables)
+
     Note:
     - If mcp.json is not found, will automatically fallback to mcp-example.json
     - User-specific mcp.json should be created by copying mcp-example.json
 
     Args:
         config_path: Path to MCP configuration file (default: "mcp.json")
+        startup_timeout: Global deadline in seconds for all servers (None: only
+            the per-server connect timeouts apply)
+        on_late_tools: If given, servers still connecting at the deadline keep
+            connecting in the background and their tools are passed to this
+            callback once ready; otherwise they are abandoned
 
     Returns:
         List of Tool objects representing MCP tools
     """
     global _mcp_connections
 
-    config_file = _resolve_mcp_config_path(config_path)
-
-    if config_file is None:
-        print(f"MCP config not found: {config_path}")
+    mcp_servers = _read_mcp_servers(config_path)
+    if mcp_servers is None:
         return []
 
     try:
-        with open(config_file, encoding="utf-8") as f:
-            config = json.load(f)
-
-        mcp_servers = config.get("mcpServers", {})
-
         if not mcp_servers:
             print("No MCP servers configured")
             return []
 
-        all_tools = []
-
-        # Connect to each enabled server
-        for server_name, server_config in mcp_servers.items():
-            if server_config.get("disabled", False):
-                print(f"Skipping disabled server: {server_name}")
-                continue
-
-            conn_type = _determine_connection_type(server_config)
-            url = server_config.get("url")
-            command = server_config.get("command")
-
-            # Validate config
-            if conn_type == "stdio" and not command:
-                print(f"No command specified for STDIO server: {server_name}")
-                continue
-            if conn_type in ("sse", "http", "streamable_http") and not url:
-                print(f"No url specified for {conn_type.upper()} server: {server_name}")
-                continue
+        connections = [
+            connection
+            for server_name, server_config in mcp_servers.items()
+            if (connection := _create_connection(server_name, server_config)) is not None
+        ]
+        if not connections:
+            print("\nTotal MCP tools loaded: 0")
+            return []
 
-            connection = MCPServerConnection(
-                name=server_name,
-                connection_type=conn_type,
-                command=command,
-                args=server_config.get("args", []),
-                env=server_config.get("env", {}),
-                url=url,
-                headers=server_config.get("headers", {}),
-                # Per-server timeout overrides from mcp.json
-                connect_timeout=server_config.get("connect_timeout"),
-                execute_timeout=server_config.get("execute_timeout"),
-                sse_read_timeout=server_config.get("sse_read_timeout"),
-            )
-            success = await connection.connect()
+        # Connect to all enabled servers concurrently
+        tasks = {asyncio.create_task(_start_connection(connection)): connection for connection in connections}
+        done, pending = await asyncio.wait(tasks, timeout=startup_timeout)
 
-            if success:
+        all_tools = []
+        for task in done:
+            connection = tasks[task]
+            if not task.cancelled() and task.exception() is None and task.result():
                 _mcp_connections.append(connection)
                 all_tools.extend(connection.tools)
 
+        if pending:
+            names = ", ".join(tasks[task].name for task in pending)
+            if on_late_tools is not None:
+                print(f"MCP startup deadline ({startup_timeout}s) reached, still connecting in background: {names}")
+                for task in pending:
+                    attach = asyncio.create_task(_attach_late_connection(task, tasks[task], on_late_tools))
+                    _late_attach_tasks.add(attach)
+                    attach.add_done_callback(_late_attach_tasks.discard)
+            else:
+                print(f"MCP startup deadline ({startup_timeout}s) reached, skipping: {names}")
+                for task in pending:
+                    task.cancel()
+                await asyncio.gather(*pending, return_exceptions=True)
+                for task in pending:
+                    await tasks[task].disconnect()
+
         print(f"\nTotal MCP tools loaded: {len(all_tools)}")
 
         return all_tools
@@ -425,9 +1413,355 @@ async def load_mcp_tools_async(config_path: str = "mcp.json") -> list[Tool]:
         return []
 
 
+async def _start_connection(connection: MCPServerConnection) -> bool:
+    """Register a server's tools: from the schema cache for lazy servers, else by connecting."""
+    if connection.is_lazy() and connection.load_cached_tools():
+        connection.start_health_check()
+        return True
+    if not await connection.connect():
+        return False
+    connection.start_health_check()
+    # Lazy server without cached schemas: shut it down again once idle
+    connection.last_used = time.monotonic()
+    connection._schedule_idle_shutdown()
+    return True
+
+
+async def _attach_late_connection(
+    task: asyncio.Task,
+    connection: MCPServerConnection,
+    on_late_tools: Callable[[list[Tool]], None],
+) -> None:
+    """Register a server that finished connecting after the startup deadline."""
+    try:
+        success = await task
+    except Exception:
+        success = False
+    if not success:
+        return
+    _mcp_connections.append(connection)
+    print(f"MCP server '{connection.name}' ready, attached {len(connection.tools)} tools")
+    try:
+        on_late_tools(list(connection.tools))
+    except Exception as e:
+        print(f"Failed to attach tools of MCP server '{connection.name}': {e}")
+
+
+def _read_mcp_servers(config_path: str) -> dict[str, dict] | None:
+    """Read the mcpServers section of an MCP config file (None if unavailable)."""
+    config_file = _resolve_mcp_config_path(config_path)
+
+    if config_file is None:
+        print(f"MCP config not found: {config_path}")
+        return None
+
+    try:
+        with open(config_file, encoding="utf-8") as f:
+            config = json.load(f)
+    except Exception as e:
+        print(f"Error loading MCP config: {e}")
+        return None
+
+    return config.get("mcpServers", {})
+
+
+def _create_connection(server_name: str, server_config: dict) -> MCPServerConnection | None:
+    """Create (but do not connect) a server connection from an mcp.json entry.
+
+    Returns None for disabled or invalid entries.
+    """
+    if server_config.get("disabled", False):
+        print(f"Skipping disabled server: {server_name}")
+        return None
+
+    conn_type = _determine_connection_type(server_config)
+    url = server_config.get("url")
+    command = server_config.get("command")
+
+    # Validate config
+    if conn_type == "stdio" and not command:
+        print(f"No command specified for STDIO server: {server_name}")
+        return None
+    if conn_type in ("sse", "http", "streamable_http") and not url:
+        print(f"No url specified for {conn_type.upper()} server: {server_name}")
+        return None
+
+    connection = MCPServerConnection(
+        name=server_name,
+        connection_type=conn_type,
+        command=command,
+        args=server_config.get("args", []),
+        env=server_config.get("env", {}),
+        url=url,
+        headers=server_config.get("headers", {}),
+        # Per-server timeout overrides from mcp.json
+        connect_timeout=server_config.get("connect_timeout"),
+        execute_timeout=server_config.get("execute_timeout"),
+        sse_read_timeout=server_config.get("sse_read_timeout"),
+        # Per-server lazy connection overrides from mcp.json
+        lazy=server_config.get("lazy"),
+        idle_timeout=server_config.get("idle_timeout"),
+        # Per-server concurrency from mcp.json (pool_size > 1 only for stateless servers)
+        max_concurrency=server_config.get("max_concurrency"),
+        pool_size=server_config.get("pool_size", 1),
+        stateful=bool(server_config.get("stateful", False)),
+    )
+    connection.server_config = server_config
+    return connection
+
+
+def get_mcp_tools() -> list[Tool]:
+    """Get the tools of all currently connected MCP servers."""
+    return [tool for connection in _mcp_connections for tool in connection.tools]
+
+
+def get_mcp_server_stats() -> dict[str, dict[str, Any]]:
+    """Get connection state and counters of every registered MCP server."""
+    return {connection.name: asdict(connection.stats) for connection in _mcp_connections}
+
+
+class MCPTenantLease:
+    """One agent's claim on a tenant's MCP sessions (see MCPConnectionManager.acquire)."""
+
+    def __init__(self, manager: "MCPConnectionManager", tenant_id: str):
+        self.manager = manager
+        self.tenant_id = tenant_id
+        self.released = False
+        self._finalizer: weakref.finalize | None = None
+
+    def bind_tools(self, tools: list[Tool]) -> list[Tool]:
+        """Return tools with those of stateful servers bound to this tenant's sessions."""
+        return self.manager.bind_tools(self.tenant_id, tools)
+
+    def attach(self, owner: Any) -> None:
+        """Release the lease automatically once owner (e.g. the Agent) is garbage collected."""
+        self._finalizer = weakref.finalize(owner, self.manager._release, self.tenant_id)
+
+    def release(self) -> None:
+        """Give up the claim; the tenant's sessions become eligible for eviction."""
+        if self.released:
+            return
+        self.released = True
+        if self._finalizer is not None:
+            self._finalizer.detach()
+        self.manager._release(self.tenant_id)
+
+
+@dataclass
+class _TenantSessions:
+    """Per-tenant sessions of stateful servers, keyed by server name."""
+
+    refs: int = 0
+    connections: dict[str, MCPServerConnection] = field(default_factory=dict)
+
+
+class MCPConnectionManager:
+    """Hands out MCP sessions to tenants (chats, ACP sessions).
+
+    Stateless servers are shared by everyone through the server's own
+    connection (and its session pool, see pool_size). Servers marked
+    "stateful" in mcp.json get one session per tenant instead, so state kept
+    by the server (browser pages, working directories, logins) never leaks
+    between chats. Tenant sessions connect on first use and disconnect after
+    the server's idle timeout; tenants are reference counted and, once no
+    agent holds them any more, the least recently released beyond
+    max_idle_tenants are closed.
+    """
+
+    def __init__(self):
+        self._tenants: dict[str, _TenantSessions] = {}
+        # Released tenants, least recently released first
+        self._idle: OrderedDict[str, None] = OrderedDict()
+        self._closing: set[asyncio.Task] = set()
+        # Sessions released outside an event loop, closed once a loop is available
+        self._pending_close: list[MCPServerConnection] = []
+        self.evictions = 0
+
+    def acquire(self, tenant_id: str, owner: Any = None) -> MCPTenantLease:
+        """
+        Claim a tenant's sessions
+
+        Args:
+            tenant_id: Tenant identifier (e.g. chat or session id)
+            owner: Object whose garbage collection releases the lease
+
+        Returns:
+            Lease; use bind_tools() on the agent's tools and release() when done
+        """
+        tenant = self._tenants.setdefault(tenant_id, _TenantSessions())
+        tenant.refs += 1
+        self._idle.pop(tenant_id, None)
+        lease = MCPTenantLease(self, tenant_id)
+        if owner is not None:
+            lease.attach(owner)
+        return lease
+
+    def bind_tools(self, tenant_id: str, tools: list[Tool]) -> list[Tool]:
+        """Replace tools of stateful servers by copies bound to the tenant's sessions."""
+        tenant = self._tenants.setdefault(tenant_id, _TenantSessions())
+        bound = []
+        for tool in tools:
+            connection = tool._connection if isinstance(tool, MCPTool) else None
+            if connection is None or not connection.stateful:
+                bound.append(tool)
+                continue
+            session = tenant.connections.get(connection.name)
+            if session is None or session._primary is not connection:
+                # New server, or its connection was replaced by a reload
+                if session is not None:
+                    self._close_later(session)
+                session = connection.spawn_session()
+                tenant.connections[connection.name] = session
+            bound.extend(t for t in session.tools if t.name == tool.name)
+        return bound
+
+    def _release(self, tenant_id: str) -> None:
+        tenant = self._tenants.get(tenant_id)
+        if tenant is None:
+            return
+        tenant.refs = max(0, tenant.refs - 1)
+        if tenant.refs:
+            return
+        self._idle[tenant_id] = None
+        self._idle.move_to_end(tenant_id)
+        while len(self._idle) > _default_tenant_config.max_idle_tenants:
+            evicted_id, _ = self._idle.popitem(last=False)
+            self.evict(evicted_id)
+
+    def evict(self, tenant_id: str) -> bool:
+        """Close and forget a tenant's sessions (also if still referenced).
+
+        Returns:
+            True if the tenant was known
+        """
+        self._idle.pop(tenant_id, None)
+        tenant = self._tenants.pop(tenant_id, None)
+        if tenant is None:
+            return False
+        self.evictions += 1
+        for session in tenant.connections.values():
+            self._close_later(session)
+        return True
+
+    def drop_server(self, server_name: str) -> list[MCPServerConnection]:
+        """Detach every tenant's session to a server (e.g. after its config changed).
+
+        Returns:
+            The detached sessions (still to be closed by the caller)
+        """
+        return [
+            session
+            for tenant in self._tenants.values()
+            if (session := tenant.connections.pop(server_name, None)) is not None
+        ]
+
+    def _close_later(self, session: MCPServerConnection) -> None:
+        """Close a session in the background (release may run outside a coroutine).
+
+        Without a running loop (e.g. a lease released by the garbage collector
+        in another thread) the session is kept and closed by the next call made
+        inside a loop, or by close().
+        """
+        if session._lifecycle_task is None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._pending_close.append(session)
+            print(f"MCP session to '{session.name}' released outside an event loop, closing it later")
+            return
+        sessions, self._pending_close = [*self._pending_close, session], []
+        for pending in sessions:
+            task = loop.create_task(pending.close())
+            self._closing.add(task)
+            task.add_done_callback(self._closing.discard)
+
+    def get_stats(self) -> dict[str, int]:
+        """Tenant and per-tenant session counts."""
+        sessions = [session for tenant in self._tenants.values() for session in tenant.connections.values()]
+        return {
+            "tenants": len(self._tenants),
+            "active_tenants": len(self._tenants) - len(self._idle),
+            "tenant_sessions": len(sessions),
+            "connected_tenant_sessions": sum(1 for session in sessions if session.session is not None),
+            "evictions": self.evictions,
+        }
+
+    async def close(self) -> None:
+        """Close all tenant sessions."""
+        sessions = [session for tenant in self._tenants.values() for session in tenant.connections.values()]
+        sessions.extend(self._pending_close)
+        self._pending_close.clear()
+        self._tenants.clear()
+        self._idle.clear()
+        await asyncio.gather(*(session.close() for session in sessions), *self._closing, return_exceptions=True)
+
+
+_connection_manager = MCPConnectionManager()
+
+
+def get_mcp_connection_manager() -> MCPConnectionManager:
+    """Get the process-wide MCP connection manager."""
+    return _connection_manager
+
+
+async def reload_mcp_tools(config_path: str = "mcp.json") -> list[str]:
+    """
+    Re-read the MCP config and reconnect only the servers whose entry changed.
+
+    Servers that were removed, disabled or edited are disconnected; new or
+    edited servers are connected. Unchanged servers keep their connection.
+    If the config cannot be read, the current connections are left untouched.
+
+    Args:
+        config_path: Path to MCP configuration file
+
+    Returns:
+        Sorted names of servers that were added, changed or removed
+        (use get_mcp_tools() for the resulting tool list)
+    """
+    mcp_servers = _read_mcp_servers(config_path)
+    if mcp_servers is None:
+        return []
+
+    current = {connection.name: connection for connection in _mcp_connections}
+    changed = []
+
+    for name, connection in current.items():
+        if connection.server_config != mcp_servers.get(name):
+            stale = _connection_manager.drop_server(name)
+            _result_cache.drop_server(name)
+            await asyncio.gather(connection.close(), *(session.close() for session in stale), return_exceptions=True)
+            _mcp_connections.remove(connection)
+            changed.append(name)
+
+    new_connections = []
+    for server_name, server_config in mcp_servers.items():
+        existing = current.get(server_name)
+        if existing is not None and existing.server_config == server_config:
+            continue
+        connection = _create_connection(server_name, server_config)
+        if connection is None:
+            continue
+        new_connections.append(connection)
+        if server_name not in changed:
+            changed.append(server_name)
+
+    results = await asyncio.gather(*(_start_connection(connection) for connection in new_connections), return_exceptions=True)
+    for connection, success in zip(new_connections, results):
+        if success is True:
+            _mcp_connections.append(connection)
+
+    return sorted(changed)
+
+
 async def cleanup_mcp_connections():
     """Clean up all MCP connections."""
     global _mcp_connections
-    for connection in _mcp_connections:
-        await connection.disconnect()
+    for task in list(_late_attach_tasks):
+        task.cancel()
+    await asyncio.gather(*_late_attach_tasks, return_exceptions=True)
+    await _connection_manager.close()
+    _result_cache.clear()
+    await asyncio.gather(*(connection.close() for connection in _mcp_connections), return_exceptions=True)
     _mcp_connections.clear()
@@ -0,0 +1,228 @@
+"""SQLite-backed note store for the session note tools.
+
+Notes are appended as rows instead of rewriting a JSON file, with indexes on
+category and timestamp and an FTS5 full-text index (falls back to LIKE search
+when SQLite is built without FTS5). SQLite's file locking and WAL mode make
+concurrent writers from several sessions safe. A NoteStore may be used from
+worker threads (the note tools call it through asyncio.to_thread); calls on
+one store are serialized by a lock.
+
+A legacy ``.agent_memory.json`` next to the database is imported once.
+"""
+
+import json
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS notes (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp TEXT NOT NULL,
+    category TEXT NOT NULL,
+    content TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_notes_category ON notes(category, timestamp);
+CREATE INDEX IF NOT EXISTS idx_notes_timestamp ON notes(timestamp);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS notes_fts USING fts5(
+    content, category, content='notes', content_rowid='id'
+);
+CREATE TRIGGER IF NOT EXISTS notes_fts_insert AFTER INSERT ON notes BEGIN
+    INSERT INTO notes_fts(rowid, content, category) VALUES (new.id, new.content, new.category);
+END;
+"""
+
+
+def note_db_path(memory_file: str | Path) -> Path:
+    """Map a note file path (legacy ``.json``) to its SQLite database path."""
+    path = Path(memory_file)
+    if path.suffix == ".db":
+        return path
+    return path.with_suffix(".db")
+
+
+class NoteStore:
+    """Append-only note storage with category, time and full-text indexes."""
+
+    def __init__(self, db_path: str | Path, legacy_json: str | Path | None = None):
+        """Initialize note store.
+
+        Args:
+            db_path: Path to the SQLite database (created on first write)
+            legacy_json: Optional JSON note file to import once
+        """
+        self.db_path = Path(db_path)
+        self.legacy_json = Path(legacy_json) if legacy_json else None
+        self._conn: sqlite3.Connection | None = None
+        self._lock = threading.RLock()
+        self.has_fts = False
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database, creating schema and importing legacy notes."""
+        if self._conn is not None:
+            return self._conn
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.db_path, timeout=10, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(_SCHEMA)
+        try:
+            conn.executescript(_FTS_SCHEMA)
+            self.has_fts = True
+        except sqlite3.OperationalError:
+            # SQLite built without FTS5
+            self.has_fts = False
+        self._conn = conn
+        self._import_legacy()
+        return conn
+
+    def _import_legacy(self) -> None:
+        """Import notes from the legacy JSON file once (inside one transaction)."""
+        if self.legacy_json is None or not self.legacy_json.exists():
+            return
+        conn = self._conn
+        with conn:
+            # BEGIN IMMEDIATE takes the write lock so two processes cannot both import
+            conn.execute("BEGIN IMMEDIATE")
+            key = f"legacy_import:{self.legacy_json.resolve()}"
+            if conn.execute("SELECT 1 FROM meta WHERE key = ?", (key,)).fetchone():
+                return
+            try:
+                notes = json.loads(self.legacy_json.read_text(encoding="utf-8"))
+            except Exception:
+                notes = []
+            if not isinstance(notes, list):
+                notes = []
+            conn.executemany(
+                "INSERT INTO notes (timestamp, category, content) VALUES (?, ?, ?)",
+                [
+                    (
+                        note.get("timestamp") or datetime.now().isoformat(),
+                        note.get("category") or "general",
+                        str(note.get("content", "")),
+                    )
+                    for note in notes
+                    if isinstance(note, dict)
+                ],
+            )
+            conn.execute("INSERT INTO meta (key, value) VALUES (?, ?)", (key, datetime.now().isoformat()))
+
+    @property
+    def exists(self) -> bool:
+        """Whether any notes can exist (database or legacy file present)."""
+        return self.db_path.exists() or (self.legacy_json is not None and self.legacy_json.exists())
+
+    def add(self, content: str, category: str = "general") -> dict:
+        """Append a note and return it."""
+        with self._lock:
+            conn = self._connect()
+            note = {
+                "timestamp": datetime.now().isoformat(),
+                "category": category,
+                "content": content,
+            }
+            with conn:
+                conn.execute(
+                    "INSERT INTO notes (timestamp, category, content) VALUES (:timestamp, :category, :content)",
+                    note,
+                )
+            return note
+
+    def count(self, category: str | None = None) -> int:
+        """Count notes, optionally within a category."""
+        with self._lock:
+            if not self.exists:
+                return 0
+            conn = self._connect()
+            if category:
+                return conn.execute("SELECT COUNT(*) FROM notes WHERE category = ?", (category,)).fetchone()[0]
+            return conn.execute("SELECT COUNT(*) FROM notes").fetchone()[0]
+
+    def search(
+        self,
+        query: str | None = None,
+        category: str | None = None,
+        since: str | None = None,
+        limit: int | None = None,
+    ) -> list[dict]:
+        """Find notes.
+
+        Without a query the newest ``limit`` notes are returned in chronological
+        order. With a query, notes containing any of its words are returned,
+        best matches first.
+
+        Args:
+            query: Optional free-text query
+            category: Optional category filter
+            since: Optional ISO timestamp; only notes recorded at or after it
+            limit: Maximum number of notes to return (None for all)
+        """
+        with self._lock:
+            return self._search(query, category, since, limit)
+
+    def _search(self, query: str | None, category: str | None, since: str | None, limit: int | None) -> list[dict]:
+        """Run search(); the caller holds the lock."""
+        if not self.exists:
+            return []
+        conn = self._connect()
+
+        filters, params = [], []
+        if category:
+            filters.append("notes.category = ?")
+            params.append(category)
+        if since:
+            filters.append("notes.timestamp >= ?")
+            params.append(since)
+
+        terms = query.split() if query else []
+        limit_sql = " LIMIT ?" if limit else ""
+        limit_params = [limit] if limit else []
+
+        if not terms:
+            where = f"WHERE {' AND '.join(filters)}" if filters else ""
+            rows = conn.execute(
+                f"SELECT timestamp, category, content FROM notes {where} ORDER BY id DESC{limit_sql}",
+                params + limit_params,
+            ).fetchall()
+            return [dict(row) for row in reversed(rows)]
+
+        rows = []
+        if self.has_fts:
+            match = " OR ".join('"' + term.replace('"', '""') + '"' for term in terms)
+            where = " AND ".join(["notes_fts MATCH ?"] + filters)
+            rows = conn.execute(
+                "SELECT notes.timestamp, notes.category, notes.content FROM notes_fts "
+                "JOIN notes ON notes.id = notes_fts.rowid "
+                f"WHERE {where} ORDER BY bm25(notes_fts), notes.id DESC{limit_sql}",
+                [match] + params + limit_params,
+            ).fetchall()
+
+        if not rows:
+            # Substring match: no FTS5, or text the tokenizer does not split (e.g. CJK)
+            like = " OR ".join("notes.content LIKE ? ESCAPE '\\'" for _ in terms)
+            like_params = [
+                "%" + term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%" for term in terms
+            ]
+            where = " AND ".join([f"({like})"] + filters)
+            rows = conn.execute(
+                f"SELECT timestamp, category, content FROM notes WHERE {where} ORDER BY notes.id DESC{limit_sql}",
+                like_params + params + limit_params,
+            ).fetchall()
+
+        return [dict(row) for row in rows]
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
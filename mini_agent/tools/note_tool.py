@@ -4,14 +4,20 @@ This tool allows the agent to:
 - Record key points and important information during sessions
 - Recall previously recorded notes
 - Maintain context across agent execution chains
+
+Notes are stored in a SQLite database next to ``memory_file`` (``.json`` is
+replaced by ``.db``); see note_store.NoteStore. Database work (including the
+one-time legacy JSON import) runs in a worker thread, off the event loop.
 """
 
-import json
-from datetime import datetime
+import asyncio
 from pathlib import Path
 from typing import Any
 
 from .base import Tool, ToolResult
+from .note_store import NoteStore, note_db_path
+
+DEFAULT_RECALL_LIMIT = 20
 
 
 class SessionNoteTool(Tool):
@@ -32,10 +38,12 @@ class SessionNoteTool(Tool):
         """Initialize session note tool.
 
         Args:
-            memory_file: Path to the note storage file
+            memory_file: Path to the note storage file. A legacy JSON file at
+                this path is imported into the SQLite store on first use.
         """
         self.memory_file = Path(memory_file)
-        # Lazy loading: file and directory are only created when first note is recorded
+        # Lazy loading: database and directory are only created when first used
+        self.store = NoteStore(note_db_path(self.memory_file), legacy_json=self.memory_file)
 
     @property
     def name(self) -> str:
@@ -66,28 +74,6 @@ class SessionNoteTool(Tool):
             "required": ["content"],
         }
 
-    def _load_from_file(self) -> list:
-        """Load notes from file.
-        
-        Returns empty list if file doesn't exist (lazy loading).
-        """
-        if not self.memory_file.exists():
-            return []
-        
-        try:
-            return json.loads(self.memory_file.read_text())
-        except Exception:
-            return []
-
-    def _save_to_file(self, notes: list):
-        """Save notes to file.
-        
-        Creates parent directory and file if they don't exist (lazy initialization).
-        """
-        # Ensure parent directory exists when actually saving
-        self.memory_file.parent.mkdir(parents=True, exist_ok=True)
-        self.memory_file.write_text(json.dumps(notes, indent=2, ensure_ascii=False))
-
     async def execute(self, content: str, category: str = "general") -> ToolResult:
         """Record a session note.
 
@@ -99,19 +85,8 @@ class SessionNoteTool(Tool):
             ToolResult with success status
         """
         try:
-            # Load existing notes
-            notes = self._load_from_file()
-
-            # Add new note with timestamp
-            note = {
-                "timestamp": datetime.now().isoformat(),
-                "category": category,
-                "content": content,
-            }
-            notes.append(note)
-
-            # Save back to file
-            self._save_to_file(notes)
+            # Append a timestamped note (single INSERT, no file rewrite)
+            await asyncio.to_thread(self.store.add, content, category)
 
             return ToolResult(
                 success=True,
@@ -135,6 +110,7 @@ class RecallNoteTool(Tool):
             memory_file: Path to the note storage file
         """
         self.memory_file = Path(memory_file)
+        self.store = NoteStore(note_db_path(self.memory_file), legacy_json=self.memory_file)
 
     @property
     def name(self) -> str:
@@ -143,9 +119,11 @@ class RecallNoteTool(Tool):
     @property
     def description(self) -> str:
         return (
-            "Recall all previously recorded session notes. "
+            "Recall previously recorded session notes. "
             "Use this to retrieve important information, context, or decisions "
-            "from earlier in the session or previous agent execution chains."
+            "from earlier in the session or previous agent execution chains. "
+            f"Returns the {DEFAULT_RECALL_LIMIT} most recent notes by default; "
+            "use query to search note text and category/since/limit to narrow results."
         )
 
     @property
@@ -153,56 +131,47 @@ class RecallNoteTool(Tool):
         return {
             "type": "object",
             "properties": {
+                "query": {
+                    "type": "string",
+                    "description": "Optional: search words; returns notes containing any of them, best matches first",
+                },
                 "category": {
                     "type": "string",
                     "description": "Optional: filter notes by category",
                 },
+                "since": {
+                    "type": "string",
+                    "description": "Optional: ISO date/time; only notes recorded at or after it (e.g. '2025-01-31')",
+                },
+                "limit": {
+                    "type": "integer",
+                    "description": f"Optional: maximum number of notes to return (default: {DEFAULT_RECALL_LIMIT})",
+                },
             },
         }
 
-    async def execute(self, category: str = None) -> ToolResult:
+    async def execute(
+        self,
+        category: str = None,
+        query: str = None,
+        since: str = None,
+        limit: int = DEFAULT_RECALL_LIMIT,
+    ) -> ToolResult:
         """Recall session notes.
 
         Args:
             category: Optional category filter
+            query: Optional full-text query
+            since: Optional ISO timestamp lower bound
+            limit: Maximum number of notes to return
 
         Returns:
             ToolResult with notes content
         """
         try:
-            if not self.memory_file.exists():
-                return ToolResult(
-                    success=True,
-                    content="No notes recorded yet.",
-                )
-
-            notes = json.loads(self.memory_file.read_text())
-
-            if not notes:
-                return ToolResult(
-                    success=True,
-                    content="No notes recorded yet.",
-                )
-
-            # Filter by category if specified
-            if category:
-                notes = [n for n in notes if n.get("category") == category]
-                if not notes:
-                    return ToolResult(
-                        success=True,
-                        content=f"No notes found in category: {category}",
-                    )
-
-            # Format notes for display
-            formatted = []
-            for idx, note in enumerate(notes, 1):
-                timestamp = note.get("timestamp", "unknown time")
-                cat = note.get("category", "general")
-                content = note.get("content", "")
-                formatted.append(f"{idx}. [{cat}] {content}\n   (recorded at {timestamp})")
-
-            result = "Recorded Notes:\n" + "\n".join(formatted)
-
+            limit = max(1, int(limit or DEFAULT_RECALL_LIMIT))
+            # FTS queries and the legacy import are blocking sqlite3 calls
+            result = await asyncio.to_thread(self._recall, category, query, since, limit)
             return ToolResult(success=True, content=result)
 
         except Exception as e:
@@ -211,3 +180,32 @@ class RecallNoteTool(Tool):
                 content="",
                 error=f"Failed to recall notes: {str(e)}",
             )
+
+    def _recall(self, category: str | None, query: str | None, since: str | None, limit: int) -> str:
+        """Query the store and format the matching notes (runs in a worker thread)."""
+        if not self.store.count():
+            return "No notes recorded yet."
+
+        notes = self.store.search(query=query, category=category, since=since, limit=limit)
+
+        if not notes:
+            if query:
+                return f"No notes found matching: {query}"
+            if category:
+                return f"No notes found in category: {category}"
+            return f"No notes found since: {since}"
+
+        # Format notes for display
+        formatted = []
+        for idx, note in enumerate(notes, 1):
+            timestamp = note.get("timestamp", "unknown time")
+            cat = note.get("category", "general")
+            content = note.get("content", "")
+            formatted.append(f"{idx}. [{cat}] {content}\n   (recorded at {timestamp})")
+
+        result = "Recorded Notes:\n" + "\n".join(formatted)
+        if not query and not since and len(notes) == limit:
+            matching = self.store.count(category)
+            if matching > limit:
+                result += f"\n(showing the {limit} most recent of {matching} notes; use query or limit to see others)"
+        return result
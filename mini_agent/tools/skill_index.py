@@ -0,0 +1,99 @@
+"""
+Skill Index - Lexical relevance ranking of skills
+
+BM25 over each skill's name, description and SKILL.md headings, so the agent
+can look up relevant skills instead of carrying the whole catalogue in its
+system prompt.
+"""
+
+import math
+import re
+from collections import Counter
+from typing import TYPE_CHECKING, Dict, Iterable, List, Tuple
+
+if TYPE_CHECKING:
+    from .skill_loader import Skill
+
+# Latin words / numbers, or single CJK characters (CJK text has no spaces)
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+|[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af]")
+
+# Field weights: a term in the name counts more than one in a heading
+NAME_WEIGHT = 3
+DESCRIPTION_WEIGHT = 2
+HEADING_WEIGHT = 1
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase search terms."""
+    return _TOKEN_PATTERN.findall(text.lower())
+
+
+class SkillIndex:
+    """Okapi BM25 index over skill metadata"""
+
+    def __init__(self, skills: Iterable["Skill"], k1: float = 1.5, b: float = 0.75):
+        """
+        Build the index
+
+        Args:
+            skills: Skills to index
+            k1: Term frequency saturation
+            b: Document length normalization
+        """
+        self.k1 = k1
+        self.b = b
+        self.skills: List["Skill"] = []
+        self._term_freqs: List[Counter] = []
+        self._lengths: List[int] = []
+        doc_freqs: Counter = Counter()
+
+        for skill in skills:
+            tokens = (
+                tokenize(skill.name) * NAME_WEIGHT
+                + tokenize(skill.description) * DESCRIPTION_WEIGHT
+                + tokenize(" ".join(skill.headings or [])) * HEADING_WEIGHT
+            )
+            freqs = Counter(tokens)
+            self.skills.append(skill)
+            self._term_freqs.append(freqs)
+            self._lengths.append(len(tokens))
+            doc_freqs.update(freqs.keys())
+
+        count = len(self.skills)
+        self._avg_length = sum(self._lengths) / count if count else 0.0
+        self._idf: Dict[str, float] = {
+            term: math.log(1 + (count - freq + 0.5) / (freq + 0.5)) for term, freq in doc_freqs.items()
+        }
+
+    def __len__(self) -> int:
+        return len(self.skills)
+
+    def search(self, query: str, limit: int = 5) -> List[Tuple["Skill", float]]:
+        """
+        Rank skills against a query
+
+        Args:
+            query: Free-text query
+            limit: Maximum number of results
+
+        Returns:
+            List of (skill, score), best match first; skills sharing no term
+            with the query are omitted
+        """
+        terms = [term for term in set(tokenize(query)) if term in self._idf]
+        if not terms or limit <= 0:
+            return []
+
+        results = []
+        for skill, freqs, length in zip(self.skills, self._term_freqs, self._lengths):
+            score = 0.0
+            norm = self.k1 * (1 - self.b + self.b * length / self._avg_length) if self._avg_length else self.k1
+            for term in terms:
+                tf = freqs.get(term)
+                if tf:
+                    score += self._idf[term] * tf * (self.k1 + 1) / (tf + norm)
+            if score > 0:
+                results.append((skill, score))
+
+        results.sort(key=lambda item: (-item[1], item[0].name))
+        return results[:limit]
@@ -4,25 +4,83 @@ Skill Loader - Load Claude Skills
 Supports loading skills from SKILL.md files and providing them to Agent
 """
 
+import hashlib
+import json
+import os
 import re
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 
 import yaml
 
+from .skill_index import SkillIndex
+
+# Bump when the index entry format changes
+SKILL_INDEX_VERSION = 2
+
+# Markdown headings of SKILL.md, indexed for search_skills
+_HEADING_PATTERN = re.compile(r"^#{1,6}\s+(.+?)\s*#*\s*$", re.MULTILINE)
+MAX_INDEXED_HEADINGS = 50
+
 
 @dataclass
 class Skill:
-    """Skill data structure"""
+    """Skill data structure
+
+    ``content`` may be lazy: skills found by ``discover_skills`` carry a
+    ``content_loader`` and only read and process SKILL.md on first access.
+    """
 
     name: str
     description: str
-    content: str
+    _content: Optional[str] = field(default=None, repr=False)
     license: Optional[str] = None
     allowed_tools: Optional[List[str]] = None
     metadata: Optional[Dict[str, str]] = None
     skill_path: Optional[Path] = None
+    content_loader: Optional[Callable[[], str]] = field(default=None, repr=False, compare=False)
+    headings: List[str] = field(default_factory=list, repr=False)
+
+    # Explicit so the constructor takes content= while the field stays private
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        content: Optional[str] = None,
+        license: Optional[str] = None,
+        allowed_tools: Optional[List[str]] = None,
+        metadata: Optional[Dict[str, str]] = None,
+        skill_path: Optional[Path] = None,
+        content_loader: Optional[Callable[[], str]] = None,
+        headings: Optional[List[str]] = None,
+    ):
+        self.name = name
+        self.description = description
+        self._content = content
+        self.license = license
+        self.allowed_tools = allowed_tools
+        self.metadata = metadata
+        self.skill_path = skill_path
+        self.content_loader = content_loader
+        self.headings = headings if headings is not None else []
+
+    @property
+    def content(self) -> str:
+        """Full skill content, loaded on first access for lazy skills."""
+        if self._content is None and self.content_loader is not None:
+            self._content = self.content_loader()
+            self.content_loader = None
+        return self._content or ""
+
+    @content.setter
+    def content(self, value: Optional[str]) -> None:
+        self._content = value
+
+    @property
+    def content_loaded(self) -> bool:
+        """Whether the full content has been loaded."""
+        return self._content is not None or self.content_loader is None
 
     def to_prompt(self) -> str:
         """Convert skill to prompt format"""
@@ -47,15 +105,90 @@ All files and references in this skill are relative to this directory.
 class SkillLoader:
     """Skill loader"""
 
-    def __init__(self, skills_dir: str = "./skills"):
+    def __init__(self, skills_dir: str = "./skills", cache_dir: Optional[str] = None):
         """
         Initialize Skill Loader
 
         Args:
             skills_dir: Skills directory path
+            cache_dir: Optional directory for the persistent skill index. When set,
+                       skill metadata is reused across runs and only changed
+                       SKILL.md files are parsed again.
         """
         self.skills_dir = Path(skills_dir)
         self.loaded_skills: Dict[str, Skill] = {}
+        # Put only a pointer to search_skills in the system prompt instead of every skill
+        self.search_enabled = False
+        # Search index and the loaded_skills dict it was built from
+        self._search_index: Optional[SkillIndex] = None
+        self._search_index_source: Optional[Dict[str, Skill]] = None
+        # In-memory copy of the skill index (relative SKILL.md path -> entry)
+        self._index: Dict[str, Dict[str, Any]] = {}
+        self.index_path: Optional[Path] = None
+        if cache_dir:
+            dir_hash = hashlib.sha1(str(self.skills_dir.resolve()).encode("utf-8")).hexdigest()[:16]
+            self.index_path = Path(cache_dir) / f"skills-index-{dir_hash}.json"
+
+    def _parse_skill_file(self, skill_path: Path) -> Optional[tuple[Dict[str, Any], str]]:
+        """
+        Read SKILL.md and split it into (frontmatter, raw body)
+
+        Returns:
+            Tuple of frontmatter dict and unprocessed body, or None if invalid
+        """
+        content = skill_path.read_text(encoding="utf-8")
+
+        # Parse YAML frontmatter
+        frontmatter_match = re.match(r"^---\n(.*?)\n---\n(.*)$", content, re.DOTALL)
+
+        if not frontmatter_match:
+            print(f"⚠️  {skill_path} missing YAML frontmatter")
+            return None
+
+        frontmatter_text = frontmatter_match.group(1)
+        skill_content = frontmatter_match.group(2).strip()
+
+        # Parse YAML
+        try:
+            frontmatter = yaml.safe_load(frontmatter_text)
+        except yaml.YAMLError as e:
+            print(f"❌ Failed to parse YAML frontmatter: {e}")
+            return None
+
+        # Required fields
+        if not isinstance(frontmatter, dict) or "name" not in frontmatter or "description" not in frontmatter:
+            print(f"⚠️  {skill_path} missing required fields (name or description)")
+            return None
+
+        return frontmatter, skill_content
+
+    @staticmethod
+    def _extract_headings(body: str) -> List[str]:
+        """Markdown headings of a SKILL.md body (used for search ranking)."""
+        return _HEADING_PATTERN.findall(body)[:MAX_INDEXED_HEADINGS]
+
+    def _load_skill_content(self, skill_path: Path) -> str:
+        """Read and process the body of SKILL.md (used for lazy content)."""
+        parsed = self._parse_skill_file(skill_path)
+        if parsed is None:
+            return ""
+        # Replace relative paths in content with absolute paths
+        # This ensures scripts and resources can be found from any working directory
+        return self._process_skill_paths(parsed[1], skill_path.parent)
+
+    @staticmethod
+    def _skill_from_metadata(meta: Dict[str, Any], skill_path: Path, content: Optional[str] = None) -> Skill:
+        """Create a Skill from frontmatter fields."""
+        return Skill(
+            name=meta["name"],
+            description=meta["description"],
+            content=content,
+            license=meta.get("license"),
+            allowed_tools=meta.get("allowed-tools"),
+            metadata=meta.get("metadata"),
+            skill_path=skill_path,
+            headings=list(meta.get("headings") or []),
+        )
 
     def load_skill(self, skill_path: Path) -> Optional[Skill]:
         """
@@ -68,49 +201,17 @@ class SkillLoader:
             Skill object, or None if loading fails
         """
         try:
-            content = skill_path.read_text(encoding="utf-8")
-
-            # Parse YAML frontmatter
-            frontmatter_match = re.match(r"^---\n(.*?)\n---\n(.*)$", content, re.DOTALL)
-
-            if not frontmatter_match:
-                print(f"⚠️  {skill_path} missing YAML frontmatter")
-                return None
-
-            frontmatter_text = frontmatter_match.group(1)
-            skill_content = frontmatter_match.group(2).strip()
-
-            # Parse YAML
-            try:
-                frontmatter = yaml.safe_load(frontmatter_text)
-            except yaml.YAMLError as e:
-                print(f"❌ Failed to parse YAML frontmatter: {e}")
+            parsed = self._parse_skill_file(skill_path)
+            if parsed is None:
                 return None
-
-            # Required fields
-            if "name" not in frontmatter or "description" not in frontmatter:
-                print(f"⚠️  {skill_path} missing required fields (name or description)")
-                return None
-
-            # Get skill directory (parent of SKILL.md)
-            skill_dir = skill_path.parent
+            frontmatter, skill_content = parsed
+            frontmatter = {**frontmatter, "headings": self._extract_headings(skill_content)}
 
             # Replace relative paths in content with absolute paths
             # This ensures scripts and resources can be found from any working directory
-            processed_content = self._process_skill_paths(skill_content, skill_dir)
-
-            # Create Skill object
-            skill = Skill(
-                name=frontmatter["name"],
-                description=frontmatter["description"],
-                content=processed_content,
-                license=frontmatter.get("license"),
-                allowed_tools=frontmatter.get("allowed-tools"),
-                metadata=frontmatter.get("metadata"),
-                skill_path=skill_path,
-            )
+            processed_content = self._process_skill_paths(skill_content, skill_path.parent)
 
-            return skill
+            return self._skill_from_metadata(frontmatter, skill_path, processed_content)
 
         except Exception as e:
             print(f"❌ Failed to load skill ({skill_path}): {e}")
@@ -191,28 +292,142 @@ class SkillLoader:
 
         return content
 
+    def _read_index(self) -> Dict[str, Dict[str, Any]]:
+        """Load the persistent skill index (empty if missing, stale or corrupt)."""
+        if self.index_path is None or not self.index_path.exists():
+            return {}
+        try:
+            data = json.loads(self.index_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+        if data.get("version") != SKILL_INDEX_VERSION:
+            return {}
+        return data.get("entries", {})
+
+    def _write_index(self, entries: Dict[str, Dict[str, Any]]) -> None:
+        """Atomically write the persistent skill index."""
+        if self.index_path is None:
+            return
+        try:
+            self.index_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.index_path.with_suffix(f".{os.getpid()}.tmp")
+            tmp_path.write_text(
+                json.dumps({"version": SKILL_INDEX_VERSION, "entries": entries}, ensure_ascii=False),
+                encoding="utf-8",
+            )
+            os.replace(tmp_path, self.index_path)
+        except OSError as e:
+            print(f"⚠️  Failed to write skill index ({self.index_path}): {e}")
+
+    def _index_entry(self, skill_file: Path, stat: os.stat_result) -> Dict[str, Any]:
+        """Parse SKILL.md frontmatter into an index entry (``meta`` is None if invalid)."""
+        try:
+            parsed = self._parse_skill_file(skill_file)
+        except Exception as e:
+            print(f"❌ Failed to load skill ({skill_file}): {e}")
+            parsed = None
+        meta = None
+        if parsed is not None:
+            frontmatter = parsed[0]
+            meta = {
+                key: frontmatter.get(key)
+                for key in ("name", "description", "license", "allowed-tools", "metadata")
+            }
+            meta["headings"] = self._extract_headings(parsed[1])
+        return {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "meta": meta}
+
+    def _scan(
+        self, index: Dict[str, Dict[str, Any]], reuse: Dict[Path, Skill]
+    ) -> tuple[Dict[str, Dict[str, Any]], List[Skill]]:
+        """
+        Walk the skills directory, re-parsing only SKILL.md files whose mtime or
+        size differ from index. Skill objects in reuse (keyed by path) are kept
+        for unchanged files so their already loaded content is not read again.
+
+        Returns:
+            Tuple of (new index, skills)
+        """
+        new_index: Dict[str, Dict[str, Any]] = {}
+        skills = []
+
+        # Recursively find all SKILL.md files
+        for skill_file in self.skills_dir.rglob("SKILL.md"):
+            try:
+                stat = skill_file.stat()
+            except OSError:
+                continue
+            key = str(skill_file.relative_to(self.skills_dir))
+            entry = index.get(key)
+            unchanged = entry and entry.get("mtime_ns") == stat.st_mtime_ns and entry.get("size") == stat.st_size
+            if not unchanged:
+                entry = self._index_entry(skill_file, stat)
+            new_index[key] = entry
+
+            meta = entry["meta"]
+            if not meta:
+                continue
+            skill = reuse.get(skill_file) if unchanged else None
+            if skill is None:
+                skill = self._skill_from_metadata(meta, skill_file)
+                skill.content_loader = lambda path=skill_file: self._load_skill_content(path)
+            skills.append(skill)
+
+        return new_index, skills
+
     def discover_skills(self) -> List[Skill]:
         """
         Discover and load all skills in the skills directory
 
+        Only frontmatter is parsed here; each skill's content is loaded lazily
+        on first access. With a cache_dir, frontmatter of SKILL.md files whose
+        mtime and size are unchanged is taken from the persistent index.
+
         Returns:
             List of Skills
         """
-        skills = []
-
         if not self.skills_dir.exists():
             print(f"⚠️  Skills directory does not exist: {self.skills_dir}")
-            return skills
+            return []
 
-        # Recursively find all SKILL.md files
-        for skill_file in self.skills_dir.rglob("SKILL.md"):
-            skill = self.load_skill(skill_file)
-            if skill:
-                skills.append(skill)
-                self.loaded_skills[skill.name] = skill
+        index = self._index or self._read_index()
+        new_index, skills = self._scan(index, {})
+        for skill in skills:
+            self.loaded_skills[skill.name] = skill
+
+        self._index = new_index
+        if new_index != index:
+            self._write_index(new_index)
 
         return skills
 
+    def refresh(self) -> List[str]:
+        """
+        Re-scan the skills directory and reload only changed skills
+
+        Added, edited and removed SKILL.md files are picked up; unchanged skills
+        keep their Skill objects. ``loaded_skills`` is replaced in one
+        assignment, so readers never see a half-updated catalogue.
+
+        Returns:
+            Sorted names of skills that were added, changed or removed
+        """
+        old_skills = self.loaded_skills
+        if not self.skills_dir.exists():
+            new_index, skills = {}, []
+        else:
+            reuse = {skill.skill_path: skill for skill in old_skills.values() if skill.skill_path}
+            new_index, skills = self._scan(self._index, reuse)
+
+        new_skills = {skill.name: skill for skill in skills}
+        changed = {name for name in old_skills.keys() | new_skills.keys() if old_skills.get(name) is not new_skills.get(name)}
+
+        self.loaded_skills = new_skills
+        if new_index != self._index:
+            self._index = new_index
+            self._write_index(new_index)
+
+        return sorted(changed)
+
     def get_skill(self, name: str) -> Optional[Skill]:
         """
         Get loaded skill
@@ -234,17 +449,46 @@ class SkillLoader:
         """
         return list(self.loaded_skills.keys())
 
+    def search_skills(self, query: str, limit: int = 5) -> List[tuple[Skill, float]]:
+        """
+        Rank loaded skills by relevance to a query (BM25 over name, description
+        and headings)
+
+        Args:
+            query: Free-text description of the task
+            limit: Maximum number of results
+
+        Returns:
+            List of (skill, score), best match first
+        """
+        # refresh() replaces loaded_skills, which invalidates the index
+        if self._search_index is None or self._search_index_source is not self.loaded_skills:
+            self._search_index_source = self.loaded_skills
+            self._search_index = SkillIndex(self.loaded_skills.values())
+        return self._search_index.search(query, limit)
+
     def get_skills_metadata_prompt(self) -> str:
         """
         Generate prompt containing ONLY metadata (name + description) for all skills.
         This implements Progressive Disclosure - Level 1.
 
+        With search_enabled, only a fixed pointer to the search_skills tool is
+        returned, so the prompt does not grow (or change) with the catalogue.
+
         Returns:
             Metadata-only prompt string
         """
         if not self.loaded_skills:
             return ""
 
+        if self.search_enabled:
+            return (
+                "## Available Skills\n\n"
+                "You have access to specialized skills. Each skill provides expert guidance for specific tasks.\n"
+                "Use `search_skills` with a short description of the task to find relevant skills, "
+                "then load one with `get_skill`."
+            )
+
         prompt_parts = ["## Available Skills\n"]
         prompt_parts.append("You have access to specialized skills. Each skill provides expert guidance for specific tasks.\n")
         prompt_parts.append("Load a skill's full content using the appropriate skill tool when needed.\n")
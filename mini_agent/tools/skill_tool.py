@@ -54,23 +54,84 @@ class GetSkillTool(Tool):
         return ToolResult(success=True, content=result)
 
 
+class SearchSkillsTool(Tool):
+    """Tool to find the skills most relevant to a task"""
+
+    MAX_LIMIT = 20
+
+    def __init__(self, skill_loader: SkillLoader):
+        self.skill_loader = skill_loader
+
+    @property
+    def name(self) -> str:
+        return "search_skills"
+
+    @property
+    def description(self) -> str:
+        return (
+            "Search available skills by relevance to a task. Returns the best matching skill names "
+            "and descriptions; load one with get_skill"
+        )
+
+    @property
+    def parameters(self) -> Dict[str, Any]:
+        return {
+            "type": "object",
+            "properties": {
+                "query": {
+                    "type": "string",
+                    "description": "Keywords describing the task (e.g. 'fill pdf form', 'create pptx slides')",
+                },
+                "limit": {
+                    "type": "integer",
+                    "description": f"Maximum number of skills to return (default: 5, max: {self.MAX_LIMIT})",
+                    "default": 5,
+                },
+            },
+            "required": ["query"],
+        }
+
+    async def execute(self, query: str, limit: int = 5) -> ToolResult:
+        """Return the top matching skills"""
+        limit = max(1, min(int(limit), self.MAX_LIMIT))
+        results = self.skill_loader.search_skills(query, limit)
+
+        if not results:
+            return ToolResult(
+                success=True,
+                content=f"No skills matched '{query}'. Try different keywords.",
+            )
+
+        lines = [f"Top {len(results)} skills for '{query}':"]
+        for skill, score in results:
+            lines.append(f"- `{skill.name}` (score {score:.2f}): {skill.description}")
+        return ToolResult(success=True, content="\n".join(lines))
+
+
 def create_skill_tools(
     skills_dir: str = "./skills",
+    cache_dir: Optional[str] = None,
+    enable_search: bool = False,
 ) -> tuple[List[Tool], Optional[SkillLoader]]:
     """
     Create skill tool for Progressive Disclosure
 
-    Only provides get_skill tool - the agent uses metadata in system prompt
-    to know what skills are available, then loads them on-demand.
+    By default only provides get_skill tool - the agent uses metadata in system
+    prompt to know what skills are available, then loads them on-demand.
+    With enable_search, search_skills is added and the system prompt carries
+    only a pointer to it instead of the full skill list.
 
     Args:
         skills_dir: Skills directory path
+        cache_dir: Optional directory for the persistent skill index
+        enable_search: Add search_skills and use the compact skills prompt
 
     Returns:
         Tuple of (list of tools, skill loader)
     """
     # Create skill loader
-    loader = SkillLoader(skills_dir)
+    loader = SkillLoader(skills_dir, cache_dir=cache_dir)
+    loader.search_enabled = enable_search
 
     # Discover and load skills
     skills = loader.discover_skills()
@@ -80,5 +141,7 @@ def create_skill_tools(
     tools = [
         GetSkillTool(loader),
     ]
+    if enable_search:
+        tools.append(SearchSkillsTool(loader))
 
     return tools, loader
@@ -4,6 +4,7 @@ Agent Team 讨论脚本
 
 使用方法:
     python run_discussion.py --topic "你的话题" --rounds 3
+    python run_discussion.py --topics-file topics.txt --rounds 2 --output results.jsonl
 
 Agent 配置从 mini_agent/agents/agents.yaml 加载。
 性格模板从 mini_agent/agents/personalities/ 加载。
@@ -12,8 +13,9 @@ Agent 配置从 mini_agent/agents/agents.yaml 加载。
 import asyncio
 import argparse
 from typing import Optional
-from mini_agent.agent_team import AgentTeam, load_agent_team_config, DiscussionMode
-from mini_agent.agents import AgentConfigLoader
+from mini_agent.agent_team import AgentTeam, ConvergenceDetector, load_agent_team_config, DiscussionMode
+from mini_agent.agent_team.batch import BatchRunner, load_topics
+from mini_agent.agents import get_agent_loader
 
 
 # ============================================================
@@ -91,50 +93,27 @@ PROVIDER_MODEL_HINTS = {
 }
 
 
-async def run_discussion(topic: str, rounds: int, mode: str, config_path: str = None):
-    """运行讨论
-
-    Args:
-        topic: 讨论话题
-        rounds: 讨论回合数
-        mode: 讨论模式 (concurrent 或 debate)
-        config_path: 配置文件路径 (可选)
-    """
-    # Parse mode
-    discussion_mode = DiscussionMode.CONCURRENT if mode == "concurrent" else DiscussionMode.DEBATE
-
-    # 从配置文件加载 agent team 配置
-    team_config = load_agent_team_config(config_path) if config_path else load_agent_team_config()
-
-    # 尝试从 agents.yaml 加载 agent 定义
-    loader = AgentConfigLoader()
-    loader.load_personality_templates()
-    agent_defs = loader.load_agents()
-
-    # 确定 agent 数量
+def build_team(
+    team_config,
+    loader,
+    agent_defs,
+    discussion_mode: DiscussionMode,
+    verbose: bool = False,
+    converge_threshold: float = None,
+) -> AgentTeam:
+    """创建聊天室并添加 Agent (agents.yaml 优先, 否则使用 legacy 配置)"""
     agent_count = len(agent_defs) if agent_defs else len(LEGACY_AGENTS)
-
-    print("=" * 60)
-    print("Agent Team 讨论程序")
-    print("=" * 60)
-    print(f"话题: {topic}")
-    print(f"回合数: {rounds}")
-    print(f"讨论模式: {'并发 (concurrent)' if mode == 'concurrent' else '辩论 (debate)'}")
-    print(f"Agent 数量: {agent_count}")
-    print(f"配置来源: {'agents.yaml' if agent_defs else 'legacy (硬编码)'}")
-    print("-" * 60)
-
-    # 创建聊天室
     team = AgentTeam(
         name="讨论室",
         max_agents=agent_count,
         timeout=team_config.timeout if team_config else 60.0,
         providers_config=team_config.providers_config if team_config else None,
         discussion_mode=discussion_mode,
+        convergence=ConvergenceDetector(threshold=converge_threshold) if converge_threshold is not None else None,
     )
 
-    # 添加 Agent
-    print("\n添加 Agent:")
+    if verbose:
+        print("\n添加 Agent:")
     if agent_defs:
         # 从 agents.yaml 加载
         for agent_def in agent_defs:
@@ -146,11 +125,17 @@ async def run_discussion(topic: str, rounds: int, mode: str, config_path: str =
                 personality_name=personality.name,
                 system_prompt=personality.system_prompt,
                 response_style=personality.response_style,
+                fallback_provider_id=agent_def.fallback.provider_id if agent_def.fallback else None,
+                fallback_model_name=agent_def.fallback.model_name if agent_def.fallback else None,
             )
-            print(f"  - {agent.name} (provider={agent_def.provider_id}, model={agent_def.model_name}, personality={personality.name})")
+            if verbose:
+                print(f"  - {agent.name} (provider={agent_def.provider_id}, model={agent_def.model_name}, personality={personality.name})")
+                if agent_def.fallback:
+                    print(f"    备用: provider={agent_def.fallback.provider_id}, model={agent_def.fallback.model_name}")
     else:
         # Legacy fallback
-        print("  (使用 legacy 配置)")
+        if verbose:
+            print("  (使用 legacy 配置)")
         for config in LEGACY_AGENTS:
             agent = team.add_agent(
                 name=config["name"],
@@ -160,7 +145,45 @@ async def run_discussion(topic: str, rounds: int, mode: str, config_path: str =
                 system_prompt=config["system_prompt"],
                 response_style=config.get("response_style"),
             )
-            print(f"  - {agent.name} (provider={config['provider_id']}, model={agent.config.model_name})")
+            if verbose:
+                print(f"  - {agent.name} (provider={config['provider_id']}, model={agent.config.model_name})")
+    return team
+
+
+async def run_discussion(topic: str, rounds: int, mode: str, config_path: str = None, converge_threshold: float = None):
+    """运行讨论
+
+    Args:
+        topic: 讨论话题
+        rounds: 讨论回合数
+        mode: 讨论模式 (concurrent 或 debate)
+        config_path: 配置文件路径 (可选)
+        converge_threshold: 收敛阈值 (可选, 设置后讨论收敛即提前结束)
+    """
+    # Parse mode
+    discussion_mode = DiscussionMode.CONCURRENT if mode == "concurrent" else DiscussionMode.DEBATE
+
+    # 从配置文件加载 agent team 配置
+    team_config = load_agent_team_config(config_path) if config_path else load_agent_team_config()
+
+    # 尝试从 agents.yaml 加载 agent 定义
+    loader = get_agent_loader()
+    agent_defs = loader.load_agents()
+
+    # 确定 agent 数量
+    agent_count = len(agent_defs) if agent_defs else len(LEGACY_AGENTS)
+
+    print("=" * 60)
+    print("Agent Team 讨论程序")
+    print("=" * 60)
+    print(f"话题: {topic}")
+    print(f"回合数: {rounds}")
+    print(f"讨论模式: {'并发 (concurrent)' if mode == 'concurrent' else '辩论 (debate)'}")
+    print(f"Agent 数量: {agent_count}")
+    print(f"配置来源: {'agents.yaml' if agent_defs else 'legacy (硬编码)'}")
+    print("-" * 60)
+
+    team = build_team(team_config, loader, agent_defs, discussion_mode, verbose=True, converge_threshold=converge_threshold)
 
     # 开始讨论
     print("\n" + "=" * 60)
@@ -186,12 +209,19 @@ async def run_discussion(topic: str, rounds: int, mode: str, config_path: str =
         print("\n" + "-" * 60)
         print(f"本轮结束。共享记忆消息数: {team.chatroom.memory.count()}")
 
+        if team.converged:
+            print(f"讨论已收敛, 提前结束 (第 {round_num} 轮)")
+            break
+
     # 总结
     print("\n" + "=" * 60)
     print("讨论结束")
     print("=" * 60)
     print(f"总回合数: {rounds}")
     print(f"总消息数: {team.chatroom.memory.count()}")
+    if team.convergence is not None:
+        stats = team.convergence.stats
+        print(f"跳过发言: {stats.skipped_turns} 次, 估计节省 tokens: {stats.tokens_saved}")
     print("\n完整对话历史:")
     for msg in team.chatroom.memory.messages:
         if msg.role == "user":
@@ -200,6 +230,44 @@ async def run_discussion(topic: str, rounds: int, mode: str, config_path: str =
             print(f"  [{msg.agent_name}]: {msg.content[:50]}...")
 
 
+async def run_batch(
+    topics_file: str,
+    rounds: int,
+    mode: str,
+    output: str,
+    checkpoint_dir: str,
+    concurrency: int,
+    llm_concurrency: int,
+    config_path: str = None,
+    converge_threshold: float = None,
+):
+    """批量运行讨论 (每个话题一场), 结果以 JSONL 追加到 output
+
+    再次使用相同的 checkpoint_dir 运行时, 已完成的话题会被跳过,
+    未完成的话题从最后完成的回合继续。
+    """
+    discussion_mode = DiscussionMode(mode)
+    team_config = load_agent_team_config(config_path) if config_path else load_agent_team_config()
+    loader = get_agent_loader()
+    agent_defs = loader.load_agents()
+
+    topics = load_topics(topics_file)
+    print(f"话题数: {len(topics)}, 回合数: {rounds}, 并发讨论数: {concurrency}, LLM 并发请求数: {llm_concurrency}")
+    runner = BatchRunner(
+        team_factory=lambda: build_team(
+            team_config, loader, agent_defs, discussion_mode, converge_threshold=converge_threshold
+        ),
+        output_path=output,
+        checkpoint_dir=checkpoint_dir,
+        rounds=rounds,
+        max_discussions=concurrency,
+        max_llm_requests=llm_concurrency,
+    )
+    summary = await runner.run(topics)
+    print(f"完成: {summary['completed']}, 跳过 (已完成): {summary['skipped']}, 失败: {summary['failed']}")
+    print(f"结果: {output}")
+
+
 def main():
     parser = argparse.ArgumentParser(description="Agent Team 讨论脚本")
     parser.add_argument("--topic", type=str, default=DEFAULT_TOPIC, help="讨论话题")
@@ -208,12 +276,19 @@ def main():
                         choices=["concurrent", "debate"], help="讨论模式: concurrent(并发) 或 debate(辩论串行)")
     parser.add_argument("--config", type=str, default=None, help="配置文件路径 (默认: mini_agent/config/config.yaml)")
     parser.add_argument("--list-agents", action="store_true", help="列出预配置的 Agent")
+    parser.add_argument("--topics-file", type=str, default=None,
+                        help="批量模式: 话题文件 (每行一个话题, 或 JSONL {\"id\", \"topic\"})")
+    parser.add_argument("--output", type=str, default="discussion_results.jsonl", help="批量模式: 结果 JSONL 文件")
+    parser.add_argument("--checkpoint-dir", type=str, default=".discussion_checkpoints",
+                        help="批量模式: 断点目录 (重新运行时从断点继续)")
+    parser.add_argument("--concurrency", type=int, default=4, help="批量模式: 同时进行的讨论数")
+    parser.add_argument("--llm-concurrency", type=int, default=8, help="批量模式: 全局 LLM 并发请求数")
+    parser.add_argument("--converge-threshold", type=float, default=None,
+                        help="收敛阈值 (0-1): 发言与上一轮的相似度达到该值视为重复, 全员重复时提前结束")
     args = parser.parse_args()
 
     if args.list_agents:
-        loader = AgentConfigLoader()
-        loader.load_personality_templates()
-        agent_defs = loader.load_agents()
+        agent_defs = get_agent_loader().load_agents()
         if agent_defs:
             print("配置的 Agent (agents.yaml):")
             for i, agent_def in enumerate(agent_defs, 1):
@@ -226,7 +301,14 @@ def main():
                 print(f"  {i}. {config['name']} (provider={config['provider_id']}, model={config['model_name']})")
         return
 
-    asyncio.run(run_discussion(args.topic, args.rounds, args.mode, args.config))
+    if args.topics_file:
+        asyncio.run(run_batch(
+            args.topics_file, args.rounds, args.mode, args.output, args.checkpoint_dir,
+            args.concurrency, args.llm_concurrency, args.config, args.converge_threshold,
+        ))
+        return
+
+    asyncio.run(run_discussion(args.topic, args.rounds, args.mode, args.config, args.converge_threshold))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,164 @@
+"""
+Test batch discussion runner
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from mini_agent.agent_team import AgentTeam, DiscussionMode
+from mini_agent.agent_team.batch import BatchRunner, load_topics
+from mini_agent.schema import LLMResponse, TokenUsage
+
+
+class FakeClient:
+    """LLM client that answers after a delay and tracks requests in flight."""
+
+    def __init__(self, name: str, tracker: dict, delay: float = 0.05, fail_on: str = None):
+        self.name = name
+        self.tracker = tracker
+        self.delay = delay
+        self.fail_on = fail_on
+
+    async def generate(self, messages):
+        self.tracker["in_flight"] += 1
+        self.tracker["peak"] = max(self.tracker["peak"], self.tracker["in_flight"])
+        try:
+            await asyncio.sleep(self.delay)
+            if self.fail_on and self.fail_on in messages[-1].content:
+                raise RuntimeError("boom")
+            self.tracker["calls"] += 1
+            return LLMResponse(
+                content=f"{self.name} on {messages[-1].content[:20]}",
+                finish_reason="stop",
+                usage=TokenUsage(prompt_tokens=10, completion_tokens=5, total_tokens=15),
+            )
+        finally:
+            self.tracker["in_flight"] -= 1
+
+
+def make_factory(tracker: dict, **client_kwargs):
+    def factory() -> AgentTeam:
+        team = AgentTeam(name="test", discussion_mode=DiscussionMode.CONCURRENT)
+        for name in ("A", "B"):
+            agent = team.add_agent(name=name, provider_id="openai", model_name="fake")
+            agent._llm_client = FakeClient(name, tracker, **client_kwargs)
+        return team
+
+    return factory
+
+
+def new_tracker() -> dict:
+    return {"in_flight": 0, "peak": 0, "calls": 0}
+
+
+def read_results(path) -> dict:
+    lines = path.read_text(encoding="utf-8").splitlines()
+    return {r["id"]: r for r in map(json.loads, lines)}
+
+
+def test_load_topics_text_and_jsonl(tmp_path):
+    """Test both topic file formats and stable ids for repeated topics"""
+    text_file = tmp_path / "topics.txt"
+    text_file.write_text("# comment\nTopic one\n\nTopic two\nTopic one\n", encoding="utf-8")
+    topics = load_topics(str(text_file))
+    assert [t.topic for t in topics] == ["Topic one", "Topic two", "Topic one"]
+    assert len({t.id for t in topics}) == 3
+    assert topics[2].id == f"{topics[0].id}-2"
+    assert load_topics(str(text_file))[1].id == topics[1].id
+
+    jsonl_file = tmp_path / "topics.jsonl"
+    jsonl_file.write_text('{"id": "q1", "topic": "First"}\n{"topic": "Second"}\n', encoding="utf-8")
+    topics = load_topics(str(jsonl_file))
+    assert topics[0].id == "q1" and topics[0].topic == "First"
+    assert topics[1].topic == "Second"
+
+
+@pytest.mark.asyncio
+async def test_llm_concurrency_is_capped_across_discussions(tmp_path):
+    """Test the shared limiter bounds requests over all running discussions"""
+    tracker = new_tracker()
+    topics_file = tmp_path / "topics.txt"
+    topics_file.write_text("\n".join(f"Topic {i}" for i in range(6)), encoding="utf-8")
+    output = tmp_path / "results.jsonl"
+
+    runner = BatchRunner(
+        make_factory(tracker),
+        output_path=str(output),
+        checkpoint_dir=str(tmp_path / "ckpt"),
+        rounds=2,
+        max_discussions=4,
+        max_llm_requests=3,
+    )
+    summary = await runner.run(load_topics(str(topics_file)))
+
+    assert summary == {"completed": 6, "skipped": 0, "failed": 0}
+    assert tracker["peak"] == 3
+    assert tracker["calls"] == 6 * 2 * 2
+
+    results = read_results(output)
+    assert len(results) == 6
+    result = next(iter(results.values()))
+    assert result["rounds"] == 2
+    assert [m["role"] for m in result["messages"]] == ["user", "agent", "agent", "agent", "agent"]
+    stats = result["agents"]["A"]
+    assert stats["calls"] == 2 and stats["failures"] == 0
+    assert stats["total_tokens"] == 30
+    assert stats["latency_avg"] >= 0.05
+
+
+@pytest.mark.asyncio
+async def test_resume_skips_finished_and_continues_partial(tmp_path):
+    """Test a rerun only does the remaining rounds of unfinished discussions"""
+    topics_file = tmp_path / "topics.txt"
+    topics_file.write_text("Good topic\nFlaky topic\n", encoding="utf-8")
+    topics = load_topics(str(topics_file))
+    output = tmp_path / "results.jsonl"
+    ckpt = tmp_path / "ckpt"
+
+    # First run: round 1 of both, then the flaky topic's team crashes
+    tracker = new_tracker()
+    factory = make_factory(tracker)
+    first = BatchRunner(factory, str(output), str(ckpt), rounds=1)
+    assert await first.run(topics) == {"completed": 2, "skipped": 0, "failed": 0}
+
+    # Second run asks for 2 rounds: nothing is done yet at that depth,
+    # but the checkpoints already hold round 1 and are marked done
+    rerun = BatchRunner(factory, str(output), str(ckpt), rounds=1)
+    assert await rerun.run(topics) == {"completed": 0, "skipped": 2, "failed": 0}
+    assert tracker["calls"] == 4
+
+    # Partial checkpoint: drop the done flag to simulate a crash after round 1 of 2
+    flaky = ckpt / f"{topics[1].id}.json"
+    state = json.loads(flaky.read_text(encoding="utf-8"))
+    del state["done"]
+    flaky.write_text(json.dumps(state), encoding="utf-8")
+
+    resumed = BatchRunner(factory, str(output), str(ckpt), rounds=2)
+    assert await resumed.run(topics) == {"completed": 1, "skipped": 1, "failed": 0}
+    assert tracker["calls"] == 6  # only round 2 of the flaky topic
+
+    lines = [json.loads(line) for line in output.read_text(encoding="utf-8").splitlines()]
+    final = lines[-1]
+    assert final["id"] == topics[1].id and final["rounds"] == 2
+    # Round 1 transcript came back from the checkpoint; topic is stored once
+    assert [m["role"] for m in final["messages"]] == ["user", "agent", "agent", "agent", "agent"]
+    assert final["agents"]["A"]["calls"] == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_agent_is_counted(tmp_path):
+    """Test agent errors show up in stats without failing the discussion"""
+    topics_file = tmp_path / "topics.txt"
+    topics_file.write_text("Please fail\n", encoding="utf-8")
+    output = tmp_path / "results.jsonl"
+
+    runner = BatchRunner(
+        make_factory(new_tracker(), fail_on="fail"), str(output), str(tmp_path / "ckpt"), rounds=1
+    )
+    assert await runner.run(load_topics(str(topics_file))) == {"completed": 1, "skipped": 0, "failed": 0}
+
+    result = next(iter(read_results(output).values()))
+    assert result["agents"]["A"]["failures"] == 1
+    assert result["agents"]["A"]["total_tokens"] == 0
@@ -0,0 +1,150 @@
+"""
+Test persistent chatroom storage
+"""
+
+import threading
+
+import pytest
+
+from mini_agent.agent_team import ChatroomManager, ChatroomStore
+from mini_agent.agent_team.memory import Memory
+
+
+def add_turns(memory: Memory, turns: int) -> None:
+    memory.add_message(role="user", content="Topic: should we rewrite the scheduler?")
+    for i in range(turns):
+        name = "Alice" if i % 2 == 0 else "Bob"
+        memory.add_message(role="agent", content=f"Turn {i}: " + "argument " * 20, agent_id=name, agent_name=name)
+
+
+def test_chatroom_survives_restart(tmp_path):
+    """Test that a reopened store restores the chatroom and renders the same context"""
+    db_path = tmp_path / "chatrooms.db"
+    manager = ChatroomManager(store=ChatroomStore(db_path))
+    chatroom = manager.create_chatroom("Scheduler", max_members=3)
+    chatroom.memory.max_tokens = 300
+    add_turns(chatroom.memory, 40)
+    expected = chatroom.memory.get_messages_for_agent("Bob")
+    manager.close()
+
+    store = ChatroomStore(db_path)
+    restored_manager = ChatroomManager(store=store)
+    assert restored_manager.list_chatroom_ids() == [chatroom.id]
+    restored = restored_manager.get_chatroom(chatroom.id)
+    assert restored.name == "Scheduler" and restored.max_members == 3
+    assert restored.memory.count() == 41
+
+    memory = Memory(max_tokens=300)
+    memory.load_from_store(store, chatroom.id, page_size=7)
+    assert memory.count() == 41
+    assert memory.get_messages_for_agent("Bob") == expected
+    # Only the topic and the context window are held in RAM
+    assert len(memory.messages) < 20
+    assert memory.messages[0].content.startswith("Topic:")
+
+
+def test_writes_are_batched(tmp_path):
+    """Test that messages are written in batches and on flush"""
+    store = ChatroomStore(tmp_path / "chatrooms.db", batch_size=5, flush_interval=3600)
+    manager = ChatroomManager(store=store)
+    memory = manager.create_chatroom("Batch").memory
+
+    add_turns(memory, 3)
+    assert store.pending_count == 4
+    memory.add_message(role="user", content="One more")
+    assert store.pending_count == 0
+
+    memory.add_message(role="user", content="Pending")
+    memory.flush()
+    assert store.pending_count == 0
+    assert store.count_messages(manager.list_chatroom_ids()[0]) == 6
+
+
+def test_streamed_and_removed_messages_are_stored(tmp_path):
+    """Test that text appended after a flush is rewritten and removed replies are deleted"""
+    store = ChatroomStore(tmp_path / "chatrooms.db")
+    manager = ChatroomManager(store=store)
+    chatroom = manager.create_chatroom("Stream")
+    memory = chatroom.memory
+
+    memory.add_message(role="user", content="Topic")
+    reply = memory.add_message(role="agent", content="", agent_name="Alice")
+    memory.flush()
+    memory.append_to_message(reply, "Hello")
+    memory.append_to_message(reply, " world")
+    empty = memory.add_message(role="agent", content="", agent_name="Bob")
+    memory.remove_message(empty)
+
+    history = store.load_messages(chatroom.id)
+    assert [(seq, m.content) for seq, m in history] == [(0, "Topic"), (1, "Hello world")]
+
+
+def test_history_pages(tmp_path):
+    """Test that history is paged from the newest messages backwards"""
+    manager = ChatroomManager(store=ChatroomStore(tmp_path / "chatrooms.db"))
+    chatroom = manager.create_chatroom("Pages")
+    add_turns(chatroom.memory, 9)
+
+    latest = manager.get_history(chatroom.id, limit=4)
+    older = manager.get_history(chatroom.id, before_seq=latest[0][0], limit=4)
+
+    assert [seq for seq, _ in latest] == [6, 7, 8, 9]
+    assert [seq for seq, _ in older] == [2, 3, 4, 5]
+    assert older[0][1].content.startswith("Turn 1:")
+
+
+def test_delete_and_limit(tmp_path):
+    """Test that the chatroom limit counts stored chatrooms and delete removes them"""
+    store = ChatroomStore(tmp_path / "chatrooms.db")
+    manager = ChatroomManager(max_chatrooms=1, store=store)
+    chatroom = manager.create_chatroom("Only")
+    chatroom.memory.add_message(role="user", content="Topic")
+
+    reopened = ChatroomManager(max_chatrooms=1, store=store)
+    with pytest.raises(ValueError):
+        reopened.create_chatroom("Second")
+
+    assert reopened.delete_chatroom(chatroom.id)
+    assert reopened.get_chatroom(chatroom.id) is None
+    assert store.count_messages(chatroom.id) == 0
+
+
+def test_flush_releases_turns_outside_window(tmp_path):
+    """Test that stored turns leave RAM on flush and later renders are unchanged"""
+    manager = ChatroomManager(store=ChatroomStore(tmp_path / "chatrooms.db"))
+    memory = manager.create_chatroom("Trim").memory
+    memory.max_tokens = 300
+    reference = Memory(max_tokens=300)
+    add_turns(memory, 40)
+    add_turns(reference, 40)
+
+    memory.flush()
+    assert len(memory.messages) < 20
+    assert memory.count() == reference.count()
+
+    reply = memory.add_message(role="agent", content="Turn 40:", agent_name="Alice")
+    memory.append_to_message(reply, " more")
+    reference.add_message(role="agent", content="Turn 40: more", agent_name="Alice")
+    assert memory.get_messages_for_agent("Alice") == reference.get_messages_for_agent("Alice")
+
+
+def test_writes_run_on_writer_thread(tmp_path):
+    """Test that message batches and discussion states are committed off the calling thread"""
+    store = ChatroomStore(tmp_path / "chatrooms.db")
+    memory = ChatroomManager(store=store).create_chatroom("Writer").memory
+    threads = []
+    original_execute = store._execute
+    original_write = store._write_messages
+    store._execute = lambda *args: threads.append(threading.current_thread()) or original_execute(*args)
+    store._write_messages = lambda rows: threads.append(threading.current_thread()) or original_write(rows)
+
+    memory.add_message(role="user", content="Topic")
+    memory.flush()
+    store.save_discussion("chat", "room", {"topic": "Topic"})
+    store.sync()
+
+    assert len(threads) == 2
+    assert threading.current_thread() not in threads
+    # Reads wait for the queued writes
+    assert store.get_discussion("chat") == ("room", {"topic": "Topic"})
+    store.close()
@@ -0,0 +1,126 @@
+"""
+Test early exit on converged discussions
+"""
+
+import pytest
+
+from mini_agent.agent_team import AgentTeam, ConvergenceDetector, DiscussionMode
+from mini_agent.agent_team.convergence import similarity
+from mini_agent.agent_team.discussion_handler import DiscussionHandler, DiscussionState, UserDiscussionSession
+
+
+def add_scripted_agent(team: AgentTeam, name: str, replies: list[str], calls: list) -> None:
+    """Agent that returns the next scripted reply (the last one repeats)."""
+    agent = team.add_agent(name=name, provider_id="openai", model_name="fake")
+
+    async def generate_response(messages):
+        calls.append(name)
+        return replies[min(len([c for c in calls if c == name]), len(replies)) - 1]
+
+    async def stream_response(messages):
+        yield await generate_response(messages)
+
+    agent.generate_response = generate_response
+    agent.stream_response = stream_response
+    agent.prepare = lambda: None
+
+
+AGREE = "I agree that we should use a message queue with idempotent consumers and retries."
+
+
+def test_similarity():
+    """Test that restatements score high and new arguments score low"""
+    assert similarity(AGREE, AGREE) == 1.0
+    assert similarity(AGREE, "Actually sharding the database matters far more than queues.") < 0.2
+    assert similarity("我们应该使用消息队列", "我们应该使用消息队列来削峰") > 0.6
+    assert similarity("", AGREE) == 0.0
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("mode", [DiscussionMode.CONCURRENT, DiscussionMode.DEBATE, DiscussionMode.STAGED])
+async def test_converged_discussion_stops_calling_agents(mode):
+    """Test that once everyone repeats the previous round, later rounds make no calls"""
+    team = AgentTeam(name="Converge", discussion_mode=mode, convergence=ConvergenceDetector(threshold=0.6))
+    calls = []
+    add_scripted_agent(team, "Alice", ["Queues help with bursts.", AGREE], calls)
+    add_scripted_agent(team, "Bob", ["Sharding helps with scale.", AGREE], calls)
+
+    for round_num in range(5):
+        await team.discuss("Topic", add_topic_to_memory=(round_num == 0))
+
+    # Staged rounds call each agent twice, so agreement is reached within the first round
+    converged_round = 2 if mode == DiscussionMode.STAGED else 3
+    calls_per_round = 2 * (2 if mode == DiscussionMode.STAGED else 1)
+    assert team.converged
+    assert team.convergence.stats.converged_round == converged_round
+    assert len(calls) == converged_round * calls_per_round
+    assert team.convergence.stats.skipped_turns == 2 * (5 - converged_round)
+    assert team.convergence.stats.tokens_saved > 0
+
+    # New user input reopens the discussion
+    await team.discuss("But what about cost?")
+    assert not team.converged
+    assert len(calls) == (converged_round + 1) * calls_per_round
+
+
+@pytest.mark.asyncio
+async def test_agent_with_nothing_new_is_skipped_until_others_move_on():
+    """Test that a repeating agent sits out while another still adds new points"""
+    team = AgentTeam(name="Skip", convergence=ConvergenceDetector(threshold=0.6))
+    calls = []
+    add_scripted_agent(team, "Alice", [AGREE], calls)
+    add_scripted_agent(
+        team, "Bob", ["Sharding first.", "Caching second.", "Replication third.", "Backups fourth."], calls
+    )
+
+    for round_num in range(4):
+        await team.discuss("Topic", add_topic_to_memory=(round_num == 0))
+
+    # Alice repeats in round 2 and skips round 3; Bob's new point brings her back in round 4
+    assert calls.count("Alice") == 3
+    assert calls.count("Bob") == 4
+    assert not team.converged
+
+
+@pytest.mark.asyncio
+async def test_judge_can_veto_convergence():
+    """Test that a judge that disagrees keeps the discussion going"""
+    verdicts = []
+
+    async def judge(transcript):
+        verdicts.append(transcript)
+        return False
+
+    team = AgentTeam(name="Judge", convergence=ConvergenceDetector(threshold=0.6, judge=judge))
+    calls = []
+    add_scripted_agent(team, "Alice", [AGREE], calls)
+
+    for round_num in range(3):
+        await team.discuss("Topic", add_topic_to_memory=(round_num == 0))
+
+    assert not team.converged
+    assert calls == ["Alice", "Alice", "Alice"]
+    assert verdicts and verdicts[0].startswith("[Alice]:")
+
+
+@pytest.mark.asyncio
+async def test_handler_reports_convergence():
+    """Test that the Feishu handler tells the user when the discussion converged"""
+    handler = DiscussionHandler(providers_config=None, loader=None, convergence_threshold=0.6)
+    team = handler._create_team("chat")
+    calls = []
+    add_scripted_agent(team, "Alice", [AGREE], calls)
+    handler._sessions["chat"] = UserDiscussionSession(
+        session_id="chat", topic="Topic", state=DiscussionState.DISCUSSING, team=team
+    )
+    sent = []
+
+    async def send_fn(text):
+        sent.append(text)
+
+    for _ in range(3):
+        await handler.handle_message("chat", "继续", send_fn)
+        await handler.wait_idle("chat")
+
+    assert calls == ["Alice", "Alice"]
+    assert "讨论已收敛" in sent[-1]
@@ -0,0 +1,134 @@
+"""
+Test streamed debate mode
+"""
+
+import asyncio
+
+import openai
+import pytest
+
+from mini_agent.agent_team import AgentTeam, DiscussionMode
+from mini_agent.agent_team.discussion_handler import DiscussionHandler, DiscussionState, UserDiscussionSession
+
+
+def make_team(replies: dict, timeout: float = 5.0) -> AgentTeam:
+    """Debate team whose agents stream canned replies chunk by chunk."""
+    team = AgentTeam(name="test", timeout=timeout, discussion_mode=DiscussionMode.DEBATE)
+    team.contexts = {}
+    for name, chunks in replies.items():
+        agent = team.add_agent(name=name, provider_id="openai", model_name="fake")
+
+        async def stream_response(messages, name=name, chunks=chunks):
+            team.contexts[name] = [m["content"] for m in messages]
+            for chunk in chunks:
+                if chunk is None:
+                    await asyncio.sleep(10)
+                yield chunk
+
+        agent.stream_response = stream_response
+        agent.prepare = lambda: None
+    return team
+
+
+@pytest.mark.asyncio
+async def test_debate_streams_deltas_into_memory():
+    """Test that deltas reach the callback and the next speaker sees the full reply"""
+    team = make_team({"Alice": ["Hello", " world"], "Bob": ["Hi"]})
+    deltas = []
+
+    async def on_delta(agent, delta):
+        deltas.append((agent.name, delta))
+
+    results = await team.discuss("Topic", on_delta=on_delta)
+
+    assert deltas == [("Alice", "Hello"), ("Alice", " world"), ("Bob", "Hi")]
+    assert [r.content for r in results] == ["Hello world", "Hi"]
+    assert all(r.success for r in results)
+    assert team.contexts["Bob"] == ["Topic", "[Alice]: Hello world"]
+    assert [m.content for m in team.chatroom.memory.messages] == ["Topic", "Hello world", "Hi"]
+
+
+@pytest.mark.asyncio
+async def test_timed_out_stream_keeps_partial_reply():
+    """Test that a reply cut off by the timeout keeps what was streamed"""
+    team = make_team({"Alice": ["Partial", None], "Bob": [None]}, timeout=0.2)
+
+    async def on_delta(agent, delta):
+        pass
+
+    results = await team.discuss("Topic", on_delta=on_delta)
+
+    assert results[0].timed_out and results[0].content == "Partial"
+    assert results[1].timed_out and results[1].content == ""
+    # Bob produced nothing, so no empty message is stored
+    assert [m.content for m in team.chatroom.memory.messages] == ["Topic", "Partial"]
+
+
+@pytest.mark.asyncio
+async def test_client_setup_failure_only_fails_that_agent():
+    """Test that a next speaker whose client cannot be built does not break the current turn"""
+    team = make_team({"Alice": ["Hello"]})
+    bob = team.add_agent(name="Bob", provider_id="openai", model_name="fake")
+
+    def prepare():
+        raise RuntimeError("Missing credentials")
+
+    bob.prepare = prepare
+
+    async def on_delta(agent, delta):
+        pass
+
+    results = await team.discuss("Topic", on_delta=on_delta)
+
+    assert results[0].success and results[0].content == "Hello"
+    assert not results[1].success and "Missing credentials" in results[1].error
+
+
+@pytest.mark.asyncio
+async def test_warm_up_opens_connection():
+    """Test that warming up the next speaker opens a connection its requests reuse"""
+    connections = []
+
+    async def handle(reader, writer):
+        connections.append(writer)
+        while await reader.readuntil(b"\r\n\r\n"):
+            writer.write(b"HTTP/1.1 404 Not Found\r\nContent-Length: 0\r\n\r\n")
+            await writer.drain()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    team = AgentTeam(name="test")
+    bob = team.add_agent(name="Bob", provider_id="openai", model_name="fake")
+    bob.config.api_url = f"http://127.0.0.1:{port}/v1"
+    bob.config.api_key = "test-key"
+    try:
+        bob.warm_up()
+        await bob._warm_up_task
+        assert len(connections) == 1
+
+        # The SDK client sends its requests over the warmed connection
+        with pytest.raises(openai.NotFoundError):
+            await bob.prepare()._client.client.models.list()
+        assert len(connections) == 1
+    finally:
+        server.close()
+
+
+@pytest.mark.asyncio
+async def test_discussion_round_sends_paragraphs_as_they_complete():
+    """Test that Feishu discussion rounds send long replies in paragraph chunks"""
+    first = "A" * 250
+    team = make_team({"Alice": [first, "\n\n", "second paragraph"]})
+    handler = DiscussionHandler(providers_config=None, loader=None)
+    session = UserDiscussionSession(session_id="chat", topic="Topic", state=DiscussionState.DISCUSSING, team=team)
+    sent = []
+
+    async def send_fn(text):
+        sent.append(text)
+
+    await handler._run_round(session, send_fn, user_message="Topic")
+
+    assert sent[0] == f"【第 1 轮 · Alice】\n{first}"
+    assert sent[1] == "second paragraph"
+    assert sent[2].startswith("第 1 轮结束")
+    assert session.message_count == 1
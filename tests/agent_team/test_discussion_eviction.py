@@ -0,0 +1,127 @@
+"""
+Test idle eviction and restore of discussion sessions
+"""
+
+import time
+
+import pytest
+
+from mini_agent.agent_team import ChatroomStore
+from mini_agent.agent_team.discussion_handler import LOST_DISCUSSION_NOTICE, DiscussionHandler, DiscussionState
+from mini_agent.agents import AgentConfigLoader
+
+AGENTS_YAML = """
+agents:
+  - name: "Alice"
+    provider_id: "openai"
+    model_name: "fake"
+    personality:
+      name: "Calm"
+      system_prompt: "You are calm."
+"""
+
+
+def make_handler(tmp_path, with_store: bool = True, **options) -> DiscussionHandler:
+    (tmp_path / "agents").mkdir(exist_ok=True)
+    (tmp_path / "agents" / "agents.yaml").write_text(AGENTS_YAML, encoding="utf-8")
+    loader = AgentConfigLoader(agents_dir=str(tmp_path / "agents"))
+    store = ChatroomStore(tmp_path / "discussions.db") if with_store else None
+    return DiscussionHandler(providers_config=None, loader=loader, store=store, **options)
+
+
+async def send(handler: DiscussionHandler, session_id: str, text: str) -> list:
+    sent = []
+
+    async def send_fn(message):
+        sent.append(message)
+
+    await handler.handle_message(session_id, text, send_fn)
+    await handler.wait_idle(session_id)
+    return sent
+
+
+@pytest.mark.asyncio
+async def test_idle_session_is_evicted_to_store_and_restored(tmp_path):
+    """Test that an expired session leaves RAM and comes back on the next message"""
+    handler = make_handler(tmp_path, session_ttl=60)
+    await send(handler, "oc/chat 1", "讨论 Topic")
+    session = handler._sessions["oc/chat 1"]
+    session.team.chatroom.memory.add_message(role="user", content="Earlier remark")
+    session.round_num = 2
+    session.last_activity = time.time() - 120
+
+    assert await handler.evict_idle() == 1
+    assert "oc/chat 1" not in handler._sessions
+    assert handler._chatrooms.list_chatroom_ids() and not handler._chatrooms._chatrooms
+    assert handler.is_active("oc/chat 1")
+
+    sent = await send(handler, "oc/chat 1", "讨论结束")
+
+    assert sent == ["讨论结束 | 话题: Topic | 参与:  | 2 轮 | 0 条消息"]
+    assert not handler.is_active("oc/chat 1")
+    assert handler._chatrooms.list_chatroom_ids() == []
+
+
+@pytest.mark.asyncio
+async def test_restored_session_keeps_summary_of_trimmed_memory(tmp_path):
+    """Test that agents, the context window and the rolling summary come back"""
+    handler = make_handler(tmp_path, session_ttl=0)
+    await send(handler, "chat", "讨论 Topic")
+    session = handler._sessions["chat"]
+    handler._add_agent(session.team, session.candidates[0])
+    session.agent_names = ["Alice"]
+    session.state = DiscussionState.DISCUSSING
+    memory = session.team.chatroom.memory
+    memory.add_message(role="user", content="Topic")
+    # Enough text to overflow the default context budget into the summary
+    for i in range(30):
+        memory.add_message(role="agent", content=f"Turn {i}: " + "argument " * 5000, agent_name="Alice")
+    assert memory.get_messages_for_agent("Alice")[1]["content"].startswith("[Summary")
+    expected = memory.get_messages_for_agent("Alice")
+    time.sleep(0.01)
+    await handler.evict_idle()
+
+    assert handler._restore_session("chat")
+    restored = handler._sessions["chat"]
+    assert restored.state == DiscussionState.DISCUSSING
+    assert [agent.name for agent in restored.team.list_agents()] == ["Alice"]
+    assert restored.team.chatroom.memory.get_messages_for_agent("Alice") == expected
+
+
+@pytest.mark.asyncio
+async def test_unrestorable_session_tells_user(tmp_path):
+    """Test that a discussion that cannot be restored is reported instead of dropping the message"""
+    handler = make_handler(tmp_path, session_ttl=0)
+    await send(handler, "chat", "讨论 Topic")
+    time.sleep(0.01)
+    await handler.evict_idle()
+    handler._store.sync()
+    handler._store._connect().execute("UPDATE discussions SET state = 'not json'").connection.commit()
+
+    sent = await send(handler, "chat", "1")
+
+    assert sent == [LOST_DISCUSSION_NOTICE]
+    assert not handler.is_active("chat")
+    assert handler._store.list_discussion_ids() == []
+
+    # Starting a new discussion right away works
+    sent = await send(handler, "chat", "讨论 Other")
+    assert handler._sessions["chat"].topic == "Other"
+
+
+@pytest.mark.asyncio
+async def test_memory_budget_evicts_least_recently_used(tmp_path):
+    """Test that the oldest idle sessions go first when over the memory budget"""
+    handler = make_handler(tmp_path, with_store=False, max_memory_bytes=1000)
+    for session_id in ["old", "mid", "new"]:
+        await send(handler, session_id, "讨论 Topic")
+        handler._sessions[session_id].team.chatroom.memory.add_message(role="user", content="y" * 500)
+        handler._update_size(session_id)
+        time.sleep(0.01)
+
+    # Each session holds ~800 bytes, so only the most recent one fits
+    assert list(handler._sessions) == ["new"]
+    # Without a store evicted discussions end, and the user is told on their next message
+    sent = await send(handler, "old", "继续")
+    assert sent == [LOST_DISCUSSION_NOTICE]
+    assert not handler.is_active("old")
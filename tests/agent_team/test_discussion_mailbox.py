@@ -0,0 +1,91 @@
+"""
+Test per-session mailboxes in DiscussionHandler
+"""
+
+import asyncio
+
+import pytest
+
+from mini_agent.agent_team import AgentTeam, DiscussionMode
+from mini_agent.agent_team.discussion_handler import DiscussionHandler, DiscussionState, UserDiscussionSession
+
+
+def add_session(handler: DiscussionHandler, session_id: str, delay: float, log: list) -> AgentTeam:
+    """Discussing session with one agent that records when it speaks."""
+    team = AgentTeam(name=session_id, discussion_mode=DiscussionMode.DEBATE)
+    agent = team.add_agent(name="Alice", provider_id="openai", model_name="fake")
+
+    async def stream_response(messages):
+        log.append(("start", session_id, messages[-1]["content"]))
+        await asyncio.sleep(delay)
+        log.append(("end", session_id, messages[-1]["content"]))
+        yield "reply"
+
+    agent.stream_response = stream_response
+    agent.prepare = lambda: None
+    handler._sessions[session_id] = UserDiscussionSession(
+        session_id=session_id, topic="Topic", state=DiscussionState.DISCUSSING, team=team
+    )
+    return team
+
+
+async def ignore(text):
+    pass
+
+
+@pytest.mark.asyncio
+async def test_same_session_is_ordered_and_sessions_run_concurrently():
+    """Test that one chat's rounds never overlap while different chats run in parallel"""
+    handler = DiscussionHandler(providers_config=None, loader=None)
+    log = []
+    add_session(handler, "a", 0.1, log)
+    add_session(handler, "b", 0.1, log)
+
+    await handler.handle_message("a", "first", ignore)
+    await handler.handle_message("a", "second", ignore)
+    await handler.handle_message("b", "other", ignore)
+    assert handler.is_active("a")
+    await handler.wait_idle()
+
+    a_events = [event[0] + ":" + event[2] for event in log if event[1] == "a"]
+    assert a_events == ["start:first", "end:first", "start:second", "end:second"]
+    # b started before a's first round ended
+    assert log.index(("start", "b", "other")) < log.index(("end", "a", "first"))
+    assert handler._mailboxes == {}
+
+
+@pytest.mark.asyncio
+async def test_rapid_continue_commands_are_coalesced():
+    """Test that several queued "继续" run a single round"""
+    handler = DiscussionHandler(providers_config=None, loader=None)
+    log = []
+    add_session(handler, "a", 0.05, log)
+
+    await handler.handle_message("a", "opinion", ignore)
+    for _ in range(3):
+        await handler.handle_message("a", "继续", ignore)
+    await handler.wait_idle("a")
+
+    assert handler._sessions["a"].round_num == 2
+
+
+@pytest.mark.asyncio
+async def test_end_cancels_round_in_flight():
+    """Test that ending the discussion cancels the running round and queued messages"""
+    handler = DiscussionHandler(providers_config=None, loader=None)
+    log = []
+    add_session(handler, "a", 10, log)
+    sent = []
+
+    async def send_fn(text):
+        sent.append(text)
+
+    await handler.handle_message("a", "opinion", send_fn)
+    await asyncio.sleep(0.05)
+    await handler.handle_message("a", "queued", send_fn)
+    await handler.handle_message("a", "讨论结束", send_fn)
+    await asyncio.wait_for(handler.wait_idle("a"), timeout=1)
+
+    assert [event[2] for event in log] == ["opinion"]
+    assert sent[-1].startswith("讨论结束")
+    assert not handler.is_active("a")
@@ -0,0 +1,81 @@
+"""
+Test that Feishu discussions persist in a ChatroomStore across restarts
+"""
+
+import pytest
+
+from mini_agent.agent_team import ChatroomStore
+from mini_agent.agent_team.discussion_handler import DiscussionHandler, DiscussionState
+from mini_agent.agents import AgentConfigLoader
+
+AGENTS_YAML = """
+agents:
+  - name: "Alice"
+    provider_id: "openai"
+    model_name: "fake"
+    personality:
+      name: "Calm"
+      system_prompt: "You are calm."
+"""
+
+
+def make_handler(tmp_path) -> DiscussionHandler:
+    (tmp_path / "agents").mkdir(exist_ok=True)
+    (tmp_path / "agents" / "agents.yaml").write_text(AGENTS_YAML, encoding="utf-8")
+    loader = AgentConfigLoader(agents_dir=str(tmp_path / "agents"))
+    store = ChatroomStore(tmp_path / "discussions.db", flush_interval=3600)
+    return DiscussionHandler(providers_config=None, loader=loader, store=store)
+
+
+async def send(handler: DiscussionHandler, session_id: str, text: str) -> list:
+    sent = []
+
+    async def send_fn(message):
+        sent.append(message)
+
+    await handler.handle_message(session_id, text, send_fn)
+    await handler.wait_idle(session_id)
+    return sent
+
+
+@pytest.mark.asyncio
+async def test_discussion_survives_restart(tmp_path):
+    """Test that state, agents and messages come back after the handler is recreated"""
+    handler = make_handler(tmp_path)
+    await send(handler, "chat", "讨论 Topic")
+    session = handler._sessions["chat"]
+    handler._add_agent(session.team, session.candidates[0])
+    session.agent_names = ["Alice"]
+    session.state = DiscussionState.DISCUSSING
+    session.round_num = 1
+    session.team.chatroom.memory.add_message(role="user", content="Topic")
+    session.team.chatroom.memory.add_message(role="agent", content="Hi", agent_name="Alice")
+    # Close writes the buffered messages even though no batch filled up
+    await handler.close()
+
+    restarted = make_handler(tmp_path)
+    assert restarted.is_active("chat")
+    restarted._restore_session("chat")
+    restored = restarted._sessions["chat"]
+    assert restored.state == DiscussionState.DISCUSSING and restored.round_num == 1
+    assert [agent.name for agent in restored.team.list_agents()] == ["Alice"]
+    assert [m.content for m in restored.team.chatroom.memory.messages] == ["Topic", "Hi"]
+
+    sent = await send(restarted, "chat", "讨论结束")
+    assert sent[-1].startswith("讨论结束 | 话题: Topic")
+    await restarted.close()
+    assert not make_handler(tmp_path).is_active("chat")
+
+
+@pytest.mark.asyncio
+async def test_agent_selection_resumes_after_restart(tmp_path):
+    """Test that a discussion waiting for agent selection keeps the list shown to the user"""
+    handler = make_handler(tmp_path)
+    await send(handler, "chat", "讨论 Topic")
+    await handler.close()
+
+    restarted = make_handler(tmp_path)
+    restarted._restore_session("chat")
+    restored = restarted._sessions["chat"]
+    assert restored.state == DiscussionState.SELECTING
+    assert [agent_def.name for agent_def in restored.candidates] == ["Alice"]
@@ -0,0 +1,160 @@
+"""
+Test adaptive per-agent deadlines and fallback hedging
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from mini_agent.agent_team import AgentTeam, DiscussionMode
+from mini_agent.agent_team.latency import LatencyTracker
+
+
+def fake(agent, delay: float, reply: str, log: list, error: Exception = None):
+    """Make an agent answer after a delay, recording start and cancellation."""
+
+    async def generate_response(messages):
+        log.append(("start", reply))
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            log.append(("cancelled", reply))
+            raise
+        if error is not None:
+            raise error
+        return reply
+
+    async def stream_response(messages):
+        yield await generate_response(messages)
+        yield "!"
+
+    agent.generate_response = generate_response
+    agent.stream_response = stream_response
+    agent.prepare = lambda: None
+    return agent
+
+
+def add_agent(team: AgentTeam, with_fallback: bool = True):
+    return team.add_agent(
+        name="Alice",
+        provider_id="openai",
+        model_name="slow",
+        fallback_provider_id="openai" if with_fallback else None,
+        fallback_model_name="fast" if with_fallback else None,
+    )
+
+
+def test_latency_tracker():
+    """Test EWMA and nearest-rank percentiles"""
+    tracker = LatencyTracker(alpha=0.5, window=20)
+    assert tracker.p95 is None
+    for seconds in [1.0, 3.0]:
+        tracker.record(seconds)
+    assert tracker.ewma == 2.0
+    for _ in range(18):
+        tracker.record(1.0)
+    tracker.record(10.0)  # Pushes the first sample out of the window
+    assert tracker.count == 20
+    assert tracker.p95 == 3.0
+    assert tracker.percentile(100) == 10.0
+
+
+def test_hedge_delay_follows_agent_latency():
+    """Test that the backup starts relative to the agent's own p95, within bounds"""
+    team = AgentTeam(name="Delay", timeout=30.0)
+    tracker = LatencyTracker()
+    assert team._hedge_delay(tracker) == 15.0  # No history yet
+
+    for _ in range(5):
+        tracker.record(2.0)
+    assert team._hedge_delay(tracker) == 3.0
+
+    slow = LatencyTracker()
+    for _ in range(5):
+        slow.record(100.0)
+    assert team._hedge_delay(slow) == 18.0  # Leaves the backup time to answer
+
+
+@pytest.mark.asyncio
+async def test_late_agent_is_answered_by_fallback():
+    """Test that a late turn is raced against the fallback and the loser is cancelled"""
+    team = AgentTeam(name="Hedge", timeout=0.5)
+    log = []
+    agent = add_agent(team)
+    fake(agent, 5, "slow reply", log)
+    fake(agent.fallback, 0.05, "fast reply", log)
+
+    start = time.monotonic()
+    results = await team.discuss("Topic")
+
+    assert time.monotonic() - start < 0.5
+    assert results[0].success and results[0].used_fallback
+    assert results[0].content == "fast reply"
+    assert results[0].agent_name == "Alice"
+    await asyncio.sleep(0)
+    assert ("cancelled", "slow reply") in log
+    assert team.chatroom.memory.messages[-1].agent_name == "Alice"
+
+
+@pytest.mark.asyncio
+async def test_failed_agent_falls_back_immediately():
+    """Test that an error starts the backup without waiting for the deadline"""
+    team = AgentTeam(name="Error", timeout=10, discussion_mode=DiscussionMode.DEBATE)
+    log = []
+    agent = add_agent(team)
+    fake(agent, 0, "broken", log, error=RuntimeError("503"))
+    fake(agent.fallback, 0, "backup", log)
+
+    start = time.monotonic()
+    results = await team.discuss("Topic")
+
+    assert time.monotonic() - start < 1
+    assert results[0].content == "backup" and results[0].used_fallback
+
+
+@pytest.mark.asyncio
+async def test_on_time_agent_does_not_start_fallback():
+    """Test that no backup request is made when the agent answers in time"""
+    team = AgentTeam(name="Fast", timeout=1)
+    log = []
+    agent = add_agent(team)
+    fake(agent, 0.01, "own reply", log)
+    fake(agent.fallback, 0, "backup", log)
+
+    results = await team.discuss("Topic")
+
+    assert results[0].content == "own reply" and not results[0].used_fallback
+    assert log == [("start", "own reply")]
+
+
+@pytest.mark.asyncio
+async def test_streamed_turn_switches_to_fallback_before_first_delta():
+    """Test that a stream without a first delta by the deadline is replaced by the fallback's"""
+    team = AgentTeam(name="Stream", timeout=0.5, discussion_mode=DiscussionMode.DEBATE)
+    log = []
+    agent = add_agent(team)
+    fake(agent, 5, "slow", log)
+    fake(agent.fallback, 0.05, "fast", log)
+    deltas = []
+
+    async def on_delta(speaker, delta):
+        deltas.append((speaker.name, delta))
+
+    results = await team.discuss("Topic", on_delta=on_delta)
+
+    assert deltas == [("Alice", "fast"), ("Alice", "!")]
+    assert results[0].content == "fast!" and results[0].used_fallback
+    assert team.chatroom.memory.messages[-1].content == "fast!"
+
+
+@pytest.mark.asyncio
+async def test_without_fallback_global_timeout_applies():
+    """Test that agents without a fallback keep the plain timeout"""
+    team = AgentTeam(name="Plain", timeout=0.1)
+    log = []
+    fake(add_agent(team, with_fallback=False), 5, "slow", log)
+
+    results = await team.discuss("Topic")
+
+    assert results[0].timed_out and not results[0].success
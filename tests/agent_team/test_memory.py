@@ -0,0 +1,89 @@
+"""
+Test Memory context window
+"""
+
+from mini_agent.agent_team.memory import Memory
+
+
+def make_debate(turns: int, **memory_options) -> Memory:
+    """Memory with a topic followed by alternating agent turns."""
+    memory = Memory(**memory_options)
+    memory.add_message(role="user", content="Topic: should we rewrite the scheduler?")
+    for i in range(turns):
+        name = "Alice" if i % 2 == 0 else "Bob"
+        memory.add_message(role="agent", content=f"Turn {i}: " + "argument " * 20, agent_id=name, agent_name=name)
+    return memory
+
+
+def test_short_history_is_unchanged():
+    """Test that a history within budget is rendered in full"""
+    memory = make_debate(3)
+    messages = memory.get_messages_for_agent("Alice")
+
+    assert len(messages) == 4
+    assert messages[0] == {"role": "user", "content": "Topic: should we rewrite the scheduler?"}
+    assert messages[1]["role"] == "assistant"
+    assert messages[2]["content"].startswith("[Bob]: Turn 1")
+    assert memory.get_summary() == ""
+
+
+def test_long_history_stays_within_budget():
+    """Test that older turns are summarized while topic and recent turns stay"""
+    memory = make_debate(40, max_tokens=300, summary_max_tokens=80)
+    messages = memory.get_messages_for_agent("Bob")
+
+    assert memory.context_tokens <= 300
+    assert messages[0]["content"].startswith("Topic:")
+    assert messages[1]["content"].startswith("[Summary of earlier discussion]")
+    assert "older turns omitted" in messages[1]["content"]
+    assert messages[-1] == {"role": "assistant", "content": "Turn 39: " + "argument " * 20}
+    assert len(messages) < 20
+
+
+def test_views_are_extended_incrementally():
+    """Test that cached views only render new messages and match a fresh render"""
+    memory = make_debate(30, max_tokens=400)
+    memory.get_messages_for_agent("Alice")
+    memory.get_messages_for_agent("Bob")
+
+    rendered = []
+    original_render = Memory._render
+    Memory._render = staticmethod(lambda msg, name: rendered.append(msg.id) or original_render(msg, name))
+    try:
+        memory.add_message(role="user", content="What about testing?")
+        incremental = memory.get_messages_for_agent("Alice")
+    finally:
+        Memory._render = staticmethod(original_render)
+
+    # The new message plus the pinned topic; nothing else is re-rendered
+    assert len(rendered) == 2
+    fresh = Memory(max_tokens=400)
+    fresh.messages = list(memory.messages)
+    assert incremental == fresh.get_messages_for_agent("Alice")
+
+
+def test_clear_resets_window():
+    """Test that clear drops the summary and cached views"""
+    memory = make_debate(40, max_tokens=300)
+    memory.get_messages_for_agent("Alice")
+    memory.clear()
+    memory.add_message(role="user", content="New topic")
+
+    assert memory.get_summary() == ""
+    assert memory.get_messages_for_agent("Alice") == [{"role": "user", "content": "New topic"}]
+
+
+def test_interleaved_views_match_fresh_render():
+    """Test that a view left behind by other agents' turns drops what was summarized"""
+    memory = Memory(max_tokens=10)
+    memory.add_message(role="user", content="Topic")
+    memory.get_messages_for_agent("Alice")
+    memory.add_message(role="agent", content="one two three four five six seven eight", agent_name="Bob")
+    memory.add_message(role="agent", content="one two three four five", agent_name="Alice")
+
+    for name in ["Alice", "Bob", "Alice", "Bob"]:
+        memory.add_message(role="agent", content=f"{name} adds a point", agent_name=name)
+        fresh = Memory(max_tokens=10)
+        fresh.messages = list(memory.messages)
+        for agent in ["Alice", "Bob"]:
+            assert memory.get_messages_for_agent(agent) == fresh.get_messages_for_agent(agent)
@@ -0,0 +1,58 @@
+"""
+Test staged discussion mode
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from mini_agent.agent_team import REBUTTAL_PROMPT, AgentTeam, DiscussionMode
+
+
+def make_team(delays: dict, rebuttal_passes: int = 1) -> AgentTeam:
+    """Staged team whose agents answer after a delay, recording their context."""
+    team = AgentTeam(name="test", discussion_mode=DiscussionMode.STAGED, rebuttal_passes=rebuttal_passes)
+    team.contexts = {name: [] for name in delays}
+    for name, delay in delays.items():
+        agent = team.add_agent(name=name, provider_id="openai", model_name="fake")
+
+        async def generate_response(messages, name=name, delay=delay):
+            team.contexts[name].append([m["content"] for m in messages])
+            await asyncio.sleep(delay)
+            return f"{name} pass {len(team.contexts[name])}"
+
+        agent.generate_response = generate_response
+    return team
+
+
+@pytest.mark.asyncio
+async def test_passes_run_in_parallel_and_see_previous_pass():
+    """Test drafts and rebuttals run concurrently, each pass seeing the last"""
+    team = make_team({"Slow": 0.3, "Fast": 0.0, "Mid": 0.1})
+
+    start = time.time()
+    results = await team.discuss("Topic")
+    elapsed = time.time() - start
+
+    assert elapsed < 0.9  # two passes bounded by the slowest agent, not the sum
+    assert [r.content for r in results] == [
+        "Slow pass 1", "Fast pass 1", "Mid pass 1",
+        "Slow pass 2", "Fast pass 2", "Mid pass 2",
+    ]
+    # Drafts are independent; rebuttals see every draft plus the instruction
+    assert team.contexts["Fast"][0] == ["Topic"]
+    assert team.contexts["Fast"][1] == [
+        "Topic", "[Slow]: Slow pass 1", "Fast pass 1", "[Mid]: Mid pass 1", REBUTTAL_PROMPT,
+    ]
+
+
+@pytest.mark.asyncio
+async def test_memory_order_is_deterministic():
+    """Test replies are stored in agent order regardless of finishing order"""
+    team = make_team({"A": 0.2, "B": 0.0}, rebuttal_passes=2)
+    await team.discuss("Topic")
+
+    stored = [m.content for m in team.chatroom.memory.messages]
+    assert stored == ["Topic", "A pass 1", "B pass 1", "A pass 2", "B pass 2", "A pass 3", "B pass 3"]
+    assert REBUTTAL_PROMPT not in stored
@@ -4,7 +4,7 @@ from types import SimpleNamespace
 
 import pytest
 
-from mini_agent.acp import MiniMaxACPAgent
+from mini_agent.acp import MiniMaxACPAgent, skills_prompt_template
 from mini_agent.config import AgentConfig, Config, LLMConfig, ToolsConfig
 from mini_agent.schema import FunctionCall, LLMResponse, ToolCall
 from mini_agent.tools.base import Tool, ToolResult
@@ -87,3 +87,22 @@ async def test_acp_invalid_session(acp_agent):
     prompt = SimpleNamespace(sessionId="missing", prompt=[{"text": "?"}])
     response = await agent.prompt(prompt)
     assert response.stopReason == "refusal"
+
+
+def test_skills_catalogue_rendered_once(tmp_path):
+    """Test the bundled prompt's placeholder is filled instead of appending a second catalogue"""
+    from mini_agent.hot_reload import HotReloader
+    from mini_agent.tools.skill_loader import SkillLoader
+
+    skill_dir = tmp_path / "skills" / "demo-skill"
+    skill_dir.mkdir(parents=True)
+    (skill_dir / "SKILL.md").write_text("---\nname: demo-skill\ndescription: Demo\n---\n\nBody\n", encoding="utf-8")
+    loader = SkillLoader(str(tmp_path / "skills"))
+    loader.discover_skills()
+
+    bundled = (Config.get_package_dir() / "config" / "system_prompt.md").read_text(encoding="utf-8")
+    for prompt in [bundled, "Plain prompt"]:
+        template = skills_prompt_template(prompt)
+        assert template.count("{SKILLS_METADATA}") == 1
+        rendered = HotReloader(system_prompt_template=template, skill_loader=loader).snapshot.system_prompt
+        assert rendered.count("demo-skill") == 1
@@ -0,0 +1,95 @@
+"""
+Test cached agent catalogue with change detection
+"""
+
+import os
+
+import pytest
+import yaml
+
+from mini_agent.agents import AgentConfigLoader, get_agent_loader
+
+
+def write_yaml(path, data, mtime_ns=None):
+    path.write_text(yaml.safe_dump(data, allow_unicode=True), encoding="utf-8")
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+@pytest.fixture
+def agents_dir(tmp_path):
+    (tmp_path / "personalities").mkdir()
+    write_yaml(tmp_path / "personalities" / "calm.yaml", {"name": "Calm", "system_prompt": "Be calm."}, 1_000)
+    write_yaml(tmp_path / "personalities" / "bold.yaml", {"name": "Bold", "system_prompt": "Be bold."}, 1_000)
+    write_yaml(
+        tmp_path / "agents.yaml",
+        {"agents": [{"name": "Alice", "provider_id": "openai", "model_name": "m", "personality": "calm"}]},
+        1_000,
+    )
+    return tmp_path
+
+
+def test_unchanged_files_are_not_parsed_again(agents_dir, monkeypatch):
+    """Test that a refresh without changes parses nothing"""
+    loader = AgentConfigLoader(agents_dir=str(agents_dir), check_interval=0)
+    text, agents = loader.format_agent_list()
+    assert text == "1. Alice (m) — Calm"
+
+    parsed = []
+    original_load = yaml.safe_load
+    monkeypatch.setattr(yaml, "safe_load", lambda f: parsed.append(f.name) or original_load(f))
+    assert loader.refresh() is False
+    loader.format_agent_list()
+    assert parsed == []
+
+
+def test_only_changed_files_are_reloaded(agents_dir, monkeypatch):
+    """Test that editing one template re-parses only that file and rebuilds the list"""
+    loader = AgentConfigLoader(agents_dir=str(agents_dir), check_interval=0)
+    generation = loader.catalogue.generation
+
+    write_yaml(agents_dir / "personalities" / "calm.yaml", {"name": "Serene", "system_prompt": "Be calm."}, 2_000)
+    parsed = []
+    original_load = yaml.safe_load
+    monkeypatch.setattr(yaml, "safe_load", lambda f: parsed.append(os.path.basename(f.name)) or original_load(f))
+
+    text, _ = loader.format_agent_list()
+    assert text == "1. Alice (m) — Serene"
+    assert parsed == ["calm.yaml"]
+    assert loader.catalogue.generation == generation + 1
+
+
+def test_new_agent_is_picked_up_and_errors_keep_previous(agents_dir):
+    """Test that added agents appear without a new loader and a broken file keeps the last good list"""
+    loader = AgentConfigLoader(agents_dir=str(agents_dir), check_interval=0)
+    loader.format_agent_list()
+
+    write_yaml(
+        agents_dir / "agents.yaml",
+        {"agents": [
+            {"name": "Alice", "provider_id": "openai", "model_name": "m", "personality": "calm"},
+            {"name": "Bob", "provider_id": "openai", "model_name": "m", "personality": "bold"},
+        ]},
+        2_000,
+    )
+    assert [agent.name for agent in loader.load_agents()] == ["Alice", "Bob"]
+
+    (agents_dir / "agents.yaml").write_text("agents: [", encoding="utf-8")
+    os.utime(agents_dir / "agents.yaml", ns=(3_000, 3_000))
+    assert [agent.name for agent in loader.load_agents()] == ["Alice", "Bob"]
+
+
+def test_check_interval_throttles_file_checks(agents_dir):
+    """Test that readers do not stat files again within the check interval"""
+    loader = AgentConfigLoader(agents_dir=str(agents_dir), check_interval=3600)
+    loader.load_agents()
+    write_yaml(agents_dir / "agents.yaml", {"agents": []}, 2_000)
+
+    assert len(loader.load_agents()) == 1
+    loader.refresh()
+    assert loader.load_agents() == []
+
+
+def test_shared_loader_per_directory(agents_dir):
+    """Test that callers share one loader per agents directory"""
+    assert get_agent_loader(str(agents_dir)) is get_agent_loader(str(agents_dir) + "/")
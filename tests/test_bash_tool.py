@@ -1,6 +1,8 @@
 """Test cases for Bash Tool."""
 
 import asyncio
+import os
+import time
 
 import pytest
 
@@ -56,11 +58,13 @@ async def test_command_timeout():
     print("\n=== Testing Command Timeout ===")
 
     bash_tool = BashTool()
-    result = await bash_tool.execute(command="sleep 10", timeout=1)
+    result = await bash_tool.execute(command="echo partial >&2; sleep 10", timeout=1)
 
     assert not result.success
     assert "timed out" in result.error.lower()
     assert result.exit_code == -1
+    # Output captured before the timeout is kept
+    assert "partial" in result.stderr
     print(f"Timeout error: {result.error}")
 
 
@@ -270,3 +274,214 @@ async def test_timeout_validation():
     result = await bash_tool.execute(command="echo 'test'", timeout=0)
     assert result.success
     print("Timeout < 1 handled correctly")
+
+
+@pytest.mark.asyncio
+async def test_persistent_session_keeps_state():
+    """Test that cd and exported variables persist across persistent commands."""
+    print("\n=== Testing Persistent Session State ===")
+
+    bash_tool = BashTool(persistent=True)
+    try:
+        result = await bash_tool.execute(command="cd /tmp && export MINI_AGENT_TEST_VAR=persisted")
+        assert result.success
+
+        result = await bash_tool.execute(command="pwd; echo $MINI_AGENT_TEST_VAR; echo 'err' >&2")
+        assert result.success
+        assert result.stdout.splitlines() == ["/tmp", "persisted"]
+        assert "err" in result.stderr
+        print(f"Output: {result.content}")
+    finally:
+        bash_tool.session_pool.close()
+
+
+@pytest.mark.asyncio
+async def test_persistent_session_recovers():
+    """Test exit codes, `exit` and timeouts in a persistent session."""
+    print("\n=== Testing Persistent Session Recovery ===")
+
+    bash_tool = BashTool(workspace_dir="/tmp", persistent=True)
+    try:
+        result = await bash_tool.execute(command="false")
+        assert not result.success
+        assert result.exit_code == 1
+
+        # `exit` kills the shell; the next command gets a fresh one
+        result = await bash_tool.execute(command="cd / && exit 3")
+        assert result.exit_code == 3
+        result = await bash_tool.execute(command="pwd")
+        assert result.stdout.strip() == "/tmp"
+
+        result = await bash_tool.execute(command="echo partial; echo oops >&2; sleep 10", timeout=1)
+        assert not result.success
+        assert "timed out" in result.error.lower()
+        assert result.exit_code == -1
+        # Output printed before the timeout is kept
+        assert result.stdout.strip() == "partial"
+        assert result.stderr.strip() == "oops"
+
+        result = await bash_tool.execute(command="echo 'alive'")
+        assert result.success
+        assert result.stdout.strip() == "alive"
+    finally:
+        bash_tool.session_pool.close()
+
+
+@pytest.mark.asyncio
+async def test_cancelled_persistent_command_discards_shell():
+    """Test that a shell cancelled mid-command is not reused by the next caller."""
+    print("\n=== Testing Persistent Session Cancellation ===")
+
+    bash_tool = BashTool(persistent=True)
+    try:
+        await bash_tool.execute(command="export MINI_AGENT_TEST_VAR=old")
+        task = asyncio.create_task(bash_tool.execute(command="sleep 5; echo stale"))
+        await asyncio.sleep(0.3)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        assert bash_tool.session_pool._idle == []
+        result = await bash_tool.execute(command="echo fresh; echo ${MINI_AGENT_TEST_VAR:-unset}", timeout=3)
+        assert result.success
+        assert result.stdout.splitlines() == ["fresh", "unset"]
+    finally:
+        bash_tool.session_pool.close()
+
+
+@pytest.mark.asyncio
+async def test_background_output_ring_buffer(tmp_path):
+    """Test that background output is bounded and reports dropped lines."""
+    print("\n=== Testing Background Output Ring Buffer ===")
+
+    bash_tool = BashTool(max_output_lines=10, spill_dir=str(tmp_path))
+    result = await bash_tool.execute(command="for i in $(seq 1 50); do echo line$i; done", run_in_background=True)
+    assert result.success
+    bash_id = result.bash_id
+
+    await asyncio.sleep(1)
+
+    bg_shell = BackgroundShellManager.get(bash_id)
+    assert len(bg_shell.output_lines) == 10
+    assert bg_shell.total_lines == 50
+
+    bash_output_tool = BashOutputTool()
+    output_result = await bash_output_tool.execute(bash_id=bash_id)
+    lines = output_result.stdout.splitlines()
+    assert lines[0].startswith("[40 lines dropped")
+    assert lines[1:] == [f"line{i}" for i in range(41, 51)]
+
+    # Evicted lines are preserved in the spill file
+    spilled = (tmp_path / f"{bash_id}.log").read_text().splitlines()
+    assert spilled == [f"line{i}" for i in range(1, 41)]
+
+    await BashKillTool().execute(bash_id=bash_id)
+
+
+@pytest.mark.asyncio
+async def test_background_shell_namespaces():
+    """Test that background shells are only visible within their namespace."""
+    print("\n=== Testing Background Shell Namespaces ===")
+
+    bash_tool = BashTool(namespace="agent-a")
+    result = await bash_tool.execute(command="sleep 100", run_in_background=True)
+    bash_id = result.bash_id
+    await asyncio.sleep(0.5)
+
+    other_output = await BashOutputTool(namespace="agent-b").execute(bash_id=bash_id)
+    assert not other_output.success
+    other_kill = await BashKillTool(namespace="agent-b").execute(bash_id=bash_id)
+    assert not other_kill.success
+    assert bash_id not in BackgroundShellManager.get_available_ids("agent-b")
+
+    kill_result = await BashKillTool(namespace="agent-a").execute(bash_id=bash_id)
+    assert kill_result.success
+
+
+@pytest.mark.asyncio
+async def test_closing_tool_discards_its_shells_and_spill_files(tmp_path):
+    """Test that close() kills the namespace's shells and that old spill files are pruned."""
+    print("\n=== Testing Bash Tool Close ===")
+
+    stale = tmp_path / "old.log"
+    stale.write_text("old output")
+    os.utime(stale, (time.time() - 7200, time.time() - 7200))
+
+    bash_tool = BashTool(namespace="session-a", max_output_lines=1, spill_dir=str(tmp_path), spill_max_age=3600)
+    other_tool = BashTool(namespace="session-b")
+    result = await bash_tool.execute(command="echo one; echo two; sleep 100", run_in_background=True)
+    other = await other_tool.execute(command="sleep 100", run_in_background=True)
+    await asyncio.sleep(0.5)
+    bg_shell = BackgroundShellManager.get(result.bash_id, "session-a")
+    assert not stale.exists()
+    assert (tmp_path / f"{result.bash_id}.log").exists()
+
+    bash_tool.close()
+    await asyncio.wait_for(bg_shell.process.wait(), timeout=5)
+
+    assert BackgroundShellManager.get_available_ids("session-a") == []
+    assert not (tmp_path / f"{result.bash_id}.log").exists()
+    assert BackgroundShellManager.get(other.bash_id, "session-b") is not None
+    other_tool.close()
+
+
+@pytest.mark.asyncio
+async def test_bash_output_wait_for():
+    """Test blocking on bash_output until a line matches a regex."""
+    print("\n=== Testing Bash Output wait_for ===")
+
+    bash_tool = BashTool()
+    result = await bash_tool.execute(
+        command="printf 'partial'; sleep 0.3; echo ' line'; sleep 0.5; echo 'READY'; sleep 100", run_in_background=True
+    )
+    bash_id = result.bash_id
+
+    bash_output_tool = BashOutputTool()
+    output_result = await bash_output_tool.execute(bash_id=bash_id, wait_for="READY", wait_timeout=10)
+    assert output_result.success
+    assert output_result.stdout.splitlines() == ["partial line", "READY"]
+
+    # No match: returns after the deadline with a marker
+    output_result = await bash_output_tool.execute(bash_id=bash_id, wait_for="NEVER", wait_timeout=0.5)
+    assert output_result.success
+    assert "not matched" in output_result.stdout
+
+    await BashKillTool().execute(bash_id=bash_id)
+
+
+@pytest.mark.asyncio
+async def test_foreground_output_truncation():
+    """Test that large foreground output keeps only head and tail bytes."""
+    print("\n=== Testing Foreground Output Truncation ===")
+
+    bash_tool = BashTool(output_head_bytes=100, output_tail_bytes=100)
+    result = await bash_tool.execute(command="echo START; yes filler | head -c 1000000; echo; echo END")
+
+    assert result.success
+    assert result.stdout.startswith("START")
+    assert result.stdout.rstrip().endswith("END")
+    assert "bytes of output truncated" in result.stdout
+    assert len(result.stdout) < 400
+
+
+@pytest.mark.asyncio
+async def test_foreground_progress_and_group_kill():
+    """Test live progress callbacks and that timeouts kill the whole pipeline."""
+    print("\n=== Testing Foreground Progress ===")
+
+    from mini_agent.tools.base import tool_progress
+
+    progress = []
+    bash_tool = BashTool()
+    with tool_progress(progress.append):
+        result = await bash_tool.execute(command="echo first; sleep 1.2; echo second")
+    assert result.success
+    assert progress and "first" in progress[0]
+    assert "second" in progress[-1]
+
+    # The pipeline would keep the pipes open for 30s if only the shell were killed
+    start = asyncio.get_running_loop().time()
+    result = await bash_tool.execute(command="sleep 30 | cat", timeout=1)
+    assert not result.success
+    assert "timed out" in result.error.lower()
+    assert asyncio.get_running_loop().time() - start < 5
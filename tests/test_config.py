@@ -0,0 +1,27 @@
+"""Test cases for loading config.yaml."""
+
+from mini_agent.config import Config
+
+
+def write_config(tmp_path, tools_yaml: str):
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text(f"api_key: test-key\ntools:\n{tools_yaml}", encoding="utf-8")
+    return Config.from_yaml(config_path)
+
+
+def test_bash_spill_retention_is_read(tmp_path):
+    """Test that tools.bash.spill_max_age_hours is loaded from YAML."""
+    config = write_config(tmp_path, "  bash:\n    spill_max_age_hours: 1\n")
+    assert config.tools.bash.spill_max_age_hours == 1
+
+    assert write_config(tmp_path, "  enable_bash: true\n").tools.bash.spill_max_age_hours == 24.0
+
+
+def test_mcp_output_retention_is_read(tmp_path):
+    """Test that the MCP output retention settings are loaded from YAML."""
+    config = write_config(tmp_path, "  mcp:\n    output_max_age_hours: 2\n    output_max_mb: 10\n")
+    assert config.tools.mcp.output_max_age_hours == 2
+    assert config.tools.mcp.output_max_mb == 10
+
+    defaults = write_config(tmp_path, "  enable_mcp: true\n").tools.mcp
+    assert (defaults.output_max_age_hours, defaults.output_max_mb) == (24.0, 256)
@@ -0,0 +1,80 @@
+"""Test hot reload of skills into running agents."""
+
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from mini_agent.agent import Agent
+from mini_agent.hot_reload import HotReloader, ReloadSnapshot
+from mini_agent.tools.mcp_loader import MCPTool
+from mini_agent.tools.skill_loader import SkillLoader
+
+
+def write_skill(skills_dir: Path, name: str, description: str):
+    skill_dir = skills_dir / name
+    skill_dir.mkdir(exist_ok=True)
+    (skill_dir / "SKILL.md").write_text(
+        f"---\nname: {name}\ndescription: {description}\n---\n\nContent of {name}\n",
+        encoding="utf-8",
+    )
+
+
+@pytest.mark.asyncio
+async def test_agent_applies_reloaded_skills_between_steps():
+    """Test a new SKILL.md reaches the agent's system prompt on the next step"""
+    with tempfile.TemporaryDirectory() as skills_dir, tempfile.TemporaryDirectory() as workspace_dir:
+        skills_path = Path(skills_dir)
+        write_skill(skills_path, "first-skill", "First skill")
+
+        loader = SkillLoader(skills_dir)
+        loader.discover_skills()
+        reloader = HotReloader(system_prompt_template="Prompt\n{SKILLS_METADATA}", skill_loader=loader)
+
+        agent = Agent(
+            llm_client=None,
+            system_prompt=reloader.snapshot.system_prompt,
+            tools=[],
+            workspace_dir=workspace_dir,
+        )
+        agent.attach_hot_reloader(reloader)
+        assert "first-skill" in agent.system_prompt
+        assert not await reloader.check()
+        assert not agent.apply_hot_reload()
+
+        write_skill(skills_path, "second-skill", "Second skill")
+        assert await reloader.check()
+        assert reloader.snapshot.generation == 1
+
+        assert agent.apply_hot_reload()
+        assert "second-skill" in agent.system_prompt
+        assert "Current Workspace" in agent.system_prompt
+        assert agent.messages[0].content == agent.system_prompt
+        assert not agent.apply_hot_reload()
+
+
+def test_late_mcp_tools_are_tracked_by_reloader():
+    """Test tools of a server that connected late are handed out and dropped by reloads"""
+    with tempfile.TemporaryDirectory() as workspace_dir:
+        early = MCPTool("early", "Early tool", {})
+        late = MCPTool("late", "Late tool", {})
+        reloader = HotReloader(mcp_tools=[early])
+        agent = Agent(llm_client=None, system_prompt="Prompt", tools=[early], workspace_dir=workspace_dir)
+        agent.attach_hot_reloader(reloader)
+
+        agent.add_tools([late])
+        reloader.add_tools([late])
+        assert "late" in reloader.initial_tool_names
+        assert agent.apply_hot_reload()
+        assert set(agent.tools) == {"early", "late"}
+
+        # An agent created later with the late tool treats it as reloadable too
+        later_agent = Agent(llm_client=None, system_prompt="Prompt", tools=[early, late], workspace_dir=workspace_dir)
+        later_agent.attach_hot_reloader(reloader)
+
+        # The late server is removed from mcp.json
+        reloader.snapshot = ReloadSnapshot(generation=reloader.snapshot.generation + 1, mcp_tools=(early,), system_prompt=None)
+        assert agent.apply_hot_reload()
+        assert later_agent.apply_hot_reload()
+        assert set(agent.tools) == {"early"}
+        assert set(later_agent.tools) == {"early"}
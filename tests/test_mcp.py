@@ -1,19 +1,42 @@
 """Test cases for MCP tool loading and Git-based MCP servers."""
 
 import asyncio
+import base64
 import json
+import os
+import sys
 import tempfile
+import time
 from pathlib import Path
 
 import pytest
 
+from mcp.types import CallToolResult, EmbeddedResource, ImageContent, TextContent, TextResourceContents
+
 from mini_agent.tools.mcp_loader import (
+    MCPConnectionManager,
     MCPServerConnection,
     MCPTimeoutConfig,
     _determine_connection_type,
+    MCPResultCache,
+    _mcp_connections,
     cleanup_mcp_connections,
+    get_mcp_cache_config,
+    get_mcp_cache_stats,
+    get_mcp_connection_manager,
+    get_mcp_health_config,
+    get_mcp_lazy_config,
+    get_mcp_result_config,
+    get_mcp_server_stats,
+    get_mcp_tenant_config,
     get_mcp_timeout_config,
     load_mcp_tools_async,
+    render_tool_result,
+    set_mcp_cache_config,
+    set_mcp_health_config,
+    set_mcp_lazy_config,
+    set_mcp_result_config,
+    set_mcp_tenant_config,
     set_mcp_timeout_config,
 )
 
@@ -558,6 +581,535 @@ async def test_per_server_timeout_override_in_config():
             Path(f.name).unlink()
 
 
+# =============================================================================
+# Concurrent Startup Tests
+# =============================================================================
+
+ECHO_SERVER = """
+import sys, time
+time.sleep(float(sys.argv[1]))
+from mcp.server.fastmcp import FastMCP
+mcp = FastMCP(sys.argv[2])
+
+@mcp.tool(name=sys.argv[2] + "_echo")
+def echo(text: str) -> str:
+    \"\"\"Echo text back\"\"\"
+    return text
+
+mcp.run()
+"""
+
+
+def write_echo_servers(tmpdir: str, delays: dict[str, float]) -> str:
+    """Write an mcp.json with local stdio echo servers that start after a delay."""
+    script = Path(tmpdir) / "echo_server.py"
+    script.write_text(ECHO_SERVER, encoding="utf-8")
+    config = {
+        "mcpServers": {
+            name: {"command": sys.executable, "args": [str(script), str(delay), name], "connect_timeout": 20.0}
+            for name, delay in delays.items()
+        }
+    }
+    config_path = Path(tmpdir) / "mcp.json"
+    config_path.write_text(json.dumps(config), encoding="utf-8")
+    return str(config_path)
+
+
+@pytest.mark.asyncio
+async def test_servers_connect_concurrently():
+    """Test that slow servers connect in parallel rather than one after another."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        single_path = write_echo_servers(tmpdir, {"solo": 1.5})
+        try:
+            start = time.time()
+            assert len(await load_mcp_tools_async(single_path)) == 1
+            single = time.time() - start
+        finally:
+            await cleanup_mcp_connections()
+
+        config_path = write_echo_servers(tmpdir, {"a": 1.5, "b": 1.5, "c": 1.5})
+        try:
+            start = time.time()
+            tools = await load_mcp_tools_async(config_path)
+            elapsed = time.time() - start
+
+            assert sorted(tool.name for tool in tools) == ["a_echo", "b_echo", "c_echo"]
+            assert elapsed < single * 2, f"3 servers took {elapsed:.1f}s, one takes {single:.1f}s"
+
+            result = await tools[0].execute(text="hello")
+            assert result.success
+            assert result.content == "hello"
+        finally:
+            await cleanup_mcp_connections()
+
+
+@pytest.mark.asyncio
+async def test_startup_deadline_attaches_late_servers():
+    """Test that servers missing the startup deadline attach their tools later."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        config_path = write_echo_servers(tmpdir, {"slow": 1.0})
+        attached = asyncio.Event()
+        late_tools = []
+
+        def on_late_tools(tools):
+            late_tools.extend(tools)
+            attached.set()
+
+        try:
+            tools = await load_mcp_tools_async(config_path, startup_timeout=0.1, on_late_tools=on_late_tools)
+            assert tools == []
+
+            await asyncio.wait_for(attached.wait(), timeout=20)
+            assert [tool.name for tool in late_tools] == ["slow_echo"]
+        finally:
+            await cleanup_mcp_connections()
+
+
+@pytest.mark.asyncio
+async def test_closed_connection_refuses_calls():
+    """Test that a tool of a shut-down server fails instead of respawning the server."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        config_path = write_echo_servers(tmpdir, {"gone": 0})
+        try:
+            tools = await load_mcp_tools_async(config_path)
+        finally:
+            await cleanup_mcp_connections()
+
+        result = await tools[0].execute(text="hello")
+        assert not result.success
+        assert "shut down" in result.error
+        assert tools[0]._connection.session is None
+        assert tools[0]._connection.stats.state == "closed"
+
+
+@pytest.mark.asyncio
+async def test_startup_deadline_skips_late_servers():
+    """Test that without late attach, servers missing the deadline are dropped quickly."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        config_path = write_echo_servers(tmpdir, {"slow": 5.0})
+        try:
+            start = time.time()
+            tools = await load_mcp_tools_async(config_path, startup_timeout=0.5)
+            assert tools == []
+            assert time.time() - start < 3.0
+        finally:
+            await cleanup_mcp_connections()
+
+
+@pytest.mark.asyncio
+async def test_lazy_servers_use_cached_schemas_and_idle_shutdown():
+    """Test lazy mode: cached schemas at startup, connect on first call, shut down when idle."""
+    original = get_mcp_lazy_config()
+    saved = (original.lazy, original.idle_timeout, original.cache_dir)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        config_path = write_echo_servers(tmpdir, {"lazy": 0.0})
+        set_mcp_lazy_config(lazy=True, idle_timeout=0.5, cache_dir=str(Path(tmpdir) / "cache"))
+        try:
+            # Cache miss: connect once to list tools, then shut down when idle
+            tools = await load_mcp_tools_async(config_path)
+            assert [tool.name for tool in tools] == ["lazy_echo"]
+            connection = _mcp_connections[0]
+            for _ in range(50):
+                if connection.session is None:
+                    break
+                await asyncio.sleep(0.1)
+            assert connection.session is None
+            await cleanup_mcp_connections()
+
+            # Cache hit: tools are registered without starting the server
+            tools = await load_mcp_tools_async(config_path)
+            connection = _mcp_connections[0]
+            assert [tool.name for tool in tools] == ["lazy_echo"]
+            assert connection.session is None
+
+            result = await tools[0].execute(text="on demand")
+            assert result.success
+            assert result.content == "on demand"
+            assert connection.session is not None
+
+            for _ in range(50):
+                if connection.session is None:
+                    break
+                await asyncio.sleep(0.1)
+            assert connection.session is None
+
+            # Reconnects transparently after idle shutdown
+            result = await tools[0].execute(text="again")
+            assert result.content == "again"
+        finally:
+            await cleanup_mcp_connections()
+            original.lazy, original.idle_timeout, original.cache_dir = saved
+
+
+CRASHING_SERVER = """
+import os
+from mcp.server.fastmcp import FastMCP
+from mcp.types import ToolAnnotations
+mcp = FastMCP("crashy")
+
+@mcp.tool(annotations=ToolAnnotations(readOnlyHint=True))
+def lookup(key: str) -> str:
+    \"\"\"Read-only lookup\"\"\"
+    return key.upper()
+
+@mcp.tool()
+def crash() -> str:
+    \"\"\"Kill the server process\"\"\"
+    os._exit(1)
+
+mcp.run()
+"""
+
+
+def write_crashing_server(tmpdir: str) -> str:
+    """Write an mcp.json with a stdio server that exits when its crash tool is called."""
+    script = Path(tmpdir) / "crashing_server.py"
+    script.write_text(CRASHING_SERVER, encoding="utf-8")
+    config_path = Path(tmpdir) / "mcp.json"
+    config_path.write_text(
+        json.dumps({"mcpServers": {"crashy": {"command": sys.executable, "args": [str(script)]}}}),
+        encoding="utf-8",
+    )
+    return str(config_path)
+
+
+@pytest.mark.asyncio
+async def test_idempotent_call_reconnects_after_server_crash():
+    """Test that a dead session is replaced and an idempotent call is retried once."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        try:
+            tools = {tool.name: tool for tool in await load_mcp_tools_async(write_crashing_server(tmpdir))}
+            assert tools["lookup"].idempotent
+            assert not tools["crash"].idempotent
+
+            result = await tools["crash"].execute()
+            assert not result.success
+
+            result = await tools["lookup"].execute(key="abc")
+            assert result.success, result.error
+            assert result.content == "ABC"
+
+            stats = get_mcp_server_stats()["crashy"]
+            assert stats["state"] == "connected"
+            assert stats["reconnects"] == 1
+            assert stats["connection_losses"] == 1
+        finally:
+            await cleanup_mcp_connections()
+
+
+@pytest.mark.asyncio
+async def test_health_check_reconnects_dead_server():
+    """Test that health-check pings detect a dead server and reconnect it in the background."""
+    health = get_mcp_health_config()
+    saved = health.health_check_interval
+    set_mcp_health_config(health_check_interval=0.2)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        try:
+            tools = {tool.name: tool for tool in await load_mcp_tools_async(write_crashing_server(tmpdir))}
+            await tools["crash"].execute()
+
+            for _ in range(100):
+                stats = get_mcp_server_stats()["crashy"]
+                if stats["reconnects"] == 1 and stats["state"] == "connected":
+                    break
+                await asyncio.sleep(0.1)
+            assert stats["state"] == "connected"
+            assert stats["reconnects"] == 1
+        finally:
+            await cleanup_mcp_connections()
+            set_mcp_health_config(health_check_interval=saved)
+
+
+SLOW_SERVER = """
+import asyncio
+from mcp.server.fastmcp import FastMCP
+mcp = FastMCP("slow")
+
+@mcp.tool()
+async def work(seconds: float) -> str:
+    \"\"\"Sleep, then report done\"\"\"
+    await asyncio.sleep(seconds)
+    return "done"
+
+mcp.run()
+"""
+
+
+def write_slow_server(tmpdir: str, **server_options) -> str:
+    """Write an mcp.json with a stdio server whose tool sleeps."""
+    script = Path(tmpdir) / "slow_server.py"
+    script.write_text(SLOW_SERVER, encoding="utf-8")
+    config_path = Path(tmpdir) / "mcp.json"
+    config_path.write_text(
+        json.dumps({"mcpServers": {"slow": {"command": sys.executable, "args": [str(script)], **server_options}}}),
+        encoding="utf-8",
+    )
+    return str(config_path)
+
+
+@pytest.mark.asyncio
+async def test_max_concurrency_queues_calls():
+    """Test that calls beyond max_concurrency wait and the wait is recorded."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        try:
+            tools = await load_mcp_tools_async(write_slow_server(tmpdir, max_concurrency=1, execute_timeout=0.8))
+            # Each call fits its execute timeout; queueing does not count against it
+            results = await asyncio.gather(*(tools[0].execute(seconds=0.4) for _ in range(3)))
+            assert all(result.success for result in results)
+
+            stats = get_mcp_server_stats()["slow"]
+            assert stats["calls"] == 3
+            assert stats["queued"] == 0
+            assert stats["in_flight"] == 0
+            assert stats["queue_wait_max"] >= 0.7
+        finally:
+            await cleanup_mcp_connections()
+
+
+@pytest.mark.asyncio
+async def test_pool_spreads_calls_over_sessions():
+    """Test that pool_size adds sessions for a saturated stateless server."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        try:
+            tools = await load_mcp_tools_async(write_slow_server(tmpdir, max_concurrency=1, pool_size=3))
+            start = time.time()
+            results = await asyncio.gather(*(tools[0].execute(seconds=2.0) for _ in range(3)))
+            elapsed = time.time() - start
+
+            assert all(result.success for result in results)
+            assert get_mcp_server_stats()["slow"]["sessions"] == 3
+            assert elapsed < 5.0, f"3 pooled calls took {elapsed:.1f}s"
+        finally:
+            await cleanup_mcp_connections()
+
+
+COUNTER_SERVER = """
+from mcp.server.fastmcp import FastMCP
+mcp = FastMCP("counter")
+count = 0
+
+@mcp.tool()
+def bump() -> str:
+    \"\"\"Increment this session's counter\"\"\"
+    global count
+    count += 1
+    return str(count)
+
+mcp.run()
+"""
+
+
+@pytest.mark.asyncio
+async def test_stateful_server_gets_session_per_tenant():
+    """Test that tenants get isolated sessions of a stateful server, reused until evicted."""
+    config = get_mcp_tenant_config()
+    saved = config.max_idle_tenants
+    with tempfile.TemporaryDirectory() as tmpdir:
+        script = Path(tmpdir) / "counter_server.py"
+        script.write_text(COUNTER_SERVER, encoding="utf-8")
+        config_path = Path(tmpdir) / "mcp.json"
+        config_path.write_text(
+            json.dumps({"mcpServers": {"counter": {"command": sys.executable, "args": [str(script)], "stateful": True}}}),
+            encoding="utf-8",
+        )
+        manager = get_mcp_connection_manager()
+        try:
+            set_mcp_tenant_config(max_idle_tenants=1)
+            shared = await load_mcp_tools_async(str(config_path))
+            alice = manager.acquire("alice")
+            bob = manager.acquire("bob")
+            alice_bump = alice.bind_tools(shared)[0]
+            bob_bump = bob.bind_tools(shared)[0]
+            assert alice_bump is not shared[0] and alice_bump is not bob_bump
+            assert alice.bind_tools(shared)[0] is alice_bump
+
+            assert [(await alice_bump.execute()).content for _ in range(2)] == ["1", "2"]
+            assert (await bob_bump.execute()).content == "1"
+            assert (await shared[0].execute()).content == "1"
+            assert manager.get_stats()["connected_tenant_sessions"] == 2
+
+            # A released tenant keeps its session until pushed out by another
+            alice.release()
+            assert manager.get_stats()["active_tenants"] == 1
+            again = manager.acquire("alice")
+            assert (await again.bind_tools(shared)[0].execute()).content == "3"
+            again.release()
+            bob.release()
+            await asyncio.sleep(0.5)
+            stats = manager.get_stats()
+            assert stats["tenants"] == 1
+            assert stats["evictions"] == 1
+            assert stats["connected_tenant_sessions"] == 1
+        finally:
+            await cleanup_mcp_connections()
+            set_mcp_tenant_config(max_idle_tenants=saved)
+
+
+def test_session_released_outside_loop_is_closed_later():
+    """Test that a tenant evicted without a running loop still gets its session closed."""
+    manager = MCPConnectionManager()
+    closed = []
+    session = MCPServerConnection("counter", "stdio", command="true")
+    session._lifecycle_task = object()  # Looks connected
+
+    async def close():
+        closed.append(session.name)
+
+    session.close = close
+    manager.acquire("alice")
+    manager._tenants["alice"].connections["counter"] = session
+
+    assert manager.evict("alice")
+    assert closed == []
+    asyncio.run(manager.close())
+    assert closed == ["counter"]
+
+
+@pytest.mark.asyncio
+async def test_result_cache_reuses_marked_results():
+    """Test that configured tools reuse results for identical arguments only."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        script = Path(tmpdir) / "counter_server.py"
+        script.write_text(COUNTER_SERVER, encoding="utf-8")
+        config_path = Path(tmpdir) / "mcp.json"
+        config_path.write_text(
+            json.dumps({"mcpServers": {"counter": {"command": sys.executable, "args": [str(script)], "cache_tools": {"bump": 60}}}}),
+            encoding="utf-8",
+        )
+        try:
+            tools = await load_mcp_tools_async(str(config_path))
+            before = get_mcp_cache_stats()
+            first = await tools[0].execute()
+            second = await tools[0].execute()
+
+            assert first.content == "1"
+            assert second.success
+            assert second.content.startswith("[Cached result")
+            assert second.content.endswith("\n1")
+            stats = get_mcp_cache_stats()
+            assert stats["hits"] - before["hits"] == 1
+            assert stats["misses"] - before["misses"] == 1
+            assert get_mcp_server_stats()["counter"]["calls"] == 1
+        finally:
+            await cleanup_mcp_connections()
+
+
+def test_result_cache_ttl_and_byte_budget():
+    """Test expiry, canonical argument keys and LRU eviction by size."""
+    saved = get_mcp_cache_config().max_bytes
+    cache = MCPResultCache()
+    try:
+        set_mcp_cache_config(max_bytes=10)
+        key = MCPResultCache.make_key("s", "t", {"b": 1, "a": 2})
+        assert key == MCPResultCache.make_key("s", "t", {"a": 2, "b": 1})
+
+        cache.put("a", "aaaa", ttl=60)
+        cache.put("b", "bbbb", ttl=60)
+        assert cache.get("a") is not None  # a is now most recently used
+        cache.put("c", "cccc", ttl=60)
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.bytes == 8
+        assert cache.evictions == 1
+
+        cache.put("too-big", "x" * 11, ttl=60)
+        assert cache.get("too-big") is None
+
+        cache.put("short", "s", ttl=0.01)
+        time.sleep(0.02)
+        assert cache.get("short") is None
+        assert cache.expirations == 1
+    finally:
+        set_mcp_cache_config(max_bytes=saved)
+
+
+# =============================================================================
+# Result Rendering Tests
+# =============================================================================
+
+
+@pytest.fixture
+def result_spill_dir():
+    """Point MCP result spilling at a temp dir with a small token cap."""
+    config = get_mcp_result_config()
+    saved = (config.max_result_tokens, config.spill_dir)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        set_mcp_result_config(max_result_tokens=200, spill_dir=tmpdir)
+        try:
+            yield Path(tmpdir)
+        finally:
+            config.max_result_tokens, config.spill_dir = saved
+
+
+def test_large_result_truncated_and_spilled(result_spill_dir):
+    """Test that oversized results keep head and tail and are saved in full."""
+    lines = [f"line {i}: " + "lorem ipsum " * 5 for i in range(500)]
+    result = CallToolResult(content=[TextContent(type="text", text="\n".join(lines))])
+
+    text = render_tool_result("search", result)
+
+    assert text.startswith("line 0:")
+    assert text.rstrip().endswith(lines[-1].rstrip())
+    assert "line 250:" not in text
+    assert "Result truncated" in text
+    spilled = list(result_spill_dir.glob("search-*.txt"))
+    assert len(spilled) == 1
+    assert str(spilled[0]) in text
+    assert spilled[0].read_text(encoding="utf-8") == "\n".join(lines)
+
+
+def test_spill_dir_retention(result_spill_dir):
+    """Test that old saved results are deleted and the directory stays within its size budget."""
+    config = get_mcp_result_config()
+    saved = (config.spill_max_age, config.spill_max_bytes)
+    now = time.time()
+    for name, age in [("expired.txt", 7200), ("older.txt", 60), ("newer.txt", 30)]:
+        path = result_spill_dir / name
+        path.write_text("x" * 1000)
+        os.utime(path, (now - age, now - age))
+    try:
+        set_mcp_result_config(spill_max_age=3600, spill_max_bytes=1500)
+        lines = [f"line {i}: " + "lorem ipsum " * 5 for i in range(500)]
+        render_tool_result("search", CallToolResult(content=[TextContent(type="text", text="\n".join(lines))]))
+    finally:
+        config.spill_max_age, config.spill_max_bytes = saved
+
+    names = sorted(path.name for path in result_spill_dir.iterdir())
+    assert "expired.txt" not in names and "older.txt" not in names
+    assert "newer.txt" in names
+    assert len(names) == 2
+
+
+def test_small_result_unchanged(result_spill_dir):
+    """Test that results within the cap are returned as-is."""
+    result = CallToolResult(content=[TextContent(type="text", text="a"), TextContent(type="text", text="b")])
+    assert render_tool_result("lookup", result) == "a\nb"
+    assert list(result_spill_dir.iterdir()) == []
+
+
+def test_binary_blocks_are_saved_not_stringified(result_spill_dir):
+    """Test that image data is saved to a file instead of entering the history."""
+    png = b"\x89PNG\r\n\x1a\n" + b"\x00" * 100
+    result = CallToolResult(
+        content=[
+            ImageContent(type="image", data=base64.b64encode(png).decode(), mimeType="image/png"),
+            EmbeddedResource(
+                type="resource",
+                resource=TextResourceContents(uri="file:///notes.txt", mimeType="text/plain", text="note body"),
+            ),
+        ]
+    )
+
+    text = render_tool_result("screenshot", result)
+
+    assert base64.b64encode(png).decode() not in text
+    assert "[image: image/png, 108 bytes, saved to" in text
+    assert "[resource file:///notes.txt]\nnote body" in text
+    saved = list(result_spill_dir.glob("screenshot-*.png"))
+    assert len(saved) == 1
+    assert saved[0].read_bytes() == png
+
+
 async def main():
     """Run all MCP tests."""
     print("=" * 80)
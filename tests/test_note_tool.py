@@ -1,13 +1,24 @@
 """Test cases for Session Note Tool."""
 
+import asyncio
+import json
 import tempfile
 from pathlib import Path
 
 import pytest
 
+from mini_agent.tools.note_store import NoteStore, note_db_path
 from mini_agent.tools.note_tool import RecallNoteTool, SessionNoteTool
 
 
+def _remove_note_files(note_file: str):
+    """Remove a note file and its SQLite database files."""
+    Path(note_file).unlink(missing_ok=True)
+    db_path = note_db_path(note_file)
+    for suffix in ("", "-wal", "-shm"):
+        Path(f"{db_path}{suffix}").unlink(missing_ok=True)
+
+
 @pytest.mark.asyncio
 async def test_record_and_recall_notes():
     """Test recording and recalling notes."""
@@ -54,7 +65,7 @@ async def test_record_and_recall_notes():
         print("✅ Note record and recall test passed")
 
     finally:
-        Path(note_file).unlink(missing_ok=True)
+        _remove_note_files(note_file)
 
 
 @pytest.mark.asyncio
@@ -80,7 +91,7 @@ async def test_empty_notes():
         print("✅ Empty notes test passed")
 
     finally:
-        Path(note_file).unlink(missing_ok=True)
+        _remove_note_files(note_file)
 
 
 @pytest.mark.asyncio
@@ -110,7 +121,99 @@ async def test_note_persistence():
         print("✅ Note persistence test passed")
 
     finally:
-        Path(note_file).unlink(missing_ok=True)
+        _remove_note_files(note_file)
+
+
+@pytest.mark.asyncio
+async def test_legacy_json_import():
+    """Test that notes from a legacy JSON file are imported once."""
+    print("\n=== Testing Legacy JSON Import ===")
+
+    with tempfile.NamedTemporaryFile(mode="w", delete=False, suffix=".json") as f:
+        json.dump([{"timestamp": "2024-01-01T00:00:00", "category": "legacy", "content": "Old note"}], f)
+        note_file = f.name
+
+    try:
+        record_tool = SessionNoteTool(memory_file=note_file)
+        result = await record_tool.execute(content="New note", category="test")
+        assert result.success
+
+        # A second store on the same files must not import the JSON again
+        recall_tool = RecallNoteTool(memory_file=note_file)
+        result = await recall_tool.execute()
+        assert result.success
+        assert result.content.count("Old note") == 1
+        assert "New note" in result.content
+        assert result.content.index("Old note") < result.content.index("New note")
+
+    finally:
+        _remove_note_files(note_file)
+
+
+@pytest.mark.asyncio
+async def test_recall_query_and_limit():
+    """Test full-text query, since filter and limit on recall."""
+    print("\n=== Testing Recall Query and Limit ===")
+
+    with tempfile.NamedTemporaryFile(mode="w", delete=False, suffix=".json") as f:
+        note_file = f.name
+    Path(note_file).unlink()
+
+    try:
+        store = NoteStore(note_db_path(note_file))
+        for i in range(30):
+            store.add(f"Routine note number {i}", "log")
+        store.add("Deployment uses docker compose", "project_info")
+        store.add("用户喜欢简洁的回答", "user_preference")
+
+        recall_tool = RecallNoteTool(memory_file=note_file)
+
+        result = await recall_tool.execute(query="docker")
+        assert "docker compose" in result.content
+        assert "Routine note" not in result.content
+
+        # CJK text is matched by substring
+        result = await recall_tool.execute(query="简洁")
+        assert "用户喜欢简洁的回答" in result.content
+
+        result = await recall_tool.execute(category="log", limit=5)
+        assert result.content.count("Routine note") == 5
+        assert "Routine note number 29" in result.content
+        assert "showing the 5 most recent of 30 notes" in result.content
+
+        result = await recall_tool.execute(since="2999-01-01")
+        assert "No notes found" in result.content
+        store.close()
+
+    finally:
+        _remove_note_files(note_file)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_notes_from_worker_threads():
+    """Test that concurrent record/recall calls share one store safely off the event loop."""
+    print("\n=== Testing Concurrent Notes ===")
+
+    with tempfile.NamedTemporaryFile(mode="w", delete=False, suffix=".json") as f:
+        note_file = f.name
+    Path(note_file).unlink()
+
+    try:
+        record_tool = SessionNoteTool(memory_file=note_file)
+        recall_tool = RecallNoteTool(memory_file=note_file)
+
+        results = await asyncio.gather(
+            *(record_tool.execute(content=f"Parallel note {i}", category="parallel") for i in range(20)),
+            *(recall_tool.execute(query="Parallel") for _ in range(5)),
+        )
+        assert all(result.success for result in results)
+        assert record_tool.store.count("parallel") == 20
+
+        record_tool.store.close()
+        recall_tool.store.close()
+
+    finally:
+        _remove_note_files(note_file)
 
 
 async def main():
@@ -122,6 +225,9 @@ async def main():
     await test_record_and_recall_notes()
     await test_empty_notes()
     await test_note_persistence()
+    await test_legacy_json_import()
+    await test_recall_query_and_limit()
+    await test_concurrent_notes_from_worker_threads()
 
     print("\n" + "=" * 80)
     print("All Session Note Tool tests passed! ✅")
@@ -129,6 +235,4 @@ async def main():
 
 
 if __name__ == "__main__":
-    import asyncio
-
     asyncio.run(main())
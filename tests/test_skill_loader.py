@@ -272,3 +272,75 @@ Skill content here.
         assert "Skill Root Directory" in prompt
         assert str(skill_dir) in prompt
         assert "All files and references in this skill are relative to this directory" in prompt
+
+
+def test_skill_constructor_accepts_content():
+    """Test that Skill(content=...) works and content stays settable"""
+    skill = Skill(name="manual", description="Built by hand", content="Body")
+    assert skill.content == "Body" and skill.content_loaded
+    assert "_content" not in repr(skill)
+
+    lazy = Skill(name="lazy", description="Lazy", content_loader=lambda: "Loaded")
+    assert not lazy.content_loaded
+    assert lazy.content == "Loaded"
+    lazy.content = "Replaced"
+    assert lazy.content == "Replaced"
+
+
+def test_discover_skills_lazy_content_and_index_cache():
+    """Test lazy skill content and incremental reuse of the persistent index"""
+    with tempfile.TemporaryDirectory() as tmpdir, tempfile.TemporaryDirectory() as cache_dir:
+        for i in range(2):
+            skill_dir = Path(tmpdir) / f"skill-{i}"
+            skill_dir.mkdir()
+            create_test_skill(skill_dir, f"skill-{i}", f"Test skill {i}", f"Content {i}")
+
+        loader = SkillLoader(tmpdir, cache_dir=cache_dir)
+        skills = loader.discover_skills()
+        assert len(skills) == 2
+        assert loader.index_path.exists()
+
+        # Content is only read on first access
+        skill = loader.get_skill("skill-0")
+        assert not skill.content_loaded
+        assert "Content 0" in skill.content
+        assert skill.content_loaded
+
+        # Unchanged files come from the index; changed files are parsed again
+        create_test_skill(Path(tmpdir) / "skill-1", "skill-1", "Updated description", "New content")
+        loader = SkillLoader(tmpdir, cache_dir=cache_dir)
+        parsed = []
+        original_parse = loader._parse_skill_file
+        loader._parse_skill_file = lambda path: parsed.append(path.parent.name) or original_parse(path)
+        loader.discover_skills()
+
+        assert parsed == ["skill-1"]
+        assert loader.get_skill("skill-1").description == "Updated description"
+        assert loader.get_skill("skill-0").description == "Test skill 0"
+
+
+def test_refresh_reloads_only_changed_skills():
+    """Test refresh picks up added, edited and removed skills"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for i in range(2):
+            skill_dir = Path(tmpdir) / f"skill-{i}"
+            skill_dir.mkdir()
+            create_test_skill(skill_dir, f"skill-{i}", f"Test skill {i}", f"Content {i}")
+
+        loader = SkillLoader(tmpdir)
+        loader.discover_skills()
+        unchanged = loader.get_skill("skill-0")
+        assert loader.refresh() == []
+
+        create_test_skill(Path(tmpdir) / "skill-1", "skill-1", "Updated description", "New content")
+        new_dir = Path(tmpdir) / "skill-2"
+        new_dir.mkdir()
+        create_test_skill(new_dir, "skill-2", "Added skill", "Added content")
+
+        assert loader.refresh() == ["skill-1", "skill-2"]
+        assert loader.get_skill("skill-0") is unchanged
+        assert loader.get_skill("skill-1").description == "Updated description"
+
+        (Path(tmpdir) / "skill-2" / "SKILL.md").unlink()
+        assert loader.refresh() == ["skill-2"]
+        assert loader.get_skill("skill-2") is None
@@ -109,3 +109,38 @@ def test_tool_count_optimization():
         tool = tools[0]
         assert tool.name == "get_skill"
         assert "get complete content" in tool.description.lower() or "获取" in tool.description
+
+
+@pytest.mark.asyncio
+async def test_search_skills_ranks_by_relevance():
+    """Test search_skills ranks skills by name, description and headings"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        skills = {
+            "pdf-forms": ("Fill and extract PDF form fields", "# Filling forms\n## Extracting text"),
+            "pptx-builder": ("Create PowerPoint presentations", "# Slides\n## Charts"),
+            "xlsx-analyst": ("Analyze spreadsheets", "# Pivot tables\n## PDF export"),
+        }
+        for name, (description, content) in skills.items():
+            skill_dir = Path(tmpdir) / name
+            skill_dir.mkdir()
+            create_test_skill(skill_dir, name, description, content)
+
+        tools, loader = create_skill_tools(tmpdir, enable_search=True)
+        assert [tool.name for tool in tools] == ["get_skill", "search_skills"]
+
+        results = loader.search_skills("fill pdf form")
+        assert [skill.name for skill, _ in results] == ["pdf-forms", "xlsx-analyst"]
+
+        # Headings are indexed too
+        assert loader.search_skills("pivot")[0][0].name == "xlsx-analyst"
+        assert loader.search_skills("unrelated words") == []
+
+        result = await tools[1].execute(query="slides presentation", limit=1)
+        assert result.success
+        assert "pptx-builder" in result.content
+        assert "pdf-forms" not in result.content
+
+        # The system prompt only points at search_skills
+        prompt = loader.get_skills_metadata_prompt()
+        assert "search_skills" in prompt
+        assert "pdf-forms" not in prompt